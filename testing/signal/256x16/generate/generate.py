@@ -0,0 +1,169 @@
+import numpy as np
+import argparse
+import json
+import os
+import sys
+
+# ================= KONFIGURASI 256x16 =================
+POINTS = 256
+BIT_DEPTH = 16
+MAX_VAL = 32767 # Signed 16-bit max
+TARGET_HEADROOM = 32000.0 # Target nilai integer maksimum (agar aman dari overflow)
+
+# INPUT USER
+FUNC_STR = "1.5 * np.sin(2 * np.pi * 5 * t) + 0.5 * np.sin(2 * np.pi * 15 * t)"
+
+# LIMITASI 1
+# FUNC_STR = "np.sin(10 * t) + 0.5 * np.sin(2 * t) + 3 * np.sin(5 * t) + np.sin(3 * t) + 0.05 * np.sin(8 * t) + 0.2 * np.sin(12 * t) + 10 * np.sin(t)" 
+# LIMITASI 2
+# FUNC_STR = "(1 + 0.8 * np.sin(2 * np.pi * 4.5 * t)) * np.sin(2 * np.pi * 29 * t)"
+
+START_TIME = 0.0
+# END_TIME = 2 * np.pi
+
+# FUNC_STR = "(1 + 0.8 * np.sin(2*np.pi*4.5*t)) * np.sin(2*np.pi*29*t)"
+END_TIME = 1 # only for above FUNC_STR
+
+# PATH HANDLING
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT_DIR = os.path.abspath(os.path.join(CURRENT_DIR, "../../../"))
+BIN_FILENAME = os.path.join(PARENT_DIR, "input_256x16.bin")
+TXT_FILENAME = os.path.join(CURRENT_DIR, "input_debug.txt")
+META_FILENAME = os.path.join(CURRENT_DIR, "meta_data.json")
+
+# FORMAT FILE BIN
+# "raw"  : format lama (1 frame mentah, langsung di-upload ke FPGA)
+# "fftc" : container multi-frame dengan header (lihat testing/tools/capture_format.py)
+BIN_FORMAT = "raw"
+
+# MODE SCALING
+# "fixed" : puncak sinyal -> TARGET_HEADROOM
+# "auto"  : target terbesar yang tidak menimbulkan wrap di datapath FFT/magnitude,
+#           dicek dengan golden model (lihat testing/tools/headroom.py)
+SCALE_MODE = "fixed"
+
+# MODE PACK (g_PACK_TWO = true di uart_fft_top)
+# Frame kedua dikirim tepat setelah frame pertama dan masuk ke mem_Imag (satu FFT untuk keduanya).
+# Kedua frame di-scale ke TARGET_HEADROOM / sqrt(2) agar a + jb tidak wrap di twiddle (-3 dB).
+# None = mode normal (1 frame per transaksi)
+PACK_FUNC_STR = None
+# PACK_FUNC_STR = "np.sin(2 * np.pi * 3 * t)"
+
+TOOLS_DIR = os.path.join(PARENT_DIR, "tools")
+sys.path.insert(0, TOOLS_DIR)
+import capture_format
+import corpus
+import headroom
+
+def load_pyplot(headless=False):
+    """Import matplotlib hanya saat plot dibutuhkan (backend Agg jika headless)"""
+    import matplotlib
+    if headless:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+def run(plot=True, save_path=None):
+    print(f"--- GENERATOR 256x16 (AUTO-NORMALIZED) ---")
+    
+    # 1. Generate Sinyal Float
+    t_ideal = np.linspace(START_TIME, END_TIME, 1000)
+    context = {"np": np, "t": t_ideal}
+    y_ideal = eval(FUNC_STR, context)
+
+    # 2. Generate Sinyal Sampel
+    t_samples = np.linspace(START_TIME, END_TIME, POINTS, endpoint=False)
+    context_samples = {"np": np, "t": t_samples}
+    y_samples_float = eval(FUNC_STR, context_samples)
+    
+    # [FIX] AUTO-SCALING LOGIC (16-BIT)
+    # Cari nilai maksimum absolut dari sinyal input
+    max_amp = np.max(np.abs(y_samples_float))
+    
+    # Hitung scale factor dinamis:
+    # Kita ingin 'max_amp' dipetakan menjadi 'TARGET_HEADROOM' (32000)
+    # Mode pack: a + jb bisa sqrt(2) x puncak -> kedua frame pakai target bersama yang lebih kecil
+    target = TARGET_HEADROOM
+    if PACK_FUNC_STR is not None:
+        y_pack_float = eval(PACK_FUNC_STR, context_samples)[np.newaxis, :]
+        target = TARGET_HEADROOM * headroom.PACK_HEADROOM
+    if SCALE_MODE == "auto":
+        if PACK_FUNC_STR is not None:
+            target = float(headroom.safe_pack_targets(y_samples_float[np.newaxis, :], y_pack_float, f"{POINTS}x{BIT_DEPTH}")[0])
+        else:
+            target = float(headroom.safe_targets(y_samples_float[np.newaxis, :], f"{POINTS}x{BIT_DEPTH}")[0])
+        print(f"[-] Auto Headroom: {target:.0f} (fixed: {TARGET_HEADROOM:.0f})")
+    if max_amp > 0:
+        final_scale = target / max_amp
+    else:
+        final_scale = target # Default jika sinyal 0
+        
+    print(f"[-] Max Input Amp: {max_amp:.4f}")
+    print(f"[-] Applied Scale: {final_scale:.4f}")
+
+    # Terapkan scaling dinamis
+    y_samples_int = (y_samples_float * final_scale).astype(int)
+    y_samples_int = np.clip(y_samples_int, -32768, 32767) # Safety clip 16-bit
+
+    # Frame kedua mode pack: target sama, scale sendiri disimpan di metadata
+    frames_int = y_samples_int[np.newaxis, :]
+    if PACK_FUNC_STR is not None:
+        y_pack_int, pack_scale = corpus.quantize(y_pack_float, BIT_DEPTH, target)
+        frames_int = np.vstack([frames_int, y_pack_int])
+        print(f"[-] Pack Scale   : {pack_scale[0]:.4f} ({PACK_FUNC_STR})")
+
+    # 3. Simpan File BIN (Untuk FPGA) - Little Endian Short (<h)
+    if BIN_FORMAT == "fftc":
+        capture_format.write_capture(BIN_FILENAME, frames_int, BIT_DEPTH, final_scale, FUNC_STR)
+    else:
+        frames_int.astype(capture_format.frame_dtype(BIT_DEPTH)).tofile(BIN_FILENAME)
+
+    # 4. Simpan File TXT (Debug Biner)
+    with open(TXT_FILENAME, "wb") as f:
+        f.write(corpus.binary_text(frames_int, BIT_DEPTH))
+
+    # 5. Simpan Metadata untuk Verify.py
+    meta = {
+        "func": FUNC_STR,
+        "points": POINTS,
+        "bits": BIT_DEPTH,
+        "scale": final_scale, # Simpan scale dinamis
+        "t_start": START_TIME,
+        "t_end": END_TIME
+    }
+    if PACK_FUNC_STR is not None:
+        meta["pack"] = {"func": PACK_FUNC_STR, "scale": float(pack_scale[0])}
+    with open(META_FILENAME, "w") as f:
+        json.dump(meta, f)
+
+    print(f"[OK] Bin file saved to: {BIN_FILENAME}")
+    
+    if not plot:
+        return
+
+    # 6. Plotting
+    plt = load_pyplot(headless=save_path is not None)
+    plt.figure(figsize=(10, 5))
+    plt.plot(t_ideal, y_ideal, label=f'Ideal (Max: {max_amp:.2f})')
+    plt.step(t_samples, y_samples_float, where='mid', label='Sampel Float', color='red', linewidth=2)
+    plt.plot(t_samples, y_samples_float, 'ro')
+    plt.title(f"Input Generation 256x16\n{FUNC_STR}")
+    plt.xlabel("Waktu")
+    plt.ylabel("Amplitudo")
+    plt.legend()
+    plt.grid(True)
+    if save_path:
+        plt.savefig(save_path)
+        print(f"[OK] Plot disimpan: {save_path}")
+    else:
+        plt.show()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generator input FFT 256x16")
+    parser.add_argument("--stats", action="store_true", help="Tanpa plot (matplotlib tidak di-import)")
+    parser.add_argument("--save", help="Simpan plot ke PNG (backend Agg, tanpa jendela)")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    run(plot=not args.stats, save_path=args.save)
\ No newline at end of file
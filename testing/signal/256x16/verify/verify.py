@@ -0,0 +1,267 @@
+import numpy as np
+import argparse
+import json
+import os
+import sys
+
+# PATH HANDLING
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+GENERATE_DIR = os.path.abspath(os.path.join(CURRENT_DIR, "../generate"))
+PARENT_DIR = os.path.abspath(os.path.join(CURRENT_DIR, "../../../"))
+
+META_FILENAME = os.path.join(GENERATE_DIR, "meta_data.json")
+INPUT_BIN = os.path.join(PARENT_DIR, "input_256x16.bin")
+OUTPUT_BIN = os.path.join(PARENT_DIR, "output_256x16.bin")
+
+# Golden model bit-accurate (testing/tools)
+TOOLS_DIR = os.path.join(PARENT_DIR, "tools")
+sys.path.insert(0, TOOLS_DIR)
+import golden_model
+import capture_format
+import ref_cache
+
+# ================= PENGATURAN TAMPILAN =================
+def load_pyplot(headless=False):
+    """Import matplotlib hanya saat plot dibutuhkan (backend Agg jika headless)"""
+    import matplotlib
+    if headless:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    plt.rcParams['mathtext.fontset'] = 'cm'
+    plt.rcParams['font.family'] = 'serif'
+    return plt
+
+def print_header(title):
+    print("="*60)
+    print(f"{title:^60}")
+    print("="*60)
+
+def run_verify(frame_idx=0, stats_only=False, save_path=None, half=False, pack=False):
+    # 1. LOAD METADATA
+    if not os.path.exists(META_FILENAME):
+        print("Error: Metadata tidak ditemukan. Jalankan generate.py dulu.")
+        return
+    
+    with open(META_FILENAME, "r") as f:
+        meta = json.load(f)
+    
+    POINTS = meta["points"]
+    FUNC_STR = meta["func"]
+    T_START = meta["t_start"]
+    T_END = meta["t_end"]
+    SCALE = meta["scale"] 
+    BITS = meta["bits"]
+
+    # Mode pack (g_PACK_TWO): output frame j berisi spektrum input frame 2j (A) dan 2j+1 (B)
+    pack = pack or "pack" in meta
+    if pack and frame_idx % 2 and "pack" in meta:
+        FUNC_STR = meta["pack"]["func"]
+        SCALE = meta["pack"]["scale"]
+
+    # Hitung Axis Frekuensi
+    DURATION = T_END - T_START
+    SAMPLING_RATE = POINTS / DURATION if DURATION > 0 else 1
+    FREQ_AXIS = np.arange(POINTS) * (SAMPLING_RATE / POINTS)
+
+    print_header(f"VERIFIKASI FFT {POINTS} POINT ({BITS}-BIT) [LINEAR UNIT]")
+    print(f"[-] Fungsi Input   : {FUNC_STR}")
+    print(f"[-] Scale Factor   : {SCALE:.4f}")
+    print(f"[-] Resolusi Freq  : {SAMPLING_RATE/POINTS:.2f} Hz/bin")
+    print("-" * 60)
+
+    # 2. LOAD INPUT & RESTORE KE SATUAN ASLI
+    if not os.path.exists(INPUT_BIN): return
+    # Capture FFTC multi-frame atau .bin lama (1 frame), di-memmap tanpa copy
+    _, input_frames = capture_format.open_capture(INPUT_BIN, POINTS, BITS)
+    if frame_idx >= len(input_frames):
+        print(f"[!] Frame {frame_idx} tidak ada (total {len(input_frames)} frame)")
+        return
+    raw_input_int = input_frames[frame_idx].astype(int)
+    input_signal_real = np.array(raw_input_int) / SCALE
+
+    # 2.5 HITUNG TRUE ANALOG SPECTRUM (High Resolution) -- [BARU]
+    # Kita melakukan oversampling (misal 32x lipat) untuk mensimulasikan sinyal analog
+    OVERSAMPLE = 32
+    POINTS_HIGH = POINTS * OVERSAMPLE
+    SAMPLING_RATE_HIGH = POINTS_HIGH / DURATION
+    
+    t_high = np.linspace(T_START, T_END, POINTS_HIGH, endpoint=False)
+    # Sinyal analog, spektrum referensi, spektrum ideal & golden output di-cache per
+    # hash (func, points, bits, t_start, t_end, scale, oversample, config golden model) -> lihat testing/tools/ref_cache.py
+    ref = ref_cache.ReferenceCache().reference(FUNC_STR, POINTS, BITS, T_START, T_END, SCALE, OVERSAMPLE)
+    # Cache hanya berlaku jika input di file memang hasil generate.py untuk FUNC_STR ini
+    ref_valid = np.array_equal(ref["input_int"], raw_input_int)
+    y_high = ref["y_high"]
+    fft_high_mag = ref["spec_high"]
+    
+    # Axis Frekuensi High Res
+    freq_axis_high = np.arange(POINTS_HIGH) * (SAMPLING_RATE_HIGH / POINTS_HIGH)
+
+    # 3. HITUNG FFT IDEAL DISKRET (NUMPY 256 Point)
+    if ref_valid:
+        fft_ideal_mag = ref["spec_ideal"]
+    else:
+        fft_ideal_complex = np.fft.fft(input_signal_real)
+        fft_ideal_mag = np.abs(fft_ideal_complex) / (POINTS / 2)
+        fft_ideal_mag[0] = fft_ideal_mag[0] / 2
+
+    # 4. LOAD OUTPUT FPGA
+    if not os.path.exists(OUTPUT_BIN):
+        print(f"[!] File output tidak ditemukan: {OUTPUT_BIN}")
+        return
+
+    # Mode half-spectrum (g_HALF_SPECTRUM): board hanya mengirim bin 0..POINTS/2.
+    # Capture FFTC dikenali dari jumlah word per frame; .bin mentah butuh --half.
+    out_words = POINTS + 2 if pack else golden_model.out_bins(POINTS, half)
+    out_header, output_frames = capture_format.open_capture(OUTPUT_BIN, out_words, BITS)
+    half = half or (not pack and out_header["points"] == golden_model.out_bins(POINTS, True))
+    out_idx = frame_idx // 2 if pack else frame_idx
+    if out_idx >= len(output_frames):
+        print(f"[!] Frame output {out_idx} tidak ada (total {len(output_frames)} frame)")
+        return
+    fpga_raw_int = output_frames[out_idx].astype(int)
+
+    # 4.5 GOLDEN MODEL (BIT-ACCURATE)
+    # Selisih terhadap golden model = kesalahan hardware, bukan error kuantisasi
+    if pack:
+        pair = np.asarray(input_frames[frame_idx - frame_idx % 2:][:2])
+        if len(pair) < 2:
+            print(f"[!] Mode pack butuh pasangan frame {frame_idx - frame_idx % 2} dan {frame_idx - frame_idx % 2 + 1}")
+            return
+        golden_words = golden_model.golden_output_packed(pair, f"{POINTS}x{BITS}")[0]
+        golden_int = golden_model.unpack_output(golden_words, POINTS)[frame_idx % 2].astype(int)
+        fpga_words = fpga_raw_int
+        fpga_raw_int = golden_model.unpack_output(fpga_words, POINTS)[frame_idx % 2]
+    elif half:
+        golden_int = golden_model.golden_output(raw_input_int, f"{POINTS}x{BITS}", half=True)[0].astype(int)
+    elif ref_valid:
+        golden_int = ref["golden"]
+    else:
+        golden_int = golden_model.golden_output(raw_input_int, f"{POINTS}x{BITS}")[0].astype(int)
+    golden_mismatch = np.count_nonzero(golden_int != fpga_raw_int)
+    n_words = len(fpga_raw_int)
+    # Skew byte LOW uart_tx (32x16) dibalik dulu (sebelum cermin / unpack), galat & SNR dihitung dari magnitude asli
+    if half:
+        fpga_raw_int = golden_model.unskew_words(fpga_raw_int, f"{POINTS}x{BITS}").astype(int)
+    elif pack:
+        fpga_words = golden_model.unskew_words(fpga_words, f"{POINTS}x{BITS}").astype(int)
+        fpga_raw_int = golden_model.unpack_output(fpga_words, POINTS)[frame_idx % 2]
+    if half or pack:
+        # Bin N-k = cermin bin k (input real), spektrum penuh dibangun ulang di host
+        fpga_raw_int = golden_model.mirror_spectrum(fpga_raw_int, POINTS)
+
+    # KONVERSI: Output FPGA -> Nilai Asli
+    fpga_mag_real = (fpga_raw_int * 2) / SCALE
+
+    # 5. ANALISIS ERROR
+    error = np.abs(fft_ideal_mag - fpga_mag_real)
+    max_error = np.max(error)
+    avg_error = np.mean(error)
+    
+    signal_power = np.sum(fft_ideal_mag**2)
+    noise_power = np.sum(error**2)
+    snr = 10 * np.log10(signal_power / noise_power) if noise_power > 0 else 999
+
+    print(f"STATISTIK PERFORMA:")
+    print(f"[-] Max Galat      : {max_error:.5f} Unit")
+    print(f"[-] Rata-rata Galat: {avg_error:.5f} Unit")
+    print(f"[-] SNR (Estimasi) : {snr:.2f} dB")
+    print(f"[-] Beda vs Golden : {golden_mismatch}/{n_words} bin (0 = identik bit-per-bit)")
+    if half:
+        print(f"[-] Mode Output    : half-spectrum ({n_words} word, bin {n_words}..{POINTS - 1} dicerminkan)")
+    if pack:
+        print(f"[-] Mode Output    : pack 2 frame (output {out_idx}, spektrum {'AB'[frame_idx % 2]}, "
+              f"bin {n_words}..{POINTS - 1} dicerminkan)")
+
+    if stats_only:
+        return
+
+    # ================= VISUALISASI =================
+    plt = load_pyplot(headless=save_path is not None)
+    fig = plt.figure(figsize=(12, 10))
+    fig.suptitle(f"Analisis Spektral Linear ({BITS}-bit)", fontsize=16, fontweight='bold')
+
+    gs = fig.add_gridspec(3, 1, height_ratios=[1, 2, 1], hspace=0.4)
+
+    # PLOT 1: Time Domain
+    ax1 = fig.add_subplot(gs[0])
+    t_axis = np.linspace(T_START, T_END, POINTS, endpoint=False)
+    
+    # Plot sinyal "Analog" di background sebagai referensi
+    ax1.plot(t_high, y_high, color='orange', alpha=0.4, linewidth=1, label='True Analog Signal')
+    # Plot sinyal diskrit (sampling)
+    ax1.step(t_axis, input_signal_real, where='mid', color='#1f77b4', label='Discrete Input (FPGA)')
+    ax1.plot(t_axis, input_signal_real, 'bo', alpha=0.3, markersize=4) 
+    
+    ax1.set_title(f"Domain Waktu: Input Sinyal", fontsize=12, loc='left')
+    ax1.text(0.02, 0.85, f"Input: ${FUNC_STR}$", transform=ax1.transAxes, fontsize=12, 
+             bbox=dict(facecolor='white', alpha=0.8, edgecolor='none'))
+    ax1.set_ylabel("Amplitudo (Unit Asli)")
+    ax1.set_xlabel("Waktu (detik)")
+    ax1.legend(loc='upper right')
+    ax1.grid(True, linestyle='--', alpha=0.6)
+    
+    y_max = np.max(np.abs(input_signal_real))
+    if y_max == 0: y_max = 1
+    ax1.set_ylim(-y_max*1.2, y_max*1.2)
+
+    # PLOT 2: Frequency Domain (Dengan True Analog)
+    ax2 = fig.add_subplot(gs[1])
+    
+    # [BARU] Plot True Analog Spectrum (Garis Oranye)
+    # Kita batasi X-axis agar tidak terlalu zoom out, cukup sampai sampling rate FPGA
+    ax2.plot(freq_axis_high, fft_high_mag, color='#ff7f0e', alpha=0.6, linewidth=2, label="True Analog Spectrum")
+    
+    # Plot Ideal Diskrit (Numpy)
+    ax2.stem(FREQ_AXIS, fft_ideal_mag, linefmt='b--', markerfmt='bo', basefmt=' ', label="Ideal Discrete (Python)")
+    
+    # Plot Aktual (FPGA)
+    freq_offset = (SAMPLING_RATE/POINTS) * 0.15
+    markerline2, stemlines2, baseline2 = ax2.stem(FREQ_AXIS + freq_offset, fpga_mag_real, linefmt='g-', markerfmt='gx', basefmt=' ', label="Aktual (FPGA)")
+    plt.setp(stemlines2, 'linewidth', 2)
+    
+    ax2.set_title("Domain Frekuensi: Perbandingan Analog vs Diskrit vs FPGA", fontsize=12, loc='left')
+    ax2.set_ylabel("Magnituda (Unit Asli)")
+    ax2.set_xlabel("Frekuensi (Hz)")
+    
+    # Batasi tampilan X-Axis agar fokus ke area kerja FPGA, tapi lebihkan sedikit
+    # Jika sinyal input frekuensinya tinggi (misal 29Hz), kita perlu melihat sampai situ.
+    # Kita set limit maksimum antara Sampling Rate atau Frekuensi tertinggi di input.
+    max_freq_view = max(SAMPLING_RATE, np.max(np.abs(fft_high_mag))*1.5) # Default view
+    # Tapi agar perbandingan Aliasing terlihat jelas (29 vs 3), kita set minimal sampai Sampling Rate
+    ax2.set_xlim(-1, SAMPLING_RATE * 1.1) 
+    
+    ax2.legend()
+    ax2.grid(True, which='both', alpha=0.7)
+
+    # PLOT 3: Error
+    ax3 = fig.add_subplot(gs[2])
+    ax3.bar(FREQ_AXIS, error, width=(SAMPLING_RATE/POINTS)*0.8, color='red', alpha=0.7, edgecolor='black')
+    ax3.set_title("Analisis Galat Absolut (FPGA vs Ideal Discrete)", fontsize=12, loc='left')
+    ax3.set_ylabel("Selisih (Unit Asli)")
+    ax3.set_xlabel("Frekuensi (Hz)")
+    ax3.grid(True, axis='y')
+    
+    stats_text = f"Mean Error: {avg_error:.4f}\nSNR: {snr:.1f} dB"
+    ax3.text(0.98, 0.85, stats_text, transform=ax3.transAxes, ha='right', va='top', 
+             bbox=dict(boxstyle='round', facecolor='white'))
+
+    plt.tight_layout()
+    if save_path:
+        fig.savefig(save_path)
+        print(f"[OK] Figure disimpan: {save_path}")
+    else:
+        plt.show()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Verifikasi output FPGA 256x16")
+    parser.add_argument("frame", nargs="?", type=int, default=0, help="Index frame (capture multi-frame)")
+    parser.add_argument("--stats", action="store_true", help="Hanya statistik, tanpa plot (matplotlib tidak di-import)")
+    parser.add_argument("--save", help="Simpan figure ke PNG (backend Agg, tanpa jendela)")
+    parser.add_argument("--half", action="store_true", help="Output dari build g_HALF_SPECTRUM (bin 0..POINTS/2)")
+    parser.add_argument("--pack", action="store_true", help="Output dari build g_PACK_TWO (2 frame input per output)")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    run_verify(args.frame, args.stats, args.save, args.half, args.pack)
\ No newline at end of file
@@ -1,12 +1,8 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import struct
+import argparse
 import json
 import os
-
-# ================= PENGATURAN TAMPILAN =================
-plt.rcParams['mathtext.fontset'] = 'cm'
-plt.rcParams['font.family'] = 'serif'
+import sys
 
 # PATH HANDLING
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -17,12 +13,30 @@ META_FILENAME = os.path.join(GENERATE_DIR, "meta_data.json")
 INPUT_BIN = os.path.join(PARENT_DIR, "input_32x16.bin")
 OUTPUT_BIN = os.path.join(PARENT_DIR, "output_32x16.bin")
 
+# Golden model bit-accurate (testing/tools)
+TOOLS_DIR = os.path.join(PARENT_DIR, "tools")
+sys.path.insert(0, TOOLS_DIR)
+import golden_model
+import capture_format
+import ref_cache
+
+# ================= PENGATURAN TAMPILAN =================
+def load_pyplot(headless=False):
+    """Import matplotlib hanya saat plot dibutuhkan (backend Agg jika headless)"""
+    import matplotlib
+    if headless:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    plt.rcParams['mathtext.fontset'] = 'cm'
+    plt.rcParams['font.family'] = 'serif'
+    return plt
+
 def print_header(title):
     print("="*60)
     print(f"{title:^60}")
     print("="*60)
 
-def run_verify():
+def run_verify(frame_idx=0, stats_only=False, save_path=None, half=False, pack=False):
     # 1. LOAD METADATA
     if not os.path.exists(META_FILENAME):
         print("Error: Metadata tidak ditemukan. Jalankan generate.py dulu.")
@@ -38,6 +52,12 @@ def run_verify():
     SCALE = meta["scale"] 
     BITS = meta["bits"]
 
+    # Mode pack (g_PACK_TWO): output frame j berisi spektrum input frame 2j (A) dan 2j+1 (B)
+    pack = pack or "pack" in meta
+    if pack and frame_idx % 2 and "pack" in meta:
+        FUNC_STR = meta["pack"]["func"]
+        SCALE = meta["pack"]["scale"]
+
     # Hitung Axis Frekuensi
     DURATION = T_END - T_START
     SAMPLING_RATE = POINTS / DURATION if DURATION > 0 else 1
@@ -50,14 +70,13 @@ def run_verify():
     print("-" * 60)
 
     # 2. LOAD INPUT & RESTORE KE SATUAN ASLI
-    raw_input_int = []
     if not os.path.exists(INPUT_BIN): return
-    with open(INPUT_BIN, "rb") as f:
-        content = f.read()
-        for i in range(0, len(content), 2):
-            val = struct.unpack('<h', content[i:i+2])[0]
-            raw_input_int.append(val)
-            
+    # Capture FFTC multi-frame atau .bin lama (1 frame), di-memmap tanpa copy
+    _, input_frames = capture_format.open_capture(INPUT_BIN, POINTS, BITS)
+    if frame_idx >= len(input_frames):
+        print(f"[!] Frame {frame_idx} tidak ada (total {len(input_frames)} frame)")
+        return
+    raw_input_int = input_frames[frame_idx].astype(int)
     input_signal_real = np.array(raw_input_int) / SCALE
 
     # 2.5 HITUNG TRUE ANALOG SPECTRUM (High Resolution) -- [BARU]
@@ -67,37 +86,69 @@ def run_verify():
     SAMPLING_RATE_HIGH = POINTS_HIGH / DURATION
     
     t_high = np.linspace(T_START, T_END, POINTS_HIGH, endpoint=False)
-    context_high = {"np": np, "t": t_high}
-    # Evaluasi ulang fungsi matematika pada resolusi tinggi
-    y_high = eval(FUNC_STR, context_high)
-    
-    # FFT High Res
-    fft_high_complex = np.fft.fft(y_high)
-    fft_high_mag = np.abs(fft_high_complex) / (POINTS_HIGH / 2)
-    fft_high_mag[0] = fft_high_mag[0] / 2
+    # Sinyal analog, spektrum referensi, spektrum ideal & golden output di-cache per
+    # hash (func, points, bits, t_start, t_end, scale, oversample, config golden model) -> lihat testing/tools/ref_cache.py
+    ref = ref_cache.ReferenceCache().reference(FUNC_STR, POINTS, BITS, T_START, T_END, SCALE, OVERSAMPLE)
+    # Cache hanya berlaku jika input di file memang hasil generate.py untuk FUNC_STR ini
+    ref_valid = np.array_equal(ref["input_int"], raw_input_int)
+    y_high = ref["y_high"]
+    fft_high_mag = ref["spec_high"]
     
     # Axis Frekuensi High Res
     freq_axis_high = np.arange(POINTS_HIGH) * (SAMPLING_RATE_HIGH / POINTS_HIGH)
 
     # 3. HITUNG FFT IDEAL DISKRET (NUMPY 32 Point)
-    fft_ideal_complex = np.fft.fft(input_signal_real)
-    fft_ideal_mag = np.abs(fft_ideal_complex) / (POINTS / 2)
-    fft_ideal_mag[0] = fft_ideal_mag[0] / 2 
+    if ref_valid:
+        fft_ideal_mag = ref["spec_ideal"]
+    else:
+        fft_ideal_complex = np.fft.fft(input_signal_real)
+        fft_ideal_mag = np.abs(fft_ideal_complex) / (POINTS / 2)
+        fft_ideal_mag[0] = fft_ideal_mag[0] / 2
 
     # 4. LOAD OUTPUT FPGA
     if not os.path.exists(OUTPUT_BIN):
         print(f"[!] File output tidak ditemukan: {OUTPUT_BIN}")
         return
 
-    fpga_raw_int = []
-    with open(OUTPUT_BIN, "rb") as f:
-        content = f.read()
-        for i in range(0, len(content), 2):
-            if len(fpga_raw_int) < POINTS:
-                val = struct.unpack('<h', content[i:i+2])[0]
-                fpga_raw_int.append(val)
-    
-    fpga_raw_int = np.array(fpga_raw_int)
+    # Mode half-spectrum (g_HALF_SPECTRUM): board hanya mengirim bin 0..POINTS/2.
+    # Capture FFTC dikenali dari jumlah word per frame; .bin mentah butuh --half.
+    out_words = POINTS + 2 if pack else golden_model.out_bins(POINTS, half)
+    out_header, output_frames = capture_format.open_capture(OUTPUT_BIN, out_words, BITS)
+    half = half or (not pack and out_header["points"] == golden_model.out_bins(POINTS, True))
+    out_idx = frame_idx // 2 if pack else frame_idx
+    if out_idx >= len(output_frames):
+        print(f"[!] Frame output {out_idx} tidak ada (total {len(output_frames)} frame)")
+        return
+    fpga_raw_int = output_frames[out_idx].astype(int)
+
+    # 4.5 GOLDEN MODEL (BIT-ACCURATE)
+    # Selisih terhadap golden model = kesalahan hardware, bukan error kuantisasi
+    if pack:
+        pair = np.asarray(input_frames[frame_idx - frame_idx % 2:][:2])
+        if len(pair) < 2:
+            print(f"[!] Mode pack butuh pasangan frame {frame_idx - frame_idx % 2} dan {frame_idx - frame_idx % 2 + 1}")
+            return
+        golden_words = golden_model.golden_output_packed(pair, f"{POINTS}x{BITS}")[0]
+        golden_int = golden_model.unpack_output(golden_words, POINTS)[frame_idx % 2].astype(int)
+        fpga_words = fpga_raw_int
+        fpga_raw_int = golden_model.unpack_output(fpga_words, POINTS)[frame_idx % 2]
+    elif half:
+        golden_int = golden_model.golden_output(raw_input_int, f"{POINTS}x{BITS}", half=True)[0].astype(int)
+    elif ref_valid:
+        golden_int = ref["golden"]
+    else:
+        golden_int = golden_model.golden_output(raw_input_int, f"{POINTS}x{BITS}")[0].astype(int)
+    golden_mismatch = np.count_nonzero(golden_int != fpga_raw_int)
+    n_words = len(fpga_raw_int)
+    # Skew byte LOW uart_tx (32x16) dibalik dulu (sebelum cermin / unpack), galat & SNR dihitung dari magnitude asli
+    if half:
+        fpga_raw_int = golden_model.unskew_words(fpga_raw_int, f"{POINTS}x{BITS}").astype(int)
+    elif pack:
+        fpga_words = golden_model.unskew_words(fpga_words, f"{POINTS}x{BITS}").astype(int)
+        fpga_raw_int = golden_model.unpack_output(fpga_words, POINTS)[frame_idx % 2]
+    if half or pack:
+        # Bin N-k = cermin bin k (input real), spektrum penuh dibangun ulang di host
+        fpga_raw_int = golden_model.mirror_spectrum(fpga_raw_int, POINTS)
 
     # KONVERSI: Output FPGA -> Nilai Asli
     fpga_mag_real = (fpga_raw_int * 2) / SCALE
@@ -115,8 +166,18 @@ def run_verify():
     print(f"[-] Max Galat      : {max_error:.5f} Unit")
     print(f"[-] Rata-rata Galat: {avg_error:.5f} Unit")
     print(f"[-] SNR (Estimasi) : {snr:.2f} dB")
+    print(f"[-] Beda vs Golden : {golden_mismatch}/{n_words} bin (0 = identik bit-per-bit)")
+    if half:
+        print(f"[-] Mode Output    : half-spectrum ({n_words} word, bin {n_words}..{POINTS - 1} dicerminkan)")
+    if pack:
+        print(f"[-] Mode Output    : pack 2 frame (output {out_idx}, spektrum {'AB'[frame_idx % 2]}, "
+              f"bin {n_words}..{POINTS - 1} dicerminkan)")
+
+    if stats_only:
+        return
 
     # ================= VISUALISASI =================
+    plt = load_pyplot(headless=save_path is not None)
     fig = plt.figure(figsize=(12, 10))
     fig.suptitle(f"Analisis Spektral Linear ({BITS}-bit)", fontsize=16, fontweight='bold')
 
@@ -186,7 +247,21 @@ def run_verify():
              bbox=dict(boxstyle='round', facecolor='white'))
 
     plt.tight_layout()
-    plt.show()
+    if save_path:
+        fig.savefig(save_path)
+        print(f"[OK] Figure disimpan: {save_path}")
+    else:
+        plt.show()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Verifikasi output FPGA 32x16")
+    parser.add_argument("frame", nargs="?", type=int, default=0, help="Index frame (capture multi-frame)")
+    parser.add_argument("--stats", action="store_true", help="Hanya statistik, tanpa plot (matplotlib tidak di-import)")
+    parser.add_argument("--save", help="Simpan figure ke PNG (backend Agg, tanpa jendela)")
+    parser.add_argument("--half", action="store_true", help="Output dari build g_HALF_SPECTRUM (bin 0..POINTS/2)")
+    parser.add_argument("--pack", action="store_true", help="Output dari build g_PACK_TWO (2 frame input per output)")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    run_verify()
\ No newline at end of file
+    args = parse_args()
+    run_verify(args.frame, args.stats, args.save, args.half, args.pack)
\ No newline at end of file
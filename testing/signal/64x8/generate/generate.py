@@ -1,8 +1,8 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import struct
+import argparse
 import json
 import os
+import sys
 
 # ================= KONFIGURASI 64x8 =================
 POINTS = 64
@@ -31,11 +31,39 @@ BIN_FILENAME = os.path.join(PARENT_DIR, "input_64x8.bin")
 TXT_FILENAME = os.path.join(CURRENT_DIR, "input_debug.txt")
 META_FILENAME = os.path.join(CURRENT_DIR, "meta_data.json")
 
-def int_to_binary_string(val, bits):
-    s = bin(val & int("1"*bits, 2))[2:]
-    return ("{0:0>%s}" % (bits)).format(s)
+# FORMAT FILE BIN
+# "raw"  : format lama (1 frame mentah, langsung di-upload ke FPGA)
+# "fftc" : container multi-frame dengan header (lihat testing/tools/capture_format.py)
+BIN_FORMAT = "raw"
 
-def run():
+# MODE SCALING
+# "fixed" : puncak sinyal -> TARGET_HEADROOM
+# "auto"  : target terbesar yang tidak menimbulkan wrap di datapath FFT/magnitude,
+#           dicek dengan golden model (lihat testing/tools/headroom.py)
+SCALE_MODE = "fixed"
+
+# MODE PACK (g_PACK_TWO = true di uart_fft_top)
+# Frame kedua dikirim tepat setelah frame pertama dan masuk ke mem_Imag (satu FFT untuk keduanya).
+# Kedua frame di-scale ke TARGET_HEADROOM / sqrt(2) agar a + jb tidak wrap di twiddle (-3 dB).
+# None = mode normal (1 frame per transaksi)
+PACK_FUNC_STR = None
+# PACK_FUNC_STR = "np.sin(2 * np.pi * 3 * t)"
+
+TOOLS_DIR = os.path.join(PARENT_DIR, "tools")
+sys.path.insert(0, TOOLS_DIR)
+import capture_format
+import corpus
+import headroom
+
+def load_pyplot(headless=False):
+    """Import matplotlib hanya saat plot dibutuhkan (backend Agg jika headless)"""
+    import matplotlib
+    if headless:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+def run(plot=True, save_path=None):
     print(f"--- GENERATOR 64x8 (AUTO-NORMALIZED) ---")
     
     # 1. Generate Sinyal Float
@@ -53,10 +81,21 @@ def run():
     
     # Hitung scale factor dinamis:
     # Kita ingin 'max_amp' dipetakan menjadi 'TARGET_HEADROOM' (120)
+    # Mode pack: a + jb bisa sqrt(2) x puncak -> kedua frame pakai target bersama yang lebih kecil
+    target = TARGET_HEADROOM
+    if PACK_FUNC_STR is not None:
+        y_pack_float = eval(PACK_FUNC_STR, context_samples)[np.newaxis, :]
+        target = TARGET_HEADROOM * headroom.PACK_HEADROOM
+    if SCALE_MODE == "auto":
+        if PACK_FUNC_STR is not None:
+            target = float(headroom.safe_pack_targets(y_samples_float[np.newaxis, :], y_pack_float, f"{POINTS}x{BIT_DEPTH}")[0])
+        else:
+            target = float(headroom.safe_targets(y_samples_float[np.newaxis, :], f"{POINTS}x{BIT_DEPTH}")[0])
+        print(f"[-] Auto Headroom: {target:.0f} (fixed: {TARGET_HEADROOM:.0f})")
     if max_amp > 0:
-        final_scale = TARGET_HEADROOM / max_amp
+        final_scale = target / max_amp
     else:
-        final_scale = TARGET_HEADROOM # Default jika sinyal 0
+        final_scale = target # Default jika sinyal 0
     
     print(f"[-] Max Input Amp: {max_amp:.4f}")
     print(f"[-] Applied Scale: {final_scale:.4f}")
@@ -65,15 +104,22 @@ def run():
     y_samples_int = (y_samples_float * final_scale).astype(int)
     y_samples_int = np.clip(y_samples_int, -128, 127) # Range 8-bit safety clip
 
+    # Frame kedua mode pack: target sama, scale sendiri disimpan di metadata
+    frames_int = y_samples_int[np.newaxis, :]
+    if PACK_FUNC_STR is not None:
+        y_pack_int, pack_scale = corpus.quantize(y_pack_float, BIT_DEPTH, target)
+        frames_int = np.vstack([frames_int, y_pack_int])
+        print(f"[-] Pack Scale   : {pack_scale[0]:.4f} ({PACK_FUNC_STR})")
+
     # 2. Simpan File BIN - Signed Char ('b')
-    with open(BIN_FILENAME, "wb") as f:
-        for val in y_samples_int:
-            f.write(struct.pack('b', val))
+    if BIN_FORMAT == "fftc":
+        capture_format.write_capture(BIN_FILENAME, frames_int, BIT_DEPTH, final_scale, FUNC_STR)
+    else:
+        frames_int.astype(capture_format.frame_dtype(BIT_DEPTH)).tofile(BIN_FILENAME)
 
     # 3. Simpan File TXT
-    with open(TXT_FILENAME, "w") as f:
-        for val in y_samples_int:
-            f.write(int_to_binary_string(val, BIT_DEPTH) + "\n")
+    with open(TXT_FILENAME, "wb") as f:
+        f.write(corpus.binary_text(frames_int, BIT_DEPTH))
 
     # 4. Metadata
     meta = {
@@ -84,18 +130,36 @@ def run():
         "t_start": START_TIME,
         "t_end": END_TIME
     }
+    if PACK_FUNC_STR is not None:
+        meta["pack"] = {"func": PACK_FUNC_STR, "scale": float(pack_scale[0])}
     with open(META_FILENAME, "w") as f:
         json.dump(meta, f)
 
     print(f"[OK] Bin saved: {BIN_FILENAME}")
     
+    if not plot:
+        return
+
     # 5. Plotting (Visualisasi Int untuk memastikan tidak kotak)
+    plt = load_pyplot(headless=save_path is not None)
     plt.figure(figsize=(10, 5))
     plt.plot(t_ideal, y_ideal, label=f'Ideal (Max: {max_amp:.2f})')
     # Kita plot y_samples_float agar terlihat sampling point aslinya
     plt.step(t_samples, y_samples_float, where='mid', label='Sampel Float', color='orange')
     plt.title(f"Input Generation 64x8\n{FUNC_STR}")
-    plt.grid(True); plt.legend(); plt.show()
+    plt.grid(True); plt.legend()
+    if save_path:
+        plt.savefig(save_path)
+        print(f"[OK] Plot disimpan: {save_path}")
+    else:
+        plt.show()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generator input FFT 64x8")
+    parser.add_argument("--stats", action="store_true", help="Tanpa plot (matplotlib tidak di-import)")
+    parser.add_argument("--save", help="Simpan plot ke PNG (backend Agg, tanpa jendela)")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    args = parse_args()
+    run(plot=not args.stats, save_path=args.save)
\ No newline at end of file
@@ -0,0 +1,164 @@
+library ieee;
+use ieee.std_logic_1164.all;
+use ieee.numeric_std.all;
+use ieee.math_real.all;
+use std.textio.all;
+
+-- Testbench co-simulasi uart_fft_top (dipakai testing/tools/cosim.py, semua build v5_*).
+-- g_IN_FILE : satu transaksi per baris, byte desimal dipisah spasi (urutan kirim UART)
+-- g_OUT_FILE: per transaksi "indeks siklus jumlah_byte b0 b1 ..." (jumlah < g_BYTES_OUT = timeout)
+-- Siklus dihitung dari start bit byte pertama sampai tengah stop bit byte terakhir dari board.
+-- g_MAX_GAP > 0: jeda acak 0..g_MAX_GAP siklus sebelum tiap byte (cari bug timing/race).
+-- g_PING_PONG: pengirim menjaga 2 transaksi in-flight (transaksi k+2 dikirim setelah respons k lengkap),
+-- penerima berjalan di proses terpisah; tanpa ping-pong kirim/terima bergantian (1 in-flight).
+-- g_FRAMED: byte header batch + CRC frame sudah ada di g_IN_FILE (frame_link.encode_header/encode_frame);
+-- penerima membaca [sync, seq] dulu lalu sisa respons: ACK = g_BYTES_OUT byte, NAK (E5) = 4 byte.
+-- Sync/seq/CRC dicek cosim.py (frame_link.decode_response) dari byte mentah di g_OUT_FILE.
+entity tb_uart_fft_top is
+    generic (
+        g_CLKS_PER_BIT  : integer := 16;
+        g_HALF_SPECTRUM : boolean := false;
+        g_PACK_TWO      : boolean := false;
+        g_PING_PONG     : boolean := false;
+        g_FRAMED        : boolean := false;
+        g_IN_FILE       : string := "in.txt";
+        g_OUT_FILE      : string := "out.txt";
+        g_BYTES_OUT     : integer := 64; -- mode framed: termasuk sync, seq, CRC respons ACK
+        g_TIMEOUT       : integer := 1000000; -- siklus maksimal per transaksi
+        g_MAX_GAP       : integer := 0;
+        g_SEED          : integer := 1
+    );
+end tb_uart_fft_top;
+
+architecture Sim of tb_uart_fft_top is
+    constant C_PERIOD : time := 20 ns; -- 50 MHz
+    constant C_BIT    : time := g_CLKS_PER_BIT * C_PERIOD;
+    function window(ping_pong : boolean) return natural is
+    begin
+        if ping_pong then return 2; else return 1; end if;
+    end function;
+    constant C_WINDOW : natural := window(g_PING_PONG);
+    constant C_NAK       : integer := 16#E5#; -- frame_link.SYNC_NAK
+    constant C_NAK_BYTES : integer := 4;      -- sync + seq + CRC
+    type t_Starts is array (0 to 1) of natural;
+    signal r_Clk   : std_logic := '0';
+    signal r_Rst_n : std_logic := '0';
+    signal r_RX    : std_logic := '1';
+    signal w_TX    : std_logic;
+    signal r_Cycle : natural := 0;
+    signal r_Stop  : boolean := false;
+    -- Handshake pengirim/penerima: transaksi terkirim lengkap, respons selesai, siklus mulai per slot in-flight
+    signal r_Ready    : boolean := false;
+    signal r_Sent     : natural := 0;
+    signal r_Sent_All : boolean := false;
+    signal r_Done     : natural := 0;
+    signal r_Start    : t_Starts := (others => 0);
+begin
+    r_Clk <= not r_Clk after C_PERIOD / 2 when not r_Stop else unaffected;
+
+    process(r_Clk) begin
+        if rising_edge(r_Clk) then r_Cycle <= r_Cycle + 1; end if;
+    end process;
+
+    u_dut : entity work.uart_fft_top
+        generic map (g_CLKS_PER_BIT => g_CLKS_PER_BIT, g_HALF_SPECTRUM => g_HALF_SPECTRUM, g_PACK_TWO => g_PACK_TWO,
+                     g_PING_PONG => g_PING_PONG, g_FRAMED => g_FRAMED)
+        port map (i_Clk => r_Clk, i_Rst_n => r_Rst_n, i_UART_RX => r_RX, o_UART_TX => w_TX,
+                  o_LED_Idle => open, o_LED_Busy => open);
+
+    -- Pengirim: satu transaksi per baris g_IN_FILE, maksimal C_WINDOW transaksi di depan respons
+    process
+        file f_In  : text open read_mode is g_IN_FILE;
+        variable l_In : line;
+        variable v_Byte : integer;
+        variable v_Ok : boolean;
+        variable v_Sent : natural := 0;
+        variable v_Seed1, v_Seed2 : positive;
+        variable v_Rand : real;
+
+        procedure send_byte(b : integer) is
+            constant c_Bits : std_logic_vector(7 downto 0) := std_logic_vector(to_unsigned(b, 8));
+        begin
+            r_RX <= '0'; wait for C_BIT;
+            for i in 0 to 7 loop r_RX <= c_Bits(i); wait for C_BIT; end loop;
+            r_RX <= '1'; wait for C_BIT;
+        end procedure;
+    begin
+        v_Seed1 := g_SEED; v_Seed2 := g_SEED + 1;
+        wait until r_Ready;
+
+        while not endfile(f_In) loop
+            readline(f_In, l_In);
+            if v_Sent >= r_Done + C_WINDOW then wait until v_Sent < r_Done + C_WINDOW; end if;
+            r_Start(v_Sent mod 2) <= r_Cycle;
+            loop
+                read(l_In, v_Byte, v_Ok);
+                exit when not v_Ok;
+                if g_MAX_GAP > 0 then
+                    uniform(v_Seed1, v_Seed2, v_Rand);
+                    wait for integer(v_Rand * real(g_MAX_GAP)) * C_PERIOD;
+                end if;
+                send_byte(v_Byte);
+            end loop;
+            v_Sent := v_Sent + 1;
+            r_Sent <= v_Sent;
+        end loop;
+
+        r_Sent_All <= true;
+        wait;
+    end process;
+
+    -- Penerima: g_BYTES_OUT byte per transaksi dari o_UART_TX (sampling di tengah bit), berurutan
+    -- (mode framed: berhenti setelah C_NAK_BYTES jika byte sync = NAK)
+    process
+        file f_Out : text open write_mode is g_OUT_FILE;
+        variable l_Out : line;
+        variable v_Count : integer;
+        variable v_Expect : integer;
+        variable v_Idx : natural := 0;
+        variable v_Deadline : time;
+        variable v_Bits : std_logic_vector(7 downto 0);
+        type t_Bytes is array (0 to g_BYTES_OUT-1) of integer;
+        variable v_Out : t_Bytes;
+    begin
+        r_Rst_n <= '0'; wait for 10 * C_PERIOD;
+        r_Rst_n <= '1'; wait for 10 * C_PERIOD;
+        r_Ready <= true;
+
+        loop
+            -- Respons transaksi v_Idx baru mungkin setelah semua byte-nya terkirim
+            if r_Sent <= v_Idx and not r_Sent_All then wait until r_Sent > v_Idx or r_Sent_All; end if;
+            exit when r_Sent <= v_Idx;
+
+            v_Deadline := now + g_TIMEOUT * C_PERIOD;
+            v_Count := 0;
+            v_Expect := g_BYTES_OUT;
+            while v_Count < v_Expect and now < v_Deadline loop
+                if w_TX /= '0' then wait until w_TX = '0' for v_Deadline - now; end if;
+                exit when w_TX /= '0';
+                wait for C_BIT / 2;
+                for i in 0 to 7 loop wait for C_BIT; v_Bits(i) := w_TX; end loop;
+                wait for C_BIT;
+                v_Out(v_Count) := to_integer(unsigned(v_Bits));
+                v_Count := v_Count + 1;
+                if g_FRAMED and v_Count = 1 and v_Out(0) = C_NAK then v_Expect := C_NAK_BYTES; end if;
+            end loop;
+
+            write(l_Out, v_Idx); write(l_Out, string'(" "));
+            write(l_Out, r_Cycle - r_Start(v_Idx mod 2)); write(l_Out, string'(" "));
+            write(l_Out, v_Count);
+            for i in 0 to v_Count-1 loop write(l_Out, string'(" ")); write(l_Out, v_Out(i)); end loop;
+            writeline(f_Out, l_Out);
+            -- Timeout: board dianggap hang, reset sebelum transaksi berikutnya
+            if v_Count < v_Expect then
+                r_Rst_n <= '0'; wait for 10 * C_PERIOD;
+                r_Rst_n <= '1'; wait for 10 * C_PERIOD;
+            end if;
+            v_Idx := v_Idx + 1;
+            r_Done <= v_Idx;
+        end loop;
+
+        r_Stop <= true;
+        wait;
+    end process;
+end Sim;
@@ -0,0 +1,7 @@
+import sys
+import os
+
+# Tool host diimpor sebagai modul top-level (sama seperti saat dijalankan dari testing/tools)
+TOOLS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "tools"))
+if TOOLS_DIR not in sys.path:
+    sys.path.insert(0, TOOLS_DIR)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+import capture_format
+
+
+@pytest.mark.parametrize("bits, endian", [(16, "little"), (16, "big"), (8, "little")])
+def test_write_open_round_trip(tmp_path, bits, endian):
+    path = str(tmp_path / "cap.fftc")
+    rng = np.random.default_rng(0)
+    lim = 1 << (bits - 1)
+    frames = rng.integers(-lim, lim, (7, 32))
+    capture_format.write_capture(path, frames, bits, scale=0.5, func="sin(x)", kind=capture_format.KIND_OUTPUT,
+                                 endian=endian)
+
+    header, data = capture_format.open_capture(path)
+    assert (header["points"], header["bits"], header["endian"]) == (32, bits, endian)
+    assert (header["n_frames"], header["scale"], header["func"]) == (7, 0.5, "sin(x)")
+    assert header["kind"] == capture_format.KIND_OUTPUT
+    assert header["data_offset"] % capture_format.DATA_ALIGN == 0
+    assert np.array_equal(data, frames)
+
+
+def test_create_then_append_truncates_partial_frame(tmp_path):
+    path = str(tmp_path / "cap.fftc")
+    out = capture_format.create_capture(path, 2, 16, 16)
+    out[:] = np.arange(32).reshape(2, 16)
+    out.flush()
+    del out
+    with open(path, "ab") as f:
+        f.write(b"\x01\x02\x03")  # sisa frame parsial (capture terputus)
+
+    capture_format.append_frames(path, np.full(16, -5))
+    header, data = capture_format.open_capture(path)
+    assert header["n_frames"] == 3
+    assert np.array_equal(data[:2], np.arange(32).reshape(2, 16))
+    assert np.array_equal(data[2], np.full(16, -5))
+
+
+def test_empty_capture(tmp_path):
+    path = str(tmp_path / "empty.fftc")
+    capture_format.create_capture(path, 0, 64, 8)
+    header, data = capture_format.open_capture(path)
+    assert header["n_frames"] == 0 and data.shape == (0, 64)
+
+
+def test_raw_bin_fallback(tmp_path):
+    path = str(tmp_path / "input.bin")
+    frames = np.arange(-64, 64, dtype="<i2").reshape(4, 32)
+    frames.tofile(path)
+    with open(path, "ab") as f:
+        f.write(b"\x00")  # byte sisa diabaikan
+
+    assert not capture_format.is_capture(path)
+    header, data = capture_format.open_capture(path, points=32, bits=16)
+    assert header["n_frames"] == 4 and header["kind"] is None and header["func"] is None
+    assert np.array_equal(data, frames)
+    with pytest.raises(ValueError):
+        capture_format.open_capture(path)
+
+
+def test_read_header_rejects_foreign_file(tmp_path):
+    path = str(tmp_path / "other.fftc")
+    with open(path, "wb") as f:
+        f.write(b"NOPE" + b"\x00" * 64)
+    with pytest.raises(ValueError):
+        capture_format.read_header(path)
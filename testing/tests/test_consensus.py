@@ -0,0 +1,53 @@
+import numpy as np
+
+import golden_model
+from consensus import ConsensusRunner
+
+
+class _ScriptedDriver:
+    """Driver palsu: respons diambil berurutan dari daftar"""
+
+    def __init__(self, responses):
+        self.cfg = golden_model.get_variant("64x8")
+        self.pack_two = False
+        self.half_spectrum = False
+        self.responses = list(responses)
+
+    def transact(self, frame):
+        return self.responses.pop(0), 0.0
+
+
+def _frame_and_golden():
+    frame = np.random.default_rng(0).integers(-128, 128, 64)
+    return frame, golden_model.golden_output(frame, "64x8")[0]
+
+
+def test_repeated_wrong_response_does_not_vote_with_golden():
+    frame, golden = _frame_and_golden()
+    wrong = golden.copy()
+    wrong[3] += 5
+    runner = ConsensusRunner(_ScriptedDriver([wrong] * 5), k=2, n=5)
+    words, attempts, _, method = runner.run_frame(frame)
+    assert method == "gagal" and words is None and attempts == 5
+    stats = runner.stats()
+    assert stats["failed"] == 1 and runner.time_to_result == []
+    assert stats["bad_response_rate"] == 1.0
+
+
+def test_golden_match_after_bad_responses():
+    frame, golden = _frame_and_golden()
+    wrong = golden.copy()
+    wrong[0] += 1
+    runner = ConsensusRunner(_ScriptedDriver([wrong, wrong, golden]), k=2, n=5)
+    words, attempts, _, method = runner.run_frame(frame)
+    assert method == "golden" and attempts == 3 and np.array_equal(words, golden)
+    assert len(runner.time_to_result) == 1 and runner.time_to_fail == []
+
+
+def test_consensus_without_golden():
+    frame, golden = _frame_and_golden()
+    wrong = golden.copy()
+    wrong[0] += 1
+    runner = ConsensusRunner(_ScriptedDriver([wrong, golden, wrong]), k=2, n=5, use_golden=False)
+    words, attempts, _, method = runner.run_frame(frame)
+    assert method == "consensus" and attempts == 3 and np.array_equal(words, wrong)
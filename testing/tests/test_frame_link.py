@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+import time
+
+import frame_link
+
+
+def _crc16_byte(crc, data):
+    """crc16_byte() link_pkg.vhd, bit per bit"""
+    crc ^= data << 8
+    for _ in range(8):
+        crc = ((crc << 1) ^ 0x1021) & 0xFFFF if crc & 0x8000 else (crc << 1) & 0xFFFF
+    return crc
+
+
+@pytest.mark.parametrize("data, expected", [
+    (b"", 0xFFFF),
+    (b"123456789", 0x29B1),  # check value CRC-16/CCITT-FALSE
+    (b"\x00", 0xE1F0),
+    (b"\xff\xff", 0x0000),
+])
+def test_crc16_vectors(data, expected):
+    assert frame_link.crc16(data) == expected
+
+
+def test_crc16_matches_rtl_bitwise():
+    rng = np.random.default_rng(0)
+    for n in (1, 2, 64, 129):
+        data = rng.integers(0, 256, n).astype(np.uint8).tobytes()
+        crc = frame_link.CRC_INIT
+        for byte in data:
+            crc = _crc16_byte(crc, byte)
+        assert frame_link.crc16(data) == crc
+        # CRC berantai (header lalu data) sama dengan CRC satu potong
+        assert frame_link.crc16(data[n // 2:], frame_link.crc16(data[:n // 2])) == crc
+
+
+def test_header_round_trip():
+    raw = frame_link.encode_header(256, 64)
+    assert len(raw) == frame_link.HEADER_BYTES and raw[:2] == frame_link.SYNC_HOST
+    assert frame_link.parse_header(raw) == (256, 64)
+    corrupt = bytearray(raw)
+    corrupt[3] ^= 0x01
+    assert frame_link.parse_header(bytes(corrupt)) is None
+    with pytest.raises(ValueError):
+        frame_link.encode_header(0, 64)
+
+
+class _ScriptedLink:
+    """Link palsu: setiap frame dijawab sesuai skrip ("ok", "nak", "crc" = CRC respons rusak)"""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.writes = []
+        self.rx = bytearray()
+        self.seq = 0
+
+    def write(self, data):
+        self.writes.append(bytes(data))
+        if data[:2] == frame_link.SYNC_HOST and len(data) == frame_link.HEADER_BYTES:
+            self.seq = 0
+            return
+        action = self.script.pop(0) if self.script else "ok"
+        resp = bytearray(frame_link.encode_response(self.seq, data[:-frame_link.CRC_BYTES], nak=action == "nak"))
+        if action == "crc":
+            resp[-1] ^= 0xFF
+        self.rx += resp
+        self.seq += 1
+
+    def read_exact(self, n, timeout):
+        data, self.rx = bytes(self.rx[:n]), self.rx[n:]
+        return data
+
+    def flush_input(self):
+        self.rx.clear()
+
+
+@pytest.mark.parametrize("action", ["nak", "crc"])
+def test_recovery_without_link_timeout_wait(action):
+    frames = np.arange(4 * 8, dtype=np.uint8).reshape(4, 8)
+    link = _ScriptedLink(["ok", action])
+    framed = frame_link.FramedLink(link, 8, 8, np.uint8, batch=16, resync_s=5.0)
+    t0 = time.monotonic()
+    out = list(framed.stream(frames))
+    # resync_s 5 detik tidak pernah ditunggu
+    assert time.monotonic() - t0 < 1.0
+    assert [idx for idx, _, _ in out] == [0, 1, 2, 3]
+    assert all(np.array_equal(words, frames[idx]) for idx, words, _ in out)
+    assert framed.retransmits == 1
+    if action == "nak":
+        # Board sudah di s_HDR: header baru langsung dari frame gagal
+        assert link.writes[3] == frame_link.encode_header(3, 8) and link.writes[4] == link.writes[2]
+    else:
+        # Board sudah ACK: frame diulang di batch yang sama sebagai seq berikutnya
+        assert link.writes[3] == link.writes[2]
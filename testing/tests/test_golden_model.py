@@ -0,0 +1,196 @@
+import numpy as np
+import pytest
+
+import golden_model
+
+# ================= GOLDEN MODEL vs TRANSLITERASI RTL SKALAR =================
+# Referensi independen dari golden model: fft_engine.vhd, split_unit.vhd dan magnitude_unit.vhd
+# ditulis ulang per state machine (satu butterfly / satu bin per langkah, integer Python),
+# tanpa reshape/vektorisasi. Golden model harus identik bit-per-bit untuk input acak penuh
+# (termasuk wrap), di mode biasa, half-spectrum dan pack.
+
+N_FRAMES = 300
+
+
+def _wrap(value, bits):
+    value &= (1 << bits) - 1
+    return value - (1 << bits) if value >> (bits - 1) else value
+
+
+def _resize(value, bits):
+    """numeric_std.resize() signed: bit tanda dipertahankan, sisanya (bits-1) LSB"""
+    low = value & ((1 << (bits - 1)) - 1)
+    return low - (1 << (bits - 1)) if value < 0 else low
+
+
+def _reverse_bits(n, log2):
+    return int(format(n, f"0{log2}b")[::-1], 2)
+
+
+def rtl_fft(frame, cfg, imag=None):
+    """fft_engine.vhd: s_BIT_REV_PROC/s_WAIT (swap) lalu s_STAGE..s_WRITE, ditulis in-place"""
+    points, bits = cfg["points"], cfg["bits"]
+    tw_bits = cfg.get("twiddle_bits", bits)
+    tw_cos, tw_sin = golden_model.load_twiddles(cfg)
+    log2 = points.bit_length() - 1
+    re = [_wrap(int(v), bits) for v in frame]
+    im = [0] * points if imag is None else [_wrap(int(v), bits) for v in imag]
+
+    for idx in range(points):
+        rev = _reverse_bits(idx, log2)
+        if idx < rev:
+            re[idx], re[rev] = re[rev], re[idx]
+            im[idx], im[rev] = im[rev], im[idx]
+
+    stage, dft_size = 1, 1
+    while stage <= log2:
+        dft_size *= 2
+        stage += 1
+        for group in range(0, points, dft_size):
+            for butterfly in range(dft_size // 2):
+                a, b = group + butterfly, group + butterfly + dft_size // 2
+                k = butterfly * (points // dft_size)
+                wr, wi = int(tw_cos[k]), int(tw_sin[k])
+                mult_r = _wrap(re[b] * wr - im[b] * wi, bits + tw_bits)
+                mult_i = _wrap(re[b] * wi + im[b] * wr, bits + tw_bits)
+                tr = _resize(mult_r >> (tw_bits - 1), bits)
+                ti = _resize(mult_i >> (tw_bits - 1), bits)
+                ar, ai = re[a], im[a]
+                re[a], im[a] = _resize((ar + tr) >> 1, bits), _resize((ai + ti) >> 1, bits)
+                re[b], im[b] = _resize((ar - tr) >> 1, bits), _resize((ai - ti) >> 1, bits)
+    return re, im
+
+
+def rtl_split(re, im, bits):
+    """split_unit.vhd + penulisan di uart_fft_top: slot k = A[k], slot N-k = B[k], r_Extra = B[0], B[N/2]"""
+    points = len(re)
+    re, im = list(re), list(im)
+    extra = [0, 0]
+    for k in range(points // 2 + 1):
+        m = (points - k) % points
+        zr_k, zi_k, zr_m, zi_m = re[k], im[k], re[m], im[m]
+        ar, ai = _resize((zr_k + zr_m) >> 1, bits), _resize((zi_k - zi_m) >> 1, bits)
+        br, bi = _resize((zi_k + zi_m) >> 1, bits), _resize((zr_m - zr_k) >> 1, bits)
+        re[k], im[k] = ar, ai
+        if k != m:
+            re[m], im[m] = br, bi
+        else:
+            extra[0 if k == 0 else 1] = br
+    return re + extra, im + [0, 0]
+
+
+def rtl_sqrt(op, cfg):
+    """Iterasi s_CALC magnitude_unit.vhd (restoring 32-bit / v5_64_8 16-bit)"""
+    bits = cfg["bits"]
+    op_bits = 2 * bits
+    rem, root = 0, 0
+    for _ in range(bits):
+        cand = ((rem & ((1 << (op_bits - 2)) - 1)) << 2) | (op >> (op_bits - 2))
+        if cfg["sqrt"] == "restoring":
+            sub = ((root & ((1 << (op_bits - 2)) - 1)) << 2) | 1
+        else:
+            sub = ((root & ((1 << (bits - 1)) - 1)) << 1) | 1
+        if cand >= sub:
+            rem, root = cand - sub, ((root << 1) | 1) & ((1 << bits) - 1)
+        else:
+            rem, root = cand, (root << 1) & ((1 << bits) - 1)
+        op = (op << 2) & ((1 << op_bits) - 1)
+    return _wrap(root, bits)
+
+
+def rtl_magnitude(re, im, cfg, last_bin):
+    """magnitude_unit.vhd untuk bin 0..last_bin: kuadrat (wrap 2*bits), sqrt, tulis signed"""
+    op_bits = 2 * cfg["bits"]
+    return [rtl_sqrt((re[i] * re[i] + im[i] * im[i]) & ((1 << op_bits) - 1), cfg) for i in range(last_bin + 1)]
+
+
+def _random_frames(cfg, n, seed):
+    rng = np.random.default_rng(seed)
+    lim = 1 << (cfg["bits"] - 1)
+    return rng.integers(-lim, lim, (n, cfg["points"]))
+
+
+@pytest.mark.parametrize("variant", ["32x16", "64x8"])
+def test_fft_matches_rtl(variant):
+    cfg = golden_model.get_variant(variant)
+    frames = _random_frames(cfg, N_FRAMES, 1)
+    re_part, im_part = golden_model.fft_fixed(frames, cfg)
+    for i, frame in enumerate(frames):
+        re, im = rtl_fft(frame, cfg)
+        assert re_part[i].tolist() == re and im_part[i].tolist() == im, f"frame {i}"
+
+
+@pytest.mark.parametrize("variant", ["32x16", "64x8"])
+@pytest.mark.parametrize("half", [False, True])
+def test_magnitude_matches_rtl(variant, half):
+    cfg = golden_model.get_variant(variant)
+    points = cfg["points"]
+    frames = _random_frames(cfg, N_FRAMES, 2)
+    last_bin = golden_model.out_bins(points, half) - 1
+    words = golden_model.unskew_words(golden_model.golden_output(frames, cfg, half=half), cfg)
+    for i, frame in enumerate(frames):
+        re, im = rtl_fft(frame, cfg)
+        assert words[i].tolist() == rtl_magnitude(re, im, cfg, last_bin), f"frame {i}"
+
+
+@pytest.mark.parametrize("variant", ["32x16", "64x8"])
+def test_pack_matches_rtl(variant):
+    cfg = golden_model.get_variant(variant)
+    points = cfg["points"]
+    frames = _random_frames(cfg, 2 * 100, 3)
+    words = golden_model.unskew_words(golden_model.golden_output_packed(frames, cfg), cfg)
+    for i in range(frames.shape[0] // 2):
+        re, im = rtl_fft(frames[2 * i], cfg, imag=frames[2 * i + 1])
+        slot_re, slot_im = rtl_split(re, im, cfg["bits"])
+        assert words[i].tolist() == rtl_magnitude(slot_re, slot_im, cfg, points + 1), f"pasangan {i}"
+
+
+def test_split_formula_recovers_both_spectra():
+    """split_fixed pada Z = FFT(a + jb) integer besar: A = FFT(a), B = FFT(b) (selisih <= 1 LSB)"""
+    rng = np.random.default_rng(4)
+    a, b = rng.normal(size=(2, 5, 32))
+    z = np.fft.fft(a + 1j * b, axis=-1) * (1 << 20)
+    ar, ai, br, bi = golden_model.split_fixed(np.round(z.real).astype(np.int64), np.round(z.imag).astype(np.int64))
+    half = 32 // 2 + 1
+    ref_a = np.fft.fft(a, axis=-1)[:, :half] * (1 << 20)
+    ref_b = np.fft.fft(b, axis=-1)[:, :half] * (1 << 20)
+    np.testing.assert_allclose(ar + 1j * ai, ref_a, atol=1.5)
+    np.testing.assert_allclose(br + 1j * bi, ref_b, atol=1.5)
+
+
+def test_pack_close_to_separate_frames():
+    """Magnitude mode pack vs dua frame terpisah: beda hanya pembulatan fixed-point (beberapa LSB)"""
+    cfg = golden_model.get_variant("32x16")
+    rng = np.random.default_rng(5)
+    t = np.arange(32) / 32
+    frames = np.round(12000 * np.sin(2 * np.pi * rng.integers(1, 15, (20, 1)) * t)).astype(np.int64)
+    separate = golden_model.golden_magnitude(frames, cfg)
+    words = golden_model.unskew_words(golden_model.golden_output_packed(frames, cfg), cfg)
+    mag_a, mag_b = golden_model.unpack_output(words, 32)
+    diff_a = np.abs(mag_a.astype(int) - separate[0::2, :17].astype(int))
+    diff_b = np.abs(mag_b.astype(int) - separate[1::2, :17].astype(int))
+    assert diff_a.max() <= 4 and diff_b.max() <= 4
+
+
+@pytest.mark.parametrize("half", [False, True])
+def test_unskew_inverts_tx_skew(half):
+    cfg = golden_model.get_variant("32x16")
+    rng = np.random.default_rng(6)
+    mag = rng.integers(0, 1 << 15, (10, golden_model.out_bins(32, half)))
+    skewed = golden_model.uart_tx_words(mag, cfg)
+    assert not np.array_equal(skewed, mag)
+    assert np.array_equal(golden_model.unskew_words(skewed, cfg), mag)
+    assert np.array_equal(golden_model.uart_tx_words(mag, "64x8"), mag)
+
+
+@pytest.mark.parametrize("variant", ["32x16", "64x8"])
+def test_half_spectrum_mirror_close_to_full(variant):
+    """Bin N/2+1..N-1 hasil mirror_spectrum() vs mode penuh: beda hanya truncation butterfly (<= 1 LSB per stage + 1)"""
+    cfg = golden_model.get_variant(variant)
+    points = cfg["points"]
+    frames = _random_frames(cfg, N_FRAMES, 7) // 2
+    full = golden_model.golden_magnitude(frames, cfg)
+    half = golden_model.unskew_words(golden_model.golden_output(frames, cfg, half=True), cfg)
+    assert np.array_equal(half, full[:, :points // 2 + 1])
+    mirrored = golden_model.mirror_spectrum(half, points)
+    assert np.abs(mirrored.astype(int) - full.astype(int)).max() <= points.bit_length()
@@ -0,0 +1,24 @@
+import golden_model
+import ref_cache
+
+ARGS = ("np.sin(2 * np.pi * 5 * t)", 32, 16, 0.0, 1.0, 20000.0, 32)
+
+
+def test_cache_key_follows_resolved_config():
+    base = golden_model.make_config(32, 16)
+    key = ref_cache.cache_key(*ARGS, cfg=base)
+    assert ref_cache.cache_key(*ARGS, cfg=dict(base)) == key
+    assert ref_cache.cache_key(*ARGS, cfg=dict(base, tx_skew=True)) != key
+    assert ref_cache.cache_key(*ARGS, cfg=dict(base, sqrt="v5_64_8")) != key
+    # Isi twiddle berbeda (ROM seperempat gelombang vs tabel floor) -> entry berbeda
+    assert ref_cache.cache_key(*ARGS, cfg=golden_model.make_config(32, 16, twiddle="quarter")) != key
+    # Build repo 32x16 (twiddle dari fft_pkg.vhd, skew) bukan konfigurasi generik
+    assert ref_cache.cache_key(*ARGS) != key
+
+
+def test_reference_hit_and_miss(tmp_path):
+    cache = ref_cache.ReferenceCache(str(tmp_path))
+    first = cache.reference(*ARGS)
+    second = cache.reference(*ARGS)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert (first["golden"] == second["golden"]).all()
@@ -0,0 +1,23 @@
+import capture_format
+import corpus
+import report
+
+FUNC = "np.sin(10 * t) * np.sin(2 * t)"
+
+
+def test_corpus_spec_in_sidecar(tmp_path):
+    path = str(tmp_path / "c.fftc")
+    corpus.generate_corpus(path, "multitone", 8, 32, 16, t_end=2.5)
+    # Header func kosong: spesifikasi korpus hanya di <path>.spec.json
+    assert capture_format.read_header(path)["func"] == ""
+    spec = corpus.load_spec(path)
+    assert spec["family"] == "multitone" and spec["seed"] == 0
+    assert report._time_range(spec, None, None) == (0.0, 2.5)
+    assert corpus.load_spec(str(tmp_path / "lain.fftc")) is None
+
+
+def test_time_range_from_matching_meta():
+    meta = {"func": FUNC, "scale": 1.0, "t_start": 0.0, "t_end": 6.28}
+    assert report._time_range(None, FUNC, meta) == (0.0, 6.28)
+    # meta_data.json dari generate lain (func berbeda) tidak dipakai
+    assert report._time_range(None, "np.sin(t)", meta) is None
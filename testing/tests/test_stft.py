@@ -0,0 +1,15 @@
+import numpy as np
+
+import golden_model
+import stft
+
+
+def test_model_backend_returns_unskewed_magnitude():
+    """Spectrogram / zero_cross menerima magnitude per bin, bukan word TX 32x16 yang ter-skew"""
+    cfg = golden_model.get_variant("32x16")
+    rng = np.random.default_rng(0)
+    frames = rng.integers(-20000, 20000, (8, 32))
+    backend = stft.ModelBackend("32x16")
+    assert np.array_equal(backend.process(frames), golden_model.golden_magnitude(frames, cfg))
+    half = stft.ModelBackend("32x16", half_spectrum=True).process(frames)
+    assert np.array_equal(half, golden_model.golden_magnitude(frames, cfg)[:, :17])
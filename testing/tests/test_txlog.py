@@ -0,0 +1,104 @@
+import os
+
+import pytest
+
+import txlog
+
+CONFIG = {"variant": "32x16", "points": 32, "port": "/dev/pts/1"}
+
+
+def _fill(path, n):
+    """n record, satu per 0.4 s sejak t0 log -> t0"""
+    with txlog.TransactionLog(path, CONFIG) as log:
+        for i in range(n):
+            log.append(bytes([i]) * 64, bytes([i]) * 64, 0.1, t=log.t0 + 0.4 * i)
+        return log.t0
+
+
+def test_append_and_read_back(tmp_path):
+    path = str(tmp_path / "run.fftl")
+    t0 = _fill(path, 5)
+    with txlog.TransactionLog(path, mode="r") as log:
+        assert len(log) == 5
+        rec = log.record(3)
+        assert bytes(rec["tx"]) == b"\x03" * 64 and rec["status"] == txlog.STATUS_OK
+        assert log.find_time(t0 + 0.4 * 3) == 3
+        assert log.find_time(t0 + 10.0) == 5
+
+
+def test_recover_truncates_unindexed_tail(tmp_path):
+    path = str(tmp_path / "run.fftl")
+    t0 = _fill(path, 5)
+    size = os.path.getsize(path)
+    # Proses mati di tengah append: record ke-6 tertulis sebagian, entri indeks parsial
+    with open(path, "ab") as f:
+        f.write(b"TX\x00" + b"\x07" * 40)
+    with open(path + ".idx", "ab") as f:
+        f.write(b"\x05" * 11)
+
+    with txlog.TransactionLog(path, CONFIG) as log:
+        assert len(log) == 5
+        assert os.path.getsize(path) == size
+        assert log.append(b"\xaa" * 64, b"\xbb" * 64, 0.1, t=t0 + 10.0) == 5
+    with txlog.TransactionLog(path, mode="r") as log:
+        assert len(log) == 6
+        assert bytes(log.record(4)["rx"]) == b"\x04" * 64
+        assert bytes(log.record(5)["tx"]) == b"\xaa" * 64
+
+
+def test_recover_drops_time_index_past_records(tmp_path):
+    path = str(tmp_path / "run.fftl")
+    t0 = _fill(path, 6)
+    # Indeks record terakhir hilang (data sudah tertulis, indeks belum): record & bucket-nya dibuang
+    entry = txlog.IDX_DTYPE.itemsize
+    with open(path + ".idx", "r+b") as f:
+        f.truncate(4 * entry)
+    with txlog.TransactionLog(path, CONFIG) as log:
+        assert len(log) == 4
+        assert all(int(seq) <= 4 for seq in log.tindex)
+        assert log.append(b"\x01", b"\x02", 0.1, t=t0 + 3.0) == 4
+
+
+def test_config_mismatch_rejected(tmp_path):
+    path = str(tmp_path / "run.fftl")
+    _fill(path, 1)
+    with pytest.raises(ValueError):
+        txlog.TransactionLog(path, dict(CONFIG, points=64))
+    # Nama port boleh berbeda antar sesi
+    txlog.TransactionLog(path, dict(CONFIG, port="/dev/ttyUSB0")).close()
+
+
+def test_old_config_without_new_keys(tmp_path):
+    path = str(tmp_path / "run.fftl")
+    _fill(path, 1)
+    # Log lama tanpa ping_pong / framed_raw: dibaca sebagai False, sesi baru dengan nilai default boleh lanjut
+    with txlog.TransactionLog(path, mode="r") as log:
+        assert log.config["ping_pong"] is False and log.config["framed_raw"] is False
+    txlog.TransactionLog(path, dict(CONFIG, ping_pong=False, framed_raw=False)).close()
+    with pytest.raises(ValueError):
+        txlog.TransactionLog(path, dict(CONFIG, ping_pong=True))
+
+
+def test_framed_log_records_wire_bytes(tmp_path):
+    import numpy as np
+    import frame_link
+    from board_emulator import BoardEmulator
+    from uart_driver import UartFFTDriver
+
+    path = str(tmp_path / "framed.fftl")
+    frames = np.random.default_rng(0).integers(-128, 128, (5, 64))
+    board = BoardEmulator("64x8", time_scale=0.0, framed=True)
+    try:
+        with UartFFTDriver(board.start(), "64x8", framed=True, log=path) as drv:
+            assert all(words is not None for _, words, _ in drv.stream(frames))
+    finally:
+        board.stop()
+
+    with txlog.TransactionLog(path, mode="r") as log:
+        assert log.config["framed_raw"] and len(log) == 5
+        first = log.record(0)
+        assert bytes(first["tx"]) == frame_link.encode_header(5, 64) + frame_link.encode_frame(frames[0].astype(np.int8).tobytes())
+        assert bytes(first["rx"])[:2] == bytes([frame_link.SYNC_ACK, 0])
+        assert bytes(log.record(1)["tx"])[:2] != frame_link.SYNC_HOST
+        rows = txlog.replay(log, range(len(log)))
+        assert len(rows) == 5 and all(r["logged_golden"] for r in rows)
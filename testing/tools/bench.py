@@ -0,0 +1,305 @@
+import numpy as np
+import argparse
+import platform
+import tempfile
+import json
+import time
+import os
+
+import golden_model
+import capture_format
+import corpus
+import ref_cache
+import stream_stats
+
+# ================= BENCHMARK SUITE + BASELINE =================
+# Benchmark jalur panas tool host: generate korpus, baca/tulis capture, golden model
+# (N = 32/64 dan N besar), referensi spektrum verify.py, streaming statistics, dan
+# uart_driver end-to-end lewat emulator pty. Tiap benchmark diulang, waktu terbaik dipakai
+# (paling tahan noise), hasil JSON dibandingkan dengan baseline yang di-commit:
+# regresi jika waktu > baseline * (1 + threshold). Setup tetap (file, emulator, port) di luar
+# bagian yang diukur. Baseline hanya bermakna di mesin dan --scale yang sama: jika berbeda,
+# perbandingan tetap dicetak tapi regresi tidak menggagalkan run. Rekam ulang dengan
+# --update-baseline setelah ganti mesin atau setelah optimasi.
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(CURRENT_DIR, "bench_baseline.json")
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_REPEAT = 5
+SCHEMA_VERSION = 1
+MACHINE_KEYS = ("platform", "processor", "cpu_count")  # python/numpy beda = regresi yang sah
+
+BENCHMARKS = {}
+
+
+def benchmark(name, unit):
+    """
+    Daftarkan fungsi benchmark: f(scale, tmp_dir) -> (fungsi tanpa argumen yang diukur, jumlah unit)
+    atau (fungsi, jumlah unit, cleanup) jika setup membuka resource (dipanggil setelah pengukuran)
+    """
+    def register(func):
+        BENCHMARKS[name] = {"setup": func, "unit": unit, "doc": (func.__doc__ or "").strip()}
+        return func
+    return register
+
+
+def _frames(variant, n, seed=0):
+    """Frame multitone terkuantisasi untuk variant (seperti korpus regresi)"""
+    cfg = golden_model.get_variant(variant) if isinstance(variant, str) else variant
+    rng = np.random.default_rng(seed)
+    y = corpus.eval_expr(corpus.FAMILIES["multitone"]["func"], corpus.time_grid(cfg["points"]),
+                         **corpus.sample_params("multitone", rng, n, cfg["points"]))
+    frames, scales = corpus.quantize(y, cfg["bits"], corpus.DEFAULT_HEADROOM[cfg["bits"]])
+    return frames, scales
+
+
+@benchmark("corpus_generate", "frame")
+def _bench_corpus(scale, tmp_dir):
+    """corpus.generate_corpus multitone 32x16 ke FFTC"""
+    n = int(20000 * scale)
+    path = os.path.join(tmp_dir, "corpus.fftc")
+    return lambda: corpus.generate_corpus(path, "multitone", n, 32, 16), n
+
+
+@benchmark("capture_write", "frame")
+def _bench_capture_write(scale, tmp_dir):
+    """capture_format.write_capture 32x16"""
+    n = int(200000 * scale)
+    frames = np.random.default_rng(0).integers(-32768, 32767, (n, 32), dtype=np.int16)
+    path = os.path.join(tmp_dir, "write.fftc")
+    return lambda: capture_format.write_capture(path, frames, 16), n
+
+
+@benchmark("capture_read", "frame")
+def _bench_capture_read(scale, tmp_dir):
+    """capture_format.open_capture (memmap) + baca semua frame"""
+    n = int(200000 * scale)
+    path = os.path.join(tmp_dir, "read.fftc")
+    capture_format.write_capture(path, np.random.default_rng(1).integers(-32768, 32767, (n, 32), dtype=np.int16), 16)
+
+    def read():
+        _, frames = capture_format.open_capture(path)
+        return int(np.asarray(frames, dtype=np.int64).sum())
+    return read, n
+
+
+def _golden(variant, n):
+    frames, _ = _frames(variant, n)
+    return lambda: golden_model.golden_output(frames, variant), n
+
+
+@benchmark("golden_32x16", "frame")
+def _bench_golden_32(scale, tmp_dir):
+    """golden_model.golden_output 32x16"""
+    return _golden("32x16", int(50000 * scale))
+
+
+@benchmark("golden_64x8", "frame")
+def _bench_golden_64(scale, tmp_dir):
+    """golden_model.golden_output 64x8"""
+    return _golden("64x8", int(50000 * scale))
+
+
+@benchmark("golden_256x16", "frame")
+def _bench_golden_256(scale, tmp_dir):
+    """golden_model.golden_output 256x16 (konfigurasi generik, twiddle seperempat gelombang)"""
+    return _golden(golden_model.make_config(256, 16, twiddle="quarter"), int(10000 * scale))
+
+
+@benchmark("golden_1024x16", "frame")
+def _bench_golden_1024(scale, tmp_dir):
+    """golden_model.golden_output 1024x16 (konfigurasi generik, twiddle seperempat gelombang)"""
+    return _golden(golden_model.make_config(1024, 16, twiddle="quarter"), int(2000 * scale))
+
+
+@benchmark("verify_reference", "call")
+def _bench_reference(scale, tmp_dir):
+    """ref_cache.compute_reference (referensi verify.py tanpa cache), 32x16 oversample 32"""
+    n = max(1, int(50 * scale))
+    func = "1.5 * np.sin(2 * np.pi * 5 * t) + 0.5 * np.sin(2 * np.pi * 15 * t)"
+
+    def compute():
+        for i in range(n):
+            ref_cache.compute_reference(func, 32, 16, 0.0, 1.0, 20000.0 + i, 32)
+    return compute, n
+
+
+@benchmark("stream_stats", "frame")
+def _bench_stream_stats(scale, tmp_dir):
+    """stream_stats.StreamingStats.update 32x16 (output = golden model)"""
+    n = int(50000 * scale)
+    frames, scales = _frames("32x16", n)
+    out = golden_model.golden_output(frames, "32x16")
+
+    def update():
+        stats = stream_stats.StreamingStats(32)
+        for start in range(0, n, stream_stats.CHUNK_FRAMES):
+            stats.update(frames[start:start + stream_stats.CHUNK_FRAMES], out[start:start + stream_stats.CHUNK_FRAMES],
+                         scales[start:start + stream_stats.CHUNK_FRAMES], "32x16", start)
+    return update, n
+
+
+@benchmark("uart_emulated", "frame")
+def _bench_uart(scale, tmp_dir):
+    """uart_driver.UartFFTDriver.stream lewat emulator pty (time_scale 0), 32x16"""
+    from board_emulator import BoardEmulator
+    from uart_driver import UartFFTDriver
+
+    n = max(1, int(200 * scale))
+    frames, _ = _frames("32x16", n)
+    # Start emulator + buka port sekali (~50 ms tetap), hanya stream() yang diukur
+    board = BoardEmulator("32x16", time_scale=0.0)
+    drv = UartFFTDriver(board.start(), "32x16")
+
+    def stream():
+        lost = sum(words is None for _, words, _ in drv.stream(frames))
+        if lost:
+            raise RuntimeError(f"{lost} frame hilang lewat emulator")
+
+    def cleanup():
+        drv.close()
+        board.stop()
+    return stream, n, cleanup
+
+
+def run_benchmarks(names=None, scale=1.0, repeat=DEFAULT_REPEAT):
+    """Jalankan benchmark -> dict hasil (siap ditulis JSON)"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in names or list(BENCHMARKS):
+            bench = BENCHMARKS[name]
+            func, units, *cleanup = bench["setup"](scale, tmp_dir)
+            try:
+                func()  # warm-up (cache twiddle/sqrt, import, page cache)
+                times = []
+                for _ in range(repeat):
+                    t0 = time.perf_counter()
+                    func()
+                    times.append(time.perf_counter() - t0)
+            finally:
+                for done in cleanup:
+                    done()
+            best = min(times)
+            results[name] = {
+                "seconds": best,
+                "median_s": float(np.median(times)),
+                "units": units,
+                "unit": bench["unit"],
+                "per_s": units / best if best > 0 else 0.0,
+            }
+            print(f"    {name:<18} {best * 1e3:10.2f} ms  {results[name]['per_s']:12.1f} {bench['unit']}/s")
+    return {
+        "version": SCHEMA_VERSION,
+        "scale": scale,
+        "repeat": repeat,
+        "machine": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+
+def mismatch_reasons(current, baseline):
+    """Alasan hasil tidak sebanding dengan baseline (scale / mesin berbeda), list kosong jika sebanding"""
+    reasons = []
+    if current.get("scale") != baseline.get("scale"):
+        reasons.append(f"scale {current.get('scale')} != baseline {baseline.get('scale')}")
+    cur_machine, base_machine = current.get("machine", {}), baseline.get("machine", {})
+    for key in MACHINE_KEYS:
+        if cur_machine.get(key) != base_machine.get(key):
+            reasons.append(f"{key} {cur_machine.get(key)} != baseline {base_machine.get(key)}")
+    return reasons
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Bandingkan waktu per unit dengan baseline (skala korpus boleh beda).
+    Return list dict: name, baseline/current (detik per unit), ratio, status ("OK", "REGRESI", "LEBIH CEPAT", "BARU")
+    """
+    rows = []
+    for name, cur in current["results"].items():
+        cur_per_unit = cur["seconds"] / cur["units"]
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            rows.append({"name": name, "baseline": None, "current": cur_per_unit, "ratio": None, "status": "BARU"})
+            continue
+        base_per_unit = base["seconds"] / base["units"]
+        ratio = cur_per_unit / base_per_unit
+        status = "REGRESI" if ratio > 1 + threshold else ("LEBIH CEPAT" if ratio < 1 / (1 + threshold) else "OK")
+        rows.append({"name": name, "baseline": base_per_unit, "current": cur_per_unit, "ratio": ratio, "status": status})
+    return rows
+
+
+def print_comparison(rows, threshold):
+    print(f"    {'benchmark':<18} {'baseline':>12} {'sekarang':>12} {'rasio':>7}  status (us/unit, threshold {threshold * 100:.0f}%)")
+    for r in rows:
+        base = f"{r['baseline'] * 1e6:12.2f}" if r["baseline"] is not None else f"{'-':>12}"
+        ratio = f"{r['ratio']:6.2f}x" if r["ratio"] is not None else f"{'-':>7}"
+        print(f"    {r['name']:<18} {base} {r['current'] * 1e6:12.2f} {ratio}  {r['status']}")
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Benchmark tool host + golden model, bandingkan dengan baseline")
+    parser.add_argument("--bench", action="append", choices=list(BENCHMARKS), help="Default: semua")
+    parser.add_argument("--scale", type=float, default=1.0, help="Faktor ukuran korpus (mis. 0.1 untuk cek cepat)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Batas regresi (0.25 = 25%% lebih lambat)")
+    parser.add_argument("--out", help="Simpan hasil JSON")
+    parser.add_argument("--update-baseline", action="store_true", help="Tulis hasil sebagai baseline baru")
+    parser.add_argument("--list", action="store_true", help="Tampilkan daftar benchmark")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, bench in BENCHMARKS.items():
+            print(f"    {name:<18} {bench['doc']}")
+        return
+
+    print(f"--- BENCHMARK (scale {args.scale}, terbaik dari {args.repeat}) ---")
+    current = run_benchmarks(args.bench, args.scale, args.repeat)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"[OK] Hasil disimpan: {args.out}")
+
+    if args.update_baseline:
+        baseline = {}
+        if args.bench and os.path.exists(args.baseline):
+            with open(args.baseline, "r") as f:
+                baseline = json.load(f)  # hanya benchmark yang dijalankan yang diganti
+        merged = dict(current, results=dict(baseline.get("results", {}), **current["results"]))
+        with open(args.baseline, "w") as f:
+            json.dump(merged, f, indent=2)
+            f.write("\n")
+        print(f"[OK] Baseline diperbarui: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"[!] Baseline tidak ada: {args.baseline} (jalankan dengan --update-baseline)")
+        return
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f)
+    print(f"[-] Baseline: {baseline.get('timestamp', '?')} ({baseline.get('machine', {}).get('platform', '?')})")
+    rows = compare(current, baseline, args.threshold)
+    print_comparison(rows, args.threshold)
+    regressions = [r["name"] for r in rows if r["status"] == "REGRESI"]
+    reasons = mismatch_reasons(current, baseline)
+    if reasons:
+        # Overhead tetap per panggilan / mesin lain menggeser waktu per unit: bukan bukti regresi
+        print(f"[!] Tidak sebanding dengan baseline ({'; '.join(reasons)}), regresi hanya informasi")
+        if regressions:
+            print(f"[-] Lebih lambat dari baseline: {', '.join(regressions)}")
+        return
+    if regressions:
+        print(f"[!] Regresi performa: {', '.join(regressions)}")
+        raise SystemExit(1)
+    print("[OK] Tidak ada regresi")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,327 @@
+import numpy as np
+import threading
+import argparse
+import select
+import time
+import os
+from collections import deque
+
+import golden_model
+import cycle_model
+import frame_link
+
+# ================= EMULATOR BOARD (PTY) =================
+# Emulasi FSM uart_fft_top di pseudo-terminal:
+#   s_IDLE -> s_RX -> s_RX_SETTLE (50000 siklus) -> s_FFT -> s_MAG -> s_TX -> s_IDLE
+# Output dihitung dengan golden model bit-accurate, timing mengikuti baud g_CLKS_PER_BIT.
+# Byte yang datang saat board tidak di s_RX dibuang (sama seperti rx_done yang diabaikan FSM).
+# time_scale = 1.0 -> real-time, 0.0 -> secepat mungkin (tanpa delay).
+# fault_rate > 0 meniru bug acak v5_32_16: satu swap bit-reversal hanya tertulis sebagian
+# (sampel i tertimpa sampel reverse_bits(i)), sesuai capture output_32x16.bin.
+# half_spectrum = True meniru g_HALF_SPECTRUM: hanya bin 0..POINTS/2 yang dihitung & dikirim.
+# pack_two = True meniru g_PACK_TWO: 2 frame per transaksi (mem_Real + mem_Imag), POINTS + 2 word keluar.
+# framed = True meniru g_FRAMED (lihat frame_link.py): s_HDR -> (s_RX -> FFT -> MAG -> TX) x jumlah frame,
+# tanpa settle; CRC frame salah -> NAK lalu cari header. Timer idle (C_LINK_TIMEOUT, pasangan byte uart_rx)
+# tidak pernah lebih pendek dari real-time agar resync host (sleep real-time) tetap berlaku di time_scale < 1.
+# drop_rate > 0 membuang byte masuk secara acak (gangguan jalur) untuk menguji resync.
+# ping_pong = True meniru g_PING_PONG: 2 bank memori, RX frame berikutnya masuk bank lain selagi
+# SETTLE/FFT/MAG/TX frame sebelumnya berjalan; byte dibuang hanya jika bank penerima belum selesai dikirim.
+# Frame parsial dibuang setelah link diam > RX_IDLE_TIMEOUT (timer real-time seperti mode framed).
+
+
+class BoardEmulator:
+    def __init__(self, variant="32x16", clk_hz=cycle_model.CLK_HZ, clks_per_bit=cycle_model.CLKS_PER_BIT,
+                 time_scale=1.0, fault_rate=0.0, seed=None, half_spectrum=False, pack_two=False,
+                 framed=False, drop_rate=0.0, ping_pong=False):
+        if framed and ping_pong:
+            raise ValueError("ping_pong tidak didukung bersama framed (g_FRAMED)")
+        self.variant = variant
+        self.ping_pong = ping_pong
+        self.framed = framed
+        self.half_spectrum = half_spectrum
+        self.pack_two = pack_two
+        self.cfg = golden_model.get_variant(variant)
+        self.dtype = golden_model.sample_dtype(self.cfg["bits"])
+        self.points = self.cfg["points"]
+        self.bytes_per_word = cycle_model.bytes_per_word(self.cfg["bits"])
+
+        # Durasi (detik, sudah dikali time_scale), siklus per fase dari cycle_model
+        to_s = lambda cycles: cycle_model.cycles_to_seconds(cycles, clk_hz) * time_scale
+        params = cycle_model.rtl_params(self.cfg)
+        params["half_spectrum"] = half_spectrum
+        params["pack_two"] = pack_two
+        params["framed"] = framed
+        self.rx_words = self.points * cycle_model.frames_per_transaction(params)
+        phases = cycle_model.phase_cycles(params, clks_per_bit)
+        self._byte_s = to_s(cycle_model.uart_byte_cycles(clks_per_bit))
+        self._tx_byte_s = to_s(cycle_model.uart_byte_cycles(clks_per_bit) + params["tx_overhead"])
+        self._compute_s = to_s(sum(v for k, v in phases.items() if k not in ("rx", "tx", "framing")))
+        self._rx_timeout_s = to_s(cycle_model.RX_IDLE_TIMEOUT) if self.bytes_per_word == 2 else 0.0
+        idle_s = lambda cycles: cycle_model.cycles_to_seconds(cycles, clk_hz) * max(time_scale, 1.0)
+        self._frame_timeout_s = idle_s(cycle_model.RX_IDLE_TIMEOUT) if ping_pong else 0.0
+        if framed:
+            self._rx_timeout_s = idle_s(cycle_model.RX_IDLE_TIMEOUT) if self.bytes_per_word == 2 else 0.0
+            self._link_timeout_s = idle_s(frame_link.LINK_TIMEOUT)
+        self.drop_rate = drop_rate
+
+        self.fault_rate = fault_rate
+        self._rng = np.random.default_rng(seed)
+        self._rev = golden_model.bit_reverse_indices(self.points)
+        self._swap_idx = np.flatnonzero(np.arange(self.points) < self._rev)
+
+        # Statistik
+        self.frames_done = 0
+        self.frames_faulted = 0
+        self.bytes_dropped = 0
+        self.bytes_lost = 0
+        self.naks_sent = 0
+
+        self.port = None
+        self._master = None
+        self._slave = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._reset_state()
+
+    def _reset_state(self):
+        self._line_free_at = 0.0      # waktu byte terakhir selesai diterima di jalur RX
+        self._rx_ready_at = 0.0       # waktu FSM kembali ke s_RX
+        self._pending_lsb = None      # r_LSB_Reg / r_Waiting_Byte (v5_32_16)
+        self._last_byte_at = 0.0
+        self._last_rx_at = 0.0       # byte terakhir yang diterima FSM (timer C_LINK_TIMEOUT)
+        self._words = []
+        self._tx_queue = deque()
+        # Bank memori frame: waktu bank selesai dikirim (s_TX) dan boleh diisi RX lagi
+        self._bank_free_at = [0.0] * (cycle_model.PING_PONG_BANKS if self.ping_pong else 1)
+        self._rx_bank = 0
+        self._proc_free_at = 0.0      # waktu FSM master kembali ke s_IDLE (byte terakhir s_TX)
+        # Protokol framed: s_HDR (byte header terkumpul) / s_RX dalam batch
+        self._hdr = bytearray()
+        self._in_batch = False
+        self._frames_left = 0
+        self._seq = 0
+
+    # ----------------- Lifecycle -----------------
+    def start(self):
+        """Buka pty dan jalankan thread FSM. Return: path port untuk host driver"""
+        import pty
+        import tty
+        self._master, self._slave = pty.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"board-{self.variant}", daemon=True)
+        self._thread.start()
+        return self.port
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                os.close(fd)
+        self._master = self._slave = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ----------------- FSM -----------------
+    def _run(self):
+        while not self._stop.is_set():
+            now = time.monotonic()
+            timeout = 0.05
+            if self._tx_queue:
+                timeout = min(timeout, max(0.0, self._tx_queue[0][0] - now))
+            ready, _, _ = select.select([self._master], [], [], timeout)
+            if ready:
+                try:
+                    data = os.read(self._master, 4096)
+                except OSError:
+                    break
+                arrival = time.monotonic()
+                for byte in data:
+                    self._on_byte(byte, arrival)
+            self._pump_tx(time.monotonic())
+
+    def _on_byte(self, byte, arrival):
+        if self.drop_rate > 0 and self._rng.random() < self.drop_rate:
+            self.bytes_lost += 1
+            return
+        # Byte selesai diterima setelah 10 bit di jalur (antri di belakang byte sebelumnya)
+        done = max(arrival, self._line_free_at) + self._byte_s
+        gap = done - self._byte_s - self._last_byte_at
+        self._line_free_at = done
+        self._last_byte_at = done
+
+        # FSM sedang SETTLE/FFT/MAG/TX (ping-pong: bank penerima belum selesai dikirim): rx_done diabaikan
+        if done < self._rx_ready_at:
+            self.bytes_dropped += 1
+            return
+
+        # Ping-pong: link diam terlalu lama di tengah frame -> frame parsial dibuang (rx_count <= 0)
+        if self._frame_timeout_s > 0 and self._words and gap > self._frame_timeout_s:
+            self.bytes_dropped += len(self._words) * self.bytes_per_word
+            self._words = []
+
+        # Link diam > C_LINK_TIMEOUT di tengah header/batch -> s_IDLE -> s_HDR (timer hanya jalan di s_HDR/s_RX)
+        idle = done - self._byte_s - max(self._last_rx_at, self._rx_ready_at)
+        if self.framed and (self._in_batch or self._hdr) and idle > self._link_timeout_s:
+            self._end_batch()
+        self._last_rx_at = done
+
+        if self.bytes_per_word == 2:
+            # uart_rx v5_32_16: idle > C_TIMEOUT_VAL mereset pasangan LSB/MSB
+            if self._pending_lsb is not None and self._rx_timeout_s > 0 and gap > self._rx_timeout_s:
+                self.bytes_dropped += 1
+                self._pending_lsb = None
+            if self._pending_lsb is None:
+                self._pending_lsb = byte
+                return
+            word = self._pending_lsb | (byte << 8)
+            self._pending_lsb = None
+        else:
+            word = byte
+
+        if self.framed:
+            self._on_framed_word(word, done)
+            return
+        self._words.append(word)
+
+        if len(self._words) == self.rx_words:
+            self._process_frame(done)
+
+    def _on_framed_word(self, word, done):
+        data = int(word).to_bytes(self.bytes_per_word, "little")
+        if not self._in_batch:
+            self._on_header_bytes(data)
+            return
+
+        # Data frame + CRC u16, lalu cek CRC seperti s_RX framed
+        self._words.append(word)
+        crc_words = frame_link.CRC_BYTES // self.bytes_per_word
+        if len(self._words) < self.rx_words + crc_words:
+            return
+        raw = np.array(self._words, dtype=np.uint16 if self.bytes_per_word == 2 else np.uint8).tobytes()
+        payload, crc = raw[:-frame_link.CRC_BYTES], int.from_bytes(raw[-frame_link.CRC_BYTES:], "little")
+        self._words = self._words[:self.rx_words]
+        if crc != frame_link.crc16(payload):
+            self._words = []
+            self._send(done, frame_link.encode_response(self._seq, nak=True))
+            self.naks_sent += 1
+            self._end_batch()
+            return
+        self._process_frame(done)
+
+    def _on_header_bytes(self, data):
+        for b in data:
+            self._hdr.append(b)
+            # Cari sync A5 5A (v5_64_8 per byte: A5 A5 5A tetap dikenali)
+            if self._hdr[0] != frame_link.SYNC_HOST[0]:
+                self._hdr.clear()
+            elif len(self._hdr) == 2 and self._hdr[1] != frame_link.SYNC_HOST[1]:
+                self._hdr = bytearray([b]) if b == frame_link.SYNC_HOST[0] and self.bytes_per_word == 1 else bytearray()
+        if len(self._hdr) < frame_link.HEADER_BYTES:
+            return
+        header = frame_link.parse_header(bytes(self._hdr))
+        self._hdr.clear()
+        if header is not None and header[0] > 0 and header[1] == self.rx_words:
+            self._in_batch, self._frames_left, self._seq, self._words = True, header[0], 0, []
+
+    def _end_batch(self):
+        # s_IDLE: uart_sync_reset ikut mereset pasangan byte
+        self._pending_lsb = None
+        self._in_batch = False
+        self._hdr.clear()
+        self._words = []
+
+    def _process_frame(self, rx_done_at):
+        frame = np.array(self._words, dtype=np.uint16 if self.bytes_per_word == 2 else np.uint8)
+        frame = frame.view(self.dtype).reshape(-1, self.points)
+        self._words = []
+
+        if self.fault_rate > 0 and self._rng.random() < self.fault_rate:
+            # Swap yang hilang mengenai mem_Real dan mem_Imag (frame kedua pada mode pack)
+            i = self._rng.choice(self._swap_idx)
+            frame = frame.copy()
+            frame[:, i] = frame[:, self._rev[i]]
+            self.frames_faulted += 1
+
+        # Termasuk skew byte LOW uart_tx v5_32_16 (kondisi steady-state, tx_addr tertahan di alamat terakhir)
+        if self.pack_two:
+            payload = golden_model.golden_output_packed(frame, self.cfg)[0].tobytes()
+        else:
+            payload = golden_model.golden_output(frame, self.cfg, half=self.half_spectrum)[0].tobytes()
+
+        if self.framed:
+            # Frame berikutnya dalam batch langsung ke s_RX (tanpa s_IDLE / uart_sync_reset)
+            self._send(rx_done_at + self._compute_s, frame_link.encode_response(self._seq, payload))
+            self._seq = (self._seq + 1) & 0xFF
+            self._frames_left -= 1
+            if self._frames_left == 0:
+                self._end_batch()
+            self.frames_done += 1
+            return
+
+        # s_RX_SETTLE -> s_FFT -> s_MAG, lalu s_TX byte demi byte (ping-pong: setelah frame sebelumnya terkirim)
+        tx_end = self._send(max(rx_done_at, self._proc_free_at) + self._compute_s, payload)
+        self._proc_free_at = tx_end
+        # Bank ini bebas lagi setelah s_TX; RX berikutnya menunggu bank lain (tanpa ping-pong: bank yang sama)
+        self._bank_free_at[self._rx_bank] = tx_end
+        self._rx_bank = (self._rx_bank + 1) % len(self._bank_free_at)
+        self._rx_ready_at = self._bank_free_at[self._rx_bank]
+        # s_IDLE -> uart_sync_reset: pasangan byte di-reset saat kembali ke s_RX
+        self._pending_lsb = None
+        self.frames_done += 1
+
+    def _send(self, tx_start, payload):
+        """Antrikan byte s_TX; FSM kembali menerima setelah byte terakhir. Return: waktu byte terakhir"""
+        for i, byte in enumerate(payload):
+            self._tx_queue.append((tx_start + (i + 1) * self._tx_byte_s, byte))
+        self._rx_ready_at = tx_start + len(payload) * self._tx_byte_s
+        return self._rx_ready_at
+
+    def _pump_tx(self, now):
+        out = bytearray()
+        while self._tx_queue and self._tx_queue[0][0] <= now:
+            out.append(self._tx_queue.popleft()[1])
+        if out:
+            os.write(self._master, bytes(out))
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Emulator pty untuk uart_fft_top")
+    parser.add_argument("--variant", default="32x16", choices=list(golden_model.VARIANTS))
+    parser.add_argument("--time-scale", type=float, default=1.0, help="1.0 = real-time, 0 = tanpa delay")
+    parser.add_argument("--fault-rate", type=float, default=0.0, help="Peluang frame salah (bug v5_32_16)")
+    parser.add_argument("--half", action="store_true", help="Mode half-spectrum (g_HALF_SPECTRUM = true)")
+    parser.add_argument("--pack", action="store_true", help="Mode 2 frame per FFT (g_PACK_TWO = true)")
+    parser.add_argument("--framed", action="store_true", help="Protokol framed (g_FRAMED = true)")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Peluang byte masuk hilang (uji resync)")
+    parser.add_argument("--ping-pong", action="store_true", help="Memori frame ping-pong (g_PING_PONG = true)")
+    args = parser.parse_args()
+    if args.framed and args.ping_pong:
+        parser.error("--framed dan --ping-pong tidak bisa dipakai bersamaan")
+
+    print(f"--- EMULATOR BOARD {args.variant} ---")
+    with BoardEmulator(args.variant, time_scale=args.time_scale, fault_rate=args.fault_rate,
+                       half_spectrum=args.half, pack_two=args.pack, framed=args.framed,
+                       drop_rate=args.drop_rate, ping_pong=args.ping_pong) as board:
+        print(f"[OK] Port emulator: {board.port} (Ctrl+C untuk berhenti)")
+        try:
+            while True:
+                time.sleep(1.0)
+        except KeyboardInterrupt:
+            pass
+        print(f"[-] Frame diproses: {board.frames_done} ({board.frames_faulted} salah), byte dibuang: {board.bytes_dropped}")
+        if args.framed:
+            print(f"[-] Byte hilang di jalur: {board.bytes_lost}, NAK terkirim: {board.naks_sent}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,181 @@
+import numpy as np
+import argparse
+import struct
+import os
+
+# ================= CONTAINER CAPTURE MULTI-FRAME (.fftc) =================
+# Layout file (semua field little endian):
+#
+#   offset  ukuran  field
+#   0       4       magic "FFTC"
+#   4       1       versi format (1)
+#   5       1       bit depth per sampel (8 / 16)
+#   6       1       endianness data: 0 = little, 1 = big
+#   7       1       jenis data: 0 = input (sampel), 1 = output (magnitude)
+#   8       4       POINTS per frame (uint32)
+#   12      8       jumlah frame (uint64)
+#   20      8       scale factor (float64, dari generate.py)
+#   28      4       panjang string func dalam byte (uint32)
+#   32      n       string func (UTF-8)
+#   ...     pad     padding nol sampai kelipatan 64 byte
+#   data    ...     n_frames * POINTS sampel signed (int8 / int16)
+#
+# Data disimpan kontigu sehingga bisa di-np.memmap langsung sebagai (n_frames, POINTS).
+# File .bin lama (tanpa header, 1 frame mentah) tetap bisa dibaca.
+
+MAGIC = b"FFTC"
+VERSION = 1
+HEADER_FMT = "<4sBBBBIQdI"
+HEADER_SIZE = struct.calcsize(HEADER_FMT)
+DATA_ALIGN = 64
+
+KIND_INPUT = 0
+KIND_OUTPUT = 1
+
+
+def frame_dtype(bits, endian="little"):
+    """dtype sampel: '<i2' / '>i2' untuk 16-bit, 'i1' untuk 8-bit"""
+    if bits == 8:
+        return np.dtype("i1")
+    if bits == 16:
+        return np.dtype("<i2" if endian == "little" else ">i2")
+    raise ValueError(f"Bit depth tidak didukung: {bits}")
+
+
+def _pack_header(points, bits, n_frames, scale, func, kind, endian):
+    func_bytes = func.encode("utf-8")
+    header = struct.pack(HEADER_FMT, MAGIC, VERSION, bits, 0 if endian == "little" else 1,
+                         kind, points, n_frames, float(scale), len(func_bytes)) + func_bytes
+    pad = (-len(header)) % DATA_ALIGN
+    return header + b"\x00" * pad
+
+
+def is_capture(path):
+    """True jika file memakai container FFTC (bukan .bin mentah)"""
+    with open(path, "rb") as f:
+        return f.read(4) == MAGIC
+
+
+def read_header(path):
+    """Baca header container -> dict (points, bits, endian, kind, n_frames, scale, func, data_offset)"""
+    with open(path, "rb") as f:
+        raw = f.read(HEADER_SIZE)
+        if len(raw) < HEADER_SIZE or raw[:4] != MAGIC:
+            raise ValueError(f"Bukan file capture FFTC: {path}")
+        magic, version, bits, endian, kind, points, n_frames, scale, func_len = struct.unpack(HEADER_FMT, raw)
+        if version != VERSION:
+            raise ValueError(f"Versi capture tidak didukung: {version}")
+        func = f.read(func_len).decode("utf-8")
+
+    data_offset = HEADER_SIZE + func_len
+    data_offset += (-data_offset) % DATA_ALIGN
+    return {
+        "points": points,
+        "bits": bits,
+        "endian": "little" if endian == 0 else "big",
+        "kind": kind,
+        "n_frames": n_frames,
+        "scale": scale,
+        "func": func,
+        "data_offset": data_offset,
+    }
+
+
+def write_capture(path, frames, bits, scale=1.0, func="", kind=KIND_INPUT, endian="little"):
+    """Tulis array (n_frames, POINTS) ke container FFTC"""
+    frames = np.asarray(frames)
+    if frames.ndim == 1:
+        frames = frames[np.newaxis, :]
+    n_frames, points = frames.shape
+
+    with open(path, "wb") as f:
+        f.write(_pack_header(points, bits, n_frames, scale, func, kind, endian))
+        np.ascontiguousarray(frames, dtype=frame_dtype(bits, endian)).tofile(f)
+
+
+def create_capture(path, n_frames, points, bits, scale=1.0, func="", kind=KIND_INPUT, endian="little"):
+    """Alokasikan container kosong berisi n_frames dan return np.memmap (n_frames, POINTS) yang bisa ditulis"""
+    header = _pack_header(points, bits, n_frames, scale, func, kind, endian)
+    dtype = frame_dtype(bits, endian)
+    with open(path, "wb") as f:
+        f.write(header)
+        f.truncate(len(header) + n_frames * points * dtype.itemsize)
+    if n_frames == 0:
+        return np.empty((0, points), dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r+", offset=len(header), shape=(n_frames, points))
+
+
+def append_frames(path, frames):
+    """Tambah frame di akhir container yang sudah ada dan perbarui n_frames di header"""
+    header = read_header(path)
+    frames = np.asarray(frames)
+    if frames.ndim == 1:
+        frames = frames[np.newaxis, :]
+    if frames.shape[1] != header["points"]:
+        raise ValueError(f"Panjang frame {frames.shape[1]} != POINTS {header['points']}")
+
+    with open(path, "r+b") as f:
+        # Potong sisa frame parsial (misal capture terputus) sebelum menulis
+        frame_bytes = header["points"] * frame_dtype(header["bits"]).itemsize
+        f.truncate(header["data_offset"] + header["n_frames"] * frame_bytes)
+        f.seek(0, os.SEEK_END)
+        np.ascontiguousarray(frames, dtype=frame_dtype(header["bits"], header["endian"])).tofile(f)
+        f.seek(12)
+        f.write(struct.pack("<Q", header["n_frames"] + frames.shape[0]))
+
+
+def open_capture(path, points=None, bits=None, mode="r"):
+    """
+    Buka capture sebagai np.memmap (n_frames, POINTS) tanpa copy.
+    File FFTC: metadata dari header. File .bin mentah (format lama): points & bits wajib diisi.
+    Return: (header dict, array)
+    """
+    if is_capture(path):
+        header = read_header(path)
+    else:
+        if points is None or bits is None:
+            raise ValueError(f"File mentah {path} butuh argumen points dan bits")
+        dtype = frame_dtype(bits)
+        header = {
+            "points": points,
+            "bits": bits,
+            "endian": "little",
+            "kind": None,
+            "n_frames": os.path.getsize(path) // (points * dtype.itemsize),
+            "scale": None,
+            "func": None,
+            "data_offset": 0,
+        }
+
+    dtype = frame_dtype(header["bits"], header["endian"])
+    shape = (header["n_frames"], header["points"])
+    if header["n_frames"] == 0:
+        return header, np.empty(shape, dtype=dtype)
+    return header, np.memmap(path, dtype=dtype, mode=mode, offset=header["data_offset"], shape=shape)
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Info header capture .fftc / .bin mentah")
+    parser.add_argument("paths", nargs="+", help="File capture")
+    args = parser.parse_args()
+
+    print("--- CAPTURE FORMAT: INFO FILE ---")
+    missing = 0
+    for path in args.paths:
+        if not os.path.isfile(path):
+            print(f"[!] File tidak ditemukan: {path}")
+            missing += 1
+            continue
+        if not is_capture(path):
+            print(f"[-] {path}: file .bin mentah (format lama, tanpa header)")
+            continue
+        h = read_header(path)
+        kind = "input" if h["kind"] == KIND_INPUT else "output"
+        print(f"[-] {path}: {h['n_frames']} frame x {h['points']} titik, {h['bits']}-bit {h['endian']} ({kind})")
+        print(f"    scale={h['scale']:.4f} func={h['func']}")
+    if missing:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,174 @@
+import numpy as np
+import argparse
+import time
+import os
+from collections import Counter
+
+import golden_model
+import capture_format
+from uart_driver import UartFFTDriver
+
+# ================= RETRY & CONSENSUS (v5_32_16) =================
+# Build v5_32_16 kadang mengeluarkan output salah untuk input yang sama.
+# Daripada retry manual, frame dikirim ulang sampai:
+#   1. respons cocok dengan golden model (selisih <= tolerance LSB), atau
+#   2. k dari n respons identik (konsensus, hanya tanpa golden model).
+# Dengan golden model, respons yang tidak cocok tidak ikut voting (konsensus atas output salah
+# yang berulang tidak dianggap hasil). Jumlah percobaan dicatat per frame; waktu sampai hasil
+# hanya untuk frame yang berhasil, frame "gagal" dicatat terpisah.
+
+
+class ConsensusRunner:
+    def __init__(self, driver, k=2, n=5, tolerance=0, use_golden=True):
+        if k < 1 or n < k:
+            raise ValueError(f"Konfigurasi k-of-n tidak valid: k={k}, n={n}")
+        self.driver = driver
+        self.k = k
+        self.n = n
+        self.tolerance = tolerance
+        self.use_golden = use_golden
+
+        # Statistik
+        self.attempts = []        # jumlah percobaan per frame
+        self.time_to_result = []  # detik sampai hasil diterima per frame (hanya yang berhasil)
+        self.time_to_fail = []    # detik sampai menyerah per frame "gagal"
+        self.methods = Counter()  # "golden" / "consensus" / "gagal"
+        self.bad_responses = 0
+        self.total_responses = 0
+
+    def _expected(self, frame):
+        """Golden output untuk satu transaksi (mode pack: frame berisi 2 * POINTS sampel)"""
+        if self.driver.pack_two:
+            return golden_model.golden_output_packed(np.reshape(frame, (2, -1)), self.driver.cfg)[0]
+        return golden_model.golden_output(frame, self.driver.cfg, half=self.driver.half_spectrum)[0]
+
+    def run_frame(self, frame):
+        """
+        Return: (words, jumlah percobaan, waktu detik, metode).
+        Metode "gagal": words None dengan golden model, tanpa golden model respons terbanyak (tebakan terbaik).
+        """
+        expected = self._expected(frame) if self.use_golden else None
+        votes = Counter()
+        responses = {}
+        t0 = time.monotonic()
+        words, method = None, "gagal"
+
+        for attempt in range(1, self.n + 1):
+            resp, _ = self.driver.transact(frame)
+            if resp is None:
+                continue
+            self.total_responses += 1
+
+            if expected is not None:
+                if np.max(np.abs(resp.astype(int) - expected.astype(int))) <= self.tolerance:
+                    words, method = resp, "golden"
+                    break
+                self.bad_responses += 1
+                continue
+
+            key = resp.tobytes()
+            votes[key] += 1
+            responses[key] = resp
+            if votes[key] >= self.k:
+                words, method = resp, "consensus"
+                break
+
+        if words is None and votes and expected is None:
+            # Tidak ada yang lolos: kembalikan respons terbanyak sebagai tebakan terbaik
+            words = responses[votes.most_common(1)[0][0]]
+
+        elapsed = time.monotonic() - t0
+        self.attempts.append(attempt)
+        (self.time_to_fail if method == "gagal" else self.time_to_result).append(elapsed)
+        self.methods[method] += 1
+        return words, attempt, elapsed, method
+
+    def stats(self, bins=10):
+        """Ringkasan retry dan histogram waktu sampai hasil benar"""
+        attempts = np.array(self.attempts) if self.attempts else np.zeros(1, dtype=int)
+        times = np.array(self.time_to_result) if self.time_to_result else np.zeros(1)
+        retry_hist = np.bincount(attempts, minlength=self.n + 1)[1:]
+        time_hist, time_edges = np.histogram(times, bins=bins)
+        return {
+            "frames": len(self.attempts),
+            "methods": dict(self.methods),
+            "mean_attempts": float(attempts.mean()),
+            "retry_hist": retry_hist,
+            "time_hist": time_hist,
+            "time_edges": time_edges,
+            "bad_response_rate": self.bad_responses / self.total_responses if self.total_responses else 0.0,
+            "failed": len(self.time_to_fail),
+            "mean_fail_time": float(np.mean(self.time_to_fail)) if self.time_to_fail else 0.0,
+        }
+
+
+def print_stats(stats):
+    print(f"[-] Frame              : {stats['frames']} {stats['methods']}")
+    print(f"[-] Rata-rata percobaan: {stats['mean_attempts']:.2f}")
+    print(f"[-] Respons salah      : {stats['bad_response_rate'] * 100:.1f}% (flakiness board)")
+    print("[-] Histogram percobaan:")
+    for i, count in enumerate(stats["retry_hist"], start=1):
+        print(f"    {i:>2}x : {count}")
+    if stats["failed"]:
+        print(f"[!] Gagal              : {stats['failed']} frame, rata-rata {stats['mean_fail_time'] * 1e3:.1f} ms sampai menyerah")
+    print("[-] Histogram waktu sampai hasil (frame berhasil):")
+    edges = stats["time_edges"]
+    for i, count in enumerate(stats["time_hist"]):
+        print(f"    {edges[i] * 1e3:8.1f} - {edges[i + 1] * 1e3:8.1f} ms : {count}")
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Retry-and-consensus untuk output board yang tidak deterministik")
+    parser.add_argument("--variant", default="32x16", choices=list(golden_model.VARIANTS))
+    parser.add_argument("--port")
+    parser.add_argument("--emulate", action="store_true")
+    parser.add_argument("--time-scale", type=float, default=1.0)
+    parser.add_argument("--fault-rate", type=float, default=0.3, help="Peluang frame salah di emulator")
+    parser.add_argument("--input")
+    parser.add_argument("--output")
+    parser.add_argument("--frames", type=int, default=None)
+    parser.add_argument("-k", type=int, default=2, help="Jumlah respons identik minimal")
+    parser.add_argument("-n", type=int, default=5, help="Jumlah percobaan maksimal per frame")
+    parser.add_argument("--tolerance", type=int, default=0, help="Toleransi LSB terhadap golden model")
+    parser.add_argument("--no-golden", action="store_true", help="Hanya pakai konsensus k-of-n")
+    args = parser.parse_args()
+
+    cfg = golden_model.get_variant(args.variant)
+    testing_dir = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    input_path = args.input or os.path.join(testing_dir, f"input_{args.variant}.bin")
+    header, frames = capture_format.open_capture(input_path, cfg["points"], cfg["bits"])
+    n_frames = args.frames or len(frames)
+
+    board = None
+    port = args.port
+    if args.emulate:
+        from board_emulator import BoardEmulator
+        board = BoardEmulator(args.variant, time_scale=args.time_scale, fault_rate=args.fault_rate)
+        port = board.start()
+    if port is None:
+        parser.error("--port atau --emulate wajib diisi")
+
+    print(f"--- RETRY & CONSENSUS {args.variant} (k={args.k}, n={args.n}) ---")
+    received = np.zeros((n_frames, cfg["points"]), dtype=golden_model.sample_dtype(cfg["bits"]))
+    try:
+        with UartFFTDriver(port, args.variant) as drv:
+            runner = ConsensusRunner(drv, args.k, args.n, args.tolerance, use_golden=not args.no_golden)
+            for idx in range(n_frames):
+                words, attempts, elapsed, method = runner.run_frame(frames[idx % len(frames)])
+                if words is not None:
+                    received[idx] = words
+                if method == "gagal":
+                    print(f"[!] Frame {idx}: tidak ada hasil valid setelah {attempts} percobaan")
+            print_stats(runner.stats())
+    finally:
+        if board is not None:
+            board.stop()
+
+    if args.output:
+        capture_format.write_capture(args.output, received, cfg["bits"], header["scale"] or 1.0,
+                                     header["func"] or "", kind=capture_format.KIND_OUTPUT)
+        print(f"[OK] Output disimpan: {args.output}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,240 @@
+import numpy as np
+import argparse
+import json
+import time
+import os
+
+import golden_model
+import capture_format
+
+# ================= GENERATOR KORPUS TEST-VECTOR (BATCH) =================
+# Versi batch dari generate.py untuk korpus regresi 10^5 - 10^6 frame.
+# Ekspresi sinyal di-compile sekali lalu dievaluasi sekaligus pada grid waktu (n_frames, POINTS);
+# parameter tiap frame (amplitudo, frekuensi, fase, ...) berupa array (n_frames, 1) yang di-broadcast.
+# Auto-scaling, truncation dan clipping sama dengan generate.py, tapi per frame dan tervektorisasi.
+# Sidecar di samping container: <path>.scales.npy (scale per frame) dan <path>.spec.json (spesifikasi
+# korpus: keluarga, seed, t_start/t_end, ...). Field func header FFTC tetap kosong (hanya generate.py
+# yang mengisinya dengan ekspresi tunggal).
+
+CHUNK_FRAMES = 65536  # frame per blok evaluasi (batasi memori float64)
+
+# Target integer maksimum seperti TARGET_HEADROOM di generate.py
+DEFAULT_HEADROOM = {8: 120.0, 16: 32000.0}
+
+SPEC_SUFFIX = ".spec.json"
+
+# Keluarga sinyal parametrik: ekspresi + rentang parameter.
+# Dalam ekspresi, t berbentuk (1, POINTS) dan parameter (n, 1) atau (n, 1, TONES).
+FAMILIES = {
+    # Jumlah beberapa sinus dengan amplitudo, frekuensi dan fase acak
+    "multitone": {
+        "func": "np.sum(a * np.sin(2 * np.pi * f * t[..., np.newaxis] + phi), axis=-1)",
+        "t_end": 1.0,
+    },
+    # AM seperti LIMITASI 2: (1 + m sin(2 pi fm t)) sin(2 pi fc t), fc boleh di atas Nyquist
+    "am": {
+        "func": "(1 + m * np.sin(2 * np.pi * fm * t)) * np.sin(2 * np.pi * fc * t)",
+        "t_end": 1.0,
+    },
+    # Noise Gaussian dengan offset DC
+    "noise": {
+        "func": "dc + sigma * w",
+        "t_end": 1.0,
+    },
+}
+
+_CODE_CACHE = {}
+
+
+def compile_expr(func):
+    """Compile ekspresi sekali, hasilnya di-cache per string"""
+    code = _CODE_CACHE.get(func)
+    if code is None:
+        code = _CODE_CACHE[func] = compile(func, "<signal>", "eval")
+    return code
+
+
+def eval_expr(func, t, **params):
+    """Evaluasi ekspresi tervektorisasi; hasil di-broadcast ke (n_frames, POINTS)"""
+    n_frames = max([1] + [np.shape(v)[0] for v in params.values() if np.ndim(v) > 0])
+    y = eval(compile_expr(func), {"np": np, "t": t, **params})
+    return np.broadcast_to(y, (n_frames, t.shape[-1]))
+
+
+def time_grid(points, t_start=0.0, t_end=1.0):
+    """Grid sampel seperti generate.py (endpoint=False), bentuk (1, POINTS)"""
+    return np.linspace(t_start, t_end, points, endpoint=False)[np.newaxis, :]
+
+
+def sample_params(family, rng, n, points, tones=3):
+    """Parameter acak untuk n frame dari satu keluarga sinyal"""
+    nyquist = points / 2
+    if family == "multitone":
+        return {
+            "a": rng.uniform(0.05, 1.0, (n, 1, tones)),
+            "f": rng.uniform(0.5, nyquist - 0.5, (n, 1, tones)),
+            "phi": rng.uniform(0.0, 2 * np.pi, (n, 1, tones)),
+        }
+    if family == "am":
+        fm = rng.uniform(0.5, points / 8, (n, 1))
+        return {
+            "m": rng.uniform(0.1, 0.9, (n, 1)),
+            "fm": fm,
+            "fc": fm + rng.uniform(1.0, points, (n, 1)),
+        }
+    if family == "noise":
+        return {
+            "dc": rng.uniform(-0.5, 0.5, (n, 1)),
+            "sigma": rng.uniform(0.1, 1.0, (n, 1)),
+            "w": rng.standard_normal((n, points)),
+        }
+    raise ValueError(f"Keluarga sinyal tidak dikenal: {family} (pilihan: {', '.join(FAMILIES)})")
+
+
+def quantize(y_float, bits, target_headroom):
+    """
+    Auto-scaling per frame seperti generate.py: max |y| -> target_headroom (skalar atau array per frame),
+    lalu truncation (astype int) dan safety clip ke rentang signed bits.
+    Return: (sampel int64 (n, POINTS), scale per frame (n,))
+    """
+    max_val = (1 << (bits - 1)) - 1
+    max_amp = np.max(np.abs(y_float), axis=1)
+    target = np.broadcast_to(np.asarray(target_headroom, dtype=np.float64), max_amp.shape)
+    scale = target.copy()  # Default jika sinyal 0
+    np.divide(target, max_amp, out=scale, where=max_amp > 0)
+    y_int = (y_float * scale[:, np.newaxis]).astype(np.int64)
+    return np.clip(y_int, -max_val - 1, max_val), scale
+
+
+def binary_text(frames, bits):
+    """Dump biner two's complement (satu sampel per baris) seperti input_debug.txt, tanpa loop per sampel"""
+    u = np.asarray(frames, dtype=np.int64).ravel() & ((1 << bits) - 1)
+    out = np.empty((u.size, bits + 1), dtype=np.uint8)
+    out[:, :bits] = ((u[:, np.newaxis] >> np.arange(bits - 1, -1, -1)) & 1) + ord("0")
+    out[:, bits] = ord("\n")
+    return out.tobytes()
+
+
+def generate_corpus(path, family, n_frames, points, bits, target_headroom=None, seed=0, tones=3,
+                    exprs=None, t_start=0.0, t_end=None, txt_path=None, auto_scale=None, variant=None):
+    """
+    Tulis korpus ke container FFTC (+ scale per frame di <path>.scales.npy, spesifikasi di <path>.spec.json).
+    family = nama di FAMILIES, atau "expr" untuk daftar ekspresi (satu frame per ekspresi).
+    auto_scale = None (target_headroom tetap), "frame" (target aman terbesar per frame) atau
+    "corpus" (satu scale aman untuk seluruh korpus), dicek dengan golden model (lihat headroom.py).
+    Return: dict ringkasan
+    """
+    target_headroom = target_headroom or DEFAULT_HEADROOM.get(bits, 0.977 * ((1 << (bits - 1)) - 1))
+    if family == "expr":
+        if not exprs:
+            raise ValueError("Mode expr butuh minimal satu ekspresi")
+        n_frames = len(exprs)
+        spec = {"family": "expr", "exprs": exprs}
+    else:
+        sample_params(family, np.random.default_rng(0), 1, points, tones)  # validasi nama keluarga
+        spec = {"family": family, "func": FAMILIES[family]["func"], "seed": seed, "tones": tones}
+    t_end = t_end if t_end is not None else (1.0 if family == "expr" else FAMILIES[family]["t_end"])
+    spec.update({"t_start": t_start, "t_end": t_end, "headroom": target_headroom, "auto_scale": auto_scale})
+    t = time_grid(points, t_start, t_end)
+
+    def float_chunks():
+        # RNG dibuat ulang agar mode "corpus" bisa membaca korpus dua kali dengan data identik
+        rng = np.random.default_rng(seed)
+        for start in range(0, n_frames, CHUNK_FRAMES):
+            stop = min(start + CHUNK_FRAMES, n_frames)
+            if family == "expr":
+                y_float = np.concatenate([eval_expr(e, t) for e in exprs[start:stop]])
+            else:
+                y_float = eval_expr(FAMILIES[family]["func"], t, **sample_params(family, rng, stop - start, points, tones))
+            yield start, stop, y_float
+
+    if auto_scale is not None:
+        import headroom
+        cfg = variant or golden_model.make_config(points, bits)
+        if auto_scale == "corpus":
+            global_scale = min(headroom.safe_corpus_scale(y, cfg) for _, _, y in float_chunks())
+            spec["scale"] = global_scale
+        elif auto_scale != "frame":
+            raise ValueError(f"Mode auto_scale tidak dikenal: {auto_scale}")
+
+    out = capture_format.create_capture(path, n_frames, points, bits, 0.0, "")
+    scales = np.empty(n_frames)
+    txt = open(txt_path, "wb") if txt_path else None
+    try:
+        for start, stop, y_float in float_chunks():
+            if auto_scale == "frame":
+                target = headroom.safe_targets(y_float, cfg)
+            elif auto_scale == "corpus":
+                max_amp = np.max(np.abs(y_float), axis=1)
+                target = np.where(max_amp > 0, global_scale * max_amp, global_scale)
+            else:
+                target = target_headroom
+            y_int, scales[start:stop] = quantize(y_float, bits, target)
+            out[start:stop] = y_int
+            if txt is not None:
+                txt.write(binary_text(y_int, bits))
+    finally:
+        if txt is not None:
+            txt.close()
+    out.flush()
+    del out
+    np.save(path + ".scales.npy", scales)
+    with open(path + SPEC_SUFFIX, "w") as f:
+        json.dump(spec, f, indent=2)
+    return {"path": path, "n_frames": n_frames, "spec": spec}
+
+
+def load_spec(path):
+    """Spesifikasi korpus dari sidecar <path>.spec.json, None jika capture bukan hasil corpus.py"""
+    try:
+        with open(path + SPEC_SUFFIX, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def load_scales(path):
+    """Scale per frame dari sidecar .scales.npy, atau scale header bila tidak ada"""
+    sidecar = path + ".scales.npy"
+    if os.path.exists(sidecar):
+        return np.load(sidecar, mmap_mode="r")
+    header = capture_format.read_header(path)
+    return np.full(header["n_frames"], header["scale"] or 1.0)
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Generator korpus test-vector multi-frame")
+    parser.add_argument("family", choices=list(FAMILIES) + ["expr"])
+    parser.add_argument("--variant", default="32x16", choices=list(golden_model.VARIANTS))
+    parser.add_argument("--frames", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tones", type=int, default=3, help="Jumlah sinus (multitone)")
+    parser.add_argument("--headroom", type=float, default=None, help="Target integer maksimum per frame")
+    parser.add_argument("--auto-scale", choices=["frame", "corpus"], default=None,
+                        help="Pilih scale aman terbesar (tanpa wrap di datapath) per frame / per korpus")
+    parser.add_argument("--expr", action="append", help="Ekspresi (mode expr), bisa diulang")
+    parser.add_argument("--expr-file", help="File berisi satu ekspresi per baris (mode expr)")
+    parser.add_argument("--t-start", type=float, default=0.0)
+    parser.add_argument("--t-end", type=float, default=None)
+    parser.add_argument("--txt", help="Tulis juga dump biner (format input_debug.txt)")
+    parser.add_argument("-o", "--output", default="corpus.fftc")
+    args = parser.parse_args()
+
+    cfg = golden_model.get_variant(args.variant)
+    exprs = list(args.expr or [])
+    if args.expr_file:
+        with open(args.expr_file, "r") as f:
+            exprs += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+    print(f"--- GENERATOR KORPUS {args.variant}: {args.family} ---")
+    t0 = time.perf_counter()
+    info = generate_corpus(args.output, args.family, args.frames, cfg["points"], cfg["bits"], args.headroom,
+                           args.seed, args.tones, exprs, args.t_start, args.t_end, args.txt, args.auto_scale, cfg)
+    elapsed = time.perf_counter() - t0
+    print(f"[-] Frame        : {info['n_frames']}")
+    print(f"[-] Waktu        : {elapsed:.2f} s ({info['n_frames'] / elapsed:,.0f} frame/s)")
+    print(f"[OK] Korpus disimpan: {args.output}")
+
+
+if __name__ == "__main__":
+    run()
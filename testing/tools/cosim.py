@@ -0,0 +1,311 @@
+import numpy as np
+import argparse
+import subprocess
+import shutil
+import json
+import time
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import golden_model
+import capture_format
+import cycle_model
+import frame_link
+
+# ================= CO-SIMULASI GHDL (REGRESI RTL) =================
+# Testbench testing/sim/tb_uart_fft_top.vhd di sekitar uart_fft_top build v5_*:
+# di-analisis + elaborasi sekali dengan GHDL (ghdl -i / -m), lalu dijalankan paralel per shard
+# korpus (satu proses ghdl -r per core). Byte input di-drive di jalur UART RX, byte o_UART_TX
+# di-decode testbench lalu dibandingkan dengan golden model bit-accurate (termasuk skew 32x16).
+# UART disimulasikan dengan g_CLKS_PER_BIT kecil agar cepat; settle / FFT / magnitude tetap
+# siklus asli, sehingga siklus per frame bisa dicek terhadap cycle_model.
+# ping_pong: DUT di-elaborasi dengan g_PING_PONG = true, testbench menjaga 2 transaksi in-flight;
+# siklus per transaksi dibandingkan dengan latency steady-state cycle_model (2 x periode).
+# framed: DUT di-elaborasi dengan g_FRAMED = true, stimulus per shard = batch frame_link (header tiap
+# `batch` transaksi, CRC per frame); respons mentah (sync, seq, CRC) di-decode frame_link.decode_response,
+# seq harus = indeks transaksi di batch. Respons NAK / CRC / seq salah = status "link".
+
+SIM_DIR = os.path.join(golden_model.REPO_DIR, "testing", "sim")
+TESTBENCH = os.path.join(SIM_DIR, "tb_uart_fft_top.vhd")
+TB_ENTITY = "tb_uart_fft_top"
+WORK_DIR = os.path.join(SIM_DIR, "work")
+DEFAULT_CLKS_PER_BIT = 16  # 3.125 Mbaud @ 50 MHz, uart_rx sampling di tengah bit tetap valid
+DEFAULT_STD = "08"
+TIMEOUT_FACTOR = 3  # batas siklus per transaksi = TIMEOUT_FACTOR x prediksi cycle_model
+
+
+class GhdlBuild:
+    """Hasil analisis + elaborasi testbench untuk satu build (work library per build)"""
+
+    def __init__(self, variant, ghdl="ghdl", std=DEFAULT_STD, work_dir=WORK_DIR):
+        self.cfg = golden_model.get_variant(variant)
+        self.variant = variant
+        self.ghdl = ghdl
+        self.std = std
+        self.work_dir = os.path.join(work_dir, variant)
+
+    def sources(self):
+        rtl_dir = os.path.join(golden_model.REPO_DIR, self.cfg["rtl_dir"])
+        return sorted(os.path.join(rtl_dir, f) for f in os.listdir(rtl_dir) if f.endswith(".vhd")) + [TESTBENCH]
+
+    def _flags(self):
+        return [f"--std={self.std}", f"--workdir={self.work_dir}"]
+
+    def build(self):
+        """ghdl -i (urutan file bebas) lalu ghdl -m (analisis sesuai dependensi + elaborasi)"""
+        if shutil.which(self.ghdl) is None:
+            raise FileNotFoundError(f"GHDL tidak ditemukan: {self.ghdl} (install ghdl atau pakai --ghdl PATH)")
+        os.makedirs(self.work_dir, exist_ok=True)
+        t0 = time.monotonic()
+        for cmd in (["-i"] + self._flags() + self.sources(), ["-m"] + self._flags() + [TB_ENTITY]):
+            proc = subprocess.run([self.ghdl] + cmd, cwd=self.work_dir, capture_output=True, text=True)
+            if proc.returncode != 0:
+                raise RuntimeError(f"ghdl {cmd[0]} gagal:\n{proc.stdout}{proc.stderr}")
+        return time.monotonic() - t0
+
+    def run_shard(self, in_path, out_path, generics):
+        """Jalankan satu shard -> (returncode, stderr, wall detik)"""
+        cmd = [self.ghdl, "-r"] + self._flags() + [TB_ENTITY, "--ieee-asserts=disable"]
+        cmd += [f"-g{name}={value}" for name, value in generics.items()]
+        cmd += [f"-gg_IN_FILE={in_path}", f"-gg_OUT_FILE={out_path}"]
+        t0 = time.monotonic()
+        proc = subprocess.run(cmd, cwd=self.work_dir, capture_output=True, text=True)
+        return proc.returncode, proc.stderr, time.monotonic() - t0
+
+
+def encode_transactions(frames, cfg, pack=False):
+    """Frame int -> list byte per transaksi (mode pack: 2 frame berurutan per transaksi)"""
+    data = np.asarray(frames).astype(golden_model.sample_dtype(cfg["bits"]))
+    per = 2 if pack else 1
+    n = len(data) // per
+    return [data[i * per:(i + 1) * per].tobytes() for i in range(n)]
+
+
+def frame_transactions(transactions, words, batch=frame_link.DEFAULT_BATCH):
+    """Byte transaksi -> byte di jalur mode framed: header tiap awal batch + CRC per frame"""
+    out = []
+    for i, data in enumerate(transactions):
+        head = b""
+        if i % batch == 0:
+            head = frame_link.encode_header(min(batch, len(transactions) - i), words)
+        out.append(head + frame_link.encode_frame(data))
+    return out
+
+
+def expected_words(frames, cfg, half=False, pack=False):
+    """Word yang seharusnya diterima host per transaksi (golden model)"""
+    if pack:
+        return golden_model.golden_output_packed(frames[:len(frames) // 2 * 2], cfg)
+    return golden_model.golden_output(frames, cfg, half=half)
+
+
+def write_stimulus(path, transactions):
+    with open(path, "w") as f:
+        for data in transactions:
+            f.write(" ".join(str(b) for b in data) + "\n")
+
+
+def read_response(path):
+    """File output testbench -> list (indeks, siklus, bytes)"""
+    rows = []
+    with open(path, "r") as f:
+        for line in f:
+            fields = [int(v) for v in line.split()]
+            if len(fields) >= 3:
+                rows.append((fields[0], fields[1], bytes(fields[3:3 + fields[2]])))
+    return rows
+
+
+def check_response(data, expected, dtype, out_bytes, framed=False, seq=0):
+    """
+    Byte respons satu transaksi -> (status, jumlah bin beda, selisih maks).
+    Status "cocok", "salah", "timeout", atau "link" (mode framed: NAK, CRC/sync salah, seq salah).
+    """
+    if framed:
+        link, got_seq, payload = frame_link.decode_response(data, out_bytes)
+        if link == "timeout":
+            return "timeout", 0, 0
+        if link != "ok" or got_seq != seq & 0xFF:
+            return "link", 0, 0
+        data = payload
+    if len(data) < out_bytes:
+        return "timeout", 0, 0
+    words = np.frombuffer(data[:out_bytes], dtype=dtype).astype(int)
+    diff = np.abs(words - np.asarray(expected).astype(int))
+    return ("cocok" if not diff.any() else "salah"), int(np.count_nonzero(diff)), int(diff.max())
+
+
+def shard_ranges(n, shards):
+    """Bagi 0..n menjadi maksimal `shards` rentang kontinu yang hampir sama besar"""
+    shards = max(1, min(shards, n))
+    bounds = np.linspace(0, n, shards + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def cosimulate(variant, frames, jobs=None, clks_per_bit=DEFAULT_CLKS_PER_BIT, half=False, pack=False,
+               max_gap=0, seed=1, ghdl="ghdl", std=DEFAULT_STD, work_dir=WORK_DIR, build=None, ping_pong=False,
+               framed=False, batch=frame_link.DEFAULT_BATCH):
+    """
+    Co-simulasi paralel: build testbench sekali, jalankan shard korpus di `jobs` proses ghdl.
+    Mode framed: tiap shard mulai dengan batch baru (seq dari 0).
+    Return dict: hasil per transaksi (status, siklus, selisih vs golden) + statistik waktu.
+    """
+    if framed and ping_pong:
+        raise ValueError("Mode framed dan ping-pong tidak bisa dipakai bersamaan")
+    build = build or GhdlBuild(variant, ghdl, std, work_dir)
+    cfg = build.cfg
+    frames = np.asarray(frames)
+    transactions = encode_transactions(frames, cfg, pack)
+    expected = expected_words(frames, cfg, half, pack)
+    dtype = golden_model.sample_dtype(cfg["bits"])
+
+    params = dict(cycle_model.rtl_params(cfg), half_spectrum=half, pack_two=pack, framed=framed, batch=batch,
+                  ping_pong=ping_pong)
+    predicted = cycle_model.steady_latency(params, clks_per_bit)
+    out_bytes = cycle_model.frame_bytes(cycle_model.out_words(params), cfg["bits"])
+    rx_words = cfg["points"] * cycle_model.frames_per_transaction(params)
+    wire_bytes = out_bytes + (frame_link.RESP_HEADER_BYTES + frame_link.CRC_BYTES if framed else 0)
+    generics = {
+        "g_CLKS_PER_BIT": clks_per_bit,
+        "g_HALF_SPECTRUM": str(half).lower(),
+        "g_PACK_TWO": str(pack).lower(),
+        "g_PING_PONG": str(ping_pong).lower(),
+        "g_FRAMED": str(framed).lower(),
+        "g_BYTES_OUT": wire_bytes,
+        "g_TIMEOUT": TIMEOUT_FACTOR * cycle_model.frame_cycles(params, clks_per_bit),
+        "g_MAX_GAP": max_gap,
+    }
+
+    build_s = build.build()
+    ranges = shard_ranges(len(transactions), jobs or os.cpu_count())
+    shard_dir = os.path.join(build.work_dir, "shards")
+    os.makedirs(shard_dir, exist_ok=True)
+
+    def run_one(i):
+        start, end = ranges[i]
+        in_path = os.path.join(shard_dir, f"in_{i}.txt")
+        out_path = os.path.join(shard_dir, f"out_{i}.txt")
+        shard = transactions[start:end]
+        write_stimulus(in_path, frame_transactions(shard, rx_words, batch) if framed else shard)
+        code, stderr, wall = build.run_shard(in_path, out_path, dict(generics, g_SEED=seed + i))
+        rows = read_response(out_path) if os.path.exists(out_path) else []
+        return start, end, code, stderr, wall, rows
+
+    t0 = time.monotonic()
+    with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+        shards = list(pool.map(run_one, range(len(ranges))))
+    elapsed = time.monotonic() - t0
+
+    results = []
+    errors = []
+    for start, end, code, stderr, wall, rows in shards:
+        if code != 0:
+            errors.append(f"shard {start}..{end - 1}: ghdl keluar dengan kode {code}\n{stderr.strip()}")
+        got = {idx: (cycles, data) for idx, cycles, data in rows}
+        for j in range(end - start):
+            idx = start + j
+            if j not in got:
+                results.append({"index": idx, "status": "hilang", "cycles": None, "bins": 0, "max_diff": 0})
+                continue
+            cycles, data = got[j]
+            status, bins, max_diff = check_response(data, expected[idx], dtype, out_bytes, framed, j % batch)
+            results.append({"index": idx, "status": status, "cycles": cycles, "bins": bins, "max_diff": max_diff})
+
+    cycles = np.array([r["cycles"] for r in results if r["status"] in ("cocok", "salah")], dtype=float)
+    shard_wall = sum(s[4] for s in shards)
+    return {
+        "variant": variant,
+        "transactions": len(transactions),
+        "results": results,
+        "errors": errors,
+        "counts": {k: sum(r["status"] == k for r in results) for k in ("cocok", "salah", "timeout", "link", "hilang")},
+        "cycles": {
+            "predicted": predicted,
+            "mean": float(cycles.mean()) if len(cycles) else None,
+            "min": float(cycles.min()) if len(cycles) else None,
+            "max": float(cycles.max()) if len(cycles) else None,
+        },
+        "clks_per_bit": clks_per_bit,
+        "shards": len(ranges),
+        "build_s": build_s,
+        "elapsed_s": elapsed,
+        "shard_wall_s": shard_wall,
+        "frames_per_s": len(transactions) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def print_report(report, max_rows=20):
+    counts, cyc = report["counts"], report["cycles"]
+    print(f"[-] Transaksi        : {report['transactions']} ({report['shards']} shard paralel)")
+    print(f"[-] Cocok / salah    : {counts['cocok']} / {counts['salah']} (timeout {counts['timeout']}, link {counts['link']}, "
+          f"hilang {counts['hilang']})")
+    bad = [r for r in report["results"] if r["status"] != "cocok"]
+    for r in bad[:max_rows]:
+        detail = f"{r['bins']} bin beda, max {r['max_diff']} LSB" if r["status"] == "salah" else r["status"]
+        print(f"    transaksi {r['index']:6d}: {detail}")
+    if len(bad) > max_rows:
+        print(f"    ... {len(bad) - max_rows} lagi")
+    if cyc["mean"] is not None:
+        print(f"[-] Siklus/transaksi : mean {cyc['mean']:.0f}, min {cyc['min']:.0f}, max {cyc['max']:.0f} "
+              f"(cycle_model {cyc['predicted']}, g_CLKS_PER_BIT {report['clks_per_bit']})")
+    print(f"[-] Waktu build      : {report['build_s']:.2f} s")
+    print(f"[-] Waktu simulasi   : {report['elapsed_s']:.2f} s wall, {report['shard_wall_s']:.2f} s total shard "
+          f"({report['shard_wall_s'] / max(report['elapsed_s'], 1e-9):.1f}x paralel, {report['frames_per_s']:.1f} transaksi/s)")
+    for err in report["errors"]:
+        print(f"[!] {err}")
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Regresi RTL: co-simulasi GHDL uart_fft_top vs golden model (paralel)")
+    parser.add_argument("--variant", default="32x16", choices=list(golden_model.VARIANTS))
+    parser.add_argument("--input", help="Korpus .fftc / .bin (default testing/input_<variant>.bin)")
+    parser.add_argument("--frames", type=int, default=None, help="Jumlah frame (input diulang jika kurang)")
+    parser.add_argument("--jobs", type=int, default=None, help="Shard paralel (default: semua core)")
+    parser.add_argument("--clks-per-bit", type=int, default=DEFAULT_CLKS_PER_BIT, help="g_CLKS_PER_BIT simulasi")
+    parser.add_argument("--half", action="store_true", help="g_HALF_SPECTRUM = true")
+    parser.add_argument("--pack", action="store_true", help="g_PACK_TWO = true")
+    parser.add_argument("--ping-pong", action="store_true", help="g_PING_PONG = true (2 transaksi in-flight)")
+    parser.add_argument("--framed", action="store_true", help="g_FRAMED = true (header batch, CRC, seq)")
+    parser.add_argument("--batch", type=int, default=frame_link.DEFAULT_BATCH, help="Frame per batch (mode framed)")
+    parser.add_argument("--max-gap", type=int, default=0, help="Jeda acak antar byte input (siklus), cari bug timing")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--ghdl", default="ghdl")
+    parser.add_argument("--std", default=DEFAULT_STD)
+    parser.add_argument("--work-dir", default=WORK_DIR)
+    parser.add_argument("--report", help="Simpan laporan JSON")
+    args = parser.parse_args()
+    if args.half and args.pack:
+        parser.error("--half dan --pack tidak bisa dipakai bersamaan")
+    if args.framed and args.ping_pong:
+        parser.error("--framed dan --ping-pong tidak bisa dipakai bersamaan")
+    if not 0 < args.batch <= frame_link.MAX_BATCH:
+        parser.error(f"--batch harus 1..{frame_link.MAX_BATCH}")
+
+    cfg = golden_model.get_variant(args.variant)
+    testing_dir = os.path.abspath(os.path.join(golden_model.CURRENT_DIR, ".."))
+    input_path = args.input or os.path.join(testing_dir, f"input_{args.variant}.bin")
+    _, frames = capture_format.open_capture(input_path, cfg["points"], cfg["bits"])
+    n_frames = args.frames or len(frames)
+    frames = np.asarray(frames)[np.arange(n_frames) % len(frames)]
+
+    print(f"--- CO-SIMULASI GHDL {args.variant} ({n_frames} frame) ---")
+    try:
+        report = cosimulate(args.variant, frames, args.jobs, args.clks_per_bit, args.half, args.pack,
+                            args.max_gap, args.seed, args.ghdl, args.std, args.work_dir, ping_pong=args.ping_pong,
+                            framed=args.framed, batch=args.batch)
+    except (FileNotFoundError, RuntimeError) as e:
+        print(f"[!] {e}")
+        raise SystemExit(1)
+    print_report(report)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[OK] Laporan disimpan: {args.report}")
+    if report["counts"]["cocok"] != report["transactions"] or report["errors"]:
+        print("[!] Regresi: output RTL tidak identik dengan golden model")
+        raise SystemExit(1)
+    print("[OK] Semua transaksi identik dengan golden model")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,337 @@
+import numpy as np
+import argparse
+import re
+import os
+
+import golden_model
+import frame_link
+
+# ================= MODEL TIMING uart_fft_top =================
+# Konstanta timing dari RTL (uart_fft_top.vhd, uart_rx.vhd, uart_tx.vhd)
+
+CLK_HZ = 50_000_000        # Clock board Cyclone IV
+CLKS_PER_BIT = 5208        # generic g_CLKS_PER_BIT (50 MHz / 5208 = 9600 baud)
+SETTLE_CYCLES = 50000      # r_Settle_Timer di s_RX_SETTLE
+RX_IDLE_TIMEOUT = 1000000  # C_TIMEOUT_VAL uart_rx v5_32_16 (reset pasangan byte LSB/MSB)
+UART_FRAME_BITS = 10       # start + 8 data + stop
+PING_PONG_BANKS = 2        # g_PING_PONG: bank memori frame = transaksi in-flight maksimal dari host
+
+
+def baud_rate(clk_hz=CLK_HZ, clks_per_bit=CLKS_PER_BIT):
+    """Baud rate efektif dari clock dan g_CLKS_PER_BIT"""
+    return clk_hz / clks_per_bit
+
+
+def uart_byte_cycles(clks_per_bit=CLKS_PER_BIT):
+    """Siklus clock untuk satu byte UART di jalur (start + 8 data + stop)"""
+    return UART_FRAME_BITS * clks_per_bit
+
+
+def bytes_per_word(bits):
+    """uart_rx/uart_tx v5_32_16 mengirim 2 byte per sampel (LSB dulu), v5_64_8 1 byte"""
+    return (bits + 7) // 8
+
+
+def frame_bytes(points, bits):
+    """Jumlah byte UART per frame (input maupun output)"""
+    return points * bytes_per_word(bits)
+
+
+def cycles_to_seconds(cycles, clk_hz=CLK_HZ):
+    return cycles / clk_hz
+
+
+# ================= PARAMETER DARI RTL =================
+def _read(rtl_dir, name):
+    with open(os.path.join(golden_model.REPO_DIR, rtl_dir, name), "r") as f:
+        return f.read()
+
+
+def _search_int(pattern, text, what):
+    m = re.search(pattern, text)
+    if m is None:
+        raise ValueError(f"Tidak bisa membaca {what} dari RTL (pola: {pattern})")
+    return int(m.group(1))
+
+
+def _states(text):
+    m = re.search(r"type\s+t_\w+\s+is\s*\(([^)]*)\)", text)
+    return [s.strip() for s in m.group(1).split(",")] if m else []
+
+
+def rtl_params(variant):
+    """
+    Ekstrak parameter timing dari file VHDL build:
+    points, bits, g_CLKS_PER_BIT, settle, iterasi sqrt, state s_WAIT magnitude_unit,
+    overhead state per byte di uart_tx, jumlah byte per word di uart_rx, dan mode
+    g_HALF_SPECTRUM / g_PACK_TWO / g_FRAMED / g_PING_PONG (default generic di uart_fft_top).
+    """
+    rtl_dir = golden_model.get_variant(variant)["rtl_dir"] if isinstance(variant, str) else variant["rtl_dir"]
+    pkg = _read(rtl_dir, "fft_pkg.vhd")
+    top = _read(rtl_dir, "uart_fft_top.vhd")
+    mag = _read(rtl_dir, "magnitude_unit.vhd")
+    rx = _read(rtl_dir, "uart_rx.vhd")
+    tx = _read(rtl_dir, "uart_tx.vhd")
+    split = _read(rtl_dir, "split_unit.vhd")
+
+    tx_states = _states(tx)
+    return {
+        "points": _search_int(r"constant\s+points\s*:\s*integer\s*:=\s*(\d+)", pkg, "points"),
+        "bits": _search_int(r"constant\s+data_width\s*:\s*integer\s*:=\s*(\d+)", pkg, "data_width"),
+        "clks_per_bit": _search_int(r"g_CLKS_PER_BIT\s*:\s*integer\s*:=\s*(\d+)", top, "g_CLKS_PER_BIT"),
+        "settle": _search_int(r"r_Settle_Timer\s*<\s*(\d+)", top, "settle timer"),
+        "sqrt_iters": _search_int(r"r_Iter\s*<=\s*(\d+)\s*then", mag, "iterasi sqrt"),
+        "mag_wait": "s_WAIT" in _states(mag),
+        # s_LOAD + s_NEXT_BYTE (v5_32_16) atau s_FETCH saja (v5_64_8) di luar 10 bit UART
+        "tx_overhead": 2 if "s_NEXT_BYTE" in tx_states else 1,
+        "bytes_per_word": 2 if "r_LSB_Reg" in rx else 1,
+        "half_spectrum": re.search(r"g_HALF_SPECTRUM\s*:\s*boolean\s*:=\s*true", top, re.I) is not None,
+        "pack_two": re.search(r"g_PACK_TWO\s*:\s*boolean\s*:=\s*true", top, re.I) is not None,
+        "split_wait": "s_WAIT" in _states(split),
+        "framed": re.search(r"g_FRAMED\s*:\s*boolean\s*:=\s*true", top, re.I) is not None,
+        "batch": frame_link.DEFAULT_BATCH,
+        "ping_pong": re.search(r"g_PING_PONG\s*:\s*boolean\s*:=\s*true", top, re.I) is not None,
+    }
+
+
+def params_for(points, bits, clks_per_bit=CLKS_PER_BIT, settle=SETTLE_CYCLES, half_spectrum=False, pack_two=False,
+               framed=False, batch=frame_link.DEFAULT_BATCH, ping_pong=False):
+    """Parameter timing untuk konfigurasi hipotetis (arsitektur sama dengan v5_32_16)"""
+    bpw = bytes_per_word(bits)
+    return {
+        "points": points,
+        "bits": bits,
+        "clks_per_bit": clks_per_bit,
+        "settle": settle,
+        "sqrt_iters": bits,
+        "mag_wait": True,
+        "tx_overhead": 2 if bpw > 1 else 1,
+        "bytes_per_word": bpw,
+        "half_spectrum": half_spectrum,
+        "pack_two": pack_two,
+        "split_wait": True,
+        "framed": framed,
+        "batch": batch,
+        "ping_pong": ping_pong,
+    }
+
+
+# ================= HITUNG SIKLUS PER FASE =================
+def bit_reverse_swaps(points):
+    """Jumlah swap di s_BIT_REV_PROC (idx < reverse_bits(idx))"""
+    return int(np.count_nonzero(np.arange(points) < golden_model.bit_reverse_indices(points)))
+
+
+def fft_cycles(points):
+    """
+    Siklus fft_engine dari i_Start sampai o_Done:
+      s_IDLE + s_BIT_REV_START, s_BIT_REV_PROC (1/idx, +1 s_WAIT per swap, +1 keluar),
+      per stage: s_STAGE + s_GROUP + per grup s_BUTTERFLY + 4 siklus/butterfly + s_BUTTERFLY akhir,
+      lalu s_STAGE akhir + s_DONE.
+    """
+    stages = int(points).bit_length() - 1
+    bit_rev = points + bit_reverse_swaps(points) + 1
+    per_stage = 0
+    dft_size = 2
+    while dft_size <= points:
+        groups = points // dft_size
+        per_stage += 2 + groups * (1 + 4 * (dft_size // 2)) + 1
+        dft_size *= 2
+    return {"bit_rev": 2 + bit_rev, "butterflies": per_stage, "done": 2, "stages": stages}
+
+
+def mag_cycles_per_bin(sqrt_iters, mag_wait=True):
+    """s_READ + (s_WAIT) + s_CALC (setup + iterasi + 1 keluar) + s_WRITE"""
+    return 1 + (1 if mag_wait else 0) + (1 + sqrt_iters + 1) + 1
+
+
+def frames_per_transaction(params):
+    """Frame input per transaksi UART: 2 pada mode pack (g_PACK_TWO), selain itu 1"""
+    return 2 if params.get("pack_two", False) else 1
+
+
+def split_cycles(points, split_wait=True):
+    """split_unit: s_IDLE + (s_READ + (s_WAIT) + s_CALC) per k = 0..POINTS/2 + s_DONE"""
+    return 1 + (points // 2 + 1) * (2 + (1 if split_wait else 0)) + 1
+
+
+def out_words(params, points=None):
+    """Word yang dikirim uart_tx per transaksi"""
+    n = points or params["points"]
+    if params.get("pack_two", False):
+        return n + 2
+    return golden_model.out_bins(n, params.get("half_spectrum", False))
+
+
+def framing_cycles(params, clks_per_bit):
+    """g_FRAMED: byte protokol per transaksi (CRC frame + header batch / batch, sync + seq + CRC respons)"""
+    rx_bytes, tx_bytes = frame_link.link_overhead_bytes(params.get("batch", frame_link.DEFAULT_BATCH))
+    return int(round(rx_bytes * uart_byte_cycles(clks_per_bit)
+                     + tx_bytes * (uart_byte_cycles(clks_per_bit) + params["tx_overhead"])))
+
+
+def rx_byte_latency(clks_per_bit):
+    """Siklus dari start bit sampai o_RX_Done: sync 2-FF + s_IDLE + start/2 + 8 bit + stop/2"""
+    return 3 + ((clks_per_bit - 1) // 2 + 1) + 8 * clks_per_bit + (clks_per_bit // 2 + 1)
+
+
+def phase_cycles(params, clks_per_bit=None, points=None):
+    """
+    Siklus per fase satu transaksi (host mengirim byte back-to-back):
+    rx, settle, fft, (split), mag, tx, overhead (handshake FSM).
+    Mode half-spectrum: magnitude & TX hanya untuk bin 0..POINTS/2.
+    Mode pack: RX 2 frame, split_unit, magnitude & TX untuk POINTS + 2 word.
+    Mode framed: tanpa settle, byte header/CRC/seq protokol di fase framing.
+    """
+    cpb = clks_per_bit or params["clks_per_bit"]
+    n = points or params["points"]
+    pack = params.get("pack_two", False)
+    n_bytes = n * params["bytes_per_word"] * frames_per_transaction(params)
+    n_out = out_words(params, n)
+
+    rx = (n_bytes - 1) * uart_byte_cycles(cpb) + rx_byte_latency(cpb)
+    framed = params.get("framed", False)
+    settle = 0 if framed else params["settle"] + 1
+    fft = sum(v for k, v in fft_cycles(n).items() if k != "stages")
+    mag = 1 + n_out * mag_cycles_per_bin(params["sqrt_iters"], params["mag_wait"]) + 1
+    tx = 1 + n_out * params["bytes_per_word"] * (uart_byte_cycles(cpb) + params["tx_overhead"])
+    # s_IDLE master, s_RX -> SETTLE, start/done handshake antar unit (FFT, (SPLIT), MAG, TX)
+    overhead = 1 + 1 + (4 if pack else 3) * 2
+    phases = {"rx": rx, "settle": settle, "fft": fft, "mag": mag, "tx": tx, "overhead": overhead}
+    if pack:
+        phases = {"rx": rx, "settle": settle, "fft": fft, "split": split_cycles(n, params.get("split_wait", True)),
+                  "mag": mag, "tx": tx, "overhead": overhead}
+    if framed:
+        phases["framing"] = framing_cycles(params, cpb)
+    return phases
+
+
+def frame_cycles(params, clks_per_bit=None, points=None):
+    """Total siklus satu transaksi (latency end-to-end = periode transaksi, tidak ada overlap)"""
+    return sum(phase_cycles(params, clks_per_bit, points).values())
+
+
+def transaction_period(params, clks_per_bit=None, points=None):
+    """
+    Periode transaksi steady-state (host mengirim secepat yang diizinkan board).
+    Tanpa ping-pong = frame_cycles. Mode ping-pong (g_PING_PONG): RX frame k+1 ke bank lain berjalan
+    paralel dengan SETTLE/FFT/MAG/TX frame k, periode = max(rx, proses) (+1 s_IDLE menunggu bank penuh).
+    """
+    phases = phase_cycles(params, clks_per_bit, points)
+    if not params.get("ping_pong", False):
+        return sum(phases.values())
+    return max(phases["rx"], sum(phases.values()) - phases["rx"] + 1)
+
+
+def steady_latency(params, clks_per_bit=None, points=None):
+    """
+    Latency steady-state satu transaksi (byte pertama dikirim -> byte terakhir respons).
+    Ping-pong: host menjaga PING_PONG_BANKS transaksi in-flight, latency = bank x periode (hukum Little),
+    bukan frame_cycles (itu latency frame pertama saat pipeline kosong).
+    """
+    if not params.get("ping_pong", False):
+        return frame_cycles(params, clks_per_bit, points)
+    return PING_PONG_BANKS * transaction_period(params, clks_per_bit, points)
+
+
+def bottleneck(phases):
+    """Kelompokkan fase: UART (rx+tx), settle, compute (fft+mag)"""
+    groups = {
+        "uart": phases["rx"] + phases["tx"] + phases.get("framing", 0),
+        "settle": phases["settle"],
+        "compute": phases["fft"] + phases.get("split", 0) + phases["mag"],
+    }
+    return max(groups, key=groups.get), groups
+
+
+def summarize(params, clk_hz=CLK_HZ, baud=None, points=None):
+    """Latency, frame/s dan bottleneck untuk satu titik konfigurasi"""
+    cpb = round(clk_hz / baud) if baud else params["clks_per_bit"]
+    phases = phase_cycles(params, cpb, points)
+    total = sum(phases.values())
+    period = transaction_period(params, cpb, points)
+    name, groups = bottleneck(phases)
+    return {
+        "clk_hz": clk_hz,
+        "baud": clk_hz / cpb,
+        "points": points or params["points"],
+        "phases": phases,
+        "total_cycles": total,
+        "period_cycles": period,
+        "ping_pong": params.get("ping_pong", False),
+        "latency_s": steady_latency(params, cpb, points) / clk_hz,
+        "frames_per_s": clk_hz / period * frames_per_transaction(params),
+        "bottleneck": name,
+        "groups": groups,
+    }
+
+
+def _parse_list(text, cast=float):
+    return [cast(float(v)) for v in text.split(",")] if text else None
+
+
+def print_breakdown(variant, result):
+    print(f"[{variant}] {result['points']} titik @ {result['clk_hz'] / 1e6:.1f} MHz, {result['baud']:.0f} baud")
+    for phase, cycles in result["phases"].items():
+        share = cycles / result["total_cycles"] * 100
+        print(f"    {phase:<9}: {cycles:>10} siklus  {cycles / result['clk_hz'] * 1e3:9.3f} ms  ({share:5.1f}%)")
+    if result["ping_pong"]:
+        print(f"    Ping-pong: periode {result['period_cycles'] / result['clk_hz'] * 1e3:.3f} ms "
+              f"(tanpa overlap {result['total_cycles'] / result['clk_hz'] * 1e3:.3f} ms, "
+              f"{result['total_cycles'] / result['period_cycles']:.2f}x)")
+    print(f"    Latency  : {result['latency_s'] * 1e3:.3f} ms, Throughput: {result['frames_per_s']:.3f} frame/s, "
+          f"Bottleneck: {result['bottleneck']}")
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Model siklus/latency pipeline uart_fft_top")
+    parser.add_argument("--variant", action="append", choices=list(golden_model.VARIANTS), help="Default: semua build")
+    parser.add_argument("--clk", help="Sweep clock (Hz), dipisah koma, mis. 25e6,50e6,100e6")
+    parser.add_argument("--baud", help="Sweep baud rate, mis. 9600,115200,921600")
+    parser.add_argument("--points", help="Sweep jumlah titik, mis. 32,64,128,256")
+    parser.add_argument("--half", action="store_true", help="Mode half-spectrum (g_HALF_SPECTRUM = true)")
+    parser.add_argument("--pack", action="store_true", help="Mode 2 frame per FFT (g_PACK_TWO = true)")
+    parser.add_argument("--framed", action="store_true", help="Protokol framed (g_FRAMED = true)")
+    parser.add_argument("--batch", type=int, default=frame_link.DEFAULT_BATCH, help="Frame per batch (mode framed)")
+    parser.add_argument("--ping-pong", action="store_true", help="Memori frame ping-pong (g_PING_PONG = true)")
+    args = parser.parse_args()
+    if args.framed and args.ping_pong:
+        parser.error("--framed dan --ping-pong tidak bisa dipakai bersamaan")
+
+    variants = args.variant or list(golden_model.VARIANTS)
+    clks = _parse_list(args.clk) or [CLK_HZ]
+    bauds = _parse_list(args.baud) or [None]
+    points_list = _parse_list(args.points, int) or [None]
+
+    print("--- MODEL SIKLUS PIPELINE FFT ---")
+    for variant in variants:
+        params = rtl_params(variant)
+        params["half_spectrum"] |= args.half
+        params["pack_two"] |= args.pack
+        params["framed"] |= args.framed
+        params["batch"] = args.batch
+        params["ping_pong"] |= args.ping_pong
+        print_breakdown(variant, summarize(params))
+
+    if len(clks) * len(bauds) * len(points_list) <= 1:
+        return
+
+    print("-" * 78)
+    print(f"{'build':>6} {'clk MHz':>8} {'baud':>8} {'N':>5} {'latency ms':>11} {'frame/s':>9} {'bottleneck':>11}")
+    for variant in variants:
+        params = rtl_params(variant)
+        params["half_spectrum"] |= args.half
+        params["pack_two"] |= args.pack
+        params["framed"] |= args.framed
+        params["batch"] = args.batch
+        params["ping_pong"] |= args.ping_pong
+        for clk in clks:
+            for baud in bauds:
+                for n in points_list:
+                    r = summarize(params, clk, baud, n)
+                    print(f"{variant:>6} {clk / 1e6:8.1f} {r['baud']:8.0f} {r['points']:5d} "
+                          f"{r['latency_s'] * 1e3:11.3f} {r['frames_per_s']:9.3f} {r['bottleneck']:>11}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,182 @@
+import numpy as np
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import csv
+from concurrent.futures import ProcessPoolExecutor
+
+import golden_model
+import cycle_model
+import corpus as corpus_gen
+
+# ================= DESIGN-SPACE EXPLORATION =================
+# Sweep konfigurasi (POINTS, BIT_DEPTH, presisi twiddle, headroom) terhadap korpus sinyal.
+# Tiap sel grid dievaluasi dengan golden model bit-accurate di process pool,
+# hasilnya di-cache di disk berdasarkan hash konfigurasi + korpus, lalu ditulis sebagai tabel Pareto.
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(CURRENT_DIR, ".cache", "dse")
+MODEL_VERSION = 1  # naikkan jika golden model/metrik berubah agar cache lama tidak dipakai
+
+# Korpus bawaan: sinyal uji dari generate.py
+DEFAULT_CORPUS = [
+    {"func": "1.5 * np.sin(2 * np.pi * 5 * t) + 0.5 * np.sin(2 * np.pi * 15 * t)", "t_start": 0.0, "t_end": 1.0},
+    {"func": "(1 + 0.8 * np.sin(2 * np.pi * 4.5 * t)) * np.sin(2 * np.pi * 29 * t)", "t_start": 0.0, "t_end": 1.0},
+    {"func": "np.sin(10 * t) + 0.5 * np.sin(2 * t) + 3 * np.sin(5 * t) + np.sin(3 * t) + 0.05 * np.sin(8 * t) "
+             "+ 0.2 * np.sin(12 * t) + 10 * np.sin(t)", "t_start": 0.0, "t_end": 2 * np.pi},
+    {"func": "np.sin(10 * t) * np.sin(2 * t)", "t_start": 0.0, "t_end": 2 * np.pi},
+]
+
+
+def load_corpus(path):
+    """Korpus JSON: list string ekspresi atau dict {func, t_start, t_end}"""
+    with open(path, "r") as f:
+        items = json.load(f)
+    corpus = []
+    for item in items:
+        if isinstance(item, str):
+            item = {"func": item}
+        corpus.append({"func": item["func"], "t_start": float(item.get("t_start", 0.0)),
+                       "t_end": float(item.get("t_end", 1.0))})
+    return corpus
+
+
+def corpus_hash(corpus):
+    return hashlib.sha1(json.dumps(corpus, sort_keys=True).encode()).hexdigest()
+
+
+def cell_key(cell, corpus_digest):
+    """Hash konfigurasi untuk nama file cache"""
+    payload = json.dumps({"cell": cell, "corpus": corpus_digest, "version": MODEL_VERSION}, sort_keys=True)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def sample_corpus(corpus, points):
+    """Evaluasi semua ekspresi pada grid sampel -> float (n_signals, POINTS)"""
+    return np.concatenate([corpus_gen.eval_expr(item["func"], corpus_gen.time_grid(points, item["t_start"], item["t_end"]))
+                           for item in corpus])
+
+
+def evaluate_cell(cell, corpus):
+    """Metrik satu konfigurasi: SNR (dB), max error, siklus per frame, estimasi storage"""
+    points, bits, tw_bits, headroom = cell["points"], cell["bits"], cell["twiddle_bits"], cell["headroom"]
+    cfg = golden_model.make_config(points, bits, tw_bits)
+
+    y_float = sample_corpus(corpus, points)
+    y_int, scale = corpus_gen.quantize(y_float, bits, headroom * ((1 << (bits - 1)) - 1))
+    mag_hw = golden_model.golden_magnitude(y_int, cfg).astype(np.float64) / scale[:, np.newaxis]
+    # Hardware membagi 2 per stage -> |X| / POINTS
+    mag_ideal = np.abs(np.fft.fft(y_float, axis=1)) / points
+
+    err = np.abs(mag_hw - mag_ideal)
+    signal_power = np.sum(mag_ideal ** 2, axis=1)
+    noise_power = np.sum(err ** 2, axis=1)
+    snr = 10 * np.log10(signal_power / np.maximum(noise_power, 1e-30))
+
+    params = cycle_model.params_for(points, bits)
+    phases = cycle_model.phase_cycles(params)
+    return dict(cell,
+                snr_mean=float(np.mean(snr)),
+                snr_min=float(np.min(snr)),
+                max_error=float(np.max(err) * 2),  # satuan verify.py (dikali 2)
+                compute_cycles=int(phases["fft"] + phases["mag"]),
+                frame_cycles=int(sum(phases.values())),
+                storage_bits=int(2 * points * bits + points * tw_bits))
+
+
+def _evaluate_and_cache(args):
+    cell, corpus, path = args
+    result = evaluate_cell(cell, corpus)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(result, f)
+    os.replace(tmp, path)
+    return result
+
+
+def run_sweep(cells, corpus, workers=None, cache_dir=CACHE_DIR):
+    """Evaluasi semua sel; sel yang sudah ada di cache tidak dihitung ulang"""
+    os.makedirs(cache_dir, exist_ok=True)
+    digest = corpus_hash(corpus)
+    results, todo = [], []
+    for cell in cells:
+        path = os.path.join(cache_dir, cell_key(cell, digest) + ".json")
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                results.append(json.load(f))
+        else:
+            todo.append((cell, corpus, path))
+
+    if todo:
+        workers = workers or os.cpu_count()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results.extend(pool.map(_evaluate_and_cache, todo, chunksize=max(1, len(todo) // (8 * workers))))
+    return results, len(cells) - len(todo)
+
+
+def pareto_front(results):
+    """Tandai sel yang tidak didominasi: SNR_min tinggi, frame_cycles rendah, storage_bits rendah"""
+    objs = np.array([[-r["snr_min"], r["frame_cycles"], r["storage_bits"]] for r in results], dtype=float)
+    front = np.ones(len(results), dtype=bool)
+    for i in range(len(results)):
+        dominated = np.all(objs <= objs[i], axis=1) & np.any(objs < objs[i], axis=1)
+        front[i] = not dominated.any()
+    for r, flag in zip(results, front):
+        r["pareto"] = bool(flag)
+    return results
+
+
+def build_grid(points, bits, twiddle_bits, headroom):
+    cells = []
+    for n, b, tb, h in itertools.product(points, bits, twiddle_bits, headroom):
+        cells.append({"points": int(n), "bits": int(b), "twiddle_bits": int(tb) if tb else int(b), "headroom": float(h)})
+    # twiddle_bits = 0 berarti "sama dengan bits", buang duplikat
+    unique = {json.dumps(c, sort_keys=True): c for c in cells}
+    return list(unique.values())
+
+
+def _parse_list(text, cast):
+    return [cast(v) for v in text.split(",")]
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Design-space exploration FFT fixed-point")
+    parser.add_argument("--points", default="32,64,128")
+    parser.add_argument("--bits", default="8,12,16")
+    parser.add_argument("--twiddle-bits", default="0", help="0 = sama dengan bits")
+    parser.add_argument("--headroom", default="0.5,0.75,0.945,0.977", help="Fraksi dari MAX_VAL")
+    parser.add_argument("--corpus", help="File JSON korpus sinyal (default: sinyal generate.py)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--out", default="dse_results.csv")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else DEFAULT_CORPUS
+    cells = build_grid(_parse_list(args.points, int), _parse_list(args.bits, int),
+                       _parse_list(args.twiddle_bits, int), _parse_list(args.headroom, float))
+
+    print(f"--- DESIGN-SPACE EXPLORATION: {len(cells)} konfigurasi x {len(corpus)} sinyal ---")
+    results, cached = run_sweep(cells, corpus, args.workers, args.cache_dir)
+    print(f"[-] Dari cache: {cached}, dihitung: {len(cells) - cached}")
+
+    results = pareto_front(results)
+    results.sort(key=lambda r: (not r["pareto"], -r["snr_min"], r["frame_cycles"]))
+    fields = ["pareto", "points", "bits", "twiddle_bits", "headroom", "snr_mean", "snr_min", "max_error",
+              "compute_cycles", "frame_cycles", "storage_bits"]
+    with open(args.out, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows({k: r[k] for k in fields} for r in results)
+
+    print(f"{'N':>5} {'bits':>4} {'tw':>3} {'headroom':>8} {'SNR min':>8} {'SNR avg':>8} {'max err':>8} {'frame cyc':>10} {'storage':>8}")
+    for r in results:
+        if r["pareto"]:
+            print(f"{r['points']:5d} {r['bits']:4d} {r['twiddle_bits']:3d} {r['headroom']:8.3f} {r['snr_min']:8.2f} "
+                  f"{r['snr_mean']:8.2f} {r['max_error']:8.4f} {r['frame_cycles']:10d} {r['storage_bits']:8d}")
+    print(f"[OK] Tabel lengkap: {args.out}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,293 @@
+import numpy as np
+import argparse
+import asyncio
+import time
+import os
+from collections import deque
+
+import golden_model
+import capture_format
+from uart_driver import UartFFTDriver
+
+# ================= FARM MULTI-BOARD (ASYNCIO) =================
+# Satu board 9600 baud ~7.4 frame/s; korpus besar dibagi ke N board sekaligus.
+# Antrian prioritas frame (indeks terkecil dulu, retry ikut antre di depan) diambil oleh
+# coroutine per board yang sedang idle; transaksi serial blocking dijalankan di thread
+# (asyncio.to_thread) sehingga semua port berjalan paralel dalam satu event loop.
+# Respons dicek terhadap golden model; frame yang salah / timeout dikirim ulang (ke board
+# idle yang belum pernah gagal pada frame itu, bila ada). Board dengan error rate tinggi
+# dikeluarkan dari rotasi.
+# Hasil digabung kembali sesuai urutan frame (reorder buffer).
+
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_WINDOW = 20  # transaksi terakhir untuk error rate per board
+DEFAULT_MAX_ERROR_RATE = 0.5
+DEFAULT_MAX_CONSECUTIVE = 5
+MIN_SAMPLES = 10  # transaksi minimal sebelum error rate dipakai untuk mengeluarkan board
+_STOP = (float("inf"), 0)  # sentinel antrian
+
+
+class Board:
+    """Satu port + statistik kesehatan (jendela geser error rate dan error beruntun)"""
+
+    def __init__(self, name, driver, window=DEFAULT_WINDOW):
+        self.name = name
+        self.driver = driver
+        self.recent = deque(maxlen=window)
+        self.consecutive = 0
+        self.retired = None  # alasan keluar rotasi
+
+        # Statistik
+        self.transactions = 0
+        self.ok = 0
+        self.timeouts = 0
+        self.mismatches = 0
+        self.retries = 0  # transaksi yang merupakan pengiriman ulang frame
+        self.busy_s = 0.0
+
+    def record(self, status, retry):
+        """status: "ok" / "timeout" / "mismatch" """
+        self.transactions += 1
+        self.retries += retry
+        error = status != "ok"
+        self.ok += not error
+        self.timeouts += status == "timeout"
+        self.mismatches += status == "mismatch"
+        self.recent.append(error)
+        self.consecutive = self.consecutive + 1 if error else 0
+
+    def error_rate(self):
+        return sum(self.recent) / len(self.recent) if self.recent else 0.0
+
+    def check_health(self, max_error_rate, max_consecutive):
+        """Return alasan jika board harus keluar rotasi, selain itu None"""
+        if self.consecutive >= max_consecutive:
+            return f"{self.consecutive} error beruntun"
+        if len(self.recent) >= MIN_SAMPLES and self.error_rate() > max_error_rate:
+            return f"error rate {self.error_rate() * 100:.0f}% (> {max_error_rate * 100:.0f}%)"
+        return None
+
+    def stats(self):
+        return {
+            "name": self.name,
+            "transactions": self.transactions,
+            "ok": self.ok,
+            "timeouts": self.timeouts,
+            "mismatches": self.mismatches,
+            "retries": self.retries,
+            "error_rate": (self.transactions - self.ok) / self.transactions if self.transactions else 0.0,
+            "frames_per_s": self.ok / self.busy_s if self.busy_s > 0 else 0.0,
+            "retired": self.retired,
+        }
+
+
+class BoardFarm:
+    def __init__(self, boards, variant="32x16", max_attempts=DEFAULT_MAX_ATTEMPTS, tolerance=0, use_golden=True,
+                 max_error_rate=DEFAULT_MAX_ERROR_RATE, max_consecutive=DEFAULT_MAX_CONSECUTIVE):
+        self.boards = boards
+        self.cfg = golden_model.get_variant(variant)
+        self.max_attempts = max_attempts
+        self.tolerance = tolerance
+        self.use_golden = use_golden
+        self.max_error_rate = max_error_rate
+        self.max_consecutive = max_consecutive
+
+        self._queue = None
+        self._changed = None  # di-set setiap antrian / rotasi berubah
+        self._tried = {}  # indeks frame -> board yang sudah gagal pada frame itu
+
+        # Statistik
+        self.failed = 0
+        self.elapsed_s = 0.0
+
+    def _put(self, item):
+        self._queue.put_nowait(item)
+        self._changed.set()
+
+    def _eligible(self, board, item):
+        """Retry tidak diberikan ke board yang sudah gagal pada frame itu, selama ada board lain"""
+        tried = self._tried.get(item[0])
+        if item == _STOP or not tried or board not in tried:
+            return True
+        return not any(b.retired is None and b is not board and b not in tried for b in self.boards)
+
+    async def _next(self, board):
+        """Ambil item berindeks terkecil yang boleh dikerjakan board ini, tunggu bila belum ada"""
+        while True:
+            skipped, item = [], None
+            while not self._queue.empty():
+                cand = self._queue.get_nowait()
+                if self._eligible(board, cand):
+                    item = cand
+                    break
+                skipped.append(cand)
+            for cand in skipped:
+                self._queue.put_nowait(cand)
+            if item is not None:
+                return item
+            self._changed.clear()
+            await self._changed.wait()
+
+    def _check(self, words, expected):
+        if words is None:
+            return "timeout"
+        if expected is not None and np.max(np.abs(words.astype(int) - expected.astype(int))) > self.tolerance:
+            return "mismatch"
+        return "ok"
+
+    async def _worker(self, board, frames, expected, results):
+        while True:
+            idx, attempt = await self._next(board)
+            if (idx, attempt) == _STOP:
+                return
+            t0 = time.monotonic()
+            words, _ = await asyncio.to_thread(board.driver.transact, frames[idx])
+            board.busy_s += time.monotonic() - t0
+            status = self._check(words, expected[idx] if expected is not None else None)
+            board.record(status, attempt > 0)
+
+            if status == "ok":
+                self._tried.pop(idx, None)
+                results.put_nowait((idx, words))
+            elif attempt + 1 < self.max_attempts:
+                self._tried.setdefault(idx, set()).add(board)
+                self._put((idx, attempt + 1))
+            else:
+                self._tried.pop(idx, None)
+                results.put_nowait((idx, None))
+
+            board.retired = board.check_health(self.max_error_rate, self.max_consecutive)
+            if board.retired is not None:
+                self._changed.set()
+                if all(b.retired is not None for b in self.boards):
+                    # Tidak ada board tersisa: sisa antrian dianggap gagal
+                    while not self._queue.empty():
+                        item = self._queue.get_nowait()
+                        if item != _STOP:
+                            results.put_nowait((item[0], None))
+                return
+
+    async def run(self, frames):
+        """Async generator: (index, words | None) sesuai urutan frame"""
+        frames = np.asarray(frames)
+        expected = golden_model.golden_output(frames, self.cfg) if self.use_golden else None
+        self._queue = asyncio.PriorityQueue()
+        self._changed = asyncio.Event()
+        self._tried = {}
+        results = asyncio.Queue()
+        for idx in range(len(frames)):
+            self._queue.put_nowait((idx, 0))
+        t0 = time.monotonic()
+        workers = [asyncio.create_task(self._worker(b, frames, expected, results)) for b in self.boards]
+
+        pending = {}
+        next_idx = 0
+        try:
+            while next_idx < len(frames):
+                idx, words = await results.get()
+                pending[idx] = words
+                while next_idx in pending:
+                    words = pending.pop(next_idx)
+                    self.failed += words is None
+                    yield next_idx, words
+                    next_idx += 1
+        finally:
+            for _ in workers:
+                self._put(_STOP)
+            await asyncio.gather(*workers, return_exceptions=True)
+            self.elapsed_s = time.monotonic() - t0
+
+    def stats(self):
+        boards = [b.stats() for b in self.boards]
+        ok = sum(b["ok"] for b in boards)
+        return {
+            "boards": boards,
+            "frames_ok": ok,
+            "frames_failed": self.failed,
+            "retries": sum(b["retries"] for b in boards),
+            "elapsed_s": self.elapsed_s,
+            "frames_per_s": ok / self.elapsed_s if self.elapsed_s > 0 else 0.0,
+        }
+
+
+def print_stats(stats):
+    print(f"    {'board':<12} {'trans':>6} {'OK':>6} {'timeout':>7} {'salah':>6} {'retry':>6} {'error':>6} {'frame/s':>8}  status")
+    for b in stats["boards"]:
+        print(f"    {b['name']:<12} {b['transactions']:6d} {b['ok']:6d} {b['timeouts']:7d} {b['mismatches']:6d} "
+              f"{b['retries']:6d} {b['error_rate'] * 100:5.1f}% {b['frames_per_s']:8.2f}  "
+              f"{'keluar: ' + b['retired'] if b['retired'] else 'aktif'}")
+    print(f"[-] Frame OK / gagal : {stats['frames_ok']} / {stats['frames_failed']} (retry {stats['retries']})")
+    print(f"[-] Throughput farm  : {stats['frames_per_s']:.2f} frame/s ({stats['elapsed_s']:.2f} s)")
+
+
+async def _collect(farm, frames, received):
+    async for idx, words in farm.run(frames):
+        if words is not None:
+            received[idx] = words
+        else:
+            print(f"[!] Frame {idx}: gagal di semua percobaan")
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Farm multi-board: bagi frame ke beberapa port serial (asyncio)")
+    parser.add_argument("--variant", default="32x16", choices=list(golden_model.VARIANTS))
+    parser.add_argument("--ports", help="Port board dipisah koma (mis. /dev/ttyUSB0,/dev/ttyUSB1)")
+    parser.add_argument("--emulate", type=int, default=0, metavar="N", help="Pakai N emulator pty")
+    parser.add_argument("--time-scale", type=float, default=1.0)
+    parser.add_argument("--fault-rates", default="0", help="Fault rate per emulator, dipisah koma (diulang)")
+    parser.add_argument("--input")
+    parser.add_argument("--output")
+    parser.add_argument("--frames", type=int, default=None)
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS, help="Percobaan maksimal per frame")
+    parser.add_argument("--max-error-rate", type=float, default=DEFAULT_MAX_ERROR_RATE)
+    parser.add_argument("--max-consecutive", type=int, default=DEFAULT_MAX_CONSECUTIVE)
+    parser.add_argument("--tolerance", type=int, default=0, help="Toleransi LSB terhadap golden model")
+    parser.add_argument("--no-golden", action="store_true", help="Hanya timeout yang dihitung error")
+    parser.add_argument("--log", metavar="PREFIX", help="Log transaksi per board: PREFIX_<i>.fftl")
+    args = parser.parse_args()
+
+    cfg = golden_model.get_variant(args.variant)
+    testing_dir = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    input_path = args.input or os.path.join(testing_dir, f"input_{args.variant}.bin")
+    header, frames = capture_format.open_capture(input_path, cfg["points"], cfg["bits"])
+    n_frames = args.frames or len(frames)
+    frames = np.asarray(frames)[np.arange(n_frames) % len(frames)]
+
+    emulators = []
+    ports = args.ports.split(",") if args.ports else []
+    if args.emulate:
+        from board_emulator import BoardEmulator
+        fault_rates = [float(v) for v in args.fault_rates.split(",")]
+        for i in range(args.emulate):
+            emu = BoardEmulator(args.variant, time_scale=args.time_scale, seed=i,
+                                fault_rate=fault_rates[i % len(fault_rates)])
+            emulators.append(emu)
+            ports.append(emu.start())
+    if not ports:
+        parser.error("--ports atau --emulate wajib diisi")
+
+    print(f"--- FARM MULTI-BOARD {args.variant} ({len(ports)} board, {n_frames} frame) ---")
+    received = np.zeros((n_frames, cfg["points"]), dtype=golden_model.sample_dtype(cfg["bits"]))
+    drivers = []
+    try:
+        for i, port in enumerate(ports):
+            drivers.append(UartFFTDriver(port, args.variant, log=f"{args.log}_{i}.fftl" if args.log else None))
+        boards = [Board(os.path.basename(port), drv) for port, drv in zip(ports, drivers)]
+        farm = BoardFarm(boards, args.variant, args.max_attempts, args.tolerance, not args.no_golden,
+                         args.max_error_rate, args.max_consecutive)
+        asyncio.run(_collect(farm, frames, received))
+        print_stats(farm.stats())
+    finally:
+        for drv in drivers:
+            drv.close()
+        for emu in emulators:
+            emu.stop()
+
+    if args.output:
+        capture_format.write_capture(args.output, received, cfg["bits"], header["scale"] or 1.0,
+                                     header["func"] or "", kind=capture_format.KIND_OUTPUT)
+        print(f"[OK] Output disimpan: {args.output}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,381 @@
+import numpy as np
+import argparse
+import json
+import re
+import os
+
+import golden_model
+import cycle_model
+
+# ================= GENERATOR BUILD N-POINT (128 - 1024+) =================
+# Membuat build v5_<N>_<bits>/ untuk N pangkat 2 sembarang tanpa edit tabel manual:
+#   fft_pkg.vhd    : points, data_width, c_LOG2_POINTS, ROM twiddle seperempat gelombang
+#                    (N/4 + 1 entri, bukan 2 x N/2) + twiddle_cos()/twiddle_sin() via simetri,
+#                    reverse_bits() generik selebar c_LOG2_POINTS (murni wiring, tanpa LE)
+#   fft_engine.vhd : engine yang sama dengan build lama, semua 32/64 diganti konstanta package
+#   RTL lain       : disalin dari build dengan lebar data sama (16 -> v5_32_16, 8 -> v5_64_8),
+#                    range alamat 0 to 31/63 diganti 0 to points-1
+#   fft_config.json: konfigurasi Python, otomatis terdaftar di golden_model.VARIANTS ("<N>x<bits>")
+# Script testing/signal/<N>x<bits>/generate + verify disalin dari build dasar dengan konstanta baru.
+
+CONFIG_NAME = golden_model.GENERATED_CONFIG
+BASE_BUILDS = {16: "32x16", 8: "64x8"}  # build dasar per lebar data
+COPIED_RTL = ("uart_fft_top.vhd", "uart_rx.vhd", "uart_tx.vhd", "magnitude_unit.vhd", "split_unit.vhd", "link_pkg.vhd")
+MIN_POINTS = 8
+ROW = 4  # entri to_signed per baris tabel
+
+HEADER = "-- Dibangkitkan oleh testing/tools/fft_gen.py ({name}), jangan diedit manual\n"
+
+PKG_TEMPLATE = """library ieee;
+use ieee.std_logic_1164.all;
+use ieee.numeric_std.all;
+
+package fft_pkg is
+    constant points        : integer := {points};
+    constant data_width    : integer := {bits};
+    constant c_LOG2_POINTS : integer := {log2};
+    constant c_TWIDDLE_WIDTH : integer := {twiddle_bits};
+    constant c_QUARTER     : integer := points/4;
+
+    type t_Complex_Array is array (0 to points-1) of signed(data_width-1 downto 0);
+    type t_Twiddle_ROM is array (0 to c_QUARTER) of signed(c_TWIDDLE_WIDTH-1 downto 0);
+
+    -- Seperempat gelombang: round(cos(2*pi*k/points) * {amp}), k = 0..points/4
+    constant TWIDDLE_QROM : t_Twiddle_ROM := (
+{rom}
+    );
+
+    function twiddle_cos(k : integer) return signed;
+    function twiddle_sin(k : integer) return signed;
+    function reverse_bits(n : integer) return integer;
+end package;
+
+package body fft_pkg is
+    -- W^k = cos - j*sin, k = 0..points/2-1 (TWIDDLE_SIN = -sin seperti tabel lama)
+    function twiddle_cos(k : integer) return signed is
+    begin
+        if k <= c_QUARTER then return TWIDDLE_QROM(k);
+        else return -TWIDDLE_QROM(2*c_QUARTER - k); end if;
+    end function;
+
+    function twiddle_sin(k : integer) return signed is
+    begin
+        if k <= c_QUARTER then return -TWIDDLE_QROM(c_QUARTER - k);
+        else return -TWIDDLE_QROM(k - c_QUARTER); end if;
+    end function;
+
+    function reverse_bits(n : integer) return integer is
+        variable v_in, v_out : unsigned(c_LOG2_POINTS-1 downto 0);
+    begin
+        v_in := to_unsigned(n, c_LOG2_POINTS);
+        for i in 0 to c_LOG2_POINTS-1 loop v_out(i) := v_in(c_LOG2_POINTS-1-i); end loop;
+        return to_integer(v_out);
+    end function;
+end package body;
+"""
+
+ENGINE_TEMPLATE = """library ieee;
+use ieee.std_logic_1164.all;
+use ieee.numeric_std.all;
+use work.fft_pkg.all;
+
+entity fft_engine is
+    port (
+        i_Clk : in std_logic; i_Rst_n : in std_logic; i_Start : in std_logic;
+        o_Addr_A, o_Addr_B : out integer range 0 to points-1;
+        i_Re_A, i_Im_A, i_Re_B, i_Im_B : in signed(data_width-1 downto 0);
+        o_Re_A, o_Im_A, o_Re_B, o_Im_B : out signed(data_width-1 downto 0);
+        o_WE, o_Done, o_Busy : out std_logic
+    );
+end fft_engine;
+
+architecture Behavioral of fft_engine is
+    type t_State is (s_IDLE, s_BIT_REV_START, s_BIT_REV_PROC, s_STAGE, s_GROUP, s_BUTTERFLY, s_READ, s_WAIT, s_EXEC, s_WRITE, s_DONE);
+    signal r_SM : t_State := s_IDLE;
+    signal r_Point_Idx : integer range 0 to points := 0;
+    signal r_Stage : integer range 1 to c_LOG2_POINTS+1 := 1;
+    signal r_Group : integer range 0 to points := 0;
+    signal r_Butterfly : integer range 0 to points/2 := 0;
+    signal r_DFT_Size : integer range 0 to 2*points := 1;
+    signal r_Ar, r_Ai, r_Br, r_Bi : signed(data_width-1 downto 0);
+    signal r_Wr, r_Wi : signed(c_TWIDDLE_WIDTH-1 downto 0);
+begin
+    o_Busy <= '0' when r_SM = s_IDLE else '1';
+    process(i_Clk, i_Rst_n)
+        variable v_Mult_R, v_Mult_I : signed(data_width+c_TWIDDLE_WIDTH-1 downto 0);
+        variable v_TR, v_TI : signed(data_width-1 downto 0);
+    begin
+        if i_Rst_n = '0' then r_SM <= s_IDLE; o_WE <= '0'; o_Done <= '0';
+        elsif rising_edge(i_Clk) then
+            o_WE <= '0'; o_Done <= '0';
+            case r_SM is
+                when s_IDLE => if i_Start = '1' then r_SM <= s_BIT_REV_START; end if;
+                when s_BIT_REV_START => r_Point_Idx <= 0; r_Stage <= 1; r_SM <= s_BIT_REV_PROC;
+                when s_BIT_REV_PROC =>
+                    if r_Point_Idx < points then
+                        if r_Point_Idx < reverse_bits(r_Point_Idx) then
+                            o_Addr_A <= r_Point_Idx; o_Addr_B <= reverse_bits(r_Point_Idx); r_SM <= s_WAIT;
+                        else r_Point_Idx <= r_Point_Idx + 1; end if;
+                    else r_Stage <= 1; r_DFT_Size <= 1; r_SM <= s_STAGE; end if;
+                when s_STAGE =>
+                    -- Stage terakhir: counter tidak dinaikkan agar tetap dalam range
+                    if r_Stage > c_LOG2_POINTS then r_SM <= s_DONE;
+                    else r_DFT_Size <= r_DFT_Size * 2; r_Stage <= r_Stage + 1; r_SM <= s_GROUP; end if;
+                when s_GROUP => r_Group <= 0; r_SM <= s_BUTTERFLY;
+                when s_BUTTERFLY =>
+                    if r_Group < points then r_Butterfly <= 0; r_SM <= s_READ;
+                    else r_SM <= s_STAGE; end if;
+                when s_READ =>
+                    o_Addr_A <= r_Group + r_Butterfly; o_Addr_B <= r_Group + r_Butterfly + (r_DFT_Size/2);
+                    r_Wr <= twiddle_cos(r_Butterfly * (points / r_DFT_Size));
+                    r_Wi <= twiddle_sin(r_Butterfly * (points / r_DFT_Size));
+                    r_SM <= s_WAIT;
+                when s_WAIT =>
+                    if r_Point_Idx < points and r_Stage = 1 then
+                        o_Addr_A <= r_Point_Idx; o_Addr_B <= reverse_bits(r_Point_Idx);
+                        o_Re_A <= i_Re_B; o_Im_A <= i_Im_B; o_Re_B <= i_Re_A; o_Im_B <= i_Im_A;
+                        o_WE <= '1'; r_Point_Idx <= r_Point_Idx + 1; r_SM <= s_BIT_REV_PROC;
+                    else r_Ar <= i_Re_A; r_Ai <= i_Im_A; r_Br <= i_Re_B; r_Bi <= i_Im_B; r_SM <= s_EXEC; end if;
+                when s_EXEC =>
+                    v_Mult_R := (r_Br * r_Wr) - (r_Bi * r_Wi); v_Mult_I := (r_Br * r_Wi) + (r_Bi * r_Wr);
+                    v_TR := resize(shift_right(v_Mult_R, c_TWIDDLE_WIDTH-1), data_width);
+                    v_TI := resize(shift_right(v_Mult_I, c_TWIDDLE_WIDTH-1), data_width);
+                    o_Re_A <= resize(shift_right(resize(r_Ar, data_width+1) + resize(v_TR, data_width+1), 1), data_width);
+                    o_Im_A <= resize(shift_right(resize(r_Ai, data_width+1) + resize(v_TI, data_width+1), 1), data_width);
+                    o_Re_B <= resize(shift_right(resize(r_Ar, data_width+1) - resize(v_TR, data_width+1), 1), data_width);
+                    o_Im_B <= resize(shift_right(resize(r_Ai, data_width+1) - resize(v_TI, data_width+1), 1), data_width);
+                    o_WE <= '1'; r_SM <= s_WRITE;
+                when s_WRITE =>
+                    if r_Butterfly < (r_DFT_Size/2) - 1 then r_Butterfly <= r_Butterfly + 1; r_SM <= s_READ;
+                    else r_Group <= r_Group + r_DFT_Size; r_SM <= s_BUTTERFLY; end if;
+                when s_DONE => o_Done <= '1'; r_SM <= s_IDLE;
+                when others => r_SM <= s_IDLE;
+            end case;
+        end if;
+    end process;
+end Behavioral;
+"""
+
+# (file, pola, pengganti, jumlah minimal kecocokan) untuk RTL yang disalin dari build dasar
+RTL_PATCHES = (
+    ("uart_fft_top.vhd", r"integer range 0 to (31|63);", "integer range 0 to points-1;", 1),
+    ("magnitude_unit.vhd", r"g_LAST_BIN : integer := \d+", "g_LAST_BIN : integer := points-1", 0),
+    # uart_tx 16-bit: build baru tanpa skew byte LOW (build dasar tetap seperti board)
+    ("uart_tx.vhd", r"g_TX_SKEW : boolean := true", "g_TX_SKEW : boolean := false", 0),
+)
+
+# Estimasi fit orde pertama (hitungan register + mux, bukan hasil Quartus). mem_Real/mem_Imag dibaca
+# asinkron sehingga tidak bisa masuk M9K: tiap bit = flip-flop + mux tulis, tiap port baca = mux
+# POINTS:1 per bit (~POINTS/2 LE di LUT-4). Multiplier butterfly masuk blok embedded.
+READ_PORTS = 11          # fft A/B + split A/B (re, im), magnitude re/im, uart_tx
+LE_PER_MEM_BIT = 2
+LE_PER_MUX_INPUT = 0.5
+LE_LOGIC = 600           # FSM, butterfly, sqrt, UART
+DEVICE_LE = {"EP4CE6": 6272, "EP4CE10": 10320, "EP4CE22": 22320}
+
+
+def variant_name(points, bits):
+    return f"{points}x{bits}"
+
+
+def build_dir(points, bits):
+    return f"v5_{points}_{bits}"
+
+
+def check_params(points, bits, twiddle_bits):
+    if points < MIN_POINTS or points & (points - 1):
+        raise ValueError(f"POINTS harus pangkat 2 >= {MIN_POINTS}: {points}")
+    if bits not in BASE_BUILDS:
+        raise ValueError(f"Lebar data {bits} belum punya build dasar (pilihan: {', '.join(map(str, BASE_BUILDS))})")
+    if not 2 <= twiddle_bits <= 32:
+        raise ValueError(f"Lebar twiddle harus 2..32: {twiddle_bits}")
+
+
+def format_table(values, width):
+    """Isi konstanta array VHDL: ROW entri to_signed per baris"""
+    items = [f"to_signed({int(v)}, {width})" for v in values]
+    rows = [", ".join(items[i:i + ROW]) for i in range(0, len(items), ROW)]
+    return ",\n".join("        " + row for row in rows)
+
+
+def render_pkg(points, bits, twiddle_bits):
+    qrom = golden_model.quarter_wave_rom(points, twiddle_bits)
+    return HEADER.format(name=variant_name(points, bits)) + PKG_TEMPLATE.format(
+        points=points, bits=bits, log2=points.bit_length() - 1, twiddle_bits=twiddle_bits,
+        amp=(1 << (twiddle_bits - 1)) - 1, rom=format_table(qrom, twiddle_bits))
+
+
+def render_engine(points, bits):
+    return HEADER.format(name=variant_name(points, bits)) + ENGINE_TEMPLATE
+
+
+def adapt_rtl(name, text):
+    """Ganti ukuran hardcoded build dasar dengan points"""
+    for fname, pattern, repl, min_count in RTL_PATCHES:
+        if fname != name:
+            continue
+        text, count = re.subn(pattern, repl, text)
+        if count < min_count:
+            raise ValueError(f"Pola '{pattern}' tidak ditemukan di {name} build dasar")
+    return text
+
+
+def adapt_signal_script(text, base_name, name, points):
+    """generate.py / verify.py build dasar -> build baru (nama file, judul, POINTS)"""
+    text = text.replace(base_name, name)
+    text = re.sub(r"^POINTS = \d+", f"POINTS = {points}", text, flags=re.M)
+    return re.sub(r"(NUMPY|NumPy) \d+ Point", lambda m: f"{m.group(1)} {points} Point", text)
+
+
+def _write(path, text, force):
+    if os.path.exists(path) and not force:
+        raise FileExistsError(f"{path} sudah ada (pakai --force untuk menimpa)")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", newline="\n") as f:
+        f.write(text)
+    return path
+
+
+def generate(points, bits, twiddle_bits=None, repo_dir=golden_model.REPO_DIR, signal=True, force=False):
+    """Tulis build v5_<N>_<bits>/ (+ script testing/signal), daftarkan ke VARIANTS -> konfigurasi"""
+    twiddle_bits = twiddle_bits or bits
+    check_params(points, bits, twiddle_bits)
+    base = golden_model.get_variant(BASE_BUILDS[bits])
+    name, rtl_dir = variant_name(points, bits), build_dir(points, bits)
+    out_dir = os.path.join(repo_dir, rtl_dir)
+
+    written = [
+        _write(os.path.join(out_dir, "fft_pkg.vhd"), render_pkg(points, bits, twiddle_bits), force),
+        _write(os.path.join(out_dir, "fft_engine.vhd"), render_engine(points, bits), force),
+    ]
+    for fname in COPIED_RTL:
+        with open(os.path.join(repo_dir, base["rtl_dir"], fname), "r") as f:
+            text = adapt_rtl(fname, f.read())
+        if fname == "uart_tx.vhd" and base["tx_skew"] and "g_TX_SKEW : boolean := false" not in text:
+            raise ValueError(f"uart_tx.vhd {base['rtl_dir']} tidak punya generic g_TX_SKEW")
+        written.append(_write(os.path.join(out_dir, fname), text, force))
+
+    config = {
+        "points": points,
+        "bits": bits,
+        "twiddle_bits": twiddle_bits,
+        "sqrt": base["sqrt"],
+        "rtl_dir": rtl_dir,
+        "tx_skew": False,  # uart_tx 16-bit di-patch g_TX_SKEW = false, 8-bit memang tanpa skew
+        "twiddle": "quarter",
+        "base": base["rtl_dir"],
+    }
+    written.append(_write(os.path.join(out_dir, CONFIG_NAME), json.dumps(config, indent=2) + "\n", force))
+
+    if signal:
+        base_name = BASE_BUILDS[bits]
+        for sub, script in (("generate", "generate.py"), ("verify", "verify.py")):
+            with open(os.path.join(repo_dir, "testing", "signal", base_name, sub, script), "r") as f:
+                text = adapt_signal_script(f.read(), base_name, name, points)
+            written.append(_write(os.path.join(repo_dir, "testing", "signal", name, sub, script), text, force))
+
+    golden_model.load_generated(repo_dir)
+    return config, written
+
+
+def check_build(name, n_frames=256, seed=0):
+    """
+    Cek build hasil generate: ROM di fft_pkg.vhd == quarter_wave_rom(), parameter cycle_model
+    terbaca dari RTL, dan SNR golden model vs FFT float (tone acak, /N seperti hardware).
+    """
+    cfg = golden_model.get_variant(name)
+    points, bits = cfg["points"], cfg["bits"]
+    rom_ok = None  # build tulisan tangan: tabel penuh, tidak dicek
+    if cfg.get("twiddle") == "quarter":
+        tw_cos, tw_sin = golden_model.load_twiddles(cfg)
+        expected = golden_model.expand_quarter_wave(golden_model.quarter_wave_rom(points, cfg["twiddle_bits"]), points)
+        rom_ok = np.array_equal(tw_cos, expected[0]) and np.array_equal(tw_sin, expected[1])
+
+    params = cycle_model.rtl_params(cfg)
+    params_ok = params["points"] == points and params["bits"] == bits
+
+    rng = np.random.default_rng(seed)
+    t = np.arange(points) / points
+    f = rng.uniform(1, points / 2 - 1, (n_frames, 1))
+    amp = 0.9 * ((1 << (bits - 1)) - 1)
+    frames = np.round(amp * np.sin(2 * np.pi * f * t + rng.uniform(0, 2 * np.pi, (n_frames, 1)))).astype(np.int64)
+    re_part, im_part = golden_model.fft_fixed(frames, cfg)
+    ref = np.fft.fft(frames, axis=-1) / points
+    err = (re_part + 1j * im_part) - ref
+    snr_db = 10 * np.log10(np.sum(np.abs(ref) ** 2) / max(np.sum(np.abs(err) ** 2), 1e-30))
+
+    return {
+        "rom_ok": rom_ok,
+        "params_ok": params_ok,
+        "snr_db": snr_db,
+        "fft_cycles": sum(cycle_model.fft_cycles(points).values()),
+        "frames_per_s": cycle_model.summarize(params)["frames_per_s"],
+    }
+
+
+def fit_estimate(points, bits, ping_pong=False):
+    """
+    Estimasi LE orde pertama: dict memory, read_mux, logic, total, fits (device yang muat).
+    ping_pong (g_PING_PONG): 2 bank -> register memori 2x dan tiap port baca jadi mux 2*POINTS:1.
+    """
+    banks = 2 if ping_pong else 1
+    memory = LE_PER_MEM_BIT * 2 * points * bits * banks
+    read_mux = int(READ_PORTS * bits * points * banks * LE_PER_MUX_INPUT)
+    total = memory + read_mux + LE_LOGIC
+    return {
+        "memory": memory,
+        "read_mux": read_mux,
+        "logic": LE_LOGIC,
+        "total": total,
+        "fits": [dev for dev, le in DEVICE_LE.items() if total <= le],
+    }
+
+
+def rom_bits(points, twiddle_bits):
+    """(bit ROM tabel COS + SIN penuh, bit ROM seperempat gelombang)"""
+    return 2 * (points // 2) * twiddle_bits, (points // 4 + 1) * twiddle_bits
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Generator build FFT N-point (fft_pkg.vhd, engine, config Python)")
+    parser.add_argument("--points", type=int, required=True, help="Jumlah titik FFT (pangkat 2)")
+    parser.add_argument("--bits", type=int, default=16, choices=sorted(BASE_BUILDS))
+    parser.add_argument("--twiddle-bits", type=int, default=None, help="Default: sama dengan --bits")
+    parser.add_argument("--no-signal", action="store_true", help="Jangan buat testing/signal/<N>x<bits>/")
+    parser.add_argument("--force", action="store_true", help="Timpa file yang sudah ada")
+    parser.add_argument("--check-only", action="store_true", help="Hanya cek build yang sudah ada")
+    args = parser.parse_args()
+
+    name = variant_name(args.points, args.bits)
+    print(f"--- GENERATOR BUILD {name} ---")
+    if not args.check_only:
+        config, written = generate(args.points, args.bits, args.twiddle_bits, signal=not args.no_signal, force=args.force)
+        for path in written:
+            print(f"[OK] {os.path.relpath(path, golden_model.REPO_DIR)}")
+        full, quarter = rom_bits(args.points, config["twiddle_bits"])
+        print(f"[-] ROM twiddle      : {quarter} bit (tabel penuh {full} bit, {full / quarter:.1f}x lebih kecil)")
+
+    result = check_build(name)
+    base = check_build(BASE_BUILDS[args.bits])
+    print(f"[-] ROM vs model     : {'OK' if result['rom_ok'] else 'BERBEDA'}")
+    print(f"[-] Parameter RTL    : {'OK' if result['params_ok'] else 'BERBEDA'}")
+    print(f"[-] SNR golden model : {result['snr_db']:.1f} dB (tone acak, vs FFT float / N; "
+          f"{BASE_BUILDS[args.bits]}: {base['snr_db']:.1f} dB)")
+    print(f"[-] Siklus FFT       : {result['fft_cycles']} ({result['frames_per_s']:.2f} frame/s @ baud default)")
+    base_cfg = golden_model.get_variant(BASE_BUILDS[args.bits])
+    fit, base_fit = fit_estimate(args.points, args.bits), fit_estimate(base_cfg["points"], args.bits)
+    print(f"[-] Estimasi fit     : ~{fit['total']} LE (memori {fit['memory']}, mux baca {fit['read_mux']}, "
+          f"logika {fit['logic']}; {BASE_BUILDS[args.bits]}: ~{base_fit['total']} LE), orde pertama, bukan hasil Quartus")
+    pp_fit = fit_estimate(args.points, args.bits, ping_pong=True)
+    print(f"[-] Fit ping-pong    : ~{pp_fit['total']} LE dengan g_PING_PONG = true (memori {pp_fit['memory']}, "
+          f"mux baca {pp_fit['read_mux']}; muat: {', '.join(pp_fit['fits']) or 'tidak ada'})")
+    if not fit["fits"]:
+        largest = max(DEVICE_LE, key=DEVICE_LE.get)
+        print(f"[!] Estimasi melebihi {largest} ({DEVICE_LE[largest]} LE): memori frame perlu dipindah ke M9K "
+              f"(baca sinkron) sebelum build ini bisa di-fit")
+    if not (result["rom_ok"] and result["params_ok"]):
+        print("[!] Build tidak konsisten dengan golden model")
+
+
+if __name__ == "__main__":
+    run()
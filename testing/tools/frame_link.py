@@ -0,0 +1,315 @@
+import numpy as np
+import binascii
+import struct
+import time
+
+# ================= PROTOKOL FRAMED (g_FRAMED) =================
+# Versi protokol dengan framing (v5_*/link_pkg.vhd), menggantikan "kirim POINTS word mentah":
+#   Host -> board : header batch [A5 5A | jumlah frame u16 | panjang word u16 | CRC u16]
+#                   lalu tiap frame: data + CRC u16 (host menunggu respons sebelum frame berikutnya)
+#   Board -> host : ACK [A5 | seq u8] + magnitude + CRC u16, atau NAK [E5 | seq u8] + CRC u16
+# CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF) = binascii.crc_hqx; semua u16 little endian.
+# CRC header hanya atas jumlah frame + panjang, CRC respons atas sync + seq + data.
+# Tanpa s_RX_SETTLE: frame berikutnya dalam batch langsung diterima setelah TX selesai.
+# Board kembali mencari header setelah NAK, di akhir batch, atau bila link diam > LINK_TIMEOUT
+# di tengah header/batch. Pemulihan host (batch baru dari frame gagal) sesuai state board:
+#   NAK                 -> board sudah di s_HDR: buang input, header baru langsung (tanpa tunggu)
+#   CRC respons salah   -> board sudah ACK dan menunggu seq berikutnya: kirim ulang frame yang sama
+#                          di dalam batch (frame terakhir batch: header baru langsung)
+#   timeout             -> tunggu sisa LINK_TIMEOUT sejak byte terakhir host keluar dari jalur
+#   seq salah / sync    -> resync penuh (tunggu LINK_TIMEOUT, buang input)
+
+SYNC_HOST = b"\xa5\x5a"
+SYNC_ACK = 0xA5
+SYNC_NAK = 0xE5
+CRC_INIT = 0xFFFF
+HEADER_BYTES = 8
+CRC_BYTES = 2
+RESP_HEADER_BYTES = 2
+LINK_TIMEOUT = 2500000  # C_LINK_TIMEOUT link_pkg.vhd (siklus, 50 ms @ 50 MHz)
+MAX_BATCH = 65535
+DEFAULT_BATCH = 256
+
+
+def crc16(data, crc=CRC_INIT):
+    """CRC-16/CCITT-FALSE seperti crc16_byte() di link_pkg.vhd"""
+    return binascii.crc_hqx(bytes(data), crc)
+
+
+def encode_header(count, length):
+    """Header batch: count frame, length word per frame (2 * POINTS pada mode pack)"""
+    if not 0 < count <= MAX_BATCH:
+        raise ValueError(f"Jumlah frame per batch harus 1..{MAX_BATCH}, bukan {count}")
+    fields = struct.pack("<HH", count, length)
+    return SYNC_HOST + fields + struct.pack("<H", crc16(fields))
+
+
+def parse_header(data):
+    """8 byte header -> (count, length), atau None jika sync/CRC salah"""
+    if len(data) != HEADER_BYTES or data[:2] != SYNC_HOST:
+        return None
+    count, length, crc = struct.unpack("<HHH", data[2:])
+    return (count, length) if crc == crc16(data[2:6]) else None
+
+
+def encode_frame(payload):
+    """Byte data satu frame + CRC u16"""
+    return bytes(payload) + struct.pack("<H", crc16(payload))
+
+
+def encode_response(seq, payload=b"", nak=False):
+    """Respons board (dipakai emulator): [sync, seq] + data + CRC atas semuanya"""
+    head = bytes([SYNC_NAK if nak else SYNC_ACK, seq & 0xFF]) + (b"" if nak else bytes(payload))
+    return head + struct.pack("<H", crc16(head))
+
+
+def decode_response(raw, out_bytes):
+    """
+    Byte respons apa adanya -> (status, seq, payload), status/seq seperti read_response.
+    Dipakai juga untuk respons yang di-decode testbench co-simulasi (cosim.py --framed).
+    """
+    raw = bytes(raw)
+    if len(raw) < RESP_HEADER_BYTES:
+        return "timeout", None, None
+    if raw[0] not in (SYNC_ACK, SYNC_NAK):
+        return "crc", None, None
+    total = RESP_HEADER_BYTES + (0 if raw[0] == SYNC_NAK else out_bytes) + CRC_BYTES
+    if len(raw) < total:
+        return "timeout", raw[1], None
+    payload, crc = raw[RESP_HEADER_BYTES:total - CRC_BYTES], struct.unpack("<H", raw[total - CRC_BYTES:total])[0]
+    if crc != crc16(raw[:total - CRC_BYTES]):
+        return "crc", raw[1], None
+    return ("nak" if raw[0] == SYNC_NAK else "ok"), raw[1], payload
+
+
+def read_response(link, out_bytes, timeout):
+    """
+    Baca satu respons dari board.
+    Return: (status, seq, payload, raw) dengan status "ok", "nak", "crc" (CRC/sync salah) atau "timeout",
+    raw = semua byte yang diterima apa adanya.
+    seq None pada "crc" = byte sync salah (panjang respons tidak diketahui), pada "timeout" = header respons tidak lengkap.
+    """
+    deadline = time.monotonic() + timeout
+    head = link.read_exact(RESP_HEADER_BYTES, timeout)
+    if len(head) < RESP_HEADER_BYTES:
+        return "timeout", None, None, head
+    if head[0] not in (SYNC_ACK, SYNC_NAK):
+        return "crc", None, None, head
+    body_len = (0 if head[0] == SYNC_NAK else out_bytes) + CRC_BYTES
+    body = link.read_exact(body_len, max(0.0, deadline - time.monotonic()))
+    return decode_response(head + body, out_bytes) + (head + body,)
+
+
+def strip_framing(tx, rx, frame_bytes, out_bytes):
+    """
+    Byte mentah satu percobaan (header batch opsional + frame + CRC, respons board) -> (data frame, magnitude).
+    Header dikenali dari panjang tx; magnitude kosong jika respons bukan ACK lengkap.
+    """
+    tx, rx = bytes(tx), bytes(rx)
+    if len(tx) == HEADER_BYTES + frame_bytes + CRC_BYTES:
+        tx = tx[HEADER_BYTES:]
+    ack = len(rx) == RESP_HEADER_BYTES + out_bytes + CRC_BYTES and rx[0] == SYNC_ACK
+    return tx[:frame_bytes], rx[RESP_HEADER_BYTES:-CRC_BYTES] if ack else b""
+
+
+def link_overhead_bytes(batch):
+    """Byte protokol per frame: (host -> board, board -> host), header batch dibagi rata"""
+    return CRC_BYTES + HEADER_BYTES / batch, RESP_HEADER_BYTES + CRC_BYTES
+
+
+class FramedLink:
+    """
+    Host side protokol framed di atas SerialLink: batch frame, cek seq + CRC,
+    retransmit frame yang gagal (NAK / CRC / timeout) di batch yang sama atau batch baru.
+    byte_s: waktu satu byte di jalur (10 bit), untuk menghitung kapan byte terakhir host sampai di board.
+    Timeout respons = sisa waktu kirim + waktu respons di jalur + slack_s (maks. timeout): frame yang
+    hilang dideteksi cepat, dan timeout palsu aman karena seq + CRC membuang respons yang terlambat.
+    on_exchange(tx, rx, latency, status): dipanggil untuk setiap percobaan frame dengan byte mentah di jalur
+    (tx termasuk header batch yang dikirim tepat sebelumnya), status "ok", "nak", "crc", "seq" atau "timeout".
+    """
+
+    def __init__(self, link, rx_words, out_bytes, dtype, batch=DEFAULT_BATCH, timeout=1.0,
+                 max_retries=3, resync_s=None, byte_s=10 / 9600, slack_s=None):
+        self.link = link
+        self.rx_words = rx_words
+        self.out_bytes = out_bytes
+        self.dtype = dtype
+        self.batch = min(batch, MAX_BATCH)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        # Board: C_LINK_TIMEOUT (dan C_TIMEOUT_VAL uart_rx 32x16) harus habis sebelum header baru
+        self.resync_s = resync_s if resync_s is not None else 1.5 * LINK_TIMEOUT / 50e6
+        self.byte_s = byte_s
+        self.slack_s = slack_s if slack_s is not None else 2 * self.resync_s
+        self._tx_done = 0.0
+        self._header = b""
+        self.on_exchange = None
+
+        # Statistik
+        self.batches = 0
+        self.naks = 0
+        self.crc_errors = 0
+        self.timeouts = 0
+        self.seq_errors = 0
+        self.retransmits = 0
+        self.dropped = 0
+
+    def write(self, data):
+        """Kirim byte ke board, catat perkiraan waktu byte terakhir selesai di jalur"""
+        self.link.write(data)
+        self._tx_done = max(time.monotonic(), self._tx_done) + len(data) * self.byte_s
+
+    def response_timeout(self):
+        """Batas tunggu respons frame yang baru dikirim (detik)"""
+        wire = max(0.0, self._tx_done - time.monotonic()) + (RESP_HEADER_BYTES + self.out_bytes + CRC_BYTES) * self.byte_s
+        return min(self.timeout, wire + self.slack_s)
+
+    def resync(self, full=True):
+        """
+        Tunggu board kembali mencari header, lalu buang sisa byte di input.
+        full=False: link host -> board sudah diam sejak _tx_done, cukup tunggu sisa resync_s
+        (setelah timeout respons nol, karena slack_s > resync_s).
+        """
+        wait = self.resync_s if full else self._tx_done + self.resync_s - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self.link.flush_input()
+
+    def stream(self, frames):
+        """
+        Generator: (index, words | None, latency) per frame (mode pack: per transaksi).
+        frames: list/array byte-able per transaksi; None = frame dilewati setelah max_retries.
+        """
+        frames = list(frames)
+        pos, retries = 0, 0
+        while pos < len(frames):
+            count = min(self.batch, len(frames) - pos)
+            self._header = encode_header(count, self.rx_words)
+            self.write(self._header)
+            self.batches += 1
+            for j in range(count):
+                t0 = time.monotonic()
+                tx = encode_frame(np.asarray(frames[pos]).astype(self.dtype).tobytes())
+                self.write(tx)
+                status, seq, payload, rx = read_response(self.link, self.out_bytes, self.response_timeout())
+                latency = time.monotonic() - t0
+                if status == "ok" and seq != j & 0xFF:
+                    status = "seq"
+                if self.on_exchange is not None:
+                    self.on_exchange(self._header + tx, rx, latency, status)
+                self._header = b""
+                if status != "timeout":
+                    # Ada respons: semua byte host sudah diterima board
+                    self._tx_done = min(self._tx_done, time.monotonic())
+                if status == "ok":
+                    yield pos, np.frombuffer(payload, dtype=self.dtype).copy(), latency
+                    pos, retries = pos + 1, 0
+                    continue
+
+                # Respons lengkap tapi CRC salah: board sudah ACK, frame diulang sebagai seq j + 1
+                in_batch = status == "crc" and seq is not None
+                if status == "seq":
+                    self.seq_errors += 1
+                    self.resync()
+                elif status == "nak":
+                    self.naks += 1
+                    self.link.flush_input()
+                elif status == "crc":
+                    self.crc_errors += 1
+                    if not in_batch:
+                        self.resync()
+                else:
+                    self.timeouts += 1
+                    self.resync(full=seq is not None)
+                retries += 1
+                if retries > self.max_retries:
+                    yield pos, None, latency
+                    self.dropped += 1
+                    pos, retries = pos + 1, 0
+                else:
+                    self.retransmits += 1
+                if not in_batch or pos >= len(frames):
+                    break
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "naks": self.naks,
+            "crc_errors": self.crc_errors,
+            "link_timeouts": self.timeouts,
+            "seq_errors": self.seq_errors,
+            "retransmits": self.retransmits,
+            "dropped": self.dropped,
+        }
+
+
+def bench(variant, frames, framed, drop_rate=0.0, time_scale=0.0, batch=DEFAULT_BATCH, seed=0):
+    """Jalankan frame lewat emulator pty (legacy / framed) -> dict: OK, salah, hilang, statistik driver"""
+    import golden_model
+    from board_emulator import BoardEmulator
+    from uart_driver import UartFFTDriver
+
+    expected = golden_model.golden_output(frames, variant)
+    result = {"ok": 0, "wrong": 0, "lost": 0}
+    board = BoardEmulator(variant, time_scale=time_scale, seed=seed, framed=framed, drop_rate=drop_rate)
+    port = board.start()
+    try:
+        with UartFFTDriver(port, variant, framed=framed, batch=batch) as drv:
+            t0 = time.monotonic()
+            for idx, words, _ in drv.stream(frames):
+                if words is None:
+                    result["lost"] += 1
+                elif np.array_equal(words, expected[idx]):
+                    result["ok"] += 1
+                else:
+                    result["wrong"] += 1
+            result["elapsed_s"] = time.monotonic() - t0
+            result.update(drv.stats())
+    finally:
+        board.stop()
+    return result
+
+
+def run():
+    import argparse
+    import golden_model
+    import cycle_model
+    import corpus
+
+    parser = argparse.ArgumentParser(description="Benchmark protokol framed vs legacy lewat emulator pty")
+    parser.add_argument("--variant", action="append", choices=list(golden_model.VARIANTS), help="Default: semua build")
+    parser.add_argument("--frames", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH)
+    parser.add_argument("--drop-rates", default="0,0.0002", help="Peluang byte hilang di jalur, dipisah koma")
+    parser.add_argument("--time-scale", type=float, default=0.0)
+    parser.add_argument("--bauds", default="9600,115200,921600,3125000")
+    args = parser.parse_args()
+
+    drop_rates = [float(v) for v in args.drop_rates.split(",")]
+    print("--- BENCHMARK PROTOKOL FRAMED ---")
+    for name in args.variant or list(golden_model.VARIANTS):
+        cfg = golden_model.get_variant(name)
+        rng = np.random.default_rng(0)
+        y = corpus.eval_expr(corpus.FAMILIES["multitone"]["func"], corpus.time_grid(cfg["points"]),
+                             **corpus.sample_params("multitone", rng, args.frames, cfg["points"]))
+        frames, _ = corpus.quantize(y, cfg["bits"], corpus.DEFAULT_HEADROOM[cfg["bits"]])
+
+        print(f"[{name}] {args.frames} frame, emulator time_scale {args.time_scale}")
+        print(f"    {'mode':<7} {'drop':>7} {'OK':>6} {'salah':>6} {'hilang':>6} {'retx':>5} {'waktu s':>8}")
+        for drop in drop_rates:
+            for framed in (False, True):
+                r = bench(name, frames, framed, drop, args.time_scale, args.batch)
+                print(f"    {'framed' if framed else 'legacy':<7} {drop:7.4f} {r['ok']:6d} {r['wrong']:6d} {r['lost']:6d} "
+                      f"{r.get('retransmits', r['timeouts']):5d} {r['elapsed_s']:8.2f}")
+
+        params = cycle_model.rtl_params(cfg)
+        print(f"    {'baud':>9} {'legacy':>9} {'framed':>9} {'gain':>6}  (frame/s, cycle_model, batch {args.batch})")
+        for baud in (float(v) for v in args.bauds.split(",")):
+            legacy = cycle_model.summarize(params, baud=baud)["frames_per_s"]
+            framed = cycle_model.summarize(dict(params, framed=True, batch=args.batch), baud=baud)["frames_per_s"]
+            print(f"    {baud:9.0f} {legacy:9.2f} {framed:9.2f} {framed / legacy:5.2f}x")
+    print("[-] Catatan: framed menambah 6 byte per frame (CRC + sync/seq/CRC respons), menghapus settle 1 ms.")
+
+
+if __name__ == "__main__":
+    run()
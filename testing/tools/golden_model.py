@@ -0,0 +1,530 @@
+import numpy as np
+import argparse
+import json
+import glob
+import re
+import os
+
+# ================= GOLDEN MODEL (BIT-ACCURATE) =================
+# Model NumPy dari fft_engine.vhd + magnitude_unit.vhd yang identik bit-per-bit
+# dengan hardware. Semua operasi dilakukan per-stage pada array (n_frames, POINTS),
+# tanpa loop Python per-sampel.
+
+# PATH HANDLING
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.abspath(os.path.join(CURRENT_DIR, "../../"))
+
+# Konfigurasi build yang ada di repo
+VARIANTS = {
+    "32x16": {"points": 32, "bits": 16, "sqrt": "restoring", "rtl_dir": "v5_32_16", "tx_skew": True},
+    "64x8": {"points": 64, "bits": 8, "sqrt": "v5_64_8", "rtl_dir": "v5_64_8", "tx_skew": False},
+}
+
+# Naikkan jika aritmetika / format output golden model berubah (ikut kunci ref_cache)
+MODEL_VERSION = 1
+
+# Build hasil testing/tools/fft_gen.py (v5_<N>_<bits>/fft_config.json) didaftarkan otomatis
+GENERATED_CONFIG = "fft_config.json"
+
+_TWIDDLE_CACHE = {}
+
+
+def get_variant(name):
+    """Ambil konfigurasi build berdasarkan nama ("32x16" / "64x8")"""
+    if name not in VARIANTS:
+        raise ValueError(f"Variant tidak dikenal: {name} (pilihan: {', '.join(VARIANTS)})")
+    return VARIANTS[name]
+
+
+def make_config(points, bits, twiddle_bits=None, sqrt="restoring", twiddle="floor"):
+    """
+    Konfigurasi generik (di luar build repo).
+    twiddle: "floor" (make_twiddles, konvensi tabel lama) atau "quarter" (ROM seperempat gelombang fft_gen.py)
+    """
+    if points < 2 or points & (points - 1):
+        raise ValueError(f"POINTS harus pangkat 2: {points}")
+    return {
+        "points": points,
+        "bits": bits,
+        "twiddle_bits": twiddle_bits or bits,
+        "sqrt": sqrt,
+        "rtl_dir": None,
+        "tx_skew": False,
+        "twiddle": twiddle,
+    }
+
+
+def load_generated(repo_dir=REPO_DIR):
+    """Daftarkan build hasil fft_gen.py ke VARIANTS (nama "<N>x<bits>"), return nama yang ditemukan"""
+    names = []
+    for path in sorted(glob.glob(os.path.join(repo_dir, "v5_*", GENERATED_CONFIG))):
+        with open(path, "r") as f:
+            cfg = json.load(f)
+        name = f"{cfg['points']}x{cfg['bits']}"
+        if name in VARIANTS and VARIANTS[name]["rtl_dir"] != cfg["rtl_dir"]:
+            continue  # build tulisan tangan selalu didahulukan
+        VARIANTS[name] = {key: cfg[key] for key in ("points", "bits", "twiddle_bits", "sqrt", "rtl_dir", "tx_skew", "twiddle")}
+        names.append(name)
+    return names
+
+
+def sample_dtype(bits):
+    """Tipe data NumPy untuk satu sampel/word UART (little endian)"""
+    if bits <= 8:
+        return np.dtype("i1")
+    return np.dtype("<i2") if bits <= 16 else np.dtype("<i4")
+
+
+def make_twiddles(points, twiddle_bits):
+    """Twiddle seperti tabel fft_pkg.vhd: floor(cos * (2^(b-1) - 1)) dan SIN = floor(-sin * ...)"""
+    k = np.arange(points // 2)
+    amp = (1 << (twiddle_bits - 1)) - 1
+    tw_cos = np.floor(np.cos(2 * np.pi * k / points) * amp + 1e-9).astype(np.int64)
+    tw_sin = np.floor(-np.sin(2 * np.pi * k / points) * amp + 1e-9).astype(np.int64)
+    return tw_cos, tw_sin
+
+
+def quarter_wave_rom(points, twiddle_bits):
+    """TWIDDLE_QROM fft_gen.py: round(cos(2 pi k / N) * (2^(b-1) - 1)) untuk k = 0..N/4"""
+    k = np.arange(points // 4 + 1)
+    amp = (1 << (twiddle_bits - 1)) - 1
+    return np.round(np.cos(2 * np.pi * k / points) * amp).astype(np.int64)
+
+
+def expand_quarter_wave(qrom, points):
+    """
+    twiddle_cos()/twiddle_sin() fft_pkg.vhd hasil fft_gen.py -> (COS, SIN) k = 0..N/2-1:
+    k <= N/4: COS = Q[k], SIN = -Q[N/4-k]; k > N/4: COS = -Q[N/2-k], SIN = -Q[k-N/4]
+    """
+    quarter = points // 4
+    qrom = np.asarray(qrom, dtype=np.int64)
+    if len(qrom) != quarter + 1:
+        raise ValueError(f"ROM seperempat gelombang harus {quarter + 1} entri, bukan {len(qrom)}")
+    k = np.arange(points // 2)
+    low = k <= quarter
+    tw_cos = np.where(low, qrom[np.minimum(k, quarter)], -qrom[np.clip(2 * quarter - k, 0, quarter)])
+    tw_sin = -qrom[np.abs(quarter - k)]
+    return tw_cos, tw_sin
+
+
+def load_twiddles(variant):
+    """
+    Parsing twiddle langsung dari fft_pkg.vhd (agar selalu sinkron dengan RTL):
+    TWIDDLE_COS/TWIDDLE_SIN (build lama) atau TWIDDLE_QROM (build fft_gen.py, diekspansi)
+    """
+    cfg = get_variant(variant) if isinstance(variant, str) else variant
+    if cfg.get("rtl_dir") is None:
+        key = (cfg["points"], cfg["twiddle_bits"], cfg.get("twiddle", "floor"))
+        if key not in _TWIDDLE_CACHE:
+            if key[2] == "quarter":
+                _TWIDDLE_CACHE[key] = expand_quarter_wave(quarter_wave_rom(*key[:2]), cfg["points"])
+            else:
+                _TWIDDLE_CACHE[key] = make_twiddles(*key[:2])
+        return _TWIDDLE_CACHE[key]
+
+    pkg_path = os.path.join(REPO_DIR, cfg["rtl_dir"], "fft_pkg.vhd")
+    if pkg_path in _TWIDDLE_CACHE:
+        return _TWIDDLE_CACHE[pkg_path]
+
+    with open(pkg_path, "r") as f:
+        text = f.read()
+
+    m = re.search(r"TWIDDLE_QROM\s*:\s*t_Twiddle_ROM\s*:=\s*\((.*?)\);", text, re.S)
+    if m is not None:
+        qrom = [int(v) for v in re.findall(r"to_signed\(\s*(-?\d+)\s*,", m.group(1))]
+        _TWIDDLE_CACHE[pkg_path] = expand_quarter_wave(qrom, cfg["points"])
+        return _TWIDDLE_CACHE[pkg_path]
+
+    tables = {}
+    for name in ("TWIDDLE_COS", "TWIDDLE_SIN"):
+        m = re.search(name + r"\s*:\s*t_Twiddle_Array\s*:=\s*\((.*?)\);", text, re.S)
+        if m is None:
+            raise ValueError(f"{name} tidak ditemukan di {pkg_path}")
+        values = [int(v) for v in re.findall(r"to_signed\(\s*(-?\d+)\s*,", m.group(1))]
+        tables[name] = np.array(values, dtype=np.int64)
+
+    if len(tables["TWIDDLE_COS"]) != cfg["points"] // 2 or len(tables["TWIDDLE_SIN"]) != cfg["points"] // 2:
+        raise ValueError(f"Jumlah twiddle di {pkg_path} tidak sama dengan POINTS/2")
+
+    _TWIDDLE_CACHE[pkg_path] = (tables["TWIDDLE_COS"], tables["TWIDDLE_SIN"])
+    return _TWIDDLE_CACHE[pkg_path]
+
+
+def bit_reverse_indices(points):
+    """Indeks hasil reverse_bits() untuk semua alamat 0..POINTS-1"""
+    n_bits = int(points).bit_length() - 1
+    idx = np.arange(points)
+    rev = np.zeros(points, dtype=np.int64)
+    for b in range(n_bits):
+        rev |= ((idx >> b) & 1) << (n_bits - 1 - b)
+    return rev
+
+
+def wrap_signed(x, bits):
+    """Wrap-around two's complement (perilaku register N-bit)"""
+    half = 1 << (bits - 1)
+    return ((x + half) & ((1 << bits) - 1)) - half
+
+
+def resize_signed(x, bits):
+    """Semantik numeric_std.resize() untuk signed: bit tanda + (bits-1) LSB"""
+    low = x & ((1 << (bits - 1)) - 1)
+    return low - ((x < 0).astype(x.dtype) << (bits - 1))
+
+
+class OverflowProbe:
+    """
+    Hook instrumentasi untuk fft_fixed() / magnitude_fixed(), semua per frame:
+      input_wrap     : sampel input di luar rentang signed bits (wrap saat masuk register)
+      stage_wrap     : overflow v_Mult (bits + tw_bits) dan resize() hasil B*W ke bits, per stage
+      stage_peak     : max |re|, |im| setelah tiap stage
+      stage_lsb_lost : jumlah output butterfly yang LSB-nya (bernilai 1) terbuang oleh /2, per stage
+      mag_wrap       : hasil sqrt >= 2^(bits-1) yang terbaca negatif di mem_Real
+    Bisa dipakai lintas chunk golden_magnitude(); hasil digabung oleh result().
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def on_input(self, x, wrapped):
+        self._chunks.append({
+            "input_wrap": np.count_nonzero(x != wrapped, axis=1),
+            "stage_wrap": [], "stage_peak": [], "stage_lsb_lost": [], "mag_wrap": None,
+        })
+
+    def on_stage(self, re_buf, im_buf, wraps, lsb_lost):
+        chunk = self._chunks[-1]
+        chunk["stage_peak"].append(np.maximum(np.abs(re_buf), np.abs(im_buf)).max(axis=1))
+        chunk["stage_wrap"].append(wraps)
+        chunk["stage_lsb_lost"].append(lsb_lost)
+
+    def on_magnitude(self, root, bits):
+        self._chunks[-1]["mag_wrap"] = np.count_nonzero(root >= (1 << (bits - 1)), axis=1)
+
+    def result(self):
+        """dict array: input_wrap (n,), stage_* (n, stages), mag_wrap (n,), total_wrap (n,)"""
+        out = {
+            "input_wrap": np.concatenate([c["input_wrap"] for c in self._chunks]),
+            "mag_wrap": np.concatenate([c["mag_wrap"] if c["mag_wrap"] is not None else np.zeros_like(c["input_wrap"])
+                                        for c in self._chunks]),
+        }
+        for key in ("stage_wrap", "stage_peak", "stage_lsb_lost"):
+            out[key] = np.concatenate([np.stack(c[key], axis=1) for c in self._chunks])
+        out["total_wrap"] = out["input_wrap"] + out["stage_wrap"].sum(axis=1) + out["mag_wrap"]
+        return out
+
+
+def fft_fixed(frames, variant, probe=None, imag=None):
+    """
+    FFT fixed-point sesuai fft_engine.vhd.
+    frames: array int (n_frames, POINTS) -> (re, im) int (n_frames, POINTS)
+    probe : OverflowProbe opsional (instrumentasi per stage)
+    imag  : isi mem_Imag (mode pack, g_PACK_TWO); default nol (input real)
+    """
+    cfg = get_variant(variant) if isinstance(variant, str) else variant
+    points, bits = cfg["points"], cfg["bits"]
+    tw_cos, tw_sin = load_twiddles(cfg)
+
+    tw_bits = cfg.get("twiddle_bits", bits)
+    # int32 cukup selama produk bits x tw_bits tidak melebihi 31 bit
+    work_dtype = np.int32 if bits + tw_bits <= 30 else np.int64
+    tw_cos, tw_sin = tw_cos.astype(work_dtype), tw_sin.astype(work_dtype)
+
+    x = np.asarray(frames, dtype=work_dtype)
+    if x.ndim == 1:
+        x = x[np.newaxis, :]
+    if x.shape[-1] != points:
+        raise ValueError(f"Panjang frame {x.shape[-1]} != POINTS {points}")
+    n_frames = x.shape[0]
+
+    # 1. Bit reversal (s_BIT_REV_PROC), input real -> mem_Imag = 0
+    x_wrapped = wrap_signed(x, bits)
+    if probe is not None:
+        probe.on_input(x, x_wrapped)
+    re_buf = x_wrapped[:, bit_reverse_indices(points)]
+    if imag is None:
+        im_buf = np.zeros_like(re_buf)
+    else:
+        im_buf = wrap_signed(np.asarray(imag, dtype=work_dtype).reshape(x.shape), bits)[:, bit_reverse_indices(points)]
+
+    # 2. Stage butterfly, DFT_Size = 2, 4, ..., POINTS
+    dft_size = 2
+    while dft_size <= points:
+        half = dft_size // 2
+        k = np.arange(half) * (points // dft_size)
+        wr, wi = tw_cos[k], tw_sin[k]
+
+        re_v = re_buf.reshape(n_frames, points // dft_size, 2, half)
+        im_v = im_buf.reshape(n_frames, points // dft_size, 2, half)
+        ar, ai = re_v[:, :, 0, :], im_v[:, :, 0, :]
+        br, bi = re_v[:, :, 1, :], im_v[:, :, 1, :]
+
+        # v_Mult = B * W (lebar bits + tw_bits, wrap), lalu shift_right(..., tw_bits-1) dan resize ke bits
+        prod_r = br * wr - bi * wi
+        prod_i = br * wi + bi * wr
+        mult_r = wrap_signed(prod_r, bits + tw_bits)
+        mult_i = wrap_signed(prod_i, bits + tw_bits)
+        tr = resize_signed(mult_r >> (tw_bits - 1), bits)
+        ti = resize_signed(mult_i >> (tw_bits - 1), bits)
+
+        # Scaling /2 per stage (shift_right 1 pada jumlah bits+1)
+        out_re = np.empty_like(re_v)
+        out_im = np.empty_like(im_v)
+        out_re[:, :, 0, :] = (ar + tr) >> 1
+        out_im[:, :, 0, :] = (ai + ti) >> 1
+        out_re[:, :, 1, :] = (ar - tr) >> 1
+        out_im[:, :, 1, :] = (ai - ti) >> 1
+
+        re_buf = out_re.reshape(n_frames, points)
+        im_buf = out_im.reshape(n_frames, points)
+        if probe is not None:
+            wraps = (np.count_nonzero((prod_r != mult_r) | (tr != prod_r >> (tw_bits - 1)), axis=(1, 2))
+                     + np.count_nonzero((prod_i != mult_i) | (ti != prod_i >> (tw_bits - 1)), axis=(1, 2)))
+            lsb_lost = sum(np.count_nonzero(v & 1, axis=(1, 2)) for v in (ar + tr, ai + ti, ar - tr, ai - ti))
+            probe.on_stage(re_buf, im_buf, wraps, lsb_lost)
+        dft_size *= 2
+
+    return re_buf, im_buf
+
+
+def _sqrt_restoring(op, op_bits):
+    """Shift-subtract sqrt v5_32_16: v_sub = root & "01" (4*root + 1)"""
+    rem = np.zeros_like(op)
+    root = np.zeros_like(op)
+    rem_mask = (1 << (op_bits - 2)) - 1
+    op_mask = (1 << op_bits) - 1
+    for _ in range(op_bits // 2):
+        trial = ((rem & rem_mask) << 2) | ((op >> (op_bits - 2)) & 3)
+        v_sub = (root << 2) | 1
+        ok = trial >= v_sub
+        rem = np.where(ok, trial - v_sub, trial)
+        root = (root << 1) | ok
+        op = (op << 2) & op_mask
+    return root
+
+
+def _sqrt_v5_64_8(op, op_bits):
+    """Shift-subtract sqrt v5_64_8: v_sub = (root(6..0) & '0') or 1 (2*root + 1, sesuai RTL)"""
+    rem = np.zeros_like(op)
+    root = np.zeros_like(op)
+    rem_mask = (1 << (op_bits - 2)) - 1
+    op_mask = (1 << op_bits) - 1
+    root_bits = op_bits // 2
+    root_mask = (1 << (root_bits - 1)) - 1
+    for _ in range(root_bits):
+        trial = ((rem & rem_mask) << 2) | ((op >> (op_bits - 2)) & 3)
+        v_sub = ((root & root_mask) << 1) | 1
+        ok = trial >= v_sub
+        rem = np.where(ok, trial - v_sub, trial) & op_mask
+        root = ((root & root_mask) << 1) | ok
+        op = (op << 2) & op_mask
+    return root
+
+
+SQRT_ALGORITHMS = {
+    "restoring": _sqrt_restoring,
+    "v5_64_8": _sqrt_v5_64_8,
+}
+
+_SQRT_LUT_CACHE = {}
+
+
+def _sqrt_lut(algorithm, op_bits):
+    """Tabel lookup hasil sqrt untuk semua operand (hanya untuk op_bits <= 16)"""
+    key = (algorithm, op_bits)
+    if key not in _SQRT_LUT_CACHE:
+        _SQRT_LUT_CACHE[key] = SQRT_ALGORITHMS[algorithm](np.arange(1 << op_bits, dtype=np.int64), op_bits)
+    return _SQRT_LUT_CACHE[key]
+
+
+def _isqrt_floor(op):
+    """floor(sqrt(op)) eksak (identik dengan restoring sqrt) via float64 + koreksi 1 LSB"""
+    root = np.floor(np.sqrt(op.astype(np.float64))).astype(np.int64)
+    root -= (root * root > op)
+    root += ((root + 1) * (root + 1) <= op)
+    return root
+
+
+def magnitude_fixed(re_part, im_part, variant, probe=None):
+    """Magnitude sesuai magnitude_unit.vhd -> word signed yang ditulis ke mem_Real"""
+    cfg = get_variant(variant) if isinstance(variant, str) else variant
+    bits = cfg["bits"]
+    op_bits = 2 * bits
+
+    re_part = np.asarray(re_part, dtype=np.int64)
+    im_part = np.asarray(im_part, dtype=np.int64)
+    # abs() signed N-bit: abs(-2^(N-1)) tetap -2^(N-1), kuadratnya sama saja
+    op = (re_part * re_part + im_part * im_part) & ((1 << op_bits) - 1)
+
+    # Hasil identik dengan iterasi shift-subtract, hanya jalurnya yang dipercepat
+    if op_bits <= 16:
+        root = _sqrt_lut(cfg["sqrt"], op_bits)[op]
+    elif cfg["sqrt"] == "restoring":
+        root = _isqrt_floor(op)
+    else:
+        root = SQRT_ALGORITHMS[cfg["sqrt"]](op, op_bits)
+    if probe is not None:
+        probe.on_magnitude(root, bits)
+    return wrap_signed(root, bits)
+
+
+def golden_magnitude(frames, variant, chunk=65536, probe=None):
+    """Isi mem_Real setelah s_MAG untuk tiap frame input: (n_frames, POINTS)"""
+    cfg = get_variant(variant) if isinstance(variant, str) else variant
+    frames = np.asarray(frames)
+    if frames.ndim == 1:
+        frames = frames[np.newaxis, :]
+
+    # Diproses per-chunk agar memori tetap kecil untuk jutaan frame
+    out = np.empty(frames.shape, dtype=sample_dtype(cfg["bits"]))
+    for start in range(0, frames.shape[0], chunk):
+        re_part, im_part = fft_fixed(frames[start:start + chunk], cfg, probe)
+        out[start:start + chunk] = magnitude_fixed(re_part, im_part, cfg, probe)
+    return out
+
+
+def uart_tx_words(mag, variant):
+    """
+    Word yang benar-benar dikirim uart_tx.vhd dari isi mem_Real.
+    v5_32_16: s_LOAD membaca i_Data sebelum o_Addr ter-update, sehingga byte LOW word k
+    berasal dari word k-1 (word 0 mengambil word terakhir karena tx_addr tertahan di POINTS-1).
+    """
+    cfg = get_variant(variant) if isinstance(variant, str) else variant
+    mag = np.asarray(mag)
+    if not cfg["tx_skew"]:
+        return mag
+    u = mag.astype(np.int64) & 0xFFFF
+    skewed = (u & 0xFF00) | (np.roll(u, 1, axis=-1) & 0xFF)
+    return wrap_signed(skewed, 16).astype(sample_dtype(cfg["bits"]))
+
+
+def unskew_words(words, variant):
+    """Kebalikan uart_tx_words(): byte LOW word k terkirim di word k+1 (word terakhir -> word 0)"""
+    cfg = get_variant(variant) if isinstance(variant, str) else variant
+    words = np.asarray(words)
+    if not cfg["tx_skew"]:
+        return words
+    u = words.astype(np.int64) & 0xFFFF
+    fixed = (u & 0xFF00) | (np.roll(u, -1, axis=-1) & 0xFF)
+    return wrap_signed(fixed, 16).astype(sample_dtype(cfg["bits"]))
+
+
+def out_bins(points, half=False):
+    """Jumlah word yang dikirim per frame: POINTS, atau POINTS/2 + 1 (g_HALF_SPECTRUM)"""
+    return points // 2 + 1 if half else points
+
+
+def golden_output(frames, variant, chunk=65536, half=False):
+    """
+    Output yang diterima host dari uart_fft_top untuk tiap frame input: (n_frames, POINTS).
+    half=True (g_HALF_SPECTRUM): hanya bin 0..POINTS/2 -> (n_frames, POINTS/2 + 1); tx_addr
+    tertahan di POINTS/2, sehingga skew byte LOW word 0 mengambil word POINTS/2.
+    """
+    cfg = get_variant(variant) if isinstance(variant, str) else variant
+    mag = golden_magnitude(frames, cfg, chunk)
+    return uart_tx_words(mag[:, :out_bins(cfg["points"], half)], cfg)
+
+
+def split_fixed(re_part, im_part):
+    """
+    split_unit.vhd: pisahkan Z = FFT(a + jb) menjadi A = (Z[k] + conj Z[N-k]) / 2 dan
+    B = (Z[k] - conj Z[N-k]) / 2j untuk k = 0..POINTS/2 (jumlah bits+1 lalu shift_right 1).
+    Return: (ar, ai, br, bi) masing-masing (n_frames, POINTS/2 + 1)
+    """
+    points = re_part.shape[-1]
+    k = np.arange(points // 2 + 1)
+    m = (points - k) % points
+    zr_k, zi_k = re_part[:, k].astype(np.int64), im_part[:, k].astype(np.int64)
+    zr_m, zi_m = re_part[:, m].astype(np.int64), im_part[:, m].astype(np.int64)
+    return (zr_k + zr_m) >> 1, (zi_k - zi_m) >> 1, (zi_k + zi_m) >> 1, (zr_m - zr_k) >> 1
+
+
+def pack_slots(ar, ai, br, bi):
+    """
+    Isi mem_Real/mem_Imag setelah s_SPLIT + 2 register r_Extra (alamat POINTS, POINTS+1):
+    slot 0..N/2 = A[0..N/2], slot N-k = B[k] (k = 1..N/2-1), r_Extra = B[0], B[N/2] (real).
+    Return: (re, im) (n_frames, POINTS + 2)
+    """
+    half = ar.shape[-1] - 1
+    zero = np.zeros_like(br[:, :1])
+    re = np.concatenate([ar, br[:, half - 1:0:-1], br[:, :1], br[:, half:]], axis=-1)
+    im = np.concatenate([ai, bi[:, half - 1:0:-1], zero, zero], axis=-1)
+    return re, im
+
+
+def golden_output_packed(frames, variant, chunk=65536, probe=None):
+    """
+    Output mode g_PACK_TWO: frame 2j -> mem_Real, frame 2j+1 -> mem_Imag, satu FFT untuk keduanya.
+    frames: (2 * n_pairs, POINTS) -> word yang diterima host (n_pairs, POINTS + 2)
+    """
+    cfg = get_variant(variant) if isinstance(variant, str) else variant
+    frames = np.asarray(frames)
+    if frames.ndim == 1:
+        frames = frames[np.newaxis, :]
+    if frames.shape[0] % 2:
+        raise ValueError(f"Mode pack butuh jumlah frame genap, bukan {frames.shape[0]}")
+    pairs = frames.reshape(-1, 2, cfg["points"])
+
+    out = np.empty((pairs.shape[0], cfg["points"] + 2), dtype=sample_dtype(cfg["bits"]))
+    for start in range(0, pairs.shape[0], chunk):
+        block = pairs[start:start + chunk]
+        re_part, im_part = fft_fixed(block[:, 0], cfg, probe, imag=block[:, 1])
+        re_slot, im_slot = pack_slots(*split_fixed(re_part, im_part))
+        out[start:start + chunk] = magnitude_fixed(re_slot, im_slot, cfg, probe)
+    return uart_tx_words(out, cfg)
+
+
+def unpack_output(words, points):
+    """Word mode pack (n, POINTS + 2) -> (|A|, |B|) bin 0..POINTS/2, masing-masing (n, POINTS/2 + 1)"""
+    words = np.asarray(words)
+    if words.shape[-1] != points + 2:
+        raise ValueError(f"Frame mode pack harus {points + 2} word, bukan {words.shape[-1]}")
+    half = points // 2
+    mag_a = words[..., :half + 1]
+    mag_b = np.concatenate([words[..., points:points + 1], words[..., points - 1:half:-1],
+                            words[..., points + 1:]], axis=-1)
+    return mag_a, mag_b
+
+
+def mirror_spectrum(words, points):
+    """Bangun ulang spektrum penuh dari bin 0..POINTS/2 (input real: |X[N-k]| = |X[k]|)"""
+    words = np.asarray(words)
+    half = points // 2
+    if words.shape[-1] != half + 1:
+        raise ValueError(f"Frame half-spectrum harus {half + 1} word, bukan {words.shape[-1]}")
+    return np.concatenate([words, words[..., half - 1:0:-1]], axis=-1)
+
+
+load_generated()
+
+
+def run():
+    """
+    Bandingkan golden model dengan capture board di testing/ (input_<v>.bin -> output_<v>.bin).
+    Capture itu satu kali upload dari board yang outputnya tidak deterministik (lihat README:
+    input sama bisa menghasilkan output benar atau salah), jadi selisih di sini informatif saja,
+    bukan referensi. Referensi bit-accurate: testing/tests (transliterasi RTL) dan cosim.py.
+    """
+    parser = argparse.ArgumentParser(description="Self-check golden model vs capture board di testing/ (semua build)")
+    parser.parse_args()
+
+    print("--- GOLDEN MODEL: SELF-CHECK vs FILE BOARD ---")
+    print("[-] Capture board tidak deterministik (satu kali upload), selisih bukan berarti model salah")
+    testing_dir = os.path.abspath(os.path.join(CURRENT_DIR, ".."))
+    for name, cfg in VARIANTS.items():
+        dtype = sample_dtype(cfg["bits"])
+        input_bin = os.path.join(testing_dir, f"input_{name}.bin")
+        output_bin = os.path.join(testing_dir, f"output_{name}.bin")
+        if not (os.path.exists(input_bin) and os.path.exists(output_bin)):
+            print(f"[!] File {name} tidak lengkap, dilewati")
+            continue
+
+        frame_in = np.fromfile(input_bin, dtype=dtype)[:cfg["points"]]
+        frame_out = np.fromfile(output_bin, dtype=dtype)[:cfg["points"]]
+        expected = golden_output(frame_in, name)[0]
+        diff = np.abs(expected.astype(int) - frame_out.astype(int))
+        print(f"[-] {name:>5}: {np.count_nonzero(diff)}/{cfg['points']} bin berbeda dari output board (max selisih {diff.max()} LSB)")
+
+
+if __name__ == "__main__":
+    run()
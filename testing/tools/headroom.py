@@ -0,0 +1,139 @@
+import numpy as np
+import argparse
+
+import golden_model
+import capture_format
+import corpus
+
+# ================= HEADROOM & OVERFLOW PER STAGE =================
+# TARGET_HEADROOM tetap (32000 / 120) di generate.py tidak melihat isi sinyal.
+# Dengan OverflowProbe di golden model, setiap kandidat scale dicek langsung terhadap
+# datapath bit-accurate: wrap input, overflow v_Mult / resize() di tiap stage, dan wrap
+# hasil sqrt di mem_Real. Target terbesar tanpa wrap dicari dengan binary search per frame.
+#
+# Mode pack (g_PACK_TWO): dua frame real masuk sebagai a + jb, |a + jb| bisa mencapai sqrt(2) x target
+# sehingga v_Mult stage twiddle pertama wrap. Kedua frame butuh headroom 1/sqrt(2) (-3 dB).
+
+PACK_HEADROOM = 1 / np.sqrt(2)
+
+
+def instrument(frames, variant):
+    """Jalankan golden model dengan OverflowProbe -> (magnitude, dict statistik per frame)"""
+    probe = golden_model.OverflowProbe()
+    mag = golden_model.golden_magnitude(frames, variant, probe=probe)
+    return mag, probe.result()
+
+
+def safe_targets(y_float, variant):
+    """
+    Target headroom integer terbesar per frame (1 .. MAX_VAL) yang tidak menimbulkan wrap
+    di datapath. y_float: (n_frames, POINTS). Return: array int (n_frames,)
+    """
+    cfg = golden_model.get_variant(variant) if isinstance(variant, str) else variant
+    y_float = np.atleast_2d(y_float)
+    max_val = (1 << (cfg["bits"] - 1)) - 1
+    lo = np.ones(y_float.shape[0], dtype=np.int64)
+    hi = np.full(y_float.shape[0], max_val, dtype=np.int64)
+    while True:
+        active = np.flatnonzero(lo < hi)
+        if active.size == 0:
+            return lo
+        mid = (lo[active] + hi[active] + 1) // 2
+        y_int, _ = corpus.quantize(y_float[active], cfg["bits"], mid)
+        safe = instrument(y_int, cfg)[1]["total_wrap"] == 0
+        lo[active] = np.where(safe, mid, lo[active])
+        hi[active] = np.where(safe, hi[active], mid - 1)
+
+
+def safe_pack_targets(y_a, y_b, variant):
+    """
+    Mode pack: target bersama terbesar per pasangan (frame a -> mem_Real, frame b -> mem_Imag)
+    tanpa wrap di FFT, split_unit dan magnitude. Return: array int (n_pairs,)
+    """
+    cfg = golden_model.get_variant(variant) if isinstance(variant, str) else variant
+    y_a, y_b = np.atleast_2d(y_a), np.atleast_2d(y_b)
+    max_val = (1 << (cfg["bits"] - 1)) - 1
+    lo = np.ones(y_a.shape[0], dtype=np.int64)
+    hi = np.full(y_a.shape[0], max_val, dtype=np.int64)
+    while True:
+        active = np.flatnonzero(lo < hi)
+        if active.size == 0:
+            return lo
+        mid = (lo[active] + hi[active] + 1) // 2
+        x_a, _ = corpus.quantize(y_a[active], cfg["bits"], mid)
+        x_b, _ = corpus.quantize(y_b[active], cfg["bits"], mid)
+        probe = golden_model.OverflowProbe()
+        golden_model.golden_output_packed(np.stack([x_a, x_b], axis=1).reshape(-1, cfg["points"]), cfg, probe=probe)
+        safe = probe.result()["total_wrap"] == 0
+        lo[active] = np.where(safe, mid, lo[active])
+        hi[active] = np.where(safe, hi[active], mid - 1)
+
+
+def safe_corpus_scale(y_float, variant):
+    """Satu scale global untuk seluruh korpus: minimum scale aman per frame"""
+    targets = safe_targets(y_float, variant)
+    max_amp = np.max(np.abs(np.atleast_2d(y_float)), axis=1)
+    nonzero = max_amp > 0
+    return float(np.min(targets[nonzero] / max_amp[nonzero])) if nonzero.any() else float(targets.min())
+
+
+def snr_db(y_int, scale, mag):
+    """SNR seperti verify.py (spektrum ideal dari input terkuantisasi vs magnitude hardware)"""
+    scale = np.asarray(scale, dtype=np.float64)[:, np.newaxis]
+    ideal = np.abs(np.fft.fft(y_int / scale, axis=1)) / (y_int.shape[1] / 2)
+    ideal[:, 0] /= 2
+    error = np.abs(ideal - mag.astype(np.int64) * 2 / scale)
+    noise = np.sum(error ** 2, axis=1)
+    return np.where(noise > 0, 10 * np.log10(np.sum(ideal ** 2, axis=1) / np.where(noise > 0, noise, 1)), 999.0)
+
+
+def print_stages(name, stats, bits):
+    """Ringkasan per stage: puncak, sisa headroom (bit), wrap, LSB terbuang"""
+    peak = stats["stage_peak"].max(axis=0)
+    print(f"[{name}] wrap input: {stats['input_wrap'].sum()}, wrap magnitude: {stats['mag_wrap'].sum()}")
+    print(f"    {'stage':>5} {'puncak':>8} {'headroom':>9} {'wrap':>6} {'LSB hilang/frame':>17}")
+    for s in range(peak.size):
+        spare = (bits - 1) - int(peak[s]).bit_length()
+        print(f"    {s + 1:5d} {int(peak[s]):8d} {spare:7d} b {int(stats['stage_wrap'][:, s].sum()):6d} "
+              f"{stats['stage_lsb_lost'][:, s].mean():17.2f}")
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Instrumentasi overflow per stage & auto-scale input")
+    parser.add_argument("--variant", default=None, choices=list(golden_model.VARIANTS), help="Default: semua build")
+    parser.add_argument("--input", help="Korpus .fftc; default: sinyal uji generate.py")
+    parser.add_argument("--frames", type=int, default=20000)
+    args = parser.parse_args()
+
+    variants = [args.variant] if args.variant else list(golden_model.VARIANTS)
+    print("--- HEADROOM & OVERFLOW PER STAGE ---")
+    for name in variants:
+        cfg = golden_model.get_variant(name)
+        if args.input:
+            header, frames = capture_format.open_capture(args.input)
+            y_float = np.asarray(frames[:args.frames], dtype=np.float64)  # sampel sebagai sinyal referensi
+        else:
+            from dse import DEFAULT_CORPUS, sample_corpus
+            y_float = sample_corpus(DEFAULT_CORPUS, cfg["points"])
+
+        fixed = corpus.DEFAULT_HEADROOM[cfg["bits"]]
+        y_fixed, s_fixed = corpus.quantize(y_float, cfg["bits"], fixed)
+        mag_fixed, stats_fixed = instrument(y_fixed, cfg)
+        print_stages(f"{name} TARGET_HEADROOM={fixed:.0f}", stats_fixed, cfg["bits"])
+
+        targets = safe_targets(y_float, cfg)
+        y_auto, s_auto = corpus.quantize(y_float, cfg["bits"], targets)
+        mag_auto, stats_auto = instrument(y_auto, cfg)
+        print_stages(f"{name} auto (per frame)", stats_auto, cfg["bits"])
+
+        snr_fixed = snr_db(y_fixed, s_fixed, mag_fixed)
+        snr_auto = snr_db(y_auto, s_auto, mag_auto)
+        print(f"    Target auto min/median/max : {targets.min()} / {int(np.median(targets))} / {targets.max()}")
+        print(f"    Frame wrap (tetap -> auto) : {np.count_nonzero(stats_fixed['total_wrap'])} -> "
+              f"{np.count_nonzero(stats_auto['total_wrap'])} dari {len(targets)}")
+        print(f"    SNR rata-rata              : {np.mean(snr_fixed):.2f} dB -> {np.mean(snr_auto):.2f} dB")
+        print(f"    Scale korpus (global)      : {safe_corpus_scale(y_float, cfg):.4f}")
+
+
+if __name__ == "__main__":
+    run()
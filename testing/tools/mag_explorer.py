@@ -0,0 +1,170 @@
+import numpy as np
+import argparse
+
+import golden_model
+import cycle_model
+import corpus
+
+# ================= EKSPLORASI ALGORITMA MAGNITUDE =================
+# Membandingkan jalur magnitude_unit.vhd alternatif pada output FFT bit-accurate yang sama:
+#   rtl        : sqrt build saat ini (restoring 32x16 / varian v5_64_8 dengan quirk 2*root+1)
+#   restoring  : shift-subtract floor(sqrt) ideal
+#   amb_*      : alpha-max-plus-beta-min (konstanta shift-add, tanpa multiplier)
+#   cordic_k   : CORDIC vectoring k iterasi + koreksi gain (1 multiplier)
+#   squared    : re^2 + im^2 tanpa sqrt (word 2x lebar, sqrt di host)
+# Error diukur terhadap sqrt(re^2 + im^2) eksak dari output FFT yang sama (LSB),
+# siklus per bin mengikuti struktur FSM s_READ -> s_WAIT -> s_CALC -> s_WRITE.
+# Estimasi LE: hitungan register + adder/komparator orde pertama, bukan hasil sintesis.
+
+# s_READ + s_WAIT + s_WRITE (sama untuk semua algoritma)
+FSM_OVERHEAD = 3
+
+# Varian alpha-max-plus-beta-min: daftar segmen (alpha, beta) sebagai (pembilang, shift)
+# hasil = max over segmen (alpha * max + beta * min)
+AMB_VARIANTS = {
+    "amb_1_1/2": [((1, 0), (1, 1))],
+    "amb_1_1/4": [((1, 0), (1, 2))],
+    "amb_15/16_15/32": [((15, 4), (15, 5))],
+    "amb_2seg": [((1, 0), (0, 0)), ((7, 3), (1, 1))],
+}
+
+# Bit fraksi tambahan di register x/y CORDIC (tanpa ini shift >> i cepat habis di 8 bit)
+CORDIC_GUARD = 4
+
+
+def _mul_shift(x, frac):
+    num, shift = frac
+    return (x * num) >> shift
+
+
+def mag_amb(re_part, im_part, segments):
+    a, b = np.abs(re_part), np.abs(im_part)
+    hi, lo = np.maximum(a, b), np.minimum(a, b)
+    return np.max([_mul_shift(hi, al) + _mul_shift(lo, be) for al, be in segments], axis=0)
+
+
+def cordic_gain(iters):
+    return float(np.prod(np.sqrt(1 + 2.0 ** (-2 * np.arange(iters)))))
+
+
+def mag_cordic(re_part, im_part, iters, bits, guard=CORDIC_GUARD):
+    """
+    CORDIC vectoring di kuadran 1 (|re|, |im|) dengan register bits+2+guard,
+    lalu koreksi gain x * round(2^(bits+1) / K) dan buang bit guard
+    """
+    x, y = np.abs(re_part) << guard, np.abs(im_part) << guard
+    for i in range(iters):
+        up = y >= 0
+        x, y = np.where(up, x + (y >> i), x - (y >> i)), np.where(up, y - (x >> i), y + (x >> i))
+    inv_gain = int(round((1 << (bits + 1)) / cordic_gain(iters)))
+    return (x * inv_gain) >> (bits + 1 + guard)
+
+
+def algorithms(bits, sqrt_iters, cordic_iters):
+    """dict nama -> (fungsi(re, im) -> magnitude int, siklus s_CALC per bin, estimasi LE, multiplier, faktor byte TX)"""
+    restoring_calc = 1 + sqrt_iters + 1  # setup + iterasi + keluar (sama dengan RTL)
+    algos = {
+        "rtl": (None, restoring_calc, 7 * bits + 12, 2, 1),
+        "restoring": (lambda r, i: golden_model._isqrt_floor(r * r + i * i), restoring_calc, 7 * bits + 12, 2, 1),
+    }
+    for name, segs in AMB_VARIANTS.items():
+        # abs + compare/swap + 1 adder per segmen (+ komparator antar segmen), 2 siklus
+        le = 2 * bits + bits + len(segs) * (bits + 2) + (len(segs) - 1) * bits + 8
+        algos[name] = (lambda r, i, s=segs: mag_amb(r, i, s), 2, le, 0, 1)
+    for k in cordic_iters:
+        # 2 register + 2 add/sub (bits+2+guard), barrel shifter log2(k) level untuk x dan y, counter
+        width = bits + 2 + CORDIC_GUARD
+        le = 4 * width + 2 * width * max(1, int(np.ceil(np.log2(k)))) + 10
+        algos[f"cordic_{k}"] = (lambda r, i, k=k: mag_cordic(r, i, k, bits), 1 + k + 1, le, 1, 1)
+    algos["squared"] = (lambda r, i: r * r + i * i, 1, 2 * bits + 2 * bits + 8, 2, 2)
+    return algos
+
+
+def frame_cycles(params, calc_cycles, tx_factor):
+    """Siklus per fase satu frame dengan s_CALC per bin diganti; tx_factor 2 = word keluaran 2x lebar"""
+    phases = cycle_model.phase_cycles(params)
+    n = params["points"]
+    phases["mag"] = 1 + n * (FSM_OVERHEAD + calc_cycles) + 1
+    n_bytes = n * params["bytes_per_word"] * tx_factor
+    phases["tx"] = 1 + n_bytes * (cycle_model.uart_byte_cycles(params["clks_per_bit"]) + params["tx_overhead"])
+    return phases
+
+
+def explore(frames, variant, cordic_iters=(4, 6, 8, 12)):
+    """Jalankan semua algoritma pada output FFT yang sama -> list dict hasil"""
+    cfg = golden_model.get_variant(variant) if isinstance(variant, str) else variant
+    bits = cfg["bits"]
+    max_val = (1 << (bits - 1)) - 1
+    params = cycle_model.rtl_params(cfg)
+    re_part, im_part = golden_model.fft_fixed(frames, cfg)
+    re_part, im_part = re_part.astype(np.int64), im_part.astype(np.int64)
+    exact = np.sqrt((re_part * re_part + im_part * im_part).astype(np.float64))
+
+    results = []
+    for name, (fn, calc, le, mults, tx_factor) in algorithms(bits, params["sqrt_iters"], cordic_iters).items():
+        if fn is None:
+            mag = golden_model.magnitude_fixed(re_part, im_part, cfg).astype(np.int64)
+        else:
+            mag = fn(re_part, im_part)
+        if name == "squared":
+            # Host menghitung sqrt dari word 2*bits (tidak ada wrap, presisi penuh)
+            est = np.sqrt(mag.astype(np.float64))
+            wraps = 0
+        else:
+            wraps = int(np.count_nonzero(mag > max_val))
+            est = golden_model.wrap_signed(mag, bits).astype(np.float64)
+        err = est - exact
+        big = exact >= 8  # error relatif hanya untuk bin yang cukup besar
+        phases = frame_cycles(params, calc, tx_factor)
+        results.append({
+            "name": name,
+            "bias": float(err.mean()),
+            "err_std": float(err.std()),
+            "err_p99": float(np.percentile(np.abs(err), 99)),
+            "err_max": float(np.abs(err).max()),
+            "rel_p99": float(np.percentile(np.abs(err[big]) / exact[big], 99) * 100) if big.any() else 0.0,
+            "wraps": wraps,
+            "cycles_per_bin": FSM_OVERHEAD + calc,
+            "mag_cycles": phases["mag"],
+            "frame_cycles": int(sum(phases.values())),
+            "le": le,
+            "multipliers": mults,
+            "tx_factor": tx_factor,
+        })
+    return results
+
+
+def print_results(variant, results, clk_hz=cycle_model.CLK_HZ):
+    print(f"[{variant}] error vs sqrt(re^2 + im^2) eksak (LSB), siklus & estimasi LE per algoritma")
+    print(f"    {'algoritma':<16} {'bias':>7} {'std':>7} {'p99':>7} {'max':>7} {'rel p99':>8} {'wrap':>6} "
+          f"{'cyc/bin':>7} {'MAG ms':>8} {'frame ms':>9} {'LE':>5} {'mult':>4}")
+    for r in results:
+        print(f"    {r['name']:<16} {r['bias']:7.3f} {r['err_std']:7.3f} {r['err_p99']:7.2f} {r['err_max']:7.2f} "
+              f"{r['rel_p99']:7.2f}% {r['wraps']:6d} {r['cycles_per_bin']:7d} {r['mag_cycles'] / clk_hz * 1e3:8.4f} "
+              f"{r['frame_cycles'] / clk_hz * 1e3:9.3f} {r['le']:5d} {r['multipliers']:4d}")
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Eksplorasi algoritma magnitude_unit: siklus vs akurasi")
+    parser.add_argument("--variant", action="append", choices=list(golden_model.VARIANTS), help="Default: semua build")
+    parser.add_argument("--family", default="multitone", choices=list(corpus.FAMILIES))
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cordic-iters", default="4,6,8,12")
+    args = parser.parse_args()
+
+    iters = [int(v) for v in args.cordic_iters.split(",")]
+    print("--- EKSPLORASI ALGORITMA MAGNITUDE ---")
+    for name in args.variant or list(golden_model.VARIANTS):
+        cfg = golden_model.get_variant(name)
+        rng = np.random.default_rng(args.seed)
+        t = corpus.time_grid(cfg["points"])
+        y = corpus.eval_expr(corpus.FAMILIES[args.family]["func"], t,
+                             **corpus.sample_params(args.family, rng, args.frames, cfg["points"]))
+        frames, _ = corpus.quantize(y, cfg["bits"], corpus.DEFAULT_HEADROOM[cfg["bits"]])
+        print_results(name, explore(frames, cfg, iters))
+    print("[-] Catatan: squared mengirim word 2x lebar (TX 2x lebih lama); UART tetap bottleneck frame.")
+
+
+if __name__ == "__main__":
+    run()
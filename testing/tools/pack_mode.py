@@ -0,0 +1,111 @@
+import numpy as np
+import argparse
+
+import golden_model
+import cycle_model
+import corpus
+import headroom
+
+# ================= MODE PACK: AKURASI & THROUGHPUT =================
+# g_PACK_TWO mengirim dua frame real per transaksi (a -> mem_Real, b -> mem_Imag), satu FFT,
+# lalu split_unit memisahkan A dan B. Dibandingkan dengan mode normal dan half-spectrum:
+#   akurasi    : SNR per frame pada korpus yang sama (mode pack pakai headroom x PACK_HEADROOM),
+#                plus jumlah pasangan yang wrap bila headroom penuh tetap dipakai
+#   throughput : frame/s per baud dari cycle_model (RX 2N word, TX N+2 word per 2 frame)
+
+DEFAULT_BAUDS = "9600,115200,921600,3125000"
+
+
+def spectra(words, cfg):
+    """Output mode pack (n, POINTS + 2) -> spektrum penuh per frame input (2n, POINTS), skew uart_tx dibalik"""
+    points = cfg["points"]
+    mag_a, mag_b = golden_model.unpack_output(golden_model.unskew_words(words, cfg), points)
+    full = np.stack([golden_model.mirror_spectrum(mag_a, points), golden_model.mirror_spectrum(mag_b, points)], axis=1)
+    return full.reshape(-1, points)
+
+
+def accuracy(y_float, variant):
+    """
+    SNR mode normal vs pack pada sinyal float yang sama (jumlah frame genap) -> dict.
+    Dihitung dari magnitude per bin (golden_magnitude / word pack yang sudah di-unskew), bukan word
+    TX mentah: skew byte LOW uart_tx 32x16 akan ikut terhitung sebagai noise.
+    """
+    cfg = golden_model.get_variant(variant) if isinstance(variant, str) else variant
+    bits = cfg["bits"]
+    fixed = corpus.DEFAULT_HEADROOM[bits]
+
+    x_norm, s_norm = corpus.quantize(y_float, bits, fixed)
+    snr_norm = headroom.snr_db(x_norm, s_norm, golden_model.golden_magnitude(x_norm, cfg))
+
+    probe = golden_model.OverflowProbe()
+    golden_model.golden_output_packed(x_norm, cfg, probe=probe)
+    wrap_full = int(np.count_nonzero(probe.result()["total_wrap"]))
+
+    x_pack, s_pack = corpus.quantize(y_float, bits, fixed * headroom.PACK_HEADROOM)
+    probe = golden_model.OverflowProbe()
+    words = golden_model.golden_output_packed(x_pack, cfg, probe=probe)
+    snr_pack = headroom.snr_db(x_pack, s_pack, spectra(words, cfg))
+
+    snr_same = headroom.snr_db(x_pack, s_pack, golden_model.golden_magnitude(x_pack, cfg))
+    return {
+        "pairs": x_norm.shape[0] // 2,
+        "snr_normal": float(np.mean(snr_norm)),
+        "snr_normal_same_scale": float(np.mean(snr_same)),
+        "snr_pack": float(np.mean(snr_pack)),
+        "wrap_full": wrap_full,
+        "wrap_pack": int(np.count_nonzero(probe.result()["total_wrap"])),
+    }
+
+
+def throughput(cfg, bauds):
+    """frame/s per baud untuk mode normal, half dan pack -> list dict"""
+    modes = {
+        "normal": cycle_model.rtl_params(cfg),
+        "half": dict(cycle_model.rtl_params(cfg), half_spectrum=True),
+        "pack": dict(cycle_model.rtl_params(cfg), pack_two=True),
+    }
+    rows = []
+    for baud in bauds:
+        row = {"baud": baud}
+        for mode, params in modes.items():
+            result = cycle_model.summarize(params, baud=baud)
+            row[mode] = result["frames_per_s"]
+            row[mode + "_bottleneck"] = result["bottleneck"]
+        rows.append(row)
+    return rows
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Mode pack dua frame per FFT: akurasi dan throughput")
+    parser.add_argument("--variant", action="append", choices=list(golden_model.VARIANTS), help="Default: semua build")
+    parser.add_argument("--family", default="multitone", choices=list(corpus.FAMILIES))
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bauds", default=DEFAULT_BAUDS)
+    args = parser.parse_args()
+
+    bauds = [float(v) for v in args.bauds.split(",")]
+    n_frames = args.frames + args.frames % 2
+    print("--- MODE PACK (g_PACK_TWO) ---")
+    for name in args.variant or list(golden_model.VARIANTS):
+        cfg = golden_model.get_variant(name)
+        rng = np.random.default_rng(args.seed)
+        t = corpus.time_grid(cfg["points"])
+        y = corpus.eval_expr(corpus.FAMILIES[args.family]["func"], t,
+                             **corpus.sample_params(args.family, rng, n_frames, cfg["points"]))
+        acc = accuracy(y, cfg)
+        print(f"[{name}] {acc['pairs']} pasangan frame ({args.family})")
+        print(f"    SNR normal (headroom penuh)   : {acc['snr_normal']:.2f} dB")
+        print(f"    SNR normal (headroom pack)    : {acc['snr_normal_same_scale']:.2f} dB")
+        print(f"    SNR pack                      : {acc['snr_pack']:.2f} dB")
+        print(f"    Pasangan wrap (headroom penuh -> x{headroom.PACK_HEADROOM:.3f}): "
+              f"{acc['wrap_full']} -> {acc['wrap_pack']}")
+        print(f"    {'baud':>9} {'normal':>9} {'half':>9} {'pack':>9} {'gain':>6}  bottleneck pack")
+        for row in throughput(cfg, bauds):
+            print(f"    {row['baud']:9.0f} {row['normal']:9.2f} {row['half']:9.2f} {row['pack']:9.2f} "
+                  f"{row['pack'] / row['normal']:5.2f}x  {row['pack_bottleneck']}")
+    print("[-] Catatan: gain pack < 2x selama UART bottleneck (TX N+2 word tetap dikirim per 2 frame).")
+
+
+if __name__ == "__main__":
+    run()
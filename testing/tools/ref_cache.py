@@ -0,0 +1,162 @@
+import numpy as np
+import argparse
+import hashlib
+import json
+import os
+
+import golden_model
+import corpus
+
+# ================= CACHE REFERENSI (CONTENT-ADDRESSED, LRU) =================
+# verify.py menghitung ulang sinyal analog (oversampling 32x), spektrum referensi high-res,
+# spektrum ideal diskret dan golden output untuk setiap run. Semua itu hanya bergantung pada
+# (func, points, bits, t_start, t_end, scale, oversample) dan konfigurasi golden model yang sudah
+# di-resolve (isi twiddle dari fft_pkg.vhd, sqrt, tx_skew, MODEL_VERSION), sehingga disimpan di disk
+# per hash key. Regenerasi build atau perubahan golden model otomatis memakai entry baru.
+# Ukuran cache dibatasi (LRU berdasarkan waktu akses file).
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(CURRENT_DIR, ".cache", "reference")
+MAX_BYTES = 256 * 1024 * 1024
+CACHE_VERSION = 1  # naikkan jika isi/rumus entry berubah
+
+
+def config_digest(cfg):
+    """Hash semua yang menentukan golden output: twiddle hasil resolve, sqrt, tx_skew, versi golden model"""
+    tw_cos, tw_sin = golden_model.load_twiddles(cfg)
+    h = hashlib.sha1(json.dumps([golden_model.MODEL_VERSION, int(cfg["points"]), int(cfg["bits"]),
+                                 int(cfg.get("twiddle_bits") or cfg["bits"]), cfg["sqrt"], bool(cfg["tx_skew"])]).encode())
+    h.update(np.ascontiguousarray(tw_cos, dtype=np.int64).tobytes())
+    h.update(np.ascontiguousarray(tw_sin, dtype=np.int64).tobytes())
+    return h.hexdigest()
+
+
+def cache_key(func, points, bits, t_start, t_end, scale, oversample, cfg=None):
+    cfg = cfg or _variant_for(points, bits)
+    payload = json.dumps([CACHE_VERSION, func, int(points), int(bits), float(t_start), float(t_end),
+                          float(scale), int(oversample), config_digest(cfg)])
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def _variant_for(points, bits):
+    """Build repo jika ada (twiddle dari fft_pkg.vhd), selain itu konfigurasi generik"""
+    name = f"{points}x{bits}"
+    return golden_model.get_variant(name) if name in golden_model.VARIANTS else golden_model.make_config(points, bits)
+
+
+def compute_reference(func, points, bits, t_start, t_end, scale, oversample=32, cfg=None):
+    """
+    Hitung semua referensi seperti verify.py:
+      y_high      : sinyal analog (POINTS * oversample sampel)
+      spec_high   : spektrum analog |X| / (N/2), DC dibagi 2
+      input_int   : sampel integer hasil generate.py (scale tetap, truncation + clip)
+      spec_ideal  : spektrum ideal diskret dari input_int / scale
+      golden      : output board yang diharapkan (golden model bit-accurate)
+    """
+    points_high = points * oversample
+    t_high = corpus.time_grid(points_high, t_start, t_end)
+    y_high = np.array(corpus.eval_expr(func, t_high)[0], dtype=np.float64)
+    spec_high = np.abs(np.fft.fft(y_high)) / (points_high / 2)
+    spec_high[0] = spec_high[0] / 2
+
+    max_val = (1 << (bits - 1)) - 1
+    y_samples = corpus.eval_expr(func, corpus.time_grid(points, t_start, t_end))[0]
+    input_int = np.clip((y_samples * scale).astype(np.int64), -max_val - 1, max_val)
+    spec_ideal = np.abs(np.fft.fft(input_int / scale)) / (points / 2)
+    spec_ideal[0] = spec_ideal[0] / 2
+
+    golden = golden_model.golden_output(input_int, cfg or _variant_for(points, bits))[0].astype(np.int64)
+    return {"y_high": y_high, "spec_high": spec_high, "input_int": input_int,
+            "spec_ideal": spec_ideal, "golden": golden}
+
+
+class ReferenceCache:
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".npz")
+
+    def get(self, key):
+        """Entry dari disk (dict array) atau None; akses memperbarui posisi LRU"""
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                entry = {k: data[k] for k in data.files}
+        except (OSError, ValueError):
+            return None
+        os.utime(path)
+        return entry
+
+    def put(self, key, entry):
+        path = self._path(key)
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, **entry)
+        os.replace(tmp, path)
+        self.evict()
+
+    def evict(self):
+        """Hapus entry paling lama tidak diakses sampai total ukuran <= max_bytes"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".npz") and ".tmp" not in name:
+                st = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((st.st_mtime, st.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+        return total
+
+    def reference(self, func, points, bits, t_start, t_end, scale, oversample=32):
+        """Referensi dari cache, atau dihitung lalu disimpan jika belum ada"""
+        cfg = _variant_for(points, bits)
+        key = cache_key(func, points, bits, t_start, t_end, scale, oversample, cfg)
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        entry = compute_reference(func, points, bits, t_start, t_end, scale, oversample, cfg)
+        self.put(key, entry)
+        return entry
+
+    def info(self):
+        files = [os.path.join(self.cache_dir, n) for n in os.listdir(self.cache_dir) if n.endswith(".npz")]
+        return {"entries": len(files), "bytes": sum(os.path.getsize(p) for p in files),
+                "max_bytes": self.max_bytes, "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        for name in os.listdir(self.cache_dir):
+            os.remove(os.path.join(self.cache_dir, name))
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Cache spektrum referensi & golden output")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--max-mb", type=float, default=MAX_BYTES / 2 ** 20)
+    parser.add_argument("--clear", action="store_true", help="Hapus semua entry")
+    args = parser.parse_args()
+
+    cache = ReferenceCache(args.cache_dir, int(args.max_mb * 2 ** 20))
+    print("--- CACHE REFERENSI ---")
+    if args.clear:
+        cache.clear()
+        print("[OK] Cache dikosongkan")
+    cache.evict()
+    info = cache.info()
+    print(f"[-] Lokasi : {args.cache_dir}")
+    print(f"[-] Entry  : {info['entries']} ({info['bytes'] / 2 ** 20:.2f} / {info['max_bytes'] / 2 ** 20:.0f} MB)")
+
+
+if __name__ == "__main__":
+    run()
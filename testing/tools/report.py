@@ -0,0 +1,341 @@
+import numpy as np
+import argparse
+import html
+import json
+import time
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import golden_model
+import capture_format
+import corpus
+
+# ================= LAPORAN VERIFIKASI (HEADLESS, PARALEL) =================
+# Versi batch dari verify.py untuk capture multi-frame:
+#   1. Statistik per frame (galat, SNR, beda vs golden model) dihitung tervektorisasi.
+#   2. Figure tiga panel verify.py (waktu, spektrum, galat) di-render dengan backend Agg
+#      di process pool. Tiap worker membuat figure sekali dan me-render latar statis (axis, tick,
+#      legend, sinyal analog) satu kali; per frame hanya artist dinamis yang digambar ulang (blitting).
+#      Karena itu batas sumbu Y sama untuk semua frame dalam satu laporan.
+#   3. Hasil: report.html (tabel + gambar per frame) dan summary.png.
+# Dengan --stats matplotlib tidak di-import sama sekali.
+
+OVERSAMPLE = 32  # resolusi spektrum "analog", sama dengan verify.py
+CHUNK_FRAMES = 65536
+
+
+# ================= STATISTIK =================
+def frame_stats(in_frames, out_frames, scales, variant):
+    """
+    Metrik verify.py untuk semua frame sekaligus.
+    Return: dict array (n_frames,) max_error, avg_error, snr, golden_mismatch
+    """
+    n, points = in_frames.shape
+    result = {k: np.empty(n) for k in ("max_error", "avg_error", "snr")}
+    result["golden_mismatch"] = np.empty(n, dtype=np.int64)
+    for start in range(0, n, CHUNK_FRAMES):
+        stop = min(start + CHUNK_FRAMES, n)
+        raw_in = np.asarray(in_frames[start:stop], dtype=np.int64)
+        raw_out = np.asarray(out_frames[start:stop], dtype=np.int64)
+        scale = np.asarray(scales[start:stop], dtype=np.float64)[:, np.newaxis]
+
+        ideal = spectrum_ideal(raw_in / scale)
+        error = np.abs(ideal - raw_out * 2 / scale)
+        noise = np.sum(error ** 2, axis=1)
+        signal = np.sum(ideal ** 2, axis=1)
+        result["max_error"][start:stop] = error.max(axis=1)
+        result["avg_error"][start:stop] = error.mean(axis=1)
+        result["snr"][start:stop] = np.where(noise > 0, 10 * np.log10(signal / np.where(noise > 0, noise, 1)), 999)
+        golden = golden_model.golden_output(raw_in, variant).astype(np.int64)
+        result["golden_mismatch"][start:stop] = np.count_nonzero(golden != raw_out, axis=1)
+    return result
+
+
+def spectrum_ideal(x):
+    """FFT ideal diskret seperti verify.py: |X| / (N/2), bin DC dibagi 2 lagi"""
+    mag = np.abs(np.fft.fft(x, axis=-1)) / (x.shape[-1] / 2)
+    mag[..., 0] /= 2
+    return mag
+
+
+def summarize(stats):
+    snr = stats["snr"]
+    return {
+        "frames": int(snr.size),
+        "snr_mean": float(np.mean(snr)),
+        "snr_p5": float(np.percentile(snr, 5)),
+        "snr_min": float(np.min(snr)),
+        "max_error": float(np.max(stats["max_error"])),
+        "golden_exact": int(np.count_nonzero(stats["golden_mismatch"] == 0)),
+    }
+
+
+def print_summary(s):
+    print(f"[-] Frame            : {s['frames']}")
+    print(f"[-] SNR mean/p5/min  : {s['snr_mean']:.2f} / {s['snr_p5']:.2f} / {s['snr_min']:.2f} dB")
+    print(f"[-] Max Galat        : {s['max_error']:.5f} Unit")
+    print(f"[-] Identik golden   : {s['golden_exact']}/{s['frames']} frame")
+
+
+# ================= RENDER (WORKER) =================
+_FIG = None
+
+
+def _init_worker(points, t_start, t_end, bits, func, limits):
+    """Buat figure tiga panel sekali per proses, render latar statis, simpan artist dinamis"""
+    global _FIG
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    plt.rcParams["mathtext.fontset"] = "cm"
+    plt.rcParams["font.family"] = "serif"
+
+    duration = t_end - t_start
+    fs = points / duration if duration > 0 else 1
+    freq = np.arange(points) * (fs / points)
+    t_axis = np.linspace(t_start, t_end, points, endpoint=False)
+    t_high = np.linspace(t_start, t_end, points * OVERSAMPLE, endpoint=False)
+    freq_high = np.arange(points * OVERSAMPLE) * (fs / points)
+    zeros = np.zeros(points)
+
+    fig = plt.figure(figsize=(12, 10))
+    fig.suptitle(f"Analisis Spektral Linear ({bits}-bit)", fontsize=16, fontweight="bold")
+    gs = fig.add_gridspec(3, 1, height_ratios=[1, 2, 1], hspace=0.4)
+
+    ax1 = fig.add_subplot(gs[0])
+    analog, = ax1.plot(t_high, np.zeros_like(t_high), color="orange", alpha=0.4, linewidth=1, label="True Analog Signal")
+    step, = ax1.plot(t_axis, zeros, drawstyle="steps-mid", color="#1f77b4", label="Discrete Input (FPGA)")
+    dots, = ax1.plot(t_axis, zeros, "bo", alpha=0.3, markersize=4)
+    title1 = ax1.set_title("", fontsize=12, loc="left")
+    ax1.set_ylabel("Amplitudo (Unit Asli)")
+    ax1.set_xlabel("Waktu (detik)")
+    ax1.legend(loc="upper right")
+    ax1.grid(True, linestyle="--", alpha=0.6)
+
+    ax2 = fig.add_subplot(gs[1])
+    analog_spec, = ax2.plot(freq_high, np.zeros_like(freq_high), color="#ff7f0e", alpha=0.6, linewidth=2,
+                            label="True Analog Spectrum")
+    ideal_stem = ax2.stem(freq, zeros, linefmt="b--", markerfmt="bo", basefmt=" ", label="Ideal Discrete (Python)")
+    fpga_stem = ax2.stem(freq + (fs / points) * 0.15, zeros, linefmt="g-", markerfmt="gx", basefmt=" ",
+                         label="Aktual (FPGA)")
+    fpga_stem.stemlines.set_linewidth(2)
+    ax2.set_title("Domain Frekuensi: Perbandingan Analog vs Diskrit vs FPGA", fontsize=12, loc="left")
+    ax2.set_ylabel("Magnituda (Unit Asli)")
+    ax2.set_xlabel("Frekuensi (Hz)")
+    ax2.set_xlim(-1, fs * 1.1)
+    ax2.legend()
+    ax2.grid(True, which="both", alpha=0.7)
+
+    ax3 = fig.add_subplot(gs[2])
+    bars = ax3.bar(freq, zeros, width=(fs / points) * 0.8, color="red", alpha=0.7, edgecolor="black")
+    ax3.set_title("Analisis Galat Absolut (FPGA vs Ideal Discrete)", fontsize=12, loc="left")
+    ax3.set_ylabel("Selisih (Unit Asli)")
+    ax3.set_xlabel("Frekuensi (Hz)")
+    ax3.grid(True, axis="y")
+    stats_text = ax3.text(0.98, 0.85, "", transform=ax3.transAxes, ha="right", va="top",
+                          bbox=dict(boxstyle="round", facecolor="white"))
+
+    # Sinyal analog hanya tersedia bila func berupa ekspresi tunggal (bukan korpus parametrik)
+    y_high = None
+    if func:
+        y_high = np.asarray(corpus.eval_expr(func, t_high[np.newaxis, :])[0], dtype=np.float64)
+        analog.set_ydata(y_high)
+        analog_spec.set_ydata(spectrum_ideal(y_high))
+        ax1.text(0.02, 0.85, f"Input: ${func}$", transform=ax1.transAxes, fontsize=12,
+                 bbox=dict(facecolor="white", alpha=0.8, edgecolor="none"))
+    analog.set_visible(y_high is not None)
+    analog_spec.set_visible(y_high is not None)
+
+    y_max, mag_max, err_max = limits
+    ax1.set_ylim(-y_max * 1.2, y_max * 1.2)
+    ax2.set_ylim(0, mag_max * 1.1)
+    ax3.set_ylim(0, err_max * 1.15)
+
+    dynamic = [step, dots, title1, ideal_stem.markerline, ideal_stem.stemlines,
+               fpga_stem.markerline, fpga_stem.stemlines, stats_text, *bars]
+    for artist in dynamic:
+        artist.set_animated(True)
+    fig.canvas.draw()
+
+    _FIG = {
+        "fig": fig, "background": fig.canvas.copy_from_bbox(fig.bbox), "dynamic": dynamic,
+        "freq": freq, "step": step, "dots": dots, "title1": title1, "ideal_stem": ideal_stem,
+        "fpga_stem": fpga_stem, "bars": bars, "stats_text": stats_text,
+    }
+
+
+def _set_stem(container, x, y):
+    container.markerline.set_ydata(y)
+    container.stemlines.set_segments([[(xi, 0), (xi, yi)] for xi, yi in zip(x, y)])
+
+
+def _render(job):
+    """Update data artist dinamis, gambar di atas latar statis, simpan PNG"""
+    from matplotlib.image import imsave
+    idx, x_real, ideal, fpga, error, snr, mismatch, path = job
+    f = _FIG
+    f["step"].set_ydata(x_real)
+    f["dots"].set_ydata(x_real)
+    f["title1"].set_text(f"Domain Waktu: Input Sinyal (frame {idx})")
+    _set_stem(f["ideal_stem"], f["freq"], ideal)
+    _set_stem(f["fpga_stem"], f["fpga_stem"].markerline.get_xdata(), fpga)
+    for bar, h in zip(f["bars"], error):
+        bar.set_height(h)
+    f["stats_text"].set_text(f"Mean Error: {np.mean(error):.4f}\nSNR: {snr:.1f} dB\nBeda golden: {mismatch}")
+
+    canvas = f["fig"].canvas
+    canvas.restore_region(f["background"])
+    for artist in f["dynamic"]:
+        f["fig"].draw_artist(artist)
+    imsave(path, np.asarray(canvas.buffer_rgba()), pil_kwargs={"compress_level": 1})
+    return path
+
+
+# ================= LAPORAN =================
+def render_frames(indices, in_frames, out_frames, scales, stats, out_dir, t_start, t_end, bits, func, workers=None):
+    """Render PNG per frame di process pool. Return: list path relatif terhadap out_dir"""
+    frames_dir = os.path.join(out_dir, "frames")
+    os.makedirs(frames_dir, exist_ok=True)
+    points = in_frames.shape[1]
+
+    def jobs():
+        for idx in indices:
+            x_real = np.asarray(in_frames[idx], dtype=np.float64) / scales[idx]
+            ideal = spectrum_ideal(x_real)
+            fpga = np.asarray(out_frames[idx], dtype=np.float64) * 2 / scales[idx]
+            yield (int(idx), x_real, ideal, fpga, np.abs(ideal - fpga), float(stats["snr"][idx]),
+                   int(stats["golden_mismatch"][idx]), os.path.join(frames_dir, f"frame_{idx:07d}.png"))
+
+    # Batas sumbu bersama untuk semua frame (latar statis dirender sekali per worker)
+    sel = np.sort(indices)
+    x_real = np.asarray(in_frames[sel], dtype=np.float64) / scales[sel, np.newaxis]
+    ideal = spectrum_ideal(x_real)
+    fpga = np.asarray(out_frames[sel], dtype=np.float64) * 2 / scales[sel, np.newaxis]
+    limits = (float(np.max(np.abs(x_real))) or 1.0, float(max(ideal.max(), fpga.max())) or 1.0,
+              float(np.max(np.abs(ideal - fpga))) or 1.0)
+    if func:
+        t_high = np.linspace(t_start, t_end, points * OVERSAMPLE, endpoint=False)
+        y_high = corpus.eval_expr(func, t_high[np.newaxis, :])[0]
+        limits = (max(limits[0], float(np.max(np.abs(y_high)))), max(limits[1], float(spectrum_ideal(y_high).max())),
+                  limits[2])
+
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(points, t_start, t_end, bits, func, limits)) as pool:
+        paths = list(pool.map(_render, jobs(), chunksize=max(1, len(indices) // (4 * workers))))
+    return [os.path.relpath(p, out_dir) for p in paths]
+
+
+def render_summary(stats, path):
+    """summary.png: SNR per frame dan histogram SNR"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 4))
+    ax1.plot(stats["snr"], ".", markersize=2)
+    ax1.set_title("SNR per Frame", loc="left")
+    ax1.set_xlabel("Frame")
+    ax1.set_ylabel("SNR (dB)")
+    ax1.grid(True)
+    ax2.hist(stats["snr"], bins=50, color="#1f77b4", edgecolor="black")
+    ax2.set_title("Histogram SNR", loc="left")
+    ax2.set_xlabel("SNR (dB)")
+    ax2.grid(True, axis="y")
+    fig.tight_layout()
+    fig.savefig(path, dpi=80)
+    plt.close(fig)
+
+
+def write_html(path, title, summary, stats, indices, images):
+    rows = []
+    for idx, img in zip(indices, images):
+        rows.append(
+            f"<tr><td>{idx}</td><td>{stats['snr'][idx]:.2f}</td><td>{stats['max_error'][idx]:.5f}</td>"
+            f"<td>{stats['golden_mismatch'][idx]}</td><td><img loading=\"lazy\" src=\"{img}\" width=\"600\"></td></tr>")
+    with open(path, "w") as f:
+        f.write(f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>{html.escape(title)}</title></head><body>\n")
+        f.write(f"<h1>{html.escape(title)}</h1>\n<pre>{html.escape(json.dumps(summary, indent=2))}</pre>\n")
+        f.write("<img src=\"summary.png\">\n<table border=\"1\" cellspacing=\"0\" cellpadding=\"4\">\n")
+        f.write("<tr><th>Frame</th><th>SNR (dB)</th><th>Max Galat</th><th>Beda golden</th><th>Figure</th></tr>\n")
+        f.write("\n".join(rows))
+        f.write("\n</table></body></html>\n")
+
+
+def _time_range(spec, func, meta):
+    """
+    t_start/t_end capture FFTC: spesifikasi korpus (sidecar corpus.py), atau meta_data.json generate.py
+    bila func-nya sama dengan header. None jika tidak diketahui.
+    """
+    if spec is not None:
+        return spec["t_start"], spec["t_end"]
+    if meta is not None and func is not None and meta.get("func") == func:
+        return meta["t_start"], meta["t_end"]
+    return None
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Laporan verifikasi multi-frame (headless)")
+    parser.add_argument("--variant", default="32x16", choices=list(golden_model.VARIANTS))
+    parser.add_argument("--input", help="Capture input (.fftc / .bin lama)")
+    parser.add_argument("--output", help="Capture output board (.fftc / .bin lama)")
+    parser.add_argument("--meta", help="meta_data.json generate.py (scale, func, t_start/t_end) untuk file .bin lama")
+    parser.add_argument("--stats", action="store_true", help="Hanya statistik (matplotlib tidak di-import)")
+    parser.add_argument("--frames", type=int, default=None, help="Batasi jumlah frame yang dianalisis")
+    parser.add_argument("--render", type=int, default=None, help="Hanya render N frame dengan SNR terburuk")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out-dir", default="report")
+    args = parser.parse_args()
+
+    cfg = golden_model.get_variant(args.variant)
+    testing_dir = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    input_path = args.input or os.path.join(testing_dir, f"input_{args.variant}.bin")
+    output_path = args.output or os.path.join(testing_dir, f"output_{args.variant}.bin")
+    meta_path = args.meta or os.path.join(testing_dir, "signal", args.variant, "generate", "meta_data.json")
+
+    header, in_frames = capture_format.open_capture(input_path, cfg["points"], cfg["bits"])
+    _, out_frames = capture_format.open_capture(output_path, cfg["points"], cfg["bits"])
+    n = min(len(in_frames), len(out_frames), args.frames or len(in_frames))
+    in_frames, out_frames = in_frames[:n], out_frames[:n]
+
+    # Scale & func: sidecar korpus / header FFTC, fallback meta_data.json untuk .bin lama
+    meta = None
+    if os.path.exists(meta_path):
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+    func, t_start, t_end = header["func"] or None, 0.0, 1.0
+    if header["kind"] is None and meta is not None:
+        scales = np.full(n, meta["scale"])
+        func, t_start, t_end = meta["func"], meta["t_start"], meta["t_end"]
+    else:
+        if os.path.exists(input_path + ".scales.npy") or header["scale"]:
+            scales = np.asarray(corpus.load_scales(input_path)[:n])
+        else:
+            scales = np.ones(n)
+        time_range = _time_range(corpus.load_spec(input_path), func, meta)
+        if time_range is not None:
+            t_start, t_end = time_range
+        elif header["kind"] is not None:
+            print("[!] Rentang waktu input tidak diketahui (tanpa spesifikasi korpus / meta_data.json yang cocok), pakai 0..1")
+
+    print(f"--- LAPORAN VERIFIKASI {args.variant}: {n} frame ---")
+    t0 = time.perf_counter()
+    stats = frame_stats(in_frames, out_frames, scales, args.variant)
+    summary = summarize(stats)
+    print_summary(summary)
+    print(f"[-] Waktu statistik  : {time.perf_counter() - t0:.2f} s")
+    if args.stats:
+        return
+
+    indices = np.arange(n) if args.render is None else np.argsort(stats["snr"], kind="stable")[:args.render]
+    os.makedirs(args.out_dir, exist_ok=True)
+    t0 = time.perf_counter()
+    images = render_frames(indices, in_frames, out_frames, scales, stats, args.out_dir, t_start, t_end,
+                           cfg["bits"], func, args.workers)
+    render_summary(stats, os.path.join(args.out_dir, "summary.png"))
+    write_html(os.path.join(args.out_dir, "report.html"), f"Verifikasi FFT {args.variant}", summary, stats, indices, images)
+    print(f"[-] Waktu render     : {time.perf_counter() - t0:.2f} s ({len(indices)} figure)")
+    print(f"[OK] Laporan: {os.path.join(args.out_dir, 'report.html')}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,97 @@
+import os
+import time
+import select
+
+# pyserial bersifat opsional: dipakai jika ter-install (wajib di Windows),
+# selain itu fallback ke termios (POSIX) yang juga bisa membuka pty emulator.
+try:
+    import serial
+except ImportError:
+    serial = None
+
+
+class SerialLink:
+    """Port serial minimal (raw 8N1) dengan read berbasis timeout"""
+
+    def __init__(self, port, baud=9600):
+        self.port = port
+        self.baud = baud
+        self._ser = None
+        self._fd = None
+        if serial is not None:
+            self._ser = serial.Serial(port, baudrate=baud, bytesize=8, parity="N", stopbits=1, timeout=0)
+        else:
+            self._open_termios(port, baud)
+
+    def _open_termios(self, port, baud):
+        import termios
+        import tty
+        self._fd = os.open(port, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+        tty.setraw(self._fd)
+        speed = getattr(termios, f"B{int(baud)}", None)
+        if speed is not None:
+            attrs = termios.tcgetattr(self._fd)
+            attrs[4] = attrs[5] = speed
+            termios.tcsetattr(self._fd, termios.TCSANOW, attrs)
+
+    def write(self, data):
+        """Kirim semua byte (blocking sampai seluruh data masuk buffer port)"""
+        if self._ser is not None:
+            self._ser.write(data)
+            return
+        view = memoryview(data)
+        while view:
+            try:
+                n = os.write(self._fd, view)
+                view = view[n:]
+            except BlockingIOError:
+                select.select([], [self._fd], [], 0.1)
+
+    def read_exact(self, n, timeout):
+        """Baca tepat n byte; jika timeout, kembalikan byte yang sempat diterima"""
+        buf = bytearray()
+        deadline = time.monotonic() + timeout
+        while len(buf) < n:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if self._ser is not None:
+                self._ser.timeout = remaining
+                buf += self._ser.read(n - len(buf))
+                continue
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if ready:
+                try:
+                    buf += os.read(self._fd, n - len(buf))
+                except BlockingIOError:
+                    pass
+        return bytes(buf)
+
+    def flush_input(self):
+        """Buang semua byte yang masih tertahan di buffer input"""
+        if self._ser is not None:
+            self._ser.reset_input_buffer()
+            return
+        while True:
+            ready, _, _ = select.select([self._fd], [], [], 0)
+            if not ready:
+                break
+            try:
+                if not os.read(self._fd, 4096):
+                    break
+            except BlockingIOError:
+                break
+
+    def close(self):
+        if self._ser is not None:
+            self._ser.close()
+            self._ser = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,364 @@
+import numpy as np
+import argparse
+import time
+import sys
+import os
+
+import golden_model
+import capture_format
+import corpus
+
+# ================= STFT STREAMING (SLIDING WINDOW) =================
+# Sumber sampel kontinu (file / pipe / serial / ekspresi) -> ring buffer -> frame POINTS sampel
+# yang saling overlap dengan hop tertentu -> board (uart_driver) atau golden model -> spektrogram.
+# Setiap langkah hanya frame baru yang dihitung dan hanya kolom baru yang digambar (blit),
+# sehingga tampilan live mengikuti frame rate penuh backend.
+# Basis waktu sama dengan generate.py: fs = POINTS sampel per satuan waktu (t_end = 1).
+
+CHUNK_SAMPLES = 4096  # sampel per baca dari sumber
+DEFAULT_HISTORY = 256  # kolom spektrogram (ring)
+EXPR_CALIBRATION = 1.0  # satuan waktu awal untuk mencari puncak sinyal ekspresi (auto-scaling)
+
+
+# ================= RING BUFFER =================
+class SlidingFrames:
+    """
+    Ring buffer cermin (2 x POINTS): sampel ditulis di i dan i + POINTS, sehingga
+    POINTS sampel terakhir selalu kontigu di buf[w : w + POINTS] tanpa copy ulang.
+    push() mengembalikan frame baru (k, POINTS) setiap hop sampel setelah buffer penuh.
+    """
+
+    def __init__(self, points, hop, dtype=np.int64):
+        if not 0 < hop <= points:
+            raise ValueError(f"Hop harus 1..{points}, bukan {hop}")
+        self.points = points
+        self.hop = hop
+        self.buf = np.zeros(2 * points, dtype=dtype)
+        self.w = 0
+        self.filled = 0
+        self.since = 0  # sampel sejak frame terakhir
+        self.total = 0  # sampel yang sudah masuk
+
+    def _write(self, samples):
+        idx = (self.w + np.arange(len(samples))) % self.points
+        self.buf[idx] = samples
+        self.buf[idx + self.points] = samples
+        self.w = (self.w + len(samples)) % self.points
+        self.total += len(samples)
+        self.filled = min(self.points, self.filled + len(samples))
+
+    def push(self, samples):
+        """Masukkan sampel. Return: (frame (k, POINTS), indeks sampel awal tiap frame (k,))"""
+        samples = np.asarray(samples)
+        frames, starts = [], []
+        pos = 0
+        while pos < len(samples):
+            # Isi buffer sampai penuh (frame pertama), lalu satu frame per hop sampel
+            full = self.filled == self.points
+            piece = samples[pos:pos + (self.hop - self.since if full else self.points - self.filled)]
+            self._write(piece)
+            pos += len(piece)
+            if full:
+                self.since += len(piece)
+            if (self.since == self.hop) if full else (self.filled == self.points):
+                frames.append(self.buf[self.w:self.w + self.points].copy())
+                starts.append(self.total - self.points)
+                self.since = 0
+        if not frames:
+            return np.empty((0, self.points), dtype=self.buf.dtype), np.empty(0, dtype=np.int64)
+        return np.stack(frames), np.array(starts, dtype=np.int64)
+
+
+# ================= SUMBER SAMPEL =================
+def file_source(path, bits, chunk=CHUNK_SAMPLES):
+    """Sampel int dari capture (.fftc / .bin mentah, frame disambung) atau pipe ("-" = stdin)"""
+    dtype = capture_format.frame_dtype(bits)
+    if path != "-" and capture_format.is_capture(path):
+        _, frames = capture_format.open_capture(path)
+        flat = frames.reshape(-1)
+        for start in range(0, len(flat), chunk):
+            yield np.asarray(flat[start:start + chunk], dtype=np.int64)
+        return
+
+    f = sys.stdin.buffer if path == "-" else open(path, "rb")
+    rest = b""
+    try:
+        while True:
+            data = f.read1(chunk * dtype.itemsize) if hasattr(f, "read1") else f.read(chunk * dtype.itemsize)
+            if not data:
+                return
+            data = rest + data
+            usable = len(data) - len(data) % dtype.itemsize
+            rest = data[usable:]
+            if usable:
+                yield np.frombuffer(data[:usable], dtype=dtype).astype(np.int64)
+    finally:
+        if f is not sys.stdin.buffer:
+            f.close()
+
+
+def serial_source(port, bits, baud=9600, chunk=256, timeout=1.0):
+    """Sampel int mentah dari port serial (mis. ADC yang streaming), berhenti saat link diam > timeout"""
+    from serial_link import SerialLink
+    dtype = capture_format.frame_dtype(bits)
+    with SerialLink(port, baud=baud) as link:
+        while True:
+            data = link.read_exact(chunk * dtype.itemsize, timeout)
+            usable = len(data) - len(data) % dtype.itemsize
+            if usable:
+                yield np.frombuffer(data[:usable], dtype=dtype).astype(np.int64)
+            if usable < chunk * dtype.itemsize:
+                return
+
+
+def expr_source(func, points, bits, target=None, chunk=CHUNK_SAMPLES, n_samples=None):
+    """
+    Sinyal sintetis kontinu dari ekspresi t (gaya generate.py, fs = POINTS per satuan waktu).
+    Scale tetap: puncak di EXPR_CALIBRATION satuan waktu pertama -> target (DEFAULT_HEADROOM).
+    """
+    target = corpus.DEFAULT_HEADROOM[bits] if target is None else target
+    calib = corpus.eval_expr(func, np.arange(int(EXPR_CALIBRATION * points))[np.newaxis, :] / points)[0]
+    peak = np.max(np.abs(calib))
+    scale = target / peak if peak > 0 else target
+    max_val = (1 << (bits - 1)) - 1
+    start = 0
+    while n_samples is None or start < n_samples:
+        n = chunk if n_samples is None else min(chunk, n_samples - start)
+        t = (start + np.arange(n))[np.newaxis, :] / points
+        y = corpus.eval_expr(func, t)[0]
+        yield np.clip((y * scale).astype(np.int64), -max_val - 1, max_val)
+        start += n
+
+
+def paced(source, fs):
+    """Lepas sampel sesuai waktu nyata (fs sampel/detik), untuk uji live dari file"""
+    t0 = time.monotonic()
+    sent = 0
+    for samples in source:
+        delay = t0 + sent / fs - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        yield samples
+        sent += len(samples)
+
+
+def open_source(spec, points, bits, n_samples=None):
+    """'expr:<ekspresi>', 'serial:<port>[@baud]', '-' (stdin) atau path file"""
+    if spec.startswith("expr:"):
+        return expr_source(spec[5:], points, bits, n_samples=n_samples)
+    if spec.startswith("serial:"):
+        port, _, baud = spec[7:].partition("@")
+        return serial_source(port, bits, int(baud) if baud else 9600)
+    return file_source(spec, bits)
+
+
+# ================= BACKEND =================
+# Kedua backend mengembalikan magnitude per bin (skew byte uart_tx 32x16 sudah dibalik),
+# sehingga Spectrogram dan zero_cross menerima spektrum yang sama dari model maupun board.
+class ModelBackend:
+    """Golden model bit-accurate (batch frame baru sekaligus)"""
+
+    BATCH = 65536
+
+    def __init__(self, variant, half_spectrum=False):
+        self.cfg = golden_model.get_variant(variant)
+        self.half_spectrum = half_spectrum
+        self.lost = 0
+
+    def process(self, frames):
+        out = golden_model.golden_output(frames, self.cfg, half=self.half_spectrum)
+        return golden_model.unskew_words(out, self.cfg)
+
+
+class DeviceBackend:
+    """Board / emulator lewat UartFFTDriver; frame yang timeout diisi nol dan dihitung hilang"""
+
+    BATCH = 1  # satu transaksi per frame: kolom langsung tampil
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.lost = 0
+
+    def process(self, frames):
+        out = np.zeros((len(frames), self.driver.out_words), dtype=self.driver.dtype)
+        for i, frame in enumerate(frames):
+            words, _ = self.driver.transact(frame)
+            if words is None:
+                self.lost += 1
+            else:
+                out[i] = words
+        return golden_model.unskew_words(out, self.driver.cfg)  # baris nol (hilang) tetap nol
+
+
+def stream_spectra(source, backend, points, hop, max_frames=None):
+    """
+    Generator: (indeks frame, sampel awal, frame (POINTS,), magnitude per bin) untuk setiap frame baru.
+    Hanya frame yang baru terbentuk di ring buffer yang dikirim ke backend.
+    """
+    ring = SlidingFrames(points, hop)
+    idx = 0
+    for samples in source:
+        frames, starts = ring.push(samples)
+        if max_frames is not None:
+            frames, starts = frames[:max_frames - idx], starts[:max_frames - idx]
+        if len(frames) == 0:
+            if max_frames is not None and idx >= max_frames:
+                return
+            continue
+        for i in range(0, len(frames), backend.BATCH):
+            out = backend.process(frames[i:i + backend.BATCH])
+            for frame, start, words in zip(frames[i:i + backend.BATCH], starts[i:i + backend.BATCH], out):
+                yield idx, int(start), frame, words
+                idx += 1
+        if max_frames is not None and idx >= max_frames:
+            return
+
+
+# ================= SPEKTROGRAM INKREMENTAL =================
+class Spectrogram:
+    """
+    Waterfall ring: satu AxesImage selebar satu kolom per slot history. update() hanya mengganti
+    data kolom terbaru (+ kolom kosong di depannya sebagai kursor) lalu blit area dua kolom itu.
+    """
+
+    def __init__(self, bins, history, vmax, db=False, headless=False, title=""):
+        import matplotlib
+        if headless:
+            matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        from matplotlib.colors import Normalize
+        self.plt = plt
+        self.headless = headless
+        self.db = db
+        self.history = history
+        self.data = np.zeros((bins, history))  # salinan untuk --save / akses luar
+        self.col = 0
+
+        vmax = 20 * np.log10(vmax + 1) if db else vmax
+        self.fig, self.ax = plt.subplots(figsize=(12, 5))
+        norm = Normalize(0, vmax)
+        self.images = [self.ax.imshow(np.zeros((bins, 1)), aspect="auto", origin="lower", norm=norm,
+                                      cmap="viridis", interpolation="nearest", extent=(j, j + 1, -0.5, bins - 0.5))
+                       for j in range(history)]
+        self.ax.set_xlim(0, history)
+        self.ax.set_ylim(-0.5, bins - 0.5)
+        self.ax.set_xlabel("Slot frame (ring, kolom kosong = kursor)")
+        self.ax.set_ylabel("Bin")
+        self.ax.set_title(title, loc="left")
+        self.fig.colorbar(self.images[0], ax=self.ax, label="Magnitudo (dB)" if db else "Magnitudo")
+        if not headless:
+            plt.show(block=False)
+        self.fig.canvas.draw()
+
+    def update(self, words):
+        column = np.asarray(words, dtype=np.float64)[:self.data.shape[0]]
+        if self.db:
+            column = 20 * np.log10(np.abs(column) + 1)
+        self.data[:, self.col] = column
+        cursor = (self.col + 1) % self.history
+        self.data[:, cursor] = 0
+        canvas = self.fig.canvas
+        for j in (self.col, cursor):
+            self.images[j].set_data(self.data[:, j:j + 1])
+            self.ax.draw_artist(self.images[j])
+        if not self.headless:
+            canvas.blit(self.ax.bbox)
+            canvas.flush_events()
+        self.col = cursor
+
+    def save(self, path):
+        self.fig.savefig(path)
+
+    def close(self):
+        self.plt.close(self.fig)
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Spektrogram streaming (STFT sliding window) lewat board atau golden model")
+    parser.add_argument("--variant", default="32x16", choices=list(golden_model.VARIANTS))
+    parser.add_argument("--source", default=None,
+                        help="'expr:<ekspresi t>', 'serial:<port>[@baud]', '-' (stdin) atau file .fftc/.bin. "
+                             "Default: FUNC_STR generate.py")
+    parser.add_argument("--hop", type=int, default=None, help="Sampel antar frame (default POINTS/4)")
+    parser.add_argument("--frames", type=int, default=None, help="Berhenti setelah N frame")
+    parser.add_argument("--port", help="Backend board: port serial uart_fft_top")
+    parser.add_argument("--emulate", action="store_true", help="Backend emulator pty")
+    parser.add_argument("--time-scale", type=float, default=0.0)
+    parser.add_argument("--half", action="store_true", help="Board di-build dengan g_HALF_SPECTRUM = true")
+    parser.add_argument("--realtime", type=float, default=None, metavar="FS",
+                        help="Lepas sampel sumber pada FS sampel/detik")
+    parser.add_argument("--history", type=int, default=DEFAULT_HISTORY, help="Kolom spektrogram")
+    parser.add_argument("--db", action="store_true", help="Skala warna dB")
+    parser.add_argument("--stats", action="store_true", help="Tanpa plot (matplotlib tidak di-import)")
+    parser.add_argument("--save", help="Simpan spektrogram akhir ke PNG (backend Agg, tanpa jendela)")
+    args = parser.parse_args()
+
+    cfg = golden_model.get_variant(args.variant)
+    points, bits = cfg["points"], cfg["bits"]
+    hop = args.hop or max(1, points // 4)
+    spec = args.source
+    if spec is None:
+        sys.path.insert(0, os.path.join(golden_model.REPO_DIR, "testing", "signal", args.variant, "generate"))
+        import generate
+        spec = "expr:" + generate.FUNC_STR
+    # Sumber ekspresi tak terbatas: batasi sampel bila --frames diberikan
+    n_samples = points + (args.frames - 1) * hop if args.frames else None
+    source = open_source(spec, points, bits, n_samples)
+    if args.realtime:
+        source = paced(source, args.realtime)
+
+    print(f"--- STFT STREAMING {args.variant} ---")
+    print(f"[-] Sumber: {spec}, hop {hop} ({100 * (1 - hop / points):.0f}% overlap)")
+    board = None
+    driver = None
+    if args.emulate or args.port:
+        port = args.port
+        if args.emulate:
+            from board_emulator import BoardEmulator
+            board = BoardEmulator(args.variant, time_scale=args.time_scale, half_spectrum=args.half)
+            port = board.start()
+        from uart_driver import UartFFTDriver
+        driver = UartFFTDriver(port, args.variant, half_spectrum=args.half)
+        backend = DeviceBackend(driver)
+        print(f"[-] Backend: {'emulator' if args.emulate else args.port}")
+    else:
+        backend = ModelBackend(args.variant, args.half)
+        print("[-] Backend: golden model")
+
+    view = None
+    if not args.stats:
+        view = Spectrogram(points // 2 + 1, args.history, (1 << (bits - 1)) - 1, args.db,
+                           headless=args.save is not None, title=f"STFT {args.variant}, hop {hop}: {spec}")
+
+    n = 0
+    draw_s = 0.0
+    t0 = time.monotonic()
+    try:
+        for idx, start, frame, words in stream_spectra(source, backend, points, hop, args.frames):
+            n = idx + 1
+            if view is not None:
+                t_draw = time.monotonic()
+                view.update(words)
+                draw_s += time.monotonic() - t_draw
+    except KeyboardInterrupt:
+        print("[!] Dihentikan")
+    finally:
+        elapsed = time.monotonic() - t0
+        if driver is not None:
+            driver.close()
+        if board is not None:
+            board.stop()
+
+    print(f"[-] Frame       : {n} (hilang {backend.lost})")
+    print(f"[-] Frame rate  : {n / elapsed if elapsed > 0 else 0.0:.1f} frame/s")
+    if view is not None and n:
+        print(f"[-] Gambar      : {draw_s / n * 1e3:.3f} ms/frame")
+        if args.save:
+            view.save(args.save)
+            print(f"[OK] Spektrogram disimpan: {args.save}")
+        elif not args.stats:
+            view.plt.show()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,270 @@
+import numpy as np
+import argparse
+import heapq
+import json
+import time
+import os
+
+import golden_model
+import capture_format
+import corpus
+from report import spectrum_ideal
+
+# ================= STATISTIK ERROR STREAMING (MEMORI KONSTAN) =================
+# Untuk soak test jutaan frame: semua metrik diakumulasi per batch tanpa menyimpan frame.
+#   - mean & varians galat per bin  : Welford (digabung per batch dengan rumus Chan)
+#   - persentil SNR                 : histogram tetap 0.1 dB (persentil aproksimasi)
+#   - frame terburuk                : heap top-k (SNR terendah)
+#   - beda vs golden model          : jumlah frame & per bin
+#   - retry / gagal                 : dari driver UART / ConsensusRunner (mode live)
+# Snapshot JSON ditambahkan per baris ke file --snapshot sehingga bisa di-"tail -f" saat run berjalan.
+
+SNR_EDGES = np.linspace(-40.0, 160.0, 2001)  # SNR di luar rentang masuk bin tepi
+SNR_PERFECT = 999.0  # nilai SNR verify.py jika galat nol
+CHUNK_FRAMES = 65536
+
+
+class StreamingStats:
+    def __init__(self, points, topk=10):
+        self.points = points
+        self.topk = topk
+        self.frames = 0
+        self.err_mean = np.zeros(points)
+        self.err_m2 = np.zeros(points)
+        self.err_max = np.zeros(points)
+        self.snr_hist = np.zeros(SNR_EDGES.size - 1, dtype=np.int64)
+        self.snr_min = np.inf
+        self.snr_sum = 0.0
+        self.snr_perfect = 0
+        self.golden_frames = 0  # frame yang beda vs golden model
+        self.golden_bins = np.zeros(points, dtype=np.int64)
+        self._worst = []  # heap (-snr, idx): akar = frame "terbaik" di antara k terburuk
+
+        # Mode live
+        self.transactions = 0
+        self.attempts = 0
+        self.failures = 0
+        self.t_start = time.monotonic()
+
+    # ----------------- Akumulasi -----------------
+    def update(self, raw_in, raw_out, scales, variant, first_idx=0):
+        """Tambahkan satu batch frame (n, POINTS); index global frame = first_idx + i"""
+        raw_in = np.asarray(raw_in, dtype=np.int64).reshape(-1, self.points)
+        raw_out = np.asarray(raw_out, dtype=np.int64).reshape(-1, self.points)
+        scale = np.broadcast_to(np.asarray(scales, dtype=np.float64), (raw_in.shape[0],))[:, np.newaxis]
+        n = raw_in.shape[0]
+        if n == 0:
+            return
+
+        ideal = spectrum_ideal(raw_in / scale)
+        error = np.abs(ideal - raw_out * 2 / scale)
+        noise = np.sum(error ** 2, axis=1)
+        signal = np.sum(ideal ** 2, axis=1)
+        snr = np.where(noise > 0, 10 * np.log10(np.maximum(signal, 1e-300) / np.where(noise > 0, noise, 1)), SNR_PERFECT)
+
+        # Welford per batch (Chan et al.): gabungkan mean/M2 batch ke akumulator
+        batch_mean = error.mean(axis=0)
+        batch_m2 = ((error - batch_mean) ** 2).sum(axis=0)
+        total = self.frames + n
+        delta = batch_mean - self.err_mean
+        self.err_mean += delta * n / total
+        self.err_m2 += batch_m2 + delta ** 2 * self.frames * n / total
+        np.maximum(self.err_max, error.max(axis=0), out=self.err_max)
+        self.frames = total
+
+        finite = snr < SNR_PERFECT
+        self.snr_perfect += int(n - np.count_nonzero(finite))
+        self.snr_hist += np.histogram(np.clip(snr[finite], SNR_EDGES[0], SNR_EDGES[-1]), bins=SNR_EDGES)[0]
+        self.snr_sum += float(snr[finite].sum())
+        self.snr_min = min(self.snr_min, float(snr.min()))
+
+        golden = golden_model.golden_output(raw_in, variant).astype(np.int64)
+        diff = golden != raw_out
+        self.golden_frames += int(np.count_nonzero(diff.any(axis=1)))
+        self.golden_bins += np.count_nonzero(diff, axis=0)
+
+        # Hanya k kandidat terburuk dari batch yang masuk heap
+        k = min(self.topk, n)
+        for i in np.argpartition(snr, k - 1)[:k]:
+            item = (-float(snr[i]), first_idx + int(i))
+            if len(self._worst) < self.topk:
+                heapq.heappush(self._worst, item)
+            elif item > self._worst[0]:
+                heapq.heapreplace(self._worst, item)
+
+    def record_transaction(self, attempts, ok):
+        """Hasil satu frame di mode live: jumlah percobaan dan apakah ada hasil valid"""
+        self.transactions += 1
+        self.attempts += attempts
+        self.failures += 0 if ok else 1
+
+    # ----------------- Ringkasan -----------------
+    def snr_percentile(self, q):
+        """Persentil SNR dari histogram (resolusi 0.1 dB); frame sempurna dihitung di atas semua bin"""
+        finite = int(self.snr_hist.sum())
+        total = finite + self.snr_perfect
+        if total == 0:
+            return float("nan")
+        rank = q / 100 * total
+        if rank > finite:
+            return SNR_PERFECT
+        cum = np.cumsum(self.snr_hist)
+        i = int(np.searchsorted(cum, max(rank, 1)))
+        return float((SNR_EDGES[i] + SNR_EDGES[i + 1]) / 2)
+
+    def worst(self):
+        """List (idx, snr) frame terburuk, urut dari SNR terendah"""
+        return [(idx, -neg) for neg, idx in sorted(self._worst, reverse=True)]
+
+    def snapshot(self):
+        var = self.err_m2 / (self.frames - 1) if self.frames > 1 else np.zeros(self.points)
+        finite = int(self.snr_hist.sum())
+        elapsed = time.monotonic() - self.t_start
+        return {
+            "time": time.time(),
+            "elapsed_s": elapsed,
+            "frames": self.frames,
+            "frames_per_s": self.frames / elapsed if elapsed > 0 else 0.0,
+            "err_mean": self.err_mean.tolist(),
+            "err_std": np.sqrt(var).tolist(),
+            "err_max": self.err_max.tolist(),
+            "snr_mean": self.snr_sum / finite if finite else SNR_PERFECT,
+            "snr_min": self.snr_min if self.frames else None,
+            "snr_p1": self.snr_percentile(1),
+            "snr_p5": self.snr_percentile(5),
+            "snr_p50": self.snr_percentile(50),
+            "golden_mismatch_frames": self.golden_frames,
+            "golden_mismatch_bins": self.golden_bins.tolist(),
+            "worst": [{"frame": idx, "snr": snr} for idx, snr in self.worst()],
+            "transactions": self.transactions,
+            "retry_rate": (self.attempts - self.transactions) / self.transactions if self.transactions else 0.0,
+            "failure_rate": self.failures / self.transactions if self.transactions else 0.0,
+        }
+
+
+def write_snapshot(path, snap):
+    """Tambahkan satu baris JSON (append + flush, aman untuk tail -f)"""
+    with open(path, "a") as f:
+        f.write(json.dumps(snap) + "\n")
+
+
+def print_snapshot(s):
+    print(f"[-] Frame              : {s['frames']} ({s['frames_per_s']:,.0f} frame/s)")
+    print(f"[-] SNR mean/min       : {s['snr_mean']:.2f} / {s['snr_min']:.2f} dB")
+    print(f"[-] SNR p1/p5/p50      : {s['snr_p1']:.1f} / {s['snr_p5']:.1f} / {s['snr_p50']:.1f} dB")
+    print(f"[-] Galat bin max      : {max(s['err_max']):.5f} Unit (bin {int(np.argmax(s['err_max']))})")
+    print(f"[-] Beda golden        : {s['golden_mismatch_frames']}/{s['frames']} frame")
+    if s["transactions"]:
+        print(f"[-] Retry / gagal      : {s['retry_rate'] * 100:.1f}% / {s['failure_rate'] * 100:.2f}%")
+    print("[-] Frame terburuk     : " + ", ".join(f"#{w['frame']} ({w['snr']:.1f} dB)" for w in s["worst"]))
+
+
+# ================= SUMBER DATA =================
+def iter_capture(in_frames, out_frames, bits, follow_path=None, poll_s=1.0):
+    """
+    Batch (first_idx, in, out) dari capture memmap. follow_path: buka ulang output yang
+    masih ditulis (append_frames) dan proses frame baru sampai Ctrl+C.
+    """
+    done = 0
+    while True:
+        n = min(len(in_frames), len(out_frames))
+        for start in range(done, n, CHUNK_FRAMES):
+            stop = min(start + CHUNK_FRAMES, n)
+            yield start, in_frames[start:stop], out_frames[start:stop]
+        done = n
+        if follow_path is None:
+            return
+        time.sleep(poll_s)
+        _, out_frames = capture_format.open_capture(follow_path, in_frames.shape[1], bits)
+
+
+def iter_live(driver, frames, n_frames, retries=1):
+    """Satu frame per iterasi dari board/emulator; retries > 1 memakai ConsensusRunner (golden, 2-of-n)"""
+    from consensus import ConsensusRunner
+    runner = ConsensusRunner(driver, k=2, n=retries) if retries > 1 else None
+    for idx in range(n_frames):
+        frame = frames[idx % len(frames)]
+        if runner is not None:
+            words, attempts, _, method = runner.run_frame(frame)
+            ok = method != "gagal"
+        else:
+            words, _ = driver.transact(frame)
+            attempts, ok = 1, words is not None
+        yield idx, frame, words, attempts, ok
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Statistik error streaming untuk soak test")
+    parser.add_argument("--variant", default="32x16", choices=list(golden_model.VARIANTS))
+    parser.add_argument("--input", help="Capture input (.fftc / .bin lama)")
+    parser.add_argument("--output", help="Capture output (.fftc / .bin lama)")
+    parser.add_argument("--follow", action="store_true", help="Ikuti capture output yang masih bertambah")
+    parser.add_argument("--port", help="Mode live: port serial board")
+    parser.add_argument("--emulate", action="store_true", help="Mode live: emulator pty")
+    parser.add_argument("--time-scale", type=float, default=0.0)
+    parser.add_argument("--fault-rate", type=float, default=0.0)
+    parser.add_argument("--retries", type=int, default=1, help="Percobaan maksimal per frame (mode live)")
+    parser.add_argument("--frames", type=int, default=None)
+    parser.add_argument("--scale", type=float, default=None, help="Override scale (file .bin lama)")
+    parser.add_argument("--topk", type=int, default=10)
+    parser.add_argument("--snapshot", default="stream_stats.jsonl", help="File snapshot JSON lines")
+    parser.add_argument("--every", type=float, default=5.0, help="Interval snapshot (detik)")
+    args = parser.parse_args()
+
+    cfg = golden_model.get_variant(args.variant)
+    testing_dir = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    input_path = args.input or os.path.join(testing_dir, f"input_{args.variant}.bin")
+    header, in_frames = capture_format.open_capture(input_path, cfg["points"], cfg["bits"])
+    if args.scale is not None:
+        scales = np.full(len(in_frames), args.scale)
+    else:
+        scales = corpus.load_scales(input_path) if header["kind"] is not None else np.ones(len(in_frames))
+
+    stats = StreamingStats(cfg["points"], args.topk)
+    last_snap = time.monotonic()
+    live = args.emulate or args.port
+
+    def maybe_snapshot(force=False):
+        nonlocal last_snap
+        if force or time.monotonic() - last_snap >= args.every:
+            write_snapshot(args.snapshot, stats.snapshot())
+            last_snap = time.monotonic()
+
+    print(f"--- STATISTIK STREAMING {args.variant} ({'live' if live else 'capture'}) ---")
+    board = None
+    try:
+        if live:
+            port = args.port
+            if args.emulate:
+                from board_emulator import BoardEmulator
+                board = BoardEmulator(args.variant, time_scale=args.time_scale, fault_rate=args.fault_rate)
+                port = board.start()
+            from uart_driver import UartFFTDriver
+            with UartFFTDriver(port, args.variant) as drv:
+                n_frames = args.frames or len(in_frames)
+                for idx, frame, words, attempts, ok in iter_live(drv, in_frames, n_frames, args.retries):
+                    stats.record_transaction(attempts, ok)
+                    if words is not None:
+                        stats.update(frame, words, scales[idx % len(scales)], args.variant, idx)
+                    maybe_snapshot()
+        else:
+            output_path = args.output or os.path.join(testing_dir, f"output_{args.variant}.bin")
+            _, out_frames = capture_format.open_capture(output_path, cfg["points"], cfg["bits"])
+            limit = args.frames or len(in_frames)
+            for start, raw_in, raw_out in iter_capture(in_frames[:limit], out_frames, cfg["bits"],
+                                                       output_path if args.follow else None):
+                stats.update(raw_in, raw_out, scales[start:start + len(raw_in)], args.variant, start)
+                maybe_snapshot()
+    except KeyboardInterrupt:
+        print("[!] Dihentikan, menulis snapshot terakhir")
+    finally:
+        if board is not None:
+            board.stop()
+
+    maybe_snapshot(force=True)
+    print_snapshot(stats.snapshot())
+    print(f"[OK] Snapshot: {args.snapshot}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,409 @@
+import numpy as np
+import argparse
+import struct
+import json
+import mmap
+import time
+import os
+
+import golden_model
+import frame_link
+
+# ================= LOG TRANSAKSI (.fftl) APPEND-ONLY + INDEKS =================
+# Setiap transaksi host <-> board dicatat apa adanya (byte mentah, bukan hasil decode).
+#
+# File log <path> (little endian):
+#   header  : magic "FFTL" | versi u8 | pad 3 | t0 f64 (waktu buat) | bucket_s f64 | panjang config u32 | config JSON
+#   record  : sync "TX" | status u8 | pad | seq u64 | waktu f64 | latency f64 | n_tx u32 | n_rx u32 | tx | rx
+# Indeks <path>.idx  : satu entri tetap per record (seq, waktu, latency, offset, n_tx, n_rx, status) -> record ke-seq
+#                      ada di entri seq (O(1), np.memmap structured array).
+# Indeks <path>.tidx : satu u64 per bucket waktu (default 1 s sejak t0) = seq record pertama dengan
+#                      waktu >= awal bucket -> cari per waktu = 1 lookup + scan pendek dalam bucket.
+# Record ditulis sebelum entri indeks; saat dibuka ulang, ekor yang belum terindeks dipotong.
+# Waktu dipaksa tidak turun (jam dinding mundur -> pakai waktu record sebelumnya).
+# Protokol framed: satu record per percobaan frame, tx/rx termasuk header batch, CRC dan sync/seq
+# (config "framed_raw"); log framed lama tanpa key itu berisi data frame dan magnitude hasil decode.
+
+MAGIC = b"FFTL"
+VERSION = 1
+HEADER_FMT = "<4sB3xddI"
+HEADER_SIZE = struct.calcsize(HEADER_FMT)
+REC_SYNC = b"TX"
+REC_FMT = "<2sBxQddII"
+REC_SIZE = struct.calcsize(REC_FMT)
+IDX_DTYPE = np.dtype([("seq", "<u8"), ("t", "<f8"), ("latency", "<f8"), ("offset", "<u8"), ("n_tx", "<u4"),
+                      ("n_rx", "<u4"), ("status", "u1"), ("pad", "V7")])
+TIDX_DTYPE = np.dtype("<u8")
+DEFAULT_BUCKET_S = 1.0
+
+STATUS_OK = 0
+STATUS_TIMEOUT = 1  # respons kurang dari yang diharapkan
+STATUS_RESYNC = 2  # frame nol dari UartFFTDriver.resync()
+STATUS_LINK_ERROR = 3  # protokol framed: NAK / CRC / seq salah
+STATUS_NAMES = {STATUS_OK: "ok", STATUS_TIMEOUT: "timeout", STATUS_RESYNC: "resync", STATUS_LINK_ERROR: "link"}
+# Nilai untuk key config yang belum ada di log lama
+CONFIG_DEFAULTS = {"ping_pong": False, "framed_raw": False}
+
+
+def driver_config(driver):
+    """Config yang disimpan di header log: cukup untuk decode byte dan replay"""
+    return {
+        "variant": driver.variant,
+        "points": driver.points,
+        "bits": driver.cfg["bits"],
+        "half_spectrum": driver.half_spectrum,
+        "pack_two": driver.pack_two,
+        "framed": driver.framed is not None,
+        "framed_raw": driver.framed is not None,
+        "ping_pong": driver.ping_pong,
+        "clk_hz": driver.clk_hz,
+        "clks_per_bit": driver.clks_per_bit,
+        "port": driver.link.port,
+    }
+
+
+def _comparable(config):
+    """Config tanpa nama port (pty emulator / USB bisa berganti nama antar sesi), key baru diisi default"""
+    return {k: v for k, v in dict(CONFIG_DEFAULTS, **config).items() if k != "port"}
+
+
+class TransactionLog:
+    def __init__(self, path, config=None, bucket_s=DEFAULT_BUCKET_S, mode="a"):
+        """mode "a": buat / lanjutkan log (config harus sama), mode "r": baca saja"""
+        self.path = path
+        self.mode = mode
+        self._data = None
+        self._mmap = None
+        if mode == "a" and (not os.path.exists(path) or os.path.getsize(path) == 0):
+            self._create(config or {}, bucket_s)
+        self._read_header()
+        if mode == "a":
+            if config is not None and _comparable(json.loads(json.dumps(config))) != _comparable(self.config):
+                raise ValueError(f"Config log {path} berbeda dengan sesi ini, pakai file log lain")
+            self._recover()
+            self._data = open(path, "ab")
+            self._idx = open(path + ".idx", "ab")
+            self._tidx = open(path + ".tidx", "ab")
+        self._map_index()
+
+    # ---------- tulis ----------
+    def _create(self, config, bucket_s):
+        blob = json.dumps(config).encode("utf-8")
+        with open(self.path, "wb") as f:
+            f.write(struct.pack(HEADER_FMT, MAGIC, VERSION, time.time(), bucket_s, len(blob)) + blob)
+        for ext in (".idx", ".tidx"):
+            open(self.path + ext, "wb").close()
+
+    def _recover(self):
+        """Potong record / entri indeks yang tidak lengkap (proses mati di tengah append)"""
+        n = os.path.getsize(self.path + ".idx") // IDX_DTYPE.itemsize
+        with open(self.path + ".idx", "r+b") as f:
+            f.truncate(n * IDX_DTYPE.itemsize)
+        end = self.data_offset
+        last_t = self.t0
+        if n:
+            last = np.fromfile(self.path + ".idx", dtype=IDX_DTYPE, count=1, offset=(n - 1) * IDX_DTYPE.itemsize)[0]
+            end = int(last["offset"]) + REC_SIZE + int(last["n_tx"]) + int(last["n_rx"])
+            last_t = float(last["t"])
+        with open(self.path, "r+b") as f:
+            f.truncate(end)
+        n_buckets = os.path.getsize(self.path + ".tidx") // TIDX_DTYPE.itemsize
+        tidx = np.fromfile(self.path + ".tidx", dtype=TIDX_DTYPE)[:n_buckets]
+        n_buckets = int(np.searchsorted(tidx, n, side="right"))  # entri yang menunjuk record terpotong dibuang
+        with open(self.path + ".tidx", "r+b") as f:
+            f.truncate(n_buckets * TIDX_DTYPE.itemsize)
+        self._n = n
+        self._end = end
+        self._last_t = last_t
+        self._buckets = n_buckets
+
+    def append(self, tx, rx, latency, status=STATUS_OK, t=None):
+        """Catat satu transaksi, return seq"""
+        t = max(time.time() if t is None else t, self._last_t)
+        seq = self._n
+        tx, rx = bytes(tx), bytes(rx)
+        self._data.write(struct.pack(REC_FMT, REC_SYNC, status, seq, t, latency, len(tx), len(rx)) + tx + rx)
+        self._data.flush()
+        entry = np.zeros(1, dtype=IDX_DTYPE)
+        entry[0] = (seq, t, latency, self._end, len(tx), len(rx), status, b"\x00" * 7)
+        self._idx.write(entry.tobytes())
+        self._idx.flush()
+        bucket = int((t - self.t0) // self.bucket_s)
+        if bucket >= self._buckets:
+            self._tidx.write(np.full(bucket - self._buckets + 1, seq, dtype=TIDX_DTYPE).tobytes())
+            self._tidx.flush()
+            self._buckets = bucket + 1
+        self._end += REC_SIZE + len(tx) + len(rx)
+        self._last_t = t
+        self._n += 1
+        return seq
+
+    # ---------- baca ----------
+    def _read_header(self):
+        with open(self.path, "rb") as f:
+            raw = f.read(HEADER_SIZE)
+            magic, version, t0, bucket_s, n_config = struct.unpack(HEADER_FMT, raw)
+            if magic != MAGIC:
+                raise ValueError(f"Bukan log transaksi FFTL: {self.path}")
+            if version != VERSION:
+                raise ValueError(f"Versi log tidak didukung: {version}")
+            self.config = dict(CONFIG_DEFAULTS, **json.loads(f.read(n_config).decode("utf-8")))
+        self.t0 = t0
+        self.bucket_s = bucket_s
+        self.data_offset = HEADER_SIZE + n_config
+
+    def _map_index(self):
+        """Petakan ulang indeks dan data (dipanggil lagi untuk melihat record baru, mis. log yang masih ditulis)"""
+        n = os.path.getsize(self.path + ".idx") // IDX_DTYPE.itemsize
+        nb = os.path.getsize(self.path + ".tidx") // TIDX_DTYPE.itemsize
+        self.index = np.memmap(self.path + ".idx", dtype=IDX_DTYPE, mode="r", shape=(n,)) if n else np.zeros(0, IDX_DTYPE)
+        self.tindex = np.memmap(self.path + ".tidx", dtype=TIDX_DTYPE, mode="r", shape=(nb,)) if nb else np.zeros(0, TIDX_DTYPE)
+        if self._mmap is not None:
+            self._mmap.close()
+        self._mmap = None
+        if n:
+            with open(self.path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    refresh = _map_index
+
+    def __len__(self):
+        return self._n if self.mode == "a" else len(self.index)
+
+    def record(self, seq):
+        """Record ke-seq -> dict (seq, t, latency, status, tx, rx). O(1) lewat indeks"""
+        if seq >= len(self.index):
+            self.refresh()
+        e = self.index[seq]
+        offset = int(e["offset"])
+        sync, status, rec_seq, t, latency, n_tx, n_rx = struct.unpack_from(REC_FMT, self._mmap, offset)
+        if sync != REC_SYNC or rec_seq != seq:
+            raise ValueError(f"Record {seq} rusak di offset {offset}")
+        body = offset + REC_SIZE
+        return {
+            "seq": seq, "t": t, "latency": latency, "status": status,
+            "tx": self._mmap[body:body + n_tx], "rx": self._mmap[body + n_tx:body + n_tx + n_rx],
+        }
+
+    def find_time(self, t):
+        """Seq record pertama dengan waktu >= t (lookup bucket + scan dalam satu bucket)"""
+        bucket = int((t - self.t0) // self.bucket_s)
+        if bucket < 0:
+            return 0
+        if bucket >= len(self.tindex):
+            return len(self.index)
+        seq = int(self.tindex[bucket])
+        while seq < len(self.index) and self.index[seq]["t"] < t:
+            seq += 1
+        return seq
+
+    def close(self):
+        for f in (self._data, getattr(self, "_idx", None), getattr(self, "_tidx", None)):
+            if f is not None:
+                f.close()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ================= REPLAY =================
+def payload(log, rec):
+    """Record -> (byte data frame, byte magnitude), framing dibuang untuk log framed_raw"""
+    if not log.config["framed_raw"]:
+        return rec["tx"], rec["rx"]
+    cfg = log.config
+    itemsize = golden_model.sample_dtype(cfg["bits"]).itemsize
+    n_in = cfg["points"] * (2 if cfg["pack_two"] else 1)
+    n_out = cfg["points"] + 2 if cfg["pack_two"] else golden_model.out_bins(cfg["points"], cfg["half_spectrum"])
+    return frame_link.strip_framing(rec["tx"], rec["rx"], n_in * itemsize, n_out * itemsize)
+
+
+def decode(log, raw, n_words):
+    """Byte mentah -> word int (n_words), None jika kurang"""
+    dtype = golden_model.sample_dtype(log.config["bits"])
+    if len(raw) < n_words * dtype.itemsize:
+        return None
+    return np.frombuffer(bytes(raw[:n_words * dtype.itemsize]), dtype=dtype)
+
+
+def expected_output(config, frame):
+    """Golden model untuk satu transaksi sesuai mode build yang tercatat"""
+    cfg = golden_model.get_variant(config["variant"])
+    if config["pack_two"]:
+        return golden_model.golden_output_packed(np.reshape(frame, (2, -1)), cfg)[0]
+    return golden_model.golden_output(frame, cfg, half=config["half_spectrum"])[0]
+
+
+def select(log, seq=None, count=None, t_from=None, t_to=None, status=None):
+    """Seq yang dipilih: rentang seq / waktu, opsional filter status (vektor atas indeks memmap)"""
+    start = seq if seq is not None else (log.find_time(t_from) if t_from is not None else 0)
+    stop = log.find_time(t_to) if t_to is not None else len(log.index)
+    if count is not None:
+        stop = min(stop, start + count)
+    seqs = np.arange(start, stop)
+    if status is not None:
+        seqs = seqs[log.index["status"][start:stop] == status]
+    return seqs
+
+
+def replay(log, seqs, driver=None):
+    """
+    Kirim ulang input tercatat ke golden model (driver None) atau board baru, bandingkan.
+    Return: list dict per transaksi (seq, status log, cocok golden, cocok replay, selisih max)
+    """
+    cfg = log.config
+    n_in = cfg["points"] * (2 if cfg["pack_two"] else 1)
+    rows = []
+    for seq in seqs:
+        rec = log.record(int(seq))
+        if rec["status"] == STATUS_RESYNC:
+            continue
+        tx, rx = payload(log, rec)
+        frame = decode(log, tx, n_in)
+        if frame is None:
+            continue
+        golden = expected_output(cfg, frame)
+        logged = decode(log, rx, len(golden))
+        again = None
+        if driver is not None:
+            again, _ = driver.transact(frame)
+        reference = golden if driver is None else again
+        diff = None
+        if logged is not None and reference is not None:
+            diff = int(np.max(np.abs(logged.astype(int) - reference.astype(int))))
+        rows.append({
+            "seq": int(seq),
+            "status": STATUS_NAMES.get(rec["status"], str(rec["status"])),
+            "logged_golden": logged is not None and bool(np.array_equal(logged, golden)),
+            "replay_golden": None if driver is None else again is not None and bool(np.array_equal(again, golden)),
+            "diff": diff,
+        })
+    return rows
+
+
+def triage(rows, device):
+    """Kelompokkan hasil replay. Board baru: salah sekali (acak) vs salah lagi saat replay (berulang)"""
+    groups = {"cocok": [], "timeout": [], "salah": []}
+    if device:
+        groups = {"cocok": [], "timeout": [], "salah acak": [], "salah berulang": [], "replay gagal": []}
+    for r in rows:
+        if r["status"] == "timeout" or r["diff"] is None and not device:
+            key = "timeout"
+        elif r["logged_golden"]:
+            key = "cocok"
+        elif not device:
+            key = "salah"
+        elif r["replay_golden"] is None or r["diff"] is None:
+            key = "replay gagal"
+        else:
+            key = "salah acak" if r["replay_golden"] else "salah berulang"
+        groups[key].append(r["seq"])
+    return groups
+
+
+def print_info(log):
+    idx = log.index
+    print(f"[-] Config     : {log.config}")
+    counts = ", ".join(f"{name} {int(np.sum(idx['status'] == code))}" for code, name in STATUS_NAMES.items())
+    print(f"[-] Transaksi  : {len(idx)} ({counts})")
+    if len(idx):
+        t_start, t_end = float(idx["t"][0]), float(idx["t"][-1])
+        print(f"[-] Waktu      : {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(t_start))} - "
+              f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(t_end))} ({t_end - t_start:.1f} s)")
+        lat = idx["latency"][idx["status"] == STATUS_OK]
+        if len(lat):
+            print(f"[-] Latency    : p50 {np.percentile(lat, 50) * 1e3:.2f} ms, p99 {np.percentile(lat, 99) * 1e3:.2f} ms")
+
+
+def _parse_time(text, log):
+    """Detik sejak awal log (angka) atau 'YYYY-mm-dd HH:MM:SS'"""
+    try:
+        return log.t0 + float(text)
+    except ValueError:
+        return time.mktime(time.strptime(text, "%Y-%m-%d %H:%M:%S"))
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Info, pencarian dan replay log transaksi host <-> board (.fftl)")
+    parser.add_argument("log", help="File log (.fftl)")
+    parser.add_argument("--seq", type=int, default=None, help="Mulai dari seq ini")
+    parser.add_argument("--count", type=int, default=None, help="Jumlah transaksi")
+    parser.add_argument("--from", dest="t_from", help="Mulai waktu: detik sejak awal log atau 'YYYY-mm-dd HH:MM:SS'")
+    parser.add_argument("--to", dest="t_to", help="Sampai waktu (format sama)")
+    parser.add_argument("--status", choices=list(STATUS_NAMES.values()), help="Hanya transaksi berstatus ini")
+    parser.add_argument("--show", action="store_true", help="Tampilkan word input/output tiap transaksi")
+    parser.add_argument("--replay", action="store_true", help="Replay lewat golden model (default) atau board")
+    parser.add_argument("--port", help="Replay ke board di port ini")
+    parser.add_argument("--emulate", action="store_true", help="Replay ke emulator pty")
+    parser.add_argument("--time-scale", type=float, default=0.0)
+    parser.add_argument("--fault-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    log = TransactionLog(args.log, mode="r")
+    cfg = log.config
+    print(f"--- LOG TRANSAKSI {os.path.basename(args.log)} ---")
+    print_info(log)
+    status = {v: k for k, v in STATUS_NAMES.items()}.get(args.status)
+    seqs = select(log, args.seq, args.count,
+                  _parse_time(args.t_from, log) if args.t_from else None,
+                  _parse_time(args.t_to, log) if args.t_to else None, status)
+    print(f"[-] Dipilih    : {len(seqs)} transaksi" + (f" (seq {seqs[0]}..{seqs[-1]})" if len(seqs) else ""))
+
+    if args.show:
+        n_in = cfg["points"] * (2 if cfg["pack_two"] else 1)
+        for seq in seqs:
+            rec = log.record(int(seq))
+            tx, rx = payload(log, rec)
+            frame = decode(log, tx, n_in)
+            out = decode(log, rx, len(rx) // golden_model.sample_dtype(cfg["bits"]).itemsize)
+            print(f"    #{seq} {time.strftime('%H:%M:%S', time.localtime(rec['t']))} "
+                  f"{STATUS_NAMES.get(rec['status'])} {rec['latency'] * 1e3:.1f} ms")
+            print(f"      in : {frame.tolist() if frame is not None else bytes(rec['tx']).hex()}")
+            print(f"      out: {out.tolist() if out is not None else bytes(rec['rx']).hex()}")
+
+    if not args.replay:
+        log.close()
+        return
+
+    board = None
+    driver = None
+    try:
+        port = args.port
+        if args.emulate:
+            from board_emulator import BoardEmulator
+            board = BoardEmulator(cfg["variant"], time_scale=args.time_scale, fault_rate=args.fault_rate,
+                                  half_spectrum=cfg["half_spectrum"], pack_two=cfg["pack_two"],
+                                  framed=cfg["framed"], ping_pong=cfg["ping_pong"])
+            port = board.start()
+        if port is not None:
+            from uart_driver import UartFFTDriver
+            driver = UartFFTDriver(port, cfg["variant"], half_spectrum=cfg["half_spectrum"], pack_two=cfg["pack_two"],
+                                   framed=cfg["framed"], ping_pong=cfg["ping_pong"])
+        rows = replay(log, seqs, driver)
+    finally:
+        if driver is not None:
+            driver.close()
+        if board is not None:
+            board.stop()
+        log.close()
+
+    target = "golden model" if driver is None else ("emulator" if args.emulate else args.port)
+    print(f"--- REPLAY -> {target} ---")
+    for name, group in triage(rows, driver is not None).items():
+        head = ", ".join(str(s) for s in group[:10]) + (" ..." if len(group) > 10 else "")
+        print(f"    {name:<20}: {len(group):6d}  {head}")
+    diffs = [r["diff"] for r in rows if r["diff"]]
+    if diffs:
+        print(f"[!] Selisih max log vs {'golden' if driver is None else 'replay'}: {max(diffs)} LSB")
+    else:
+        print(f"[OK] Semua output tercatat cocok dengan {'golden' if driver is None else 'replay'}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,311 @@
+import numpy as np
+import argparse
+import time
+import os
+from collections import deque
+
+import golden_model
+import cycle_model
+import capture_format
+import frame_link
+import txlog
+from serial_link import SerialLink
+
+# ================= HOST DRIVER UART (STREAMING) =================
+# Mengirim frame ke uart_fft_top dan menerima POINTS word magnitude
+# (POINTS/2 + 1 word jika board di-build dengan g_HALF_SPECTRUM = true).
+# Mode pack (g_PACK_TWO = true): satu transaksi = 2 frame input, POINTS + 2 word keluar.
+# FSM board hanya menerima data di s_RX, sehingga frame berikutnya dikirim
+# segera setelah byte terakhir respons diterima (link tidak pernah idle).
+# Protokol framed (g_FRAMED = true): batch + CRC + seq lewat frame_link.FramedLink, resync otomatis.
+# log: setiap transaksi (termasuk frame nol resync) dicatat ke log transaksi .fftl (txlog.py).
+# Mode ping-pong (g_PING_PONG = true): board punya 2 bank memori, host menjaga 2 transaksi in-flight -
+# transaksi k+2 dikirim segera setelah respons k lengkap, sehingga RX dan TX board berjalan bersamaan.
+
+
+class UartFFTDriver:
+    def __init__(self, port, variant="32x16", clk_hz=cycle_model.CLK_HZ, clks_per_bit=cycle_model.CLKS_PER_BIT,
+                 timeout_factor=3.0, half_spectrum=False, pack_two=False, framed=False, batch=frame_link.DEFAULT_BATCH,
+                 log=None, ping_pong=False):
+        if framed and ping_pong:
+            raise ValueError("ping_pong tidak didukung bersama framed (g_FRAMED)")
+        self.variant = variant
+        self.cfg = golden_model.get_variant(variant)
+        self.points = self.cfg["points"]
+        self.half_spectrum = half_spectrum
+        self.pack_two = pack_two
+        self.params = cycle_model.rtl_params(self.cfg)
+        self.params.update(half_spectrum=half_spectrum, pack_two=pack_two, framed=framed, batch=batch,
+                           ping_pong=ping_pong)
+        self.ping_pong = ping_pong
+        self.out_words = cycle_model.out_words(self.params)
+        self.dtype = golden_model.sample_dtype(self.cfg["bits"])
+        self.frame_bytes = cycle_model.frame_bytes(self.points, self.cfg["bits"]) * cycle_model.frames_per_transaction(self.params)
+        self.out_bytes = cycle_model.frame_bytes(self.out_words, self.cfg["bits"])
+        self.clk_hz = clk_hz
+        self.clks_per_bit = clks_per_bit
+        self.timeout = max(0.5, self.expected_frame_time() * timeout_factor)
+        self.link = SerialLink(port, baud=round(cycle_model.baud_rate(clk_hz, clks_per_bit)))
+        self.framed = None
+        if framed:
+            rx_words = self.points * cycle_model.frames_per_transaction(self.params)
+            self.framed = frame_link.FramedLink(self.link, rx_words, self.out_bytes, self.dtype, batch, self.timeout,
+                                                resync_s=1.5 * cycle_model.cycles_to_seconds(frame_link.LINK_TIMEOUT, clk_hz),
+                                                byte_s=cycle_model.cycles_to_seconds(cycle_model.uart_byte_cycles(clks_per_bit), clk_hz))
+        self.log = txlog.TransactionLog(log, txlog.driver_config(self)) if log is not None else None
+        if self.framed is not None and self.log is not None:
+            self.framed.on_exchange = self._log_exchange
+
+        # Statistik
+        self.latencies = []
+        self.timeouts = 0
+        self._t_first = None
+        self._t_last = None
+
+    def expected_frame_time(self):
+        """Waktu teoretis satu transaksi dari cycle_model: RX + SETTLE + FFT + MAG + TX (detik)"""
+        cycles = cycle_model.frame_cycles(self.params, self.clks_per_bit)
+        return cycle_model.cycles_to_seconds(cycles, self.clk_hz)
+
+    def expected_period(self):
+        """Periode transaksi steady-state dari cycle_model (ping-pong: RX dan proses overlap) (detik)"""
+        cycles = cycle_model.transaction_period(self.params, self.clks_per_bit)
+        return cycle_model.cycles_to_seconds(cycles, self.clk_hz)
+
+    def encode(self, frame):
+        """Frame int -> byte UART (LSB dulu untuk 16-bit)"""
+        return np.asarray(frame).astype(self.dtype).tobytes()
+
+    def transact(self, frame):
+        """Kirim satu frame (mode pack: 2 frame), tunggu out_words word. Return: (words | None, latency detik)"""
+        if self.framed is not None:
+            _, words, latency = next(self._stream_framed([frame]))
+            return words, latency
+        t0 = time.monotonic()
+        if self._t_first is None:
+            self._t_first = t0
+        data = self.encode(frame)
+        self.link.write(data)
+        raw = self.link.read_exact(self.out_bytes, self.timeout)
+        latency = time.monotonic() - t0
+        self._t_last = time.monotonic()
+        if self.log is not None:
+            self.log.append(data, raw, latency, txlog.STATUS_OK if len(raw) == self.out_bytes else txlog.STATUS_TIMEOUT)
+
+        if len(raw) < self.out_bytes:
+            self.timeouts += 1
+            self.resync()
+            return None, latency
+        self.latencies.append(latency)
+        return np.frombuffer(raw, dtype=self.dtype).copy(), latency
+
+    def resync(self):
+        """
+        Pulihkan sinkronisasi setelah timeout: tunggu idle timeout uart_rx (reset pasangan byte),
+        lalu kirim satu frame nol untuk melengkapi frame parsial di board dan buang responsnya.
+        """
+        time.sleep(cycle_model.cycles_to_seconds(cycle_model.RX_IDLE_TIMEOUT, self.clk_hz) * 1.5)
+        self.link.flush_input()
+        t0 = time.monotonic()
+        self.link.write(bytes(self.frame_bytes))
+        raw = self.link.read_exact(self.out_bytes, self.timeout)
+        if self.log is not None:
+            self.log.append(bytes(self.frame_bytes), raw, time.monotonic() - t0, txlog.STATUS_RESYNC)
+        time.sleep(cycle_model.cycles_to_seconds(cycle_model.uart_byte_cycles(self.clks_per_bit), self.clk_hz) * 2)
+        self.link.flush_input()
+
+    def stream(self, frames):
+        """Generator: (index, words | None, latency) untuk setiap transaksi, back-to-back"""
+        if self.pack_two:
+            frames = iter(frames)
+            frames = (np.concatenate([a, b]) for a, b in zip(frames, frames))
+        if self.framed is not None:
+            yield from self._stream_framed(frames)
+            return
+        if self.ping_pong:
+            yield from self._stream_pipelined(frames)
+            return
+        for idx, frame in enumerate(frames):
+            words, latency = self.transact(frame)
+            yield idx, words, latency
+
+    def _stream_pipelined(self, frames):
+        """
+        Ping-pong: maksimal PING_PONG_BANKS transaksi in-flight (satu per bank), respons datang berurutan.
+        Latency diukur dari pengiriman transaksi sampai respons lengkap (termasuk antre di belakang transaksi lain).
+        Timeout: transaksi in-flight lain ikut dianggap hilang, lalu resync_pipeline().
+        """
+        frames = enumerate(frames)
+        inflight = deque()
+        if self._t_first is None:
+            self._t_first = time.monotonic()
+        while True:
+            while len(inflight) < cycle_model.PING_PONG_BANKS:
+                item = next(frames, None)
+                if item is None:
+                    break
+                data = self.encode(item[1])
+                inflight.append((item[0], data, time.monotonic()))
+                self.link.write(data)
+            if not inflight:
+                return
+
+            idx, data, t0 = inflight.popleft()
+            raw = self.link.read_exact(self.out_bytes, self.timeout)
+            latency = time.monotonic() - t0
+            self._t_last = time.monotonic()
+            if len(raw) == self.out_bytes:
+                if self.log is not None:
+                    self.log.append(data, raw, latency, txlog.STATUS_OK)
+                self.latencies.append(latency)
+                yield idx, np.frombuffer(raw, dtype=self.dtype).copy(), latency
+                continue
+
+            lost = [(idx, data, raw, latency)] + [(i, d, b"", time.monotonic() - t) for i, d, t in inflight]
+            inflight.clear()
+            for i, d, r, lat in lost:
+                if self.log is not None:
+                    self.log.append(d, r, lat, txlog.STATUS_TIMEOUT)
+                self.timeouts += 1
+            self.resync_pipeline()
+            for i, _, _, lat in lost:
+                yield i, None, lat
+
+    def resync_pipeline(self):
+        """
+        Resync mode ping-pong: tunggu link diam > RX_IDLE_TIMEOUT (board membuang frame parsial),
+        lalu tunggu respons transaksi yang masih diproses selesai terkirim dan buang.
+        """
+        time.sleep(cycle_model.cycles_to_seconds(cycle_model.RX_IDLE_TIMEOUT, self.clk_hz) * 1.5)
+        time.sleep(self.expected_frame_time() * cycle_model.PING_PONG_BANKS)
+        self.link.flush_input()
+
+    def _stream_framed(self, frames):
+        frames = list(frames)
+        self._t_first = time.monotonic()
+        for idx, words, latency in self.framed.stream(frames):
+            self._t_last = time.monotonic()
+            if words is None:
+                self.timeouts += 1
+            else:
+                self.latencies.append(latency)
+            yield idx, words, latency
+
+    def _log_exchange(self, tx, rx, latency, status):
+        """Setiap percobaan frame framed dicatat dengan byte mentah di jalur (header, CRC, sync/seq)"""
+        code = {"ok": txlog.STATUS_OK, "timeout": txlog.STATUS_TIMEOUT}.get(status, txlog.STATUS_LINK_ERROR)
+        self.log.append(tx, rx, latency, code)
+
+    def stats(self):
+        """Ringkasan throughput dan latency"""
+        lat = np.array(self.latencies) if self.latencies else np.zeros(1)
+        elapsed = (self._t_last - self._t_first) if self._t_first is not None else 0.0
+        n_ok = len(self.latencies)
+        return {
+            "frames_ok": n_ok,
+            "timeouts": self.timeouts,
+            "elapsed_s": elapsed,
+            "frames_per_s": n_ok * cycle_model.frames_per_transaction(self.params) / elapsed if elapsed > 0 else 0.0,
+            "latency_mean_s": float(lat.mean()),
+            "latency_p50_s": float(np.percentile(lat, 50)),
+            "latency_p99_s": float(np.percentile(lat, 99)),
+            "latency_max_s": float(lat.max()),
+            "expected_frame_s": self.expected_frame_time(),
+            "expected_period_s": self.expected_period(),
+            **(self.framed.stats() if self.framed is not None else {}),
+        }
+
+    def close(self):
+        self.link.close()
+        if self.log is not None:
+            self.log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def print_stats(stats):
+    print(f"[-] Frame OK / Timeout : {stats['frames_ok']} / {stats['timeouts']}")
+    print(f"[-] Throughput         : {stats['frames_per_s']:.3f} frame/s")
+    print(f"[-] Latency mean/p50   : {stats['latency_mean_s'] * 1e3:.2f} / {stats['latency_p50_s'] * 1e3:.2f} ms")
+    print(f"[-] Latency p99/max    : {stats['latency_p99_s'] * 1e3:.2f} / {stats['latency_max_s'] * 1e3:.2f} ms")
+    print(f"[-] Teoretis per frame : {stats['expected_frame_s'] * 1e3:.2f} ms")
+    if stats["expected_period_s"] != stats["expected_frame_s"]:
+        print(f"[-] Teoretis periode   : {stats['expected_period_s'] * 1e3:.2f} ms (overlap ping-pong)")
+    if "batches" in stats:
+        print(f"[-] Batch / retransmit : {stats['batches']} / {stats['retransmits']} "
+              f"(NAK {stats['naks']}, CRC {stats['crc_errors']}, timeout {stats['link_timeouts']}, "
+              f"seq {stats['seq_errors']}, dilewati {stats['dropped']})")
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Streaming frame ke uart_fft_top")
+    parser.add_argument("--variant", default="32x16", choices=list(golden_model.VARIANTS))
+    parser.add_argument("--port", help="Port serial board (mis. /dev/ttyUSB0, COM3)")
+    parser.add_argument("--emulate", action="store_true", help="Gunakan emulator pty, bukan board")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Skala waktu emulator (0 = tanpa delay)")
+    parser.add_argument("--input", help="File input (.fftc atau .bin lama)")
+    parser.add_argument("--output", help="Simpan output ke container .fftc")
+    parser.add_argument("--frames", type=int, default=None, help="Jumlah frame (input diulang jika kurang)")
+    parser.add_argument("--half", action="store_true", help="Board di-build dengan g_HALF_SPECTRUM = true")
+    parser.add_argument("--pack", action="store_true", help="Board di-build dengan g_PACK_TWO = true")
+    parser.add_argument("--framed", action="store_true", help="Board di-build dengan g_FRAMED = true")
+    parser.add_argument("--batch", type=int, default=frame_link.DEFAULT_BATCH, help="Frame per batch (mode framed)")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Emulator: peluang byte masuk hilang")
+    parser.add_argument("--log", help="Catat semua transaksi ke log .fftl (append)")
+    parser.add_argument("--ping-pong", action="store_true", help="Board di-build dengan g_PING_PONG = true")
+    args = parser.parse_args()
+    if args.framed and args.ping_pong:
+        parser.error("--framed dan --ping-pong tidak bisa dipakai bersamaan")
+
+    cfg = golden_model.get_variant(args.variant)
+    testing_dir = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    input_path = args.input or os.path.join(testing_dir, f"input_{args.variant}.bin")
+    header, frames = capture_format.open_capture(input_path, cfg["points"], cfg["bits"])
+    n_frames = args.frames or len(frames)
+    n_frames += n_frames % 2 if args.pack else 0  # mode pack: jumlah frame genap
+    order = np.arange(n_frames) % len(frames)
+
+    board = None
+    port = args.port
+    if args.emulate:
+        from board_emulator import BoardEmulator
+        board = BoardEmulator(args.variant, time_scale=args.time_scale, half_spectrum=args.half, pack_two=args.pack,
+                              framed=args.framed, drop_rate=args.drop_rate, ping_pong=args.ping_pong)
+        port = board.start()
+    if port is None:
+        parser.error("--port atau --emulate wajib diisi")
+
+    print(f"--- UART DRIVER {args.variant} ({port}) ---")
+    if args.pack:
+        expected = golden_model.golden_output_packed(np.asarray(frames)[order], args.variant)
+    else:
+        expected = golden_model.golden_output(frames, args.variant, half=args.half)[order]
+    received = np.zeros(expected.shape, dtype=expected.dtype)
+    mismatch = 0
+    try:
+        with UartFFTDriver(port, args.variant, half_spectrum=args.half, pack_two=args.pack,
+                           framed=args.framed, batch=args.batch, log=args.log, ping_pong=args.ping_pong) as drv:
+            for idx, words, latency in drv.stream(frames[i] for i in order):
+                if words is None:
+                    print(f"[!] Transaksi {idx}: timeout, resync")
+                    continue
+                received[idx] = words
+                mismatch += int(np.any(words != expected[idx]))
+            print_stats(drv.stats())
+    finally:
+        if board is not None:
+            board.stop()
+
+    print(f"[-] Frame beda golden  : {mismatch}/{len(expected)}")
+    if args.output:
+        capture_format.write_capture(args.output, received, cfg["bits"], header["scale"] or 1.0,
+                                     header["func"] or "", kind=capture_format.KIND_OUTPUT)
+        print(f"[OK] Output disimpan: {args.output}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,268 @@
+import numpy as np
+import argparse
+import time
+import sys
+import os
+
+import golden_model
+import cycle_model
+import corpus
+import stft
+
+# ================= PREDIKSI ZERO-CROSSING DARI OUTPUT FFT =================
+# Board hanya mengirim |X[k]| (fase hilang), sehingga prediksi dibagi dua:
+#   1. Spektrum magnitude -> komponen dominan: puncak lokal bin 1..POINTS/2 di atas ambang,
+#      frekuensi diperhalus dengan interpolasi rasio magnitude tetangga (Jain, jendela rektangular).
+#   2. Frame input yang dikirim host -> amplitudo + fase tiap komponen dengan least squares
+#      (DC + cos/sin per komponen), frekuensi diperhalus beberapa iterasi Gauss-Newton,
+#      lalu model diekstrapolasi ke depan.
+# Zero-crossing prediksi = pergantian tanda model pada grid halus setelah sampel terakhir frame.
+# Semua langkah tervektorisasi pada (n_frames, ...) tanpa loop Python per frame.
+
+DEFAULT_COMPONENTS = 3
+DEFAULT_THRESHOLD_DB = -30.0  # komponen lebih lemah dari puncak terbesar - 30 dB diabaikan
+MIN_MAGNITUDE = 2  # LSB, di bawah ini dianggap noise kuantisasi
+OVERSAMPLE = 8  # titik grid per sampel untuk mencari pergantian tanda
+RIDGE = 1e-6  # regularisasi relatif least squares (komponen nonaktif / frekuensi berdempet)
+REFINE_ITERS = 3  # iterasi Gauss-Newton frekuensi (0 = frekuensi dari spektrum saja)
+MAX_CROSSINGS = 64  # crossing per frame yang disimpan (array dipad NaN)
+
+
+def find_crossings(y, u, max_count=MAX_CROSSINGS):
+    """
+    Pergantian tanda y (n, G) pada grid u (G,), diinterpolasi linear.
+    Return: (posisi (n, max_count) NaN-padded, arah +1 naik / -1 turun)
+    """
+    s = np.signbit(y)
+    change = s[:, 1:] != s[:, :-1]
+    # Ambil max_count pergantian pertama per frame tanpa loop (argsort stabil pada mask)
+    order = np.argsort(~change, axis=1, kind="stable")[:, :max_count]
+    valid = np.take_along_axis(change, order, axis=1)
+    y0 = np.take_along_axis(y, order, axis=1)
+    y1 = np.take_along_axis(y, order + 1, axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        frac = np.where(y1 != y0, y0 / (y0 - y1), 0.0)
+    pos = u[order] + frac * (u[1] - u[0])
+    direction = np.where(y1 > y0, 1, -1)
+    return np.where(valid, pos, np.nan), np.where(valid, direction, 0)
+
+
+class ZeroCrossingPredictor:
+    def __init__(self, points, components=DEFAULT_COMPONENTS, threshold_db=DEFAULT_THRESHOLD_DB,
+                 horizon=None, oversample=OVERSAMPLE, refine=REFINE_ITERS):
+        self.points = points
+        self.refine = refine
+        self.components = components
+        self.threshold = 10 ** (threshold_db / 20)
+        self.horizon = horizon or points
+        # Grid prediksi: dari sampel terakhir frame (n = POINTS - 1) sejauh horizon sampel
+        self.grid = points - 1 + np.arange(self.horizon * oversample + 1) / oversample
+        self.n = np.arange(points)
+
+    def dominant(self, mags):
+        """
+        Magnitude bin 0..POINTS/2 (n, POINTS/2 + 1) -> (frekuensi siklus/sampel (n, K), aktif (n, K)).
+        Bin POINTS/2 memakai cermin |X[N/2 + 1]| = |X[N/2 - 1]| sebagai tetangga kanan.
+        """
+        m = np.asarray(mags, dtype=np.float64)
+        half = self.points // 2
+        ext = np.concatenate([m, m[:, half - 1:half]], axis=1)
+        k = np.arange(1, half + 1)
+        left, mid, right = ext[:, k - 1], ext[:, k], ext[:, k + 1]
+        peak = (mid >= left) & (mid > right)
+        floor = np.maximum(MIN_MAGNITUDE, self.threshold * mid.max(axis=1, keepdims=True))
+        score = np.where(peak & (mid >= floor), mid, 0.0)
+
+        top = np.argsort(-score, axis=1, kind="stable")[:, :self.components]
+        active = np.take_along_axis(score, top, axis=1) > 0
+        bins = k[top]
+        m0 = np.take_along_axis(mid, top, axis=1)
+        ml = np.take_along_axis(left, top, axis=1)
+        mr = np.take_along_axis(right, top, axis=1)
+        # Jain: offset = m_tetangga / (m_puncak + m_tetangga), ke arah tetangga yang lebih besar
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = np.where(mr > ml, mr / (m0 + mr), -ml / (m0 + ml))
+        delta = np.where(bins == half, 0.0, np.nan_to_num(delta))  # Nyquist: tidak bisa digeser
+        return (bins + delta) / self.points, active
+
+    def _design(self, u, freqs, active):
+        """Matriks [1, cos, sin per komponen] (n, len(u), 2K + 1); komponen nonaktif = kolom nol"""
+        phase = 2 * np.pi * freqs[:, np.newaxis, :] * u[np.newaxis, :, np.newaxis]
+        w = active[:, np.newaxis, :]
+        ones = np.ones(phase.shape[:2] + (1,))
+        return np.concatenate([ones, np.cos(phase) * w, np.sin(phase) * w], axis=2)
+
+    def _solve(self, a, y):
+        """Normal equation batch (a^T a + ridge) d = a^T y, ridge relatif diagonal + absolut kecil"""
+        gram = np.einsum("nij,nik->njk", a, a)
+        eye = np.eye(gram.shape[-1])
+        gram += (RIDGE * np.einsum("njj->nj", gram))[:, :, np.newaxis] * eye + RIDGE * self.points * eye
+        return np.linalg.solve(gram, np.einsum("nij,ni->nj", a, y)[..., np.newaxis])[..., 0]
+
+    def fit(self, frames, freqs, active):
+        """
+        Least squares DC + amplitudo/fase per frame, lalu Gauss-Newton atas (koefisien, frekuensi).
+        Langkah frekuensi dibatasi +-0.5 bin per iterasi. Return: (koefisien (n, 2K + 1), frekuensi (n, K))
+        """
+        x = np.asarray(frames, dtype=np.float64)
+        k = freqs.shape[1]
+        a = self._design(self.n, freqs, active)
+        coef = self._solve(a, x)
+        for _ in range(self.refine):
+            phase = 2 * np.pi * freqs[:, np.newaxis, :] * self.n[np.newaxis, :, np.newaxis]
+            amp_c, amp_s = coef[:, np.newaxis, 1:k + 1], coef[:, np.newaxis, k + 1:]
+            d_freq = 2 * np.pi * self.n[np.newaxis, :, np.newaxis] * (amp_s * np.cos(phase) - amp_c * np.sin(phase))
+            jac = np.concatenate([a, d_freq * active[:, np.newaxis, :]], axis=2)
+            step = self._solve(jac, x - np.einsum("nij,nj->ni", a, coef))
+            coef = coef + step[:, :2 * k + 1]
+            freqs = freqs + np.clip(step[:, 2 * k + 1:], -0.5 / self.points, 0.5 / self.points)
+            a = self._design(self.n, freqs, active)
+        return coef, freqs
+
+    def extrapolate(self, coef, freqs, active, u=None):
+        """Nilai model di posisi sampel u (default: grid prediksi) -> (n, len(u))"""
+        u = self.grid if u is None else u
+        return np.einsum("nij,nj->ni", self._design(u, freqs, active), coef)
+
+    def predict(self, frames, mags):
+        """
+        frames (n, POINTS) sampel yang dikirim, mags (n, >= POINTS/2 + 1) magnitude (sudah di-unskew).
+        Return: (crossing (n, MAX_CROSSINGS) dalam sampel relatif awal frame, NaN-padded; arah)
+        """
+        frames = np.atleast_2d(frames)
+        mags = np.atleast_2d(mags)[:, :self.points // 2 + 1]
+        freqs, active = self.dominant(mags)
+        coef, freqs = self.fit(frames, freqs, active)
+        return find_crossings(self.extrapolate(coef, freqs, active), self.grid)
+
+
+# ================= EVALUASI =================
+def true_crossings(func, starts, predictor):
+    """Crossing sinyal analog (ekspresi t, t = sampel / POINTS seperti generate.py) pada grid prediksi"""
+    t = (starts[:, np.newaxis] + predictor.grid[np.newaxis, :]) / predictor.points
+    y = np.broadcast_to(eval(corpus.compile_expr(func), {"np": np, "t": t}), t.shape)
+    return find_crossings(np.asarray(y, dtype=np.float64), predictor.grid)
+
+
+def match_crossings(pred, true, lead, tol):
+    """
+    Cocokkan crossing yang masih bisa di-switch (>= lead sampel setelah frame) -> dict error (sampel).
+    Crossing benar tanpa prediksi dalam tol = terlewat; prediksi tanpa pasangan dalam tol = palsu.
+    """
+    true = np.where(true >= lead, true, np.nan)
+    pred = np.where(pred >= lead, pred, np.nan)
+    diff = np.abs(true[:, :, np.newaxis] - pred[:, np.newaxis, :])
+    diff = np.where(np.isnan(diff), np.inf, diff)
+    nearest = diff.min(axis=2)
+    has_true = ~np.isnan(true)
+    hit = has_true & (nearest <= tol)
+    false_pred = ~np.isnan(pred) & (diff.min(axis=1) > tol)
+    err = nearest[hit]
+    return {
+        "true": int(has_true.sum()),
+        "hit": int(hit.sum()),
+        "missed": int((has_true & ~hit).sum()),
+        "false": int(false_pred.sum()),
+        "err_mean": float(err.mean()) if err.size else float("nan"),
+        "err_p99": float(np.percentile(err, 99)) if err.size else float("nan"),
+        "err_max": float(err.max()) if err.size else float("nan"),
+    }
+
+
+def engine_latency(predictor, frames, mags, repeat):
+    """Latency per panggilan satu frame (kasus switching live) -> array detik"""
+    out = np.empty(repeat)
+    for i in range(repeat):
+        j = i % len(frames)
+        t0 = time.perf_counter()
+        predictor.predict(frames[j], mags[j])
+        out[i] = time.perf_counter() - t0
+    return out
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Prediksi zero-crossing dari output magnitude uart_fft_top")
+    parser.add_argument("--variant", default="32x16", choices=list(golden_model.VARIANTS))
+    parser.add_argument("--func", help="Ekspresi sinyal (default: FUNC_STR generate.py)")
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--hop", type=int, default=None, help="Sampel antar frame (default POINTS/4)")
+    parser.add_argument("--components", type=int, default=DEFAULT_COMPONENTS)
+    parser.add_argument("--threshold-db", type=float, default=DEFAULT_THRESHOLD_DB)
+    parser.add_argument("--horizon", type=int, default=None, help="Sampel ke depan (default POINTS)")
+    parser.add_argument("--tol", type=float, default=0.5, help="Toleransi cocok crossing (sampel)")
+    parser.add_argument("--fs", type=float, default=None, help="Sampel/detik fisik (default POINTS, t_end = 1 s)")
+    parser.add_argument("--baud", type=float, default=None, help="Baud untuk latency board (default RTL)")
+    parser.add_argument("--deadline-ms", type=float, default=1.0, help="Batas latency engine per frame")
+    parser.add_argument("--latency-frames", type=int, default=500)
+    parser.add_argument("--port", help="Backend board: port serial uart_fft_top")
+    parser.add_argument("--emulate", action="store_true", help="Backend emulator pty")
+    parser.add_argument("--time-scale", type=float, default=0.0)
+    args = parser.parse_args()
+
+    cfg = golden_model.get_variant(args.variant)
+    points = cfg["points"]
+    hop = args.hop or max(1, points // 4)
+    fs = args.fs or float(points)
+    func = args.func
+    if func is None:
+        sys.path.insert(0, os.path.join(golden_model.REPO_DIR, "testing", "signal", args.variant, "generate"))
+        import generate
+        func = generate.FUNC_STR
+
+    print(f"--- PREDIKSI ZERO-CROSSING {args.variant} ---")
+    print(f"[-] Sinyal: {func}, hop {hop}, fs {fs:g} sampel/s")
+    source = stft.expr_source(func, points, cfg["bits"], n_samples=points + (args.frames - 1) * hop)
+    board = None
+    driver = None
+    if args.emulate or args.port:
+        port = args.port
+        if args.emulate:
+            from board_emulator import BoardEmulator
+            board = BoardEmulator(args.variant, time_scale=args.time_scale)
+            port = board.start()
+        from uart_driver import UartFFTDriver
+        driver = UartFFTDriver(port, args.variant)
+        backend = stft.DeviceBackend(driver)
+    else:
+        backend = stft.ModelBackend(args.variant)
+    try:
+        rows = list(stft.stream_spectra(source, backend, points, hop, args.frames))
+    finally:
+        if driver is not None:
+            driver.close()
+        if board is not None:
+            board.stop()
+    starts = np.array([r[1] for r in rows])
+    frames = np.stack([r[2] for r in rows])
+    mags = np.stack([r[3] for r in rows])  # backend stft sudah membalik skew uart_tx
+    print(f"[-] Frame: {len(rows)} ({'golden model' if driver is None else 'board'}, hilang {backend.lost})")
+
+    predictor = ZeroCrossingPredictor(points, args.components, args.threshold_db, args.horizon)
+    t0 = time.perf_counter()
+    pred, _ = predictor.predict(frames, mags)
+    batch_s = (time.perf_counter() - t0) / len(frames)
+    single = engine_latency(predictor, frames, mags, args.latency_frames)
+
+    # Crossing yang bisa di-switch: setelah frame terkirim, diproses board dan engine
+    board_s = cycle_model.summarize(cycle_model.rtl_params(cfg), baud=args.baud)["latency_s"]
+    decision_s = board_s + float(np.percentile(single, 99))
+    lead = points - 1 + decision_s * fs
+    true, _ = true_crossings(func, starts, predictor)
+    acc = match_crossings(pred, true, lead, args.tol)
+
+    print("[-] Latency engine:")
+    print(f"    batch          : {batch_s * 1e6:.1f} us/frame")
+    print(f"    per frame p50  : {np.percentile(single, 50) * 1e6:.1f} us")
+    print(f"    per frame p99  : {np.percentile(single, 99) * 1e6:.1f} us (max {single.max() * 1e6:.1f} us)")
+    status = "[OK]" if np.percentile(single, 99) * 1e3 <= args.deadline_ms else "[!]"
+    print(f"{status} p99 vs deadline {args.deadline_ms:g} ms")
+    print(f"[-] Keputusan siap {decision_s * 1e3:.2f} ms setelah frame (board {board_s * 1e3:.2f} ms + engine p99)")
+    print(f"[-] Akurasi crossing (>= {lead - points + 1:.2f} sampel setelah frame, tol {args.tol:g} sampel):")
+    print(f"    crossing benar : {acc['true']} (kena {acc['hit']}, terlewat {acc['missed']}, palsu {acc['false']})")
+    print(f"    error mean/p99 : {acc['err_mean']:.4f} / {acc['err_p99']:.4f} sampel "
+          f"({acc['err_mean'] / fs * 1e3:.3f} / {acc['err_p99'] / fs * 1e3:.3f} ms)")
+    print(f"    error max      : {acc['err_max']:.4f} sampel")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,63 @@
+-- Dibangkitkan oleh testing/tools/fft_gen.py (256x16), jangan diedit manual
+library ieee;
+use ieee.std_logic_1164.all;
+use ieee.numeric_std.all;
+
+package fft_pkg is
+    constant points        : integer := 256;
+    constant data_width    : integer := 16;
+    constant c_LOG2_POINTS : integer := 8;
+    constant c_TWIDDLE_WIDTH : integer := 16;
+    constant c_QUARTER     : integer := points/4;
+
+    type t_Complex_Array is array (0 to points-1) of signed(data_width-1 downto 0);
+    type t_Twiddle_ROM is array (0 to c_QUARTER) of signed(c_TWIDDLE_WIDTH-1 downto 0);
+
+    -- Seperempat gelombang: round(cos(2*pi*k/points) * 32767), k = 0..points/4
+    constant TWIDDLE_QROM : t_Twiddle_ROM := (
+        to_signed(32767, 16), to_signed(32757, 16), to_signed(32728, 16), to_signed(32678, 16),
+        to_signed(32609, 16), to_signed(32521, 16), to_signed(32412, 16), to_signed(32285, 16),
+        to_signed(32137, 16), to_signed(31971, 16), to_signed(31785, 16), to_signed(31580, 16),
+        to_signed(31356, 16), to_signed(31113, 16), to_signed(30852, 16), to_signed(30571, 16),
+        to_signed(30273, 16), to_signed(29956, 16), to_signed(29621, 16), to_signed(29268, 16),
+        to_signed(28898, 16), to_signed(28510, 16), to_signed(28105, 16), to_signed(27683, 16),
+        to_signed(27245, 16), to_signed(26790, 16), to_signed(26319, 16), to_signed(25832, 16),
+        to_signed(25329, 16), to_signed(24811, 16), to_signed(24279, 16), to_signed(23731, 16),
+        to_signed(23170, 16), to_signed(22594, 16), to_signed(22005, 16), to_signed(21403, 16),
+        to_signed(20787, 16), to_signed(20159, 16), to_signed(19519, 16), to_signed(18868, 16),
+        to_signed(18204, 16), to_signed(17530, 16), to_signed(16846, 16), to_signed(16151, 16),
+        to_signed(15446, 16), to_signed(14732, 16), to_signed(14010, 16), to_signed(13279, 16),
+        to_signed(12539, 16), to_signed(11793, 16), to_signed(11039, 16), to_signed(10278, 16),
+        to_signed(9512, 16), to_signed(8739, 16), to_signed(7962, 16), to_signed(7179, 16),
+        to_signed(6393, 16), to_signed(5602, 16), to_signed(4808, 16), to_signed(4011, 16),
+        to_signed(3212, 16), to_signed(2410, 16), to_signed(1608, 16), to_signed(804, 16),
+        to_signed(0, 16)
+    );
+
+    function twiddle_cos(k : integer) return signed;
+    function twiddle_sin(k : integer) return signed;
+    function reverse_bits(n : integer) return integer;
+end package;
+
+package body fft_pkg is
+    -- W^k = cos - j*sin, k = 0..points/2-1 (TWIDDLE_SIN = -sin seperti tabel lama)
+    function twiddle_cos(k : integer) return signed is
+    begin
+        if k <= c_QUARTER then return TWIDDLE_QROM(k);
+        else return -TWIDDLE_QROM(2*c_QUARTER - k); end if;
+    end function;
+
+    function twiddle_sin(k : integer) return signed is
+    begin
+        if k <= c_QUARTER then return -TWIDDLE_QROM(c_QUARTER - k);
+        else return -TWIDDLE_QROM(k - c_QUARTER); end if;
+    end function;
+
+    function reverse_bits(n : integer) return integer is
+        variable v_in, v_out : unsigned(c_LOG2_POINTS-1 downto 0);
+    begin
+        v_in := to_unsigned(n, c_LOG2_POINTS);
+        for i in 0 to c_LOG2_POINTS-1 loop v_out(i) := v_in(c_LOG2_POINTS-1-i); end loop;
+        return to_integer(v_out);
+    end function;
+end package body;
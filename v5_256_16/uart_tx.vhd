@@ -0,0 +1,102 @@
+library ieee;
+use ieee.std_logic_1164.all;
+use ieee.numeric_std.all;
+use work.link_pkg.all;
+
+entity uart_tx is
+    generic (
+        g_CLKS_PER_BIT : integer := 5208; g_LAST_ADDR : integer := 31;
+        -- true: bingkai protokol framed [sync, seq] + data + CRC-16 (lihat link_pkg)
+        g_FRAMED : boolean := false;
+        -- true: perilaku board (byte LOW word k diambil dari word k-1, lihat golden_model.uart_tx_words);
+        -- false: o_Addr di-update satu state lebih awal sehingga s_LOAD membaca word yang benar
+        g_TX_SKEW : boolean := false
+    );
+    port (
+        i_Clk : in std_logic; i_Rst_n : in std_logic; i_Start : in std_logic;
+        o_Addr : out integer range 0 to g_LAST_ADDR;
+        i_Data : in signed(15 downto 0);
+        o_UART_TX, o_Done : out std_logic;
+        i_Seq : in std_logic_vector(7 downto 0) := (others => '0');
+        i_Nak : in std_logic := '0' -- '1': kirim NAK (tanpa data)
+    );
+end uart_tx;
+
+architecture Behavioral of uart_tx is
+    type t_TX_State is (s_IDLE, s_LOAD, s_LOAD_FRAME, s_START_BIT, s_DATA_BITS, s_STOP_BIT, s_NEXT_BYTE);
+    signal r_SM : t_TX_State := s_IDLE;
+    signal r_Bit_Ctr : integer := 0;
+    signal r_Bit_Idx : integer range 0 to 7 := 0;
+    signal r_TX_Data : std_logic_vector(7 downto 0);
+    signal r_Addr : integer range 0 to g_LAST_ADDR := 0;
+    signal r_Byte_Sel : std_logic := '0'; -- 0: Low, 1: High
+    -- g_FRAMED: bagian bingkai yang sedang dikirim, byte ke-0/1 dari header atau CRC
+    type t_Part is (p_HEADER, p_DATA, p_CRC);
+    signal r_Part : t_Part := p_DATA;
+    signal r_Part_Idx : integer range 0 to 1 := 0;
+    signal r_CRC : std_logic_vector(15 downto 0) := c_CRC_INIT;
+    signal r_Seq : std_logic_vector(7 downto 0) := (others => '0');
+    signal r_Nak : std_logic := '0';
+begin
+    process(i_Clk, i_Rst_n) begin
+        if i_Rst_n = '0' then r_SM <= s_IDLE; o_UART_TX <= '1'; o_Done <= '0'; r_Addr <= 0;
+        elsif rising_edge(i_Clk) then
+            o_Done <= '0';
+            case r_SM is
+                when s_IDLE =>
+                    if i_Start = '1' then
+                        r_Addr <= 0; r_Byte_Sel <= '0'; r_CRC <= c_CRC_INIT; r_Seq <= i_Seq; r_Nak <= i_Nak; r_Part_Idx <= 0;
+                        if not g_TX_SKEW then o_Addr <= 0; end if;
+                        if g_FRAMED then r_Part <= p_HEADER; r_SM <= s_LOAD_FRAME;
+                        else r_Part <= p_DATA; r_SM <= s_LOAD; end if;
+                    end if;
+                when s_LOAD =>
+                    o_Addr <= r_Addr;
+                    if r_Byte_Sel = '0' then r_TX_Data <= std_logic_vector(i_Data(7 downto 0)); -- Low [cite: 329]
+                    else r_TX_Data <= std_logic_vector(i_Data(15 downto 8)); end if; -- High [cite: 330]
+                    r_SM <= s_START_BIT;
+                when s_LOAD_FRAME =>
+                    -- o_Addr tidak berubah: skew byte LOW word 0 sama dengan mode biasa
+                    if r_Part = p_HEADER then
+                        if r_Part_Idx = 1 then r_TX_Data <= r_Seq;
+                        elsif r_Nak = '1' then r_TX_Data <= c_SYNC_NAK;
+                        else r_TX_Data <= c_SYNC_ACK; end if;
+                    elsif r_Part_Idx = 0 then r_TX_Data <= r_CRC(7 downto 0);
+                    else r_TX_Data <= r_CRC(15 downto 8); end if;
+                    r_SM <= s_START_BIT;
+                when s_START_BIT =>
+                    o_UART_TX <= '0';
+                    -- CRC atas byte yang benar-benar dikirim (header + data)
+                    if g_FRAMED and r_Bit_Ctr = 0 and r_Part /= p_CRC then r_CRC <= crc16_byte(r_CRC, r_TX_Data); end if;
+                    if r_Bit_Ctr < g_CLKS_PER_BIT-1 then r_Bit_Ctr <= r_Bit_Ctr + 1;
+                    else r_Bit_Ctr <= 0; r_SM <= s_DATA_BITS; r_Bit_Idx <= 0; end if;
+                when s_DATA_BITS =>
+                    o_UART_TX <= r_TX_Data(r_Bit_Idx);
+                    if r_Bit_Ctr < g_CLKS_PER_BIT-1 then r_Bit_Ctr <= r_Bit_Ctr + 1;
+                    else r_Bit_Ctr <= 0;
+                        if r_Bit_Idx < 7 then r_Bit_Idx <= r_Bit_Idx + 1; else r_SM <= s_STOP_BIT; end if;
+                    end if;
+                when s_STOP_BIT =>
+                    o_UART_TX <= '1';
+                    if r_Bit_Ctr < g_CLKS_PER_BIT-1 then r_Bit_Ctr <= r_Bit_Ctr + 1;
+                    else r_Bit_Ctr <= 0; r_SM <= s_NEXT_BYTE; end if;
+                when s_NEXT_BYTE =>
+                    if r_Part /= p_DATA then
+                        if r_Part_Idx = 0 then r_Part_Idx <= 1; r_SM <= s_LOAD_FRAME;
+                        elsif r_Part = p_HEADER and r_Nak = '0' then r_Part <= p_DATA; r_SM <= s_LOAD;
+                        elsif r_Part = p_HEADER then r_Part <= p_CRC; r_Part_Idx <= 0; r_SM <= s_LOAD_FRAME;
+                        else o_Done <= '1'; r_SM <= s_IDLE; end if;
+                    elsif r_Byte_Sel = '0' then r_Byte_Sel <= '1'; r_SM <= s_LOAD;
+                    else
+                        r_Byte_Sel <= '0';
+                        if r_Addr < g_LAST_ADDR then
+                            r_Addr <= r_Addr + 1; r_SM <= s_LOAD;
+                            if not g_TX_SKEW then o_Addr <= r_Addr + 1; end if;
+                        elsif g_FRAMED then r_Part <= p_CRC; r_Part_Idx <= 0; r_SM <= s_LOAD_FRAME;
+                        else o_Done <= '1'; r_SM <= s_IDLE; end if;
+                    end if;
+                when others => r_SM <= s_IDLE;
+            end case;
+        end if;
+    end process;
+end Behavioral;
\ No newline at end of file
@@ -41,7 +41,7 @@ begin
             o_WE <= '0'; o_Done <= '0';
             case r_SM is
                 when s_IDLE => if i_Start = '1' then r_SM <= s_BIT_REV_START; end if;
-                when s_BIT_REV_START => r_Point_Idx <= 0; r_SM <= s_BIT_REV_PROC;
+                when s_BIT_REV_START => r_Point_Idx <= 0; r_Stage <= 1; r_SM <= s_BIT_REV_PROC;
                 when s_BIT_REV_PROC =>
                     if r_Point_Idx < 32 then
                         if r_Point_Idx < reverse_bits(r_Point_Idx) then
@@ -49,8 +49,9 @@ begin
                         else r_Point_Idx <= r_Point_Idx + 1; end if;
                     else r_Stage <= 1; r_DFT_Size <= 1; r_SM <= s_STAGE; end if;
                 when s_STAGE =>
-                    r_DFT_Size <= r_DFT_Size * 2; r_Stage <= r_Stage + 1;
-                    if r_Stage > 5 then r_SM <= s_DONE; else r_SM <= s_GROUP; end if; -- [cite: 300]
+                    -- Stage terakhir: counter tidak dinaikkan agar tetap dalam range
+                    if r_Stage > 5 then r_SM <= s_DONE;
+                    else r_DFT_Size <= r_DFT_Size * 2; r_Stage <= r_Stage + 1; r_SM <= s_GROUP; end if; -- [cite: 300]
                 when s_GROUP => r_Group <= 0; r_SM <= s_BUTTERFLY;
                 when s_BUTTERFLY =>
                     if r_Group < 32 then r_Butterfly <= 0; r_SM <= s_READ;
@@ -4,9 +4,12 @@ use ieee.numeric_std.all;
 use work.fft_pkg.all;
 
 entity magnitude_unit is
+    -- g_LAST_BIN = points/2 untuk mode half-spectrum (input real: bin N-k = cermin bin k),
+    -- points+1 untuk mode pack (2 alamat tambahan r_Extra di top)
+    generic ( g_LAST_BIN : integer := points-1 );
     port (
         i_Clk, i_Rst_n, i_Start : in std_logic;
-        o_Addr : out integer range 0 to points-1;
+        o_Addr : out integer range 0 to g_LAST_BIN;
         i_Re, i_Im : in signed(data_width-1 downto 0);
         o_Re : out signed(data_width-1 downto 0);
         o_WE, o_Done, o_Busy : out std_logic
@@ -18,7 +21,7 @@ architecture Behavioral of magnitude_unit is
     type t_State is (s_IDLE, s_READ, s_WAIT, s_CALC, s_WRITE, s_DONE);
     signal r_SM : t_State := s_IDLE;
     
-    signal r_Idx       : integer range 0 to points := 0;
+    signal r_Idx       : integer range 0 to g_LAST_BIN := 0;
     signal r_Sqrt_Op   : unsigned(31 downto 0);
     signal r_Sqrt_Rem  : unsigned(31 downto 0);
     signal r_Sqrt_Root : unsigned(15 downto 0);
@@ -71,7 +74,7 @@ begin
                     o_Addr <= r_Idx;
                     o_Re   <= signed(r_Sqrt_Root);
                     o_WE   <= '1';
-                    if r_Idx < points-1 then r_Idx <= r_Idx + 1; r_SM <= s_READ;
+                    if r_Idx < g_LAST_BIN then r_Idx <= r_Idx + 1; r_SM <= s_READ;
                     else r_SM <= s_DONE; end if;
 
                 when s_DONE => o_Done <= '1'; r_SM <= s_IDLE;
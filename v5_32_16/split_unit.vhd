@@ -0,0 +1,66 @@
+library ieee;
+use ieee.std_logic_1164.all;
+use ieee.numeric_std.all;
+use work.fft_pkg.all;
+
+-- Mode pack (g_PACK_TWO): mem_Real = frame a, mem_Imag = frame b, Z = FFT(a + jb).
+-- Karena a dan b real: A[k] = (Z[k] + conj Z[N-k]) / 2, B[k] = (Z[k] - conj Z[N-k]) / 2j
+-- Untuk k = 0..points/2, A[k] ditulis ke port A (alamat k), B[k] ke port B (alamat N-k).
+-- Pada k = 0 dan points/2 kedua alamat sama; B (real) disimpan top di r_Extra.
+entity split_unit is
+    port (
+        i_Clk, i_Rst_n, i_Start : in std_logic;
+        o_Addr_A, o_Addr_B : out integer range 0 to points-1;
+        i_Re_A, i_Im_A, i_Re_B, i_Im_B : in signed(data_width-1 downto 0);
+        o_Re_A, o_Im_A, o_Re_B, o_Im_B : out signed(data_width-1 downto 0);
+        o_WE, o_Done, o_Busy : out std_logic
+    );
+end split_unit;
+
+architecture Behavioral of split_unit is
+    type t_State is (s_IDLE, s_READ, s_WAIT, s_CALC, s_DONE);
+    signal r_SM : t_State := s_IDLE;
+    signal r_K  : integer range 0 to points/2 := 0;
+
+    -- (x + y) / 2 di lebar data_width+1 agar tidak overflow, sama seperti butterfly
+    function half_sum(x, y : signed) return signed is
+    begin
+        return resize(shift_right(resize(x, data_width+1) + resize(y, data_width+1), 1), data_width);
+    end function;
+    function half_diff(x, y : signed) return signed is
+    begin
+        return resize(shift_right(resize(x, data_width+1) - resize(y, data_width+1), 1), data_width);
+    end function;
+begin
+    o_Busy <= '0' when r_SM = s_IDLE else '1';
+
+    process(i_Clk, i_Rst_n) begin
+        if i_Rst_n = '0' then
+            r_SM <= s_IDLE; o_WE <= '0'; o_Done <= '0';
+        elsif rising_edge(i_Clk) then
+            o_WE <= '0'; o_Done <= '0';
+
+            case r_SM is
+                when s_IDLE =>
+                    if i_Start = '1' then r_K <= 0; r_SM <= s_READ; end if;
+
+                when s_READ =>
+                    o_Addr_A <= r_K;
+                    o_Addr_B <= (points - r_K) mod points;
+                    r_SM <= s_WAIT; -- Jeda 1 siklus untuk latensi RAM M9K
+
+                when s_WAIT => r_SM <= s_CALC;
+
+                when s_CALC =>
+                    o_Re_A <= half_sum(i_Re_A, i_Re_B);  o_Im_A <= half_diff(i_Im_A, i_Im_B);
+                    o_Re_B <= half_sum(i_Im_A, i_Im_B);  o_Im_B <= half_diff(i_Re_B, i_Re_A);
+                    o_WE <= '1';
+                    if r_K < points/2 then r_K <= r_K + 1; r_SM <= s_READ;
+                    else r_SM <= s_DONE; end if;
+
+                when s_DONE => o_Done <= '1'; r_SM <= s_IDLE;
+                when others => r_SM <= s_IDLE;
+            end case;
+        end if;
+    end process;
+end Behavioral;
@@ -66,6 +66,7 @@ begin
                 -- BIT REVERSAL PROCESS -- [cite: 55-56]
                 when s_BIT_REV_START =>
                     r_Point_Idx <= 0;
+                    r_Stage <= 1; -- Frame berikutnya: mode swap butuh stage 1
                     r_SM <= s_BIT_REV_PROC;
 
                 when s_BIT_REV_PROC =>
@@ -82,9 +83,14 @@ begin
                     end if;
 
                 when s_STAGE =>
-                    r_DFT_Size <= r_DFT_Size * 2; -- [cite: 58]
-                    r_Stage <= r_Stage + 1; -- [cite: 59]
-                    if r_Stage > 6 then r_SM <= s_DONE; else r_SM <= s_GROUP; end if; -- [cite: 59]
+                    -- Stage terakhir: counter tidak dinaikkan agar tetap dalam range
+                    if r_Stage > 6 then
+                        r_SM <= s_DONE;
+                    else
+                        r_DFT_Size <= r_DFT_Size * 2; -- [cite: 58]
+                        r_Stage <= r_Stage + 1; -- [cite: 59]
+                        r_SM <= s_GROUP;
+                    end if; -- [cite: 59]
 
                 when s_GROUP =>
                     r_Group <= 0; r_SM <= s_BUTTERFLY; -- [cite: 61-62]
@@ -0,0 +1,37 @@
+library ieee;
+use ieee.std_logic_1164.all;
+use ieee.numeric_std.all;
+
+-- Protokol framed (g_FRAMED di uart_fft_top), lihat testing/tools/frame_link.py
+--   Host -> board : header [A5 5A | jumlah frame u16 | panjang word u16 | CRC u16], lalu tiap frame: data + CRC u16
+--   Board -> host : [A5 | seq u8] + magnitude + CRC u16, atau NAK [E5 | seq u8] + CRC u16
+-- CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF), semua field u16 little endian.
+package link_pkg is
+    constant c_SYNC_HOST : std_logic_vector(15 downto 0) := x"5AA5"; -- byte A5 lalu 5A
+    constant c_SYNC_ACK  : std_logic_vector(7 downto 0) := x"A5";
+    constant c_SYNC_NAK  : std_logic_vector(7 downto 0) := x"E5";
+    constant c_CRC_INIT  : std_logic_vector(15 downto 0) := x"FFFF";
+    -- Tanpa byte masuk selama 50 ms di tengah header/batch -> kembali cari header
+    constant C_LINK_TIMEOUT : integer := 2500000;
+
+    function crc16_byte(crc : std_logic_vector(15 downto 0); data : std_logic_vector(7 downto 0)) return std_logic_vector;
+    function crc16_word(crc : std_logic_vector(15 downto 0); data : std_logic_vector(15 downto 0)) return std_logic_vector;
+end package;
+
+package body link_pkg is
+    function crc16_byte(crc : std_logic_vector(15 downto 0); data : std_logic_vector(7 downto 0)) return std_logic_vector is
+        variable v_CRC : std_logic_vector(15 downto 0) := crc xor (data & x"00");
+    begin
+        for i in 0 to 7 loop
+            if v_CRC(15) = '1' then v_CRC := (v_CRC(14 downto 0) & '0') xor x"1021";
+            else v_CRC := v_CRC(14 downto 0) & '0'; end if;
+        end loop;
+        return v_CRC;
+    end function;
+
+    -- Word 16-bit dari uart_rx: byte LOW diterima lebih dulu
+    function crc16_word(crc : std_logic_vector(15 downto 0); data : std_logic_vector(15 downto 0)) return std_logic_vector is
+    begin
+        return crc16_byte(crc16_byte(crc, data(7 downto 0)), data(15 downto 8));
+    end function;
+end package body;
@@ -2,9 +2,24 @@ library ieee;
 use ieee.std_logic_1164.all;
 use ieee.numeric_std.all;
 use work.fft_pkg.all;
+use work.link_pkg.all;
 
 entity uart_fft_top is
-    generic ( g_CLKS_PER_BIT : integer := 5208 ); -- [cite: 1]
+    generic (
+        g_CLKS_PER_BIT  : integer := 5208; -- [cite: 1]
+        -- true: hanya bin 0..points/2 yang dihitung magnitude-nya dan dikirim (input selalu real)
+        g_HALF_SPECTRUM : boolean := false;
+        -- true: terima 2 frame real (frame a -> mem_Real, frame b -> mem_Imag), satu FFT,
+        -- dipisah split_unit lalu kirim |A| bin 0..points/2 dan |B| bin 0..points/2 (points+2 word)
+        g_PACK_TWO      : boolean := false;
+        -- true: protokol framed (link_pkg) - header batch + CRC per frame, tanpa s_RX_SETTLE,
+        -- frame dalam satu batch diproses back-to-back, respons [sync, seq] + data + CRC
+        g_FRAMED        : boolean := false;
+        -- true: memori frame ping-pong (2 bank) - frame k+1 diterima ke satu bank selagi frame k
+        -- di-FFT dan dikirim dari bank lain; host mengirim maksimal 2 transaksi di depan respons
+        -- EKSPERIMENTAL: belum co-sim / Quartus, ~2x LE memori frame (lihat fft_gen.fit_estimate)
+        g_PING_PONG     : boolean := false
+    );
     port (
         i_Clk, i_Rst_n, i_UART_RX : in std_logic; -- [cite: 2]
         o_UART_TX, o_LED_Idle, o_LED_Busy : out std_logic -- [cite: 2]
@@ -12,47 +27,176 @@ entity uart_fft_top is
 end uart_fft_top;
 
 architecture Structural of uart_fft_top is
-    signal mem_Real, mem_Imag : t_Complex_Array; -- [cite: 3, 5]
+    function last_bin(half, pack : boolean) return integer is
+    begin
+        if pack then return points+1;
+        elsif half then return points/2; else return points-1; end if;
+    end function;
+    function rx_words(pack : boolean) return integer is
+    begin
+        if pack then return 2*points; else return points; end if;
+    end function;
+    function banks(ping_pong : boolean) return integer is
+    begin
+        if ping_pong then return 2; else return 1; end if;
+    end function;
+    constant c_LAST_BIN : integer := last_bin(g_HALF_SPECTRUM, g_PACK_TWO);
+    constant c_RX_WORDS : integer := rx_words(g_PACK_TWO);
+    constant c_BANKS    : integer := banks(g_PING_PONG);
+    constant c_RX_IDLE  : integer := 1000000; -- ping-pong: link diam di tengah frame -> frame parsial dibuang
+
+    type t_Bank_Array is array (0 to c_BANKS-1) of t_Complex_Array;
+    signal mem_Real, mem_Imag : t_Bank_Array; -- [cite: 3, 5]
+    -- Bank yang sedang diproses (dibaca FFT/SPLIT/MAG/TX), bank penerima, flag bank siap diproses
+    signal w_Real, w_Imag : t_Complex_Array;
+    signal r_RX_Bank, r_Proc_Bank : integer range 0 to c_BANKS-1 := 0;
+    signal r_Bank_Full : std_logic_vector(0 to c_BANKS-1) := (others => '0');
+    signal r_RX_Idle : integer range 0 to c_RX_IDLE := 0;
+    -- Mode pack: B[0] dan B[points/2] (real) di luar memori, alamat points dan points+1
+    type t_Extra_Array is array (0 to 1) of signed(7 downto 0);
+    signal r_Extra : t_Extra_Array := (others => (others => '0'));
     -- FSM dengan tambahan Jeda Pengaman
-    type t_Master_SM is (s_IDLE, s_RX, s_RX_SETTLE, s_FFT, s_MAG, s_TX); -- [cite: 9]
+    type t_Master_SM is (s_IDLE, s_HDR, s_RX, s_RX_SETTLE, s_FFT, s_SPLIT, s_MAG, s_TX); -- [cite: 9]
     signal r_Master_SM : t_Master_SM := s_IDLE;
     
     signal rx_done : std_logic; signal rx_byte : std_logic_vector(7 downto 0);
     signal fft_start, fft_done, fft_we : std_logic;
     signal fft_addr_a, fft_addr_b : integer range 0 to 63;
     signal fft_ore_a, fft_oim_a, fft_ore_b, fft_oim_b : signed(7 downto 0);
+    signal split_start, split_done, split_we : std_logic;
+    signal split_addr_a, split_addr_b : integer range 0 to 63;
+    signal split_ore_a, split_oim_a, split_ore_b, split_oim_b : signed(7 downto 0);
     signal mag_start, mag_done, mag_we : std_logic;
-    signal mag_addr : integer range 0 to 63; signal mag_ore : signed(7 downto 0);
-    signal tx_start, tx_done : std_logic; signal tx_addr : integer range 0 to 63;
-    signal rx_count : integer range 0 to 64 := 0; -- [cite: 13]
+    signal mag_addr : integer range 0 to c_LAST_BIN; signal mag_ore : signed(7 downto 0);
+    signal mag_re_in, mag_im_in, tx_data : signed(7 downto 0);
+    signal tx_start, tx_done : std_logic; signal tx_addr : integer range 0 to c_LAST_BIN;
+    signal rx_count : integer range 0 to 2*points+1 := 0; -- [cite: 13]
     signal r_Settle_Timer : integer range 0 to 50000 := 0;
+    -- Protokol framed: byte header 0..7 = A5 5A, jumlah frame, panjang, CRC (u16 LE)
+    signal r_Hdr_Idx : integer range 0 to 7 := 0;
+    signal r_Hdr_Lo : std_logic_vector(7 downto 0) := (others => '0');
+    signal r_Hdr_Len : integer range 0 to 65535 := 0;
+    signal r_Frames_Left : integer range 0 to 65535 := 0;
+    signal r_Seq : std_logic_vector(7 downto 0) := (others => '0');
+    signal r_CRC : std_logic_vector(15 downto 0) := c_CRC_INIT;
+    signal r_Nak : std_logic := '0';
+    signal r_Link_Timer : integer range 0 to C_LINK_TIMEOUT := 0;
 
 begin
     -- LED Status -- [cite: 30-32]
-    o_LED_Idle <= '0' when r_Master_SM = s_IDLE or r_Master_SM = s_RX else '1';
-    o_LED_Busy <= '0' when r_Master_SM /= s_IDLE and r_Master_SM /= s_RX else '1';
+    o_LED_Idle <= '0' when r_Master_SM = s_IDLE or r_Master_SM = s_HDR or r_Master_SM = s_RX else '1';
+    o_LED_Busy <= '1' when r_Master_SM = s_IDLE or r_Master_SM = s_HDR or r_Master_SM = s_RX else '0';
+
+    assert not (g_FRAMED and g_PING_PONG) report "g_PING_PONG tidak didukung bersama g_FRAMED" severity failure;
+    w_Real <= mem_Real(r_Proc_Bank);
+    w_Imag <= mem_Imag(r_Proc_Bank);
 
-    u_rx  : entity work.uart_rx port map(i_Clk, i_Rst_n, i_UART_RX, rx_done, rx_byte);
+    -- Alamat >= points hanya muncul di mode pack (r_Extra, imajiner 0)
+    mag_re_in <= w_Real(mag_addr mod points) when mag_addr < points else r_Extra(mag_addr mod 2);
+    mag_im_in <= w_Imag(mag_addr mod points) when mag_addr < points else (others => '0');
+    tx_data   <= w_Real(tx_addr mod points) when tx_addr < points else r_Extra(tx_addr mod 2);
+
+    u_rx  : entity work.uart_rx generic map(g_CLKS_PER_BIT => g_CLKS_PER_BIT) port map(i_Clk, i_Rst_n, i_UART_RX, rx_done, rx_byte);
     u_fft : entity work.fft_engine port map(i_Clk, i_Rst_n, fft_start, fft_addr_a, fft_addr_b, 
-            mem_Real(fft_addr_a), mem_Imag(fft_addr_a), mem_Real(fft_addr_b), mem_Imag(fft_addr_b), 
+            w_Real(fft_addr_a), w_Imag(fft_addr_a), w_Real(fft_addr_b), w_Imag(fft_addr_b), 
             fft_ore_a, fft_oim_a, fft_ore_b, fft_oim_b, fft_we, fft_done);
-    u_mag : entity work.magnitude_unit port map(i_Clk, i_Rst_n, mag_start, mag_addr, 
-            mem_Real(mag_addr), mem_Imag(mag_addr), mag_ore, mag_we, mag_done);
-    u_tx  : entity work.uart_tx port map(i_Clk, i_Rst_n, tx_start, tx_addr, mem_Real(tx_addr), 
-            o_UART_TX, tx_done);
+    u_split : entity work.split_unit port map(i_Clk, i_Rst_n, split_start, split_addr_a, split_addr_b,
+            w_Real(split_addr_a), w_Imag(split_addr_a), w_Real(split_addr_b), w_Imag(split_addr_b),
+            split_ore_a, split_oim_a, split_ore_b, split_oim_b, split_we, split_done, open);
+    u_mag : entity work.magnitude_unit generic map(g_LAST_BIN => c_LAST_BIN) port map(i_Clk, i_Rst_n, mag_start, mag_addr, 
+            mag_re_in, mag_im_in, mag_ore, mag_we, mag_done);
+    u_tx  : entity work.uart_tx generic map(g_CLKS_PER_BIT => g_CLKS_PER_BIT, g_LAST_ADDR => c_LAST_BIN, g_FRAMED => g_FRAMED) port map(i_Clk, i_Rst_n, tx_start, tx_addr, tx_data, 
+            o_UART_TX, tx_done, open, r_Seq, r_Nak);
 
     process(i_Clk, i_Rst_n) begin
         if i_Rst_n = '0' then r_Master_SM <= s_IDLE; -- [cite: 35]
+            rx_count <= 0; r_RX_Bank <= 0; r_Proc_Bank <= 0; r_Bank_Full <= (others => '0');
         elsif rising_edge(i_Clk) then
-            fft_start <= '0'; mag_start <= '0'; tx_start <= '0';
+            fft_start <= '0'; split_start <= '0'; mag_start <= '0'; tx_start <= '0';
+
+            -- Protokol framed: link diam terlalu lama di tengah header/batch -> cari header baru
+            if g_FRAMED and (r_Master_SM = s_HDR or r_Master_SM = s_RX) then
+                if rx_done = '1' or (r_Master_SM = s_HDR and r_Hdr_Idx = 0) then r_Link_Timer <= 0;
+                elsif r_Link_Timer < C_LINK_TIMEOUT then r_Link_Timer <= r_Link_Timer + 1;
+                else r_Master_SM <= s_IDLE; end if;
+            else
+                r_Link_Timer <= 0;
+            end if;
+
+            -- Ping-pong: RX berjalan di luar FSM master, mengisi bank r_RX_Bank selagi bank lain diproses.
+            -- Byte yang datang saat kedua bank penuh dibuang (host melanggar jendela 2 transaksi).
+            -- Link diam > c_RX_IDLE di tengah frame (resync host): frame parsial dibuang.
+            if g_PING_PONG then
+                if rx_done = '1' or rx_count = 0 then r_RX_Idle <= 0;
+                elsif r_RX_Idle < c_RX_IDLE then r_RX_Idle <= r_RX_Idle + 1;
+                else r_RX_Idle <= 0; rx_count <= 0; end if;
+            end if;
+            if g_PING_PONG and rx_done = '1' and r_Bank_Full(r_RX_Bank) = '0' then
+                if rx_count < points then
+                    mem_Real(r_RX_Bank)(rx_count) <= signed(rx_byte);
+                    if not g_PACK_TWO then mem_Imag(r_RX_Bank)(rx_count) <= (others => '0'); end if;
+                else
+                    mem_Imag(r_RX_Bank)(rx_count mod points) <= signed(rx_byte); -- Mode pack: frame kedua
+                end if;
+                if rx_count < c_RX_WORDS-1 then rx_count <= rx_count + 1;
+                else
+                    -- Bank penuh: serahkan ke FSM master, frame berikutnya masuk bank lain
+                    rx_count <= 0;
+                    r_Bank_Full(r_RX_Bank) <= '1'; r_RX_Bank <= (r_RX_Bank + 1) mod c_BANKS;
+                end if;
+            end if;
+
             case r_Master_SM is
-                when s_IDLE => rx_count <= 0; r_Master_SM <= s_RX; -- [cite: 38]
-                
-                when s_RX =>
+                when s_IDLE =>
+                    r_Hdr_Idx <= 0; r_Nak <= '0'; -- [cite: 38]
+                    if g_PING_PONG then
+                        -- Tunggu bank proses penuh (RX tidak di-reset, bisa sedang di tengah frame berikutnya)
+                        if r_Bank_Full(r_Proc_Bank) = '1' then r_Settle_Timer <= 0; r_Master_SM <= s_RX_SETTLE; end if;
+                    else
+                        rx_count <= 0;
+                        if g_FRAMED then r_Master_SM <= s_HDR; else r_Master_SM <= s_RX; end if;
+                    end if;
+
+                when s_HDR =>
                     if rx_done = '1' then
-                        mem_Real(rx_count) <= signed(rx_byte); -- [cite: 50]
-                        mem_Imag(rx_count) <= (others => '0'); -- [cite: 51]
-                        if rx_count < 63 then rx_count <= rx_count + 1; -- [cite: 51]
+                        r_Hdr_Idx <= r_Hdr_Idx + 1; r_Hdr_Lo <= rx_byte;
+                        if r_Hdr_Idx >= 2 and r_Hdr_Idx <= 5 then r_CRC <= crc16_byte(r_CRC, rx_byte); end if;
+                        case r_Hdr_Idx is
+                            when 0 =>
+                                r_CRC <= c_CRC_INIT;
+                                if rx_byte /= c_SYNC_HOST(7 downto 0) then r_Hdr_Idx <= 0; end if;
+                            when 1 =>
+                                -- A5 A5 ...: byte kedua bisa jadi awal sync baru
+                                if rx_byte = c_SYNC_HOST(7 downto 0) then r_Hdr_Idx <= 1;
+                                elsif rx_byte /= c_SYNC_HOST(15 downto 8) then r_Hdr_Idx <= 0; end if;
+                            when 3 => r_Frames_Left <= to_integer(unsigned(rx_byte & r_Hdr_Lo));
+                            when 5 => r_Hdr_Len <= to_integer(unsigned(rx_byte & r_Hdr_Lo));
+                            when 7 =>
+                                -- Header diterima jika CRC cocok, panjang = byte per transaksi, jumlah frame > 0
+                                r_Hdr_Idx <= 0;
+                                if rx_byte & r_Hdr_Lo = r_CRC and r_Hdr_Len = c_RX_WORDS and r_Frames_Left > 0 then
+                                    rx_count <= 0; r_Seq <= (others => '0'); r_CRC <= c_CRC_INIT; r_Master_SM <= s_RX;
+                                end if;
+                            when others => null;
+                        end case;
+                    end if;
+
+                when s_RX =>
+                    if rx_done = '1' and g_FRAMED and rx_count >= c_RX_WORDS then
+                        -- 2 byte CRC frame: cocok -> langsung FFT (tanpa settle), salah -> NAK lalu cari header
+                        r_Hdr_Lo <= rx_byte;
+                        if rx_count = c_RX_WORDS then rx_count <= rx_count + 1;
+                        elsif rx_byte & r_Hdr_Lo = r_CRC then fft_start <= '1'; r_Master_SM <= s_FFT;
+                        else r_Nak <= '1'; tx_start <= '1'; r_Master_SM <= s_TX; end if;
+                    elsif rx_done = '1' then
+                        r_CRC <= crc16_byte(r_CRC, rx_byte);
+                        if rx_count < points then
+                            mem_Real(r_RX_Bank)(rx_count) <= signed(rx_byte); -- [cite: 50]
+                            if not g_PACK_TWO then mem_Imag(r_RX_Bank)(rx_count) <= (others => '0'); end if; -- [cite: 51]
+                        else
+                            mem_Imag(r_RX_Bank)(rx_count mod points) <= signed(rx_byte); -- Mode pack: frame kedua
+                        end if;
+                        if rx_count < c_RX_WORDS-1 or g_FRAMED then rx_count <= rx_count + 1; -- [cite: 51]
                         else r_Settle_Timer <= 0; r_Master_SM <= s_RX_SETTLE; end if; -- [cite: 52]
                     end if;
 
@@ -63,16 +207,43 @@ begin
 
                 when s_FFT =>
                     if fft_we = '1' then
-                        mem_Real(fft_addr_a) <= fft_ore_a; mem_Imag(fft_addr_a) <= fft_oim_a; -- [cite: 74-75]
-                        mem_Real(fft_addr_b) <= fft_ore_b; mem_Imag(fft_addr_b) <= fft_oim_b; -- [cite: 74-75]
+                        mem_Real(r_Proc_Bank)(fft_addr_a) <= fft_ore_a; mem_Imag(r_Proc_Bank)(fft_addr_a) <= fft_oim_a; -- [cite: 74-75]
+                        mem_Real(r_Proc_Bank)(fft_addr_b) <= fft_ore_b; mem_Imag(r_Proc_Bank)(fft_addr_b) <= fft_oim_b; -- [cite: 74-75]
+                    end if;
+                    if fft_done = '1' then -- [cite: 60]
+                        if g_PACK_TWO then split_start <= '1'; r_Master_SM <= s_SPLIT;
+                        else mag_start <= '1'; r_Master_SM <= s_MAG; end if;
                     end if;
-                    if fft_done = '1' then mag_start <= '1'; r_Master_SM <= s_MAG; end if; -- [cite: 60]
+
+                when s_SPLIT =>
+                    if split_we = '1' then
+                        mem_Real(r_Proc_Bank)(split_addr_a) <= split_ore_a; mem_Imag(r_Proc_Bank)(split_addr_a) <= split_oim_a;
+                        if split_addr_a /= split_addr_b then
+                            mem_Real(r_Proc_Bank)(split_addr_b) <= split_ore_b; mem_Imag(r_Proc_Bank)(split_addr_b) <= split_oim_b;
+                        elsif split_addr_a = 0 then r_Extra(0) <= split_ore_b;
+                        else r_Extra(1) <= split_ore_b; end if;
+                    end if;
+                    if split_done = '1' then mag_start <= '1'; r_Master_SM <= s_MAG; end if;
 
                 when s_MAG =>
-                    if mag_we = '1' then mem_Real(mag_addr) <= mag_ore; end if; -- [cite: 87]
+                    if mag_we = '1' then -- [cite: 87]
+                        if mag_addr < points then mem_Real(r_Proc_Bank)(mag_addr mod points) <= mag_ore;
+                        else r_Extra(mag_addr mod 2) <= mag_ore; end if;
+                    end if;
                     if mag_done = '1' then tx_start <= '1'; r_Master_SM <= s_TX; end if; -- [cite: 78]
 
-                when s_TX => if tx_done = '1' then r_Master_SM <= s_IDLE; end if; -- [cite: 91]
+                when s_TX =>
+                    if tx_done = '1' then -- [cite: 91]
+                        if g_FRAMED and r_Nak = '0' and r_Frames_Left > 1 then
+                            -- Frame berikutnya dalam batch: langsung s_RX tanpa s_IDLE
+                            r_Frames_Left <= r_Frames_Left - 1; r_Seq <= std_logic_vector(unsigned(r_Seq) + 1);
+                            rx_count <= 0; r_CRC <= c_CRC_INIT; r_Master_SM <= s_RX;
+                        elsif g_PING_PONG then
+                            -- Bank terkirim: kosongkan untuk RX, lanjut ke bank berikutnya
+                            r_Bank_Full(r_Proc_Bank) <= '0'; r_Proc_Bank <= (r_Proc_Bank + 1) mod c_BANKS;
+                            r_Master_SM <= s_IDLE;
+                        else r_Master_SM <= s_IDLE; end if;
+                    end if;
             end case;
         end if;
     end process;
@@ -1,43 +1,74 @@
 library ieee;
 use ieee.std_logic_1164.all;
 use ieee.numeric_std.all;
+use work.link_pkg.all;
 
 entity uart_tx is
-    generic ( g_CLKS_PER_BIT : integer := 5208 );
+    generic (
+        g_CLKS_PER_BIT : integer := 5208; g_LAST_ADDR : integer := 63;
+        g_FRAMED : boolean := false -- bingkai [sync, seq] + data + CRC-16 (link_pkg)
+    );
     port (
         i_Clk : in std_logic; i_Rst_n : in std_logic; i_Start : in std_logic;
-        o_Addr : out integer range 0 to 63; i_Data : in signed(7 downto 0);
-        o_UART_TX : out std_logic; o_Done, o_Busy : out std_logic
+        o_Addr : out integer range 0 to g_LAST_ADDR; i_Data : in signed(7 downto 0);
+        o_UART_TX : out std_logic; o_Done, o_Busy : out std_logic;
+        i_Seq : in std_logic_vector(7 downto 0) := (others => '0'); i_Nak : in std_logic := '0'
     );
 end uart_tx;
 
 architecture Behavioral of uart_tx is
     type t_State is (s_IDLE, s_FETCH, s_START, s_DATA, s_STOP);
     signal r_SM : t_State := s_IDLE;
-    signal r_Idx : integer range 0 to 64 := 0;
+    signal r_Idx : integer range 0 to g_LAST_ADDR := 0;
     signal r_Bit_Ctr, r_Bit_Idx : integer := 0;
     signal r_Buffer : std_logic_vector(7 downto 0);
+    -- g_FRAMED: header (sync, seq) -> data -> CRC (lo, hi); NAK tanpa data
+    type t_Part is (p_HEADER, p_DATA, p_CRC);
+    signal r_Part : t_Part := p_DATA;
+    signal r_Part_Idx : integer range 0 to 1 := 0;
+    signal r_CRC : std_logic_vector(15 downto 0) := c_CRC_INIT;
+    signal r_Seq : std_logic_vector(7 downto 0) := (others => '0');
+    signal r_Nak : std_logic := '0';
+    signal w_Frame_Byte : std_logic_vector(7 downto 0);
 begin
     o_Busy <= '0' when r_SM = s_IDLE else '1';
+    w_Frame_Byte <= r_Seq when r_Part = p_HEADER and r_Part_Idx = 1 else
+                    c_SYNC_NAK when r_Part = p_HEADER and r_Nak = '1' else
+                    c_SYNC_ACK when r_Part = p_HEADER else
+                    r_CRC(7 downto 0) when r_Part_Idx = 0 else r_CRC(15 downto 8);
     process(i_Clk, i_Rst_n) begin
         if i_Rst_n = '0' then r_SM <= s_IDLE; o_UART_TX <= '1';
         elsif rising_edge(i_Clk) then
             o_Done <= '0';
             case r_SM is
-                when s_IDLE => if i_Start = '1' then r_Idx <= 0; r_SM <= s_FETCH; end if;
+                when s_IDLE =>
+                    if i_Start = '1' then
+                        r_Idx <= 0; r_SM <= s_FETCH; r_CRC <= c_CRC_INIT; r_Seq <= i_Seq; r_Nak <= i_Nak; r_Part_Idx <= 0;
+                        if g_FRAMED then r_Part <= p_HEADER; else r_Part <= p_DATA; end if;
+                    end if;
                 when s_FETCH => o_Addr <= r_Idx; r_SM <= s_START; r_Bit_Ctr <= 0;
                 when s_START =>
-                    r_Buffer <= std_logic_vector(i_Data); o_UART_TX <= '0';
+                    if r_Part = p_DATA then r_Buffer <= std_logic_vector(i_Data); else r_Buffer <= w_Frame_Byte; end if;
+                    o_UART_TX <= '0';
                     if r_Bit_Ctr < g_CLKS_PER_BIT-1 then r_Bit_Ctr <= r_Bit_Ctr + 1;
                     else r_Bit_Ctr <= 0; r_SM <= s_DATA; r_Bit_Idx <= 0; end if;
                 when s_DATA =>
                     o_UART_TX <= r_Buffer(r_Bit_Idx);
+                    -- CRC atas byte yang dikirim (header + data), r_Buffer sudah final di sini
+                    if g_FRAMED and r_Bit_Idx = 0 and r_Bit_Ctr = 0 and r_Part /= p_CRC then r_CRC <= crc16_byte(r_CRC, r_Buffer); end if;
                     if r_Bit_Ctr < g_CLKS_PER_BIT-1 then r_Bit_Ctr <= r_Bit_Ctr + 1;
                     else r_Bit_Ctr <= 0; if r_Bit_Idx < 7 then r_Bit_Idx <= r_Bit_Idx + 1; else r_SM <= s_STOP; end if; end if;
                 when s_STOP =>
                     o_UART_TX <= '1';
                     if r_Bit_Ctr < g_CLKS_PER_BIT-1 then r_Bit_Ctr <= r_Bit_Ctr + 1;
-                    else if r_Idx < 63 then r_Idx <= r_Idx + 1; r_SM <= s_FETCH; else r_SM <= s_IDLE; o_Done <= '1'; end if; end if;
+                    elsif r_Part /= p_DATA then
+                        if r_Part_Idx = 0 then r_Part_Idx <= 1; r_SM <= s_FETCH;
+                        elsif r_Part = p_HEADER and r_Nak = '0' then r_Part <= p_DATA; r_SM <= s_FETCH;
+                        elsif r_Part = p_HEADER then r_Part <= p_CRC; r_Part_Idx <= 0; r_SM <= s_FETCH;
+                        else r_SM <= s_IDLE; o_Done <= '1'; end if;
+                    elsif r_Idx < g_LAST_ADDR then r_Idx <= r_Idx + 1; r_SM <= s_FETCH;
+                    elsif g_FRAMED then r_Part <= p_CRC; r_Part_Idx <= 0; r_SM <= s_FETCH;
+                    else r_SM <= s_IDLE; o_Done <= '1'; end if;
                 when others => r_SM <= s_IDLE;
             end case;
         end if;